@@ -0,0 +1,171 @@
+"""
+체크포인트 로드 벤치마크 (전체 읽기 vs mmap 지연 로드)
+
+두 가지 방식을 각각 새 프로세스에서 측정합니다.
+- full: safetensors.torch.load_file로 전체를 메모리로 읽은 뒤 모델 파라미터에 복사 (기존 방식)
+- mmap: services.checkpoint_manager로 mmap한 텐서를 모델 파라미터로 그대로 사용 (복사 없음)
+
+로드 시간, 로드 직후 RSS, 최대 RSS, 그리고 모든 가중치를 한 번 읽는 데 걸린 시간(지연 로드 비용)을 보고합니다.
+체크포인트를 지정하지 않으면 임시 safetensors 파일을 생성해 측정합니다.
+페이지 캐시 영향을 줄이려면 `--drop-caches`(root 필요)를 사용하세요.
+
+사용 예 (Back/venv_chat 디렉토리에서):
+    python -m benchmarks.checkpoint_load --size-mb 512
+    python -m benchmarks.checkpoint_load --checkpoint ../../Amphion/Amphion/pretrained/t2s_model/model.safetensors
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from typing import Dict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def current_rss_mb() -> float:
+    """현재 RSS (MB, Linux /proc 기준)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except OSError:
+        return float("nan")
+
+
+def build_skeleton(shapes: Dict[str, tuple], dtypes: Dict[str, object]):
+    """체크포인트 키 구조와 같은 모듈을 만듭니다 (실제 모델 생성처럼 파라미터를 할당)."""
+    import torch
+    from torch import nn
+
+    root = nn.Module()
+    for name, shape in shapes.items():
+        *path, leaf = name.split(".")
+        module = root
+        for part in path:
+            if not hasattr(module, part):
+                module.add_module(part, nn.Module())
+            module = getattr(module, part)
+        module.register_parameter(leaf, nn.Parameter(torch.empty(shape, dtype=dtypes[name]), requires_grad=False))
+    return root
+
+
+def make_synthetic_checkpoint(path: str, size_mb: int) -> None:
+    """Linear 계층 가중치 모양의 임시 safetensors 파일을 생성합니다."""
+    import torch
+    from safetensors.torch import save_file
+
+    tensors = {}
+    per_tensor = 1024 * 1024  # float32 4MB
+    for index in range(max(1, size_mb // 4)):
+        tensors[f"layers.{index}.weight"] = torch.randn(1024, per_tensor // 1024)
+        tensors[f"layers.{index}.bias"] = torch.randn(1024)
+    save_file(tensors, path)
+
+
+def run_worker(mode: str, checkpoint: str) -> Dict[str, object]:
+    import resource
+    import torch
+    from services import checkpoint_manager
+
+    header = checkpoint_manager.load_safetensors_mmap(checkpoint)
+    shapes = {name: tuple(tensor.shape) for name, tensor in header.items()}
+    dtypes = {name: tensor.dtype for name, tensor in header.items()}
+    del header
+
+    model = build_skeleton(shapes, dtypes)
+    baseline_rss = current_rss_mb()
+
+    start = time.perf_counter()
+    if mode == "full":
+        from safetensors.torch import load_file
+        model.load_state_dict(load_file(checkpoint), strict=True)
+    else:
+        checkpoint_manager.load_into(model, checkpoint_manager.load_state_dict(checkpoint), strict=True)
+    load_seconds = time.perf_counter() - start
+    rss_after_load = current_rss_mb()
+
+    # 모든 가중치를 한 번 읽어 지연 로드 비용을 측정
+    start = time.perf_counter()
+    with torch.no_grad():
+        checksum = sum(float(parameter.float().sum()) for parameter in model.parameters())
+    touch_seconds = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "load_seconds": load_seconds,
+        "touch_seconds": touch_seconds,
+        "rss_skeleton_mb": baseline_rss,
+        "rss_after_load_mb": rss_after_load,
+        "rss_after_touch_mb": current_rss_mb(),
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        "checksum": checksum,
+    }
+
+
+def drop_page_cache() -> None:
+    subprocess.run(["sync"], check=False)
+    try:
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+    except OSError as e:
+        print(f"페이지 캐시를 비울 수 없습니다: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="체크포인트 로드 방식별 시간/RSS 비교")
+    parser.add_argument("--checkpoint", type=str, default=None, help="측정할 safetensors 파일 (기본: 임시 파일 생성)")
+    parser.add_argument("--size-mb", type=int, default=256, help="임시 체크포인트 크기 (MB)")
+    parser.add_argument("--drop-caches", action="store_true", help="각 측정 전 페이지 캐시 비우기 (root 필요)")
+    parser.add_argument("--json", type=str, default=None, help="결과를 저장할 JSON 경로")
+    parser.add_argument("--worker", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.checkpoint)))
+        return
+
+    with tempfile.TemporaryDirectory(prefix="checkpoint_load_") as temp_dir:
+        checkpoint = args.checkpoint
+        if checkpoint is None:
+            checkpoint = os.path.join(temp_dir, "model.safetensors")
+            make_synthetic_checkpoint(checkpoint, args.size_mb)
+        size_mb = os.path.getsize(checkpoint) / (1024 * 1024)
+
+        results = []
+        for mode in ("full", "mmap"):
+            if args.drop_caches:
+                drop_page_cache()
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.checkpoint_load", "--worker", mode, "--checkpoint", checkpoint],
+                cwd=BACKEND_DIR, capture_output=True, text=True,
+            )
+            if completed.returncode != 0:
+                sys.stderr.write(completed.stderr[-4000:])
+                print(f"[{mode}] 실패")
+                continue
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    print(f"\n체크포인트: {checkpoint} ({size_mb:.0f} MB)")
+    print(f"{'mode':<6} {'load s':>8} {'touch s':>8} {'RSS load':>9} {'RSS touch':>10} {'max RSS':>9}")
+    print("-" * 56)
+    for r in results:
+        print(
+            f"{r['mode']:<6} {r['load_seconds']:>8.3f} {r['touch_seconds']:>8.3f} "
+            f"{r['rss_after_load_mb']:>9.0f} {r['rss_after_touch_mb']:>10.0f} {r['max_rss_mb']:>9.0f}"
+        )
+    if len(results) == 2 and abs(results[0]["checksum"] - results[1]["checksum"]) > 1e-3 * max(1.0, abs(results[0]["checksum"])):
+        print("경고: 두 방식의 가중치 합이 다릅니다")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"checkpoint": checkpoint, "size_mb": size_mb, "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+DeepSeek 헤지 요청 효과 측정
+
+꼬리 지연을 주입한 로컬 DeepSeek 대체 서버에 같은 요청을 보내며,
+헤지 요청을 끈 경우와 켠 경우의 p50/p95/p99 지연 시간, 헤지 비율, 마감 초과 수를 비교합니다.
+두 경우 모두 대체 서버를 같은 시드로 새로 띄우므로 주입되는 지연 순서가 같습니다.
+
+사용 예 (Back/venv_chat 디렉토리에서):
+    python -m benchmarks.deepseek_hedging
+    python -m benchmarks.deepseek_hedging --requests 400 --slow-fraction 0.03 --slow-extra-ms 4000 --budget 8 --json hedging.json
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.deepseek_stub import StubConfig, start_stub_server
+
+MESSAGES = [
+    {"role": "system", "content": "당신은 도움이 되는 AI 어시스턴트입니다."},
+    {"role": "user", "content": "오늘 날씨 어때?"},
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """선형 보간 백분위수를 계산합니다 (loadgen과 같은 방식, 모의 엔진 의존성 없이 사용)."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+async def run_case(url: str, hedge: bool, requests_count: int, concurrency: int, budget: float) -> Dict[str, object]:
+    """클라이언트 하나로 요청을 보내고 지연 시간 통계를 반환합니다."""
+    from services import deepseek_client
+
+    client = deepseek_client.DeepSeekClient(url=url, hedge=hedge)
+    payload = {"model": deepseek_client.DEEPSEEK_MODEL, "messages": MESSAGES, "max_tokens": 20, "stream": False}
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    timeouts = 0
+    errors = 0
+
+    async def one():
+        nonlocal timeouts, errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await client.request("benchmark", payload, budget)
+            except deepseek_client.DeepSeekTimeout:
+                timeouts += 1
+            except deepseek_client.DeepSeekError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    attempts_before = _attempt_counts(deepseek_client)
+    await asyncio.gather(*(one() for _ in range(requests_count)))
+    attempts = {key: value - attempts_before.get(key, 0.0) for key, value in _attempt_counts(deepseek_client).items()}
+    hedges = sum(value for (kind, _), value in attempts.items() if kind == "hedge")
+    hedge_wins = attempts.get(("hedge", "win"), 0.0)
+    client.close()
+    return {
+        "hedge": hedge,
+        "requests": requests_count,
+        "timeouts": timeouts,
+        "errors": errors,
+        "hedged": int(hedges),
+        "hedge_wins": int(hedge_wins),
+        "hedge_rate": hedges / requests_count if requests_count else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies) * 1000 if latencies else float("nan"),
+    }
+
+
+def _attempt_counts(deepseek_client) -> Dict[tuple, float]:
+    counter = deepseek_client.DEEPSEEK_ATTEMPTS
+    with counter._lock:
+        return dict(counter._values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DeepSeek 헤지 요청 효과 측정")
+    parser.add_argument("--requests", type=int, default=200, help="경우별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 요청 수")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="대체 서버 기본 지연 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=50.0, help="지연 지터 (±ms)")
+    parser.add_argument("--slow-fraction", type=float, default=0.03, help="꼬리 지연을 주입할 요청 비율")
+    parser.add_argument("--slow-extra-ms", type=float, default=3000.0, help="꼬리 지연 요청에 추가할 지연 (ms)")
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0, help="토큰 생성 속도 (0이면 즉시)")
+    parser.add_argument("--budget", type=float, default=10.0, help="요청별 지연 예산 (초)")
+    parser.add_argument("--seed", type=int, default=0, help="대체 서버 난수 시드")
+    parser.add_argument("--json", type=str, default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    results = []
+    for hedge in (False, True):
+        server, url = start_stub_server(config=StubConfig(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            tokens_per_sec=args.tokens_per_sec,
+            slow_fraction=args.slow_fraction,
+            slow_extra_ms=args.slow_extra_ms,
+            seed=args.seed,
+        ))
+        try:
+            results.append(asyncio.run(run_case(url, hedge, args.requests, args.concurrency, args.budget)))
+        finally:
+            server.shutdown()
+
+    print(f"{'hedge':<6} {'reqs':>5} {'t/o':>4} {'err':>4} {'hedged':>7} {'wins':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for row in results:
+        print(
+            f"{str(row['hedge']):<6} {row['requests']:>5} {row['timeouts']:>4} {row['errors']:>4} "
+            f"{row['hedged']:>7} {row['hedge_wins']:>5} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+            f"{row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}"
+        )
+    if results[0]["p99_ms"] > 0:
+        print(f"p99 개선: {(1 - results[1]['p99_ms'] / results[0]['p99_ms']) * 100:.1f}%")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
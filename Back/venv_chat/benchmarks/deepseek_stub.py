@@ -0,0 +1,209 @@
+"""
+DeepSeek API 로컬 대체 서버
+
+DeepSeek `/v1/chat/completions`와 호환되는 로컬 HTTP 서버입니다.
+지연 시간(첫 바이트까지)과 토큰 스트리밍 속도를 설정할 수 있어 오프라인 부하 테스트에 사용합니다.
+
+사용 예:
+    python -m benchmarks.deepseek_stub --port 8900 --latency-ms 300 --tokens-per-sec 40
+"""
+
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# 모의 응답 문장 (결정적 결과를 위해 요청 순서대로 순환)
+STUB_REPLIES = (
+    "좋은 질문이에요. 오늘 서울은 대체로 맑고 오후에는 기온이 조금 오를 예정입니다. 외출하실 때 가벼운 겉옷을 챙기시면 좋겠어요.",
+    "네, 내일 오전 열 시로 회의 일정을 등록해 두었습니다. 참석자에게 알림을 보낼까요?",
+    "근처에 평점이 높은 카페가 세 곳 있어요. 조용한 곳을 원하시면 두 번째 카페를 추천드립니다.",
+    "물론이죠. 번역할 문장을 말씀해 주시면 자연스러운 영어 표현으로 바꿔 드릴게요.",
+)
+
+
+class StubConfig:
+    """대체 서버 동작 설정"""
+
+    def __init__(
+        self,
+        latency_ms: float = 300.0,
+        jitter_ms: float = 0.0,
+        tokens_per_sec: float = 50.0,
+        slow_fraction: float = 0.0,
+        slow_extra_ms: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tokens_per_sec = tokens_per_sec
+        # 꼬리 지연 주입: slow_fraction 비율의 요청에 slow_extra_ms를 추가
+        self.slow_fraction = slow_fraction
+        self.slow_extra_ms = slow_extra_ms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counter = 0
+
+    def next_request(self):
+        """다음 요청의 (응답 문장, 첫 바이트 지연 초)를 결정합니다."""
+        with self._lock:
+            index = self._counter
+            self._counter += 1
+            delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            if self.slow_fraction and self._rng.random() < self.slow_fraction:
+                delay += self.slow_extra_ms
+        return STUB_REPLIES[index % len(STUB_REPLIES)], max(0.0, delay) / 1000.0
+
+
+def _tokenize(text: str):
+    """공백 단위로 토큰을 나눕니다 (공백 포함)."""
+    tokens = []
+    for word in text.split(" "):
+        tokens.append(word if not tokens else " " + word)
+    return tokens
+
+
+def make_handler(config: StubConfig):
+    """설정을 캡처한 요청 핸들러 클래스를 생성합니다."""
+
+    class DeepSeekStubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler 시그니처
+            logger.debug(format % args)
+
+        def _send_json(self, status: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                # 클라이언트가 응답 전에 연결을 닫은 경우 (취소된 헤지 요청 등)
+                self.close_connection = True
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+
+            length = int(self.headers.get("Content-Length", "0"))
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                self._send_json(400, {"error": {"message": "invalid json"}})
+                return
+
+            reply, delay = config.next_request()
+            max_tokens = int(payload.get("max_tokens", 500))
+            tokens = _tokenize(reply)[:max_tokens]
+            time.sleep(delay)
+
+            if payload.get("stream"):
+                self._stream(tokens, payload.get("model", "deepseek-chat"))
+            else:
+                # 비스트리밍 모드는 전체 토큰 생성 시간까지 기다린 뒤 응답
+                if config.tokens_per_sec > 0:
+                    time.sleep(len(tokens) / config.tokens_per_sec)
+                self._send_json(200, {
+                    "id": "stub",
+                    "object": "chat.completion",
+                    "model": payload.get("model", "deepseek-chat"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "".join(tokens)},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {
+                        "prompt_tokens": sum(len(m.get("content", "")) for m in payload.get("messages", [])),
+                        "completion_tokens": len(tokens),
+                        "total_tokens": len(tokens),
+                    },
+                })
+
+        def _stream(self, tokens, model: str):
+            """SSE 형식으로 토큰 델타를 전송합니다."""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            interval = 1.0 / config.tokens_per_sec if config.tokens_per_sec > 0 else 0.0
+            try:
+                for i, token in enumerate(tokens):
+                    chunk = {
+                        "id": "stub",
+                        "object": "chat.completion.chunk",
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    if interval and i < len(tokens) - 1:
+                        time.sleep(interval)
+                done = {"id": "stub", "object": "chat.completion.chunk", "model": model,
+                        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+                self.wfile.write(f"data: {json.dumps(done)}\n\n".encode("utf-8"))
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                # 클라이언트가 요청을 취소한 경우 (헤지 요청 등)
+                pass
+            self.close_connection = True
+
+    return DeepSeekStubHandler
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, config: Optional[StubConfig] = None):
+    """백그라운드 스레드에서 대체 서버를 시작하고 (server, url)을 반환합니다."""
+    server = ThreadingHTTPServer((host, port), make_handler(config or StubConfig()))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="deepseek-stub", daemon=True)
+    thread.start()
+    url = f"http://{host}:{server.server_address[1]}/v1/chat/completions"
+    logger.info(f"DeepSeek 대체 서버 시작: {url}")
+    return server, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DeepSeek API 로컬 대체 서버")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="바인드 주소")
+    parser.add_argument("--port", type=int, default=8900, help="포트")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="첫 바이트까지 지연 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="지연 시간 지터 (±ms)")
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0, help="토큰 생성 속도")
+    parser.add_argument("--slow-fraction", type=float, default=0.0, help="꼬리 지연을 주입할 요청 비율")
+    parser.add_argument("--slow-extra-ms", type=float, default=0.0, help="꼬리 지연 요청에 추가할 지연 (ms)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        tokens_per_sec=args.tokens_per_sec,
+        slow_fraction=args.slow_fraction,
+        slow_extra_ms=args.slow_extra_ms,
+        seed=args.seed,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config))
+    server.daemon_threads = True
+    logger.info(f"DeepSeek 대체 서버 실행 중: http://{args.host}:{args.port}/v1/chat/completions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("사용자에 의해 중단됨")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+벤치마크용 모의 엔진 모듈
+
+실제 모델 없이 CPU에서 오프라인으로 부하 테스트를 돌리기 위한 결정적(deterministic) 모의 엔진을 제공합니다.
+
+- FakeMetis: 텍스트 길이에 비례하는 연산 비용을 갖는 Metis 호환 모의 모델
+- build_torch_fake_metis(): 실제 nn.Linear 연산을 수행하는 Metis 호환 모의 모델 (양자화/컴파일 측정용)
+- FakeWhisperModel: faster_whisper.WhisperModel 호환 모의 모델
+- FakeBatchedInferencePipeline: faster_whisper.BatchedInferencePipeline 호환 모의 파이프라인
+- install_fake_whisper(): `faster_whisper` 모듈을 모의 구현으로 대체
+"""
+
+import io
+import sys
+import time
+import types
+import logging
+from collections import namedtuple
+from typing import Iterator, Tuple
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+# faster_whisper의 Segment/TranscriptionInfo와 같은 필드 이름을 사용
+FakeSegment = namedtuple("FakeSegment", ["id", "start", "end", "text"])
+FakeInfo = namedtuple("FakeInfo", ["language", "language_probability", "duration"])
+
+# 모의 인식 결과로 돌려줄 문장 (결정적 결과를 위해 순환 사용)
+FAKE_TRANSCRIPTS = (
+    "안녕하세요, 오늘 날씨가 어떤가요?",
+    "내일 오전 열 시에 회의 일정을 잡아 주세요.",
+    "가까운 카페를 추천해 줄 수 있나요?",
+    "이 문장을 영어로 번역해 주세요.",
+)
+
+
+def _spend(seconds: float, mode: str = "sleep") -> None:
+    """지정된 시간만큼 비용을 소모합니다.
+
+    Args:
+        seconds: 소모할 시간 (초)
+        mode: 'sleep'은 GIL을 놓고 대기 (실제 추론 커널과 유사),
+              'cpu'는 numpy 행렬 곱으로 실제 CPU를 사용
+    """
+    if seconds <= 0:
+        return
+    if mode == "cpu":
+        deadline = time.perf_counter() + seconds
+        block = np.ones((64, 64), dtype=np.float32)
+        while time.perf_counter() < deadline:
+            block = np.tanh(block @ block * 1e-3)
+    else:
+        time.sleep(seconds)
+
+
+class FakeMetis:
+    """Metis 호환 모의 모델
+
+    호출 비용 = base_ms + per_char_ms * len(text), 출력은 텍스트 길이에 비례하는 사인파입니다.
+    """
+
+    def __init__(
+        self,
+        base_ms: float = 50.0,
+        per_char_ms: float = 4.0,
+        sample_rate: int = 24000,
+        seconds_per_char: float = 0.08,
+        mode: str = "sleep",
+    ):
+        self.base_ms = base_ms
+        self.per_char_ms = per_char_ms
+        self.sample_rate = sample_rate
+        self.seconds_per_char = seconds_per_char
+        self.mode = mode
+
+    def __call__(self, text: str = "", n_timesteps: int = 25, **kwargs) -> np.ndarray:
+        # 실제 Metis처럼 추론 스텝 수에 비례하도록 비용을 조정 (25 스텝 기준)
+        cost_ms = (self.base_ms + self.per_char_ms * len(text)) * (n_timesteps / 25.0)
+        _spend(cost_ms / 1000.0, self.mode)
+
+        duration = max(0.2, len(text) * self.seconds_per_char)
+        t = np.arange(int(self.sample_rate * duration), dtype=np.float32) / self.sample_rate
+        # 텍스트 길이로 주파수를 정해 같은 입력이면 항상 같은 파형을 생성
+        frequency = 180.0 + (len(text) % 40) * 5.0
+        return (0.2 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def build_torch_fake_metis(hidden: int = 512, layers: int = 4, seed: int = 0):
+    """실제 torch 연산을 수행하는 Metis 호환 모의 모델을 생성합니다.
+
+    실제 Metis처럼 서브모듈(t2s_model, s2a_model, codec_decoder)을 속성으로 갖고,
+    n_timesteps번 반복하는 선형 계층 연산 비용이 텍스트 길이에 비례합니다.
+    int8 양자화나 torch.compile 같은 실행 모드의 상대적 효과를 GPU/체크포인트 없이 측정하는 용도입니다.
+    torch는 이 함수를 호출할 때만 임포트합니다.
+    """
+    import torch
+    from torch import nn
+
+    torch.manual_seed(seed)
+
+    def block() -> nn.Module:
+        return nn.Sequential(*[
+            nn.Sequential(nn.Linear(hidden, hidden), nn.GELU()) for _ in range(layers)
+        ])
+
+    class TorchFakeMetis:
+        def __init__(self):
+            self.t2s_model = block().eval()
+            self.s2a_model = block().eval()
+            self.codec_decoder = nn.Linear(hidden, 240).eval()  # 프레임당 240샘플 (24kHz에서 10ms)
+            self.sample_rate = 24000
+
+        def __call__(self, text: str = "", n_timesteps: int = 25, **kwargs) -> np.ndarray:
+            frames = max(20, len(text) * 8)  # 글자당 약 80ms
+            generator = torch.Generator().manual_seed(len(text))
+            x = torch.randn(1, frames, hidden, generator=generator)
+            for _ in range(n_timesteps):
+                x = x + 0.1 * self.t2s_model(x)
+            x = self.s2a_model(x)
+            wave = torch.tanh(self.codec_decoder(x)).reshape(-1)
+            return wave.detach().float().cpu().numpy()
+
+    return TorchFakeMetis()
+
+
+class FakeWhisperModel:
+    """faster_whisper.WhisperModel 호환 모의 모델
+
+    호출 비용 = base_ms + per_audio_second_ms * 오디오 길이(초)
+    """
+
+    # 벤치마크 실행기에서 조정할 수 있는 클래스 수준 기본값
+    base_ms = 30.0
+    per_audio_second_ms = 40.0
+    mode = "sleep"
+
+    def __init__(self, model_size_or_path: str = "base", device: str = "cpu", compute_type: str = "int8", **kwargs):
+        self.model_size = model_size_or_path
+        self.device = device
+        self.compute_type = compute_type
+        self._calls = 0
+
+    def transcribe(self, audio, language: str = "ko", **kwargs) -> Tuple[Iterator[FakeSegment], FakeInfo]:
+        if isinstance(audio, np.ndarray):
+            samples = audio
+        else:
+            samples = decode_audio(audio)
+        duration = len(samples) / 16000.0
+        text = FAKE_TRANSCRIPTS[self._calls % len(FAKE_TRANSCRIPTS)]
+        self._calls += 1
+        info = FakeInfo(language=language, language_probability=1.0, duration=duration)
+
+        def generate():
+            # 실제 구현처럼 제너레이터를 순회할 때 추론 비용이 발생
+            _spend((self.base_ms + self.per_audio_second_ms * duration) / 1000.0, self.mode)
+            yield FakeSegment(id=0, start=0.0, end=duration, text=" " + text)
+
+        return generate(), info
+
+
+class FakeBatchedInferencePipeline:
+    """faster_whisper.BatchedInferencePipeline 호환 모의 파이프라인
+
+    30초 창 batch_size개를 한 번의 호출 비용으로 처리합니다.
+    호출 비용 = 배치 수 * (base_ms + per_audio_second_ms * min(오디오 길이, 30))
+    """
+
+    def __init__(self, model: FakeWhisperModel, **kwargs):
+        self.model = model
+
+    def transcribe(self, audio, language: str = "ko", batch_size: int = 8, **kwargs) -> Tuple[Iterator[FakeSegment], FakeInfo]:
+        samples = audio if isinstance(audio, np.ndarray) else decode_audio(audio)
+        duration = len(samples) / 16000.0
+        windows = max(1, int(np.ceil(duration / 30.0)))
+        batches = int(np.ceil(windows / max(1, batch_size)))
+        text = FAKE_TRANSCRIPTS[self.model._calls % len(FAKE_TRANSCRIPTS)]
+        self.model._calls += 1
+        info = FakeInfo(language=language, language_probability=1.0, duration=duration)
+        model = self.model
+
+        def generate():
+            _spend(batches * (model.base_ms + model.per_audio_second_ms * min(duration, 30.0)) / 1000.0, model.mode)
+            for window in range(windows):
+                yield FakeSegment(id=window, start=window * 30.0, end=min(duration, (window + 1) * 30.0), text=" " + text)
+
+        return generate(), info
+
+
+def decode_audio(input_file, sampling_rate: int = 16000) -> np.ndarray:
+    """faster_whisper.audio.decode_audio 호환 모의 디코더 (WAV/FLAC/OGG 지원)"""
+    if isinstance(input_file, (bytes, bytearray)):
+        input_file = io.BytesIO(input_file)
+    data, sr = sf.read(input_file, dtype="float32", always_2d=True)
+    mono = data.mean(axis=1)
+    if sr != sampling_rate and len(mono):
+        # 선형 보간 리샘플링 (벤치마크 용도로 충분)
+        target_len = int(round(len(mono) * sampling_rate / sr))
+        positions = np.linspace(0, len(mono) - 1, target_len)
+        mono = np.interp(positions, np.arange(len(mono)), mono).astype(np.float32)
+    return mono
+
+
+def install_fake_whisper() -> None:
+    """`faster_whisper` 모듈을 모의 구현으로 대체합니다.
+
+    services.stt_service를 임포트하기 전에 호출해야 합니다.
+    """
+    package = types.ModuleType("faster_whisper")
+    package.WhisperModel = FakeWhisperModel
+    package.BatchedInferencePipeline = FakeBatchedInferencePipeline
+    audio_module = types.ModuleType("faster_whisper.audio")
+    audio_module.decode_audio = decode_audio
+    package.audio = audio_module
+    package.decode_audio = decode_audio
+    sys.modules["faster_whisper"] = package
+    sys.modules["faster_whisper.audio"] = audio_module
+    logger.info("faster_whisper 모의 모듈 설치 완료")
+
+
+def make_test_wav(seconds: float = 3.0, sample_rate: int = 16000) -> bytes:
+    """부하 테스트용 WAV 바이트를 생성합니다 (결정적 사인파 + 약한 노이즈)."""
+    rng = np.random.default_rng(1234)
+    t = np.arange(int(sample_rate * seconds), dtype=np.float32) / sample_rate
+    wave = 0.3 * np.sin(2 * np.pi * 220.0 * t) + 0.01 * rng.standard_normal(len(t))
+    buffer = io.BytesIO()
+    sf.write(buffer, wave.astype(np.float32), sample_rate, format="WAV")
+    return buffer.getvalue()
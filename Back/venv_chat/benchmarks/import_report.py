@@ -0,0 +1,99 @@
+"""
+임포트 시간 리포트
+
+`python -X importtime`으로 대상 모듈을 새 프로세스에서 임포트하여 모듈별 임포트 비용을 집계하고,
+전체 임포트 시간이 예산(budget)을 넘으면 종료 코드 1로 실패합니다.
+서버 콜드 스타트와 `--reload` 재시작 시간을 추적하는 용도입니다.
+
+사용 예 (Back/venv_chat 디렉토리에서):
+    python -m benchmarks.import_report services.tts_service --budget-ms 300
+    python -m benchmarks.import_report main --top 30 --json import_main.json
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def collect_import_times(module: str, python: str = sys.executable) -> List[Dict[str, object]]:
+    """대상 모듈 임포트 시 모듈별 (self, cumulative) 시간을 수집합니다 (단위: us)."""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        # 임포트 자체가 실패하면 원인을 그대로 보여줌
+        sys.stderr.write(result.stderr[-4000:])
+        raise RuntimeError(f"모듈 임포트 실패: {module}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        # 형식: "import time:      self [us] |   cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        try:
+            entries.append({
+                "module": name.rstrip(),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+                "self_us": int(self_us.strip()),
+                "cumulative_us": int(cumulative_us.strip()),
+            })
+        except ValueError:
+            # 헤더 줄 ("self [us]")
+            continue
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모듈별 임포트 시간 리포트")
+    parser.add_argument("module", nargs="?", default="services.tts_service", help="임포트할 대상 모듈")
+    parser.add_argument("--budget-ms", type=float, default=None, help="대상 모듈 임포트 시간 예산 (ms)")
+    parser.add_argument("--top", type=int, default=20, help="출력할 상위 모듈 수")
+    parser.add_argument("--json", type=str, default=None, help="전체 결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    entries = collect_import_times(args.module)
+    target = next((e for e in reversed(entries) if e["module"].strip() == args.module), None)
+    total_ms = target["cumulative_us"] / 1000.0 if target else sum(e["self_us"] for e in entries) / 1000.0
+
+    print(f"\n'{args.module}' 임포트 시간: {total_ms:.1f} ms (모듈 {len(entries)}개)")
+
+    # 최상위 의존성별 누적 비용 (대상 모듈이 직접/간접으로 끌어오는 패키지 단위)
+    top_level: Dict[str, int] = {}
+    for entry in entries:
+        root = entry["module"].strip().split(".")[0]
+        top_level[root] = top_level.get(root, 0) + entry["self_us"]
+    print(f"\n{'package':<32} {'self (ms)':>10}")
+    print("-" * 43)
+    for name, self_us in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<32} {self_us / 1000.0:>10.1f}")
+
+    print(f"\n{'module':<48} {'self (ms)':>10} {'cumul (ms)':>11}")
+    print("-" * 71)
+    for entry in sorted(entries, key=lambda e: -e["self_us"])[:args.top]:
+        print(f"{entry['module'].strip():<48} {entry['self_us'] / 1000.0:>10.1f} {entry['cumulative_us'] / 1000.0:>11.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"module": args.module, "total_ms": total_ms, "modules": entries}, f, ensure_ascii=False, indent=2)
+
+    if args.budget_ms is not None:
+        if total_ms > args.budget_ms:
+            print(f"\n예산 초과: {total_ms:.1f} ms > {args.budget_ms:.1f} ms")
+            sys.exit(1)
+        print(f"\n예산 이내: {total_ms:.1f} ms <= {args.budget_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
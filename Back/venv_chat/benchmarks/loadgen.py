@@ -0,0 +1,286 @@
+"""
+엔드 투 엔드 부하 생성기
+
+엔드포인트별로 지정된 동시성으로 요청을 보내고 p50/p95/p99 지연 시간, 처리량,
+첫 오디오 바이트까지의 시간(TTFA)을 보고합니다.
+
+`--spawn` 옵션을 주면 DeepSeek 대체 서버와 모의 엔진 API 서버를 직접 띄우므로
+네트워크, GPU, 실제 모델 없이 CPU에서 오프라인으로 실행됩니다.
+
+사용 예 (Back/venv_chat 디렉토리에서):
+    python -m benchmarks.loadgen --spawn --concurrency 1 4 8 --requests 40
+    python -m benchmarks.loadgen --base-url http://127.0.0.1:8000 --endpoints tts chat --json result.json
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.deepseek_stub import StubConfig, start_stub_server
+from benchmarks.fakes import make_test_wav
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# 부하 테스트용 한국어 문장
+TTS_TEXTS = (
+    "안녕하세요, 무엇을 도와드릴까요?",
+    "오늘 서울은 대체로 맑고 오후에는 기온이 조금 오를 예정입니다.",
+    "내일 오전 열 시로 회의 일정을 등록해 두었습니다. 참석자에게 알림을 보낼까요?",
+    "근처에 평점이 높은 카페가 세 곳 있어요. 조용한 곳을 원하시면 두 번째 카페를 추천드립니다.",
+)
+CHAT_MESSAGES = (
+    "오늘 날씨 어때?",
+    "내일 회의 일정 잡아줘.",
+    "근처 카페 추천해줘.",
+    "이 문장 영어로 번역해줘.",
+)
+
+ENDPOINTS = ("stt", "chat", "voice", "tts")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """선형 보간 백분위수를 계산합니다."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class RequestResult:
+    """단일 요청 결과"""
+
+    __slots__ = ("ok", "latency", "ttfa", "error")
+
+    def __init__(self, ok: bool, latency: float, ttfa: Optional[float] = None, error: Optional[str] = None):
+        self.ok = ok
+        self.latency = latency
+        self.ttfa = ttfa
+        self.error = error
+
+
+def _request_stt(session: requests.Session, base_url: str, index: int, audio: bytes) -> RequestResult:
+    start = time.perf_counter()
+    response = session.post(f"{base_url}/api/stt", files={"audio": ("bench.wav", audio, "audio/wav")}, timeout=120)
+    latency = time.perf_counter() - start
+    return RequestResult(response.ok, latency, error=None if response.ok else response.text[:200])
+
+
+def _request_chat(session: requests.Session, base_url: str, index: int, audio: bytes) -> RequestResult:
+    start = time.perf_counter()
+    response = session.post(
+        f"{base_url}/api/chat/",
+        json={"message": CHAT_MESSAGES[index % len(CHAT_MESSAGES)]},
+        timeout=120,
+    )
+    latency = time.perf_counter() - start
+    return RequestResult(response.ok, latency, error=None if response.ok else response.text[:200])
+
+
+def _request_voice(session: requests.Session, base_url: str, index: int, audio: bytes) -> RequestResult:
+    # 통합 음성 API는 오디오를 base64 JSON으로 돌려주므로 TTFA = 전체 응답 시간
+    start = time.perf_counter()
+    response = session.post(
+        f"{base_url}/api/chat/voice",
+        files={"audio": ("bench.wav", audio, "audio/wav")},
+        data={"history": "[]", "language": "ko"},
+        timeout=300,
+    )
+    latency = time.perf_counter() - start
+    ok = response.ok and bool(response.json().get("audio_base64"))
+    return RequestResult(ok, latency, ttfa=latency if ok else None, error=None if ok else response.text[:200])
+
+
+def _request_tts(session: requests.Session, base_url: str, index: int, audio: bytes) -> RequestResult:
+    start = time.perf_counter()
+    ttfa = None
+    with session.post(
+        f"{base_url}/tts/synthesize/stream",
+        json={"text": TTS_TEXTS[index % len(TTS_TEXTS)], "use_cache": False},
+        stream=True,
+        timeout=300,
+    ) as response:
+        if not response.ok:
+            return RequestResult(False, time.perf_counter() - start, error=response.text[:200])
+        for chunk in response.iter_content(chunk_size=4096):
+            if chunk and ttfa is None:
+                ttfa = time.perf_counter() - start
+    return RequestResult(True, time.perf_counter() - start, ttfa=ttfa)
+
+
+REQUEST_FUNCS: Dict[str, Callable[[requests.Session, str, int, bytes], RequestResult]] = {
+    "stt": _request_stt,
+    "chat": _request_chat,
+    "voice": _request_voice,
+    "tts": _request_tts,
+}
+
+
+def run_endpoint(base_url: str, endpoint: str, concurrency: int, total: int, audio: bytes) -> Dict[str, float]:
+    """한 엔드포인트에 대해 지정된 동시성으로 total개의 요청을 실행합니다."""
+    func = REQUEST_FUNCS[endpoint]
+    sessions = [requests.Session() for _ in range(concurrency)]
+
+    def worker(index: int) -> RequestResult:
+        try:
+            return func(sessions[index % concurrency], base_url, index, audio)
+        except Exception as e:
+            return RequestResult(False, 0.0, error=str(e))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, range(total)))
+    wall = time.perf_counter() - start
+
+    for session in sessions:
+        session.close()
+
+    latencies = [r.latency for r in results if r.ok]
+    ttfas = [r.ttfa for r in results if r.ok and r.ttfa is not None]
+    errors = [r.error for r in results if not r.ok]
+    if errors:
+        logger.warning(f"{endpoint}: 실패 {len(errors)}건 (예: {errors[0]})")
+
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": len(errors),
+        "throughput_rps": len(latencies) / wall if wall > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "ttfa_p50_ms": percentile(ttfas, 50) * 1000 if ttfas else None,
+        "ttfa_p95_ms": percentile(ttfas, 95) * 1000 if ttfas else None,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_fake_stack(args) -> Tuple[str, subprocess.Popen, object]:
+    """DeepSeek 대체 서버(스레드)와 모의 엔진 API 서버(하위 프로세스)를 시작합니다."""
+    stub_server, stub_url = start_stub_server(config=StubConfig(
+        latency_ms=args.llm_latency_ms,
+        jitter_ms=args.llm_jitter_ms,
+        tokens_per_sec=args.llm_tokens_per_sec,
+    ))
+
+    port = _free_port()
+    command = [
+        sys.executable, "-m", "benchmarks.serve_fakes",
+        "--port", str(port),
+        "--deepseek-url", stub_url,
+        "--tts-base-ms", str(args.tts_base_ms),
+        "--tts-per-char-ms", str(args.tts_per_char_ms),
+        "--stt-base-ms", str(args.stt_base_ms),
+        "--stt-per-second-ms", str(args.stt_per_second_ms),
+        "--cost-mode", args.cost_mode,
+    ]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR)
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.time() + args.startup_timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("모의 API 서버가 시작 중에 종료되었습니다")
+        try:
+            if requests.get(f"{base_url}/", timeout=1).ok:
+                logger.info(f"모의 API 서버 준비 완료: {base_url}")
+                return base_url, process, stub_server
+        except requests.exceptions.RequestException:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("모의 API 서버 시작 시간 초과")
+
+
+def print_report(rows: List[Dict[str, float]]) -> None:
+    """결과를 표 형식으로 출력합니다."""
+    def fmt(value):
+        return "-" if value is None else f"{value:.1f}"
+
+    header = f"{'endpoint':<8} {'conc':>4} {'reqs':>5} {'err':>4} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'ttfa50':>9} {'ttfa95':>9}"
+    print("\n" + header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['endpoint']:<8} {row['concurrency']:>4} {row['requests']:>5} {row['errors']:>4} "
+            f"{row['throughput_rps']:>8.2f} {fmt(row['p50_ms']):>9} {fmt(row['p95_ms']):>9} "
+            f"{fmt(row['p99_ms']):>9} {fmt(row['ttfa_p50_ms']):>9} {fmt(row['ttfa_p95_ms']):>9}"
+        )
+    print("(단위: ms, rps = 초당 성공 요청 수)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔드 투 엔드 부하 생성기")
+    parser.add_argument("--base-url", type=str, default=None, help="대상 API 서버 URL (--spawn 미사용 시)")
+    parser.add_argument("--spawn", action="store_true", help="모의 엔진 서버와 DeepSeek 대체 서버를 직접 실행")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS), help="측정할 엔드포인트")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4], help="동시성 수준 목록")
+    parser.add_argument("--requests", type=int, default=20, help="엔드포인트/동시성 조합당 요청 수")
+    parser.add_argument("--audio-seconds", type=float, default=3.0, help="STT 입력 오디오 길이 (초)")
+    parser.add_argument("--json", type=str, default=None, help="결과를 저장할 JSON 파일 경로")
+    # --spawn 시 모의 엔진 비용 설정
+    parser.add_argument("--tts-base-ms", type=float, default=50.0, help="Metis 호출당 고정 비용 (ms)")
+    parser.add_argument("--tts-per-char-ms", type=float, default=4.0, help="Metis 글자당 비용 (ms)")
+    parser.add_argument("--stt-base-ms", type=float, default=30.0, help="Whisper 호출당 고정 비용 (ms)")
+    parser.add_argument("--stt-per-second-ms", type=float, default=40.0, help="Whisper 오디오 1초당 비용 (ms)")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0, help="DeepSeek 첫 바이트 지연 (ms)")
+    parser.add_argument("--llm-jitter-ms", type=float, default=50.0, help="DeepSeek 지연 지터 (±ms)")
+    parser.add_argument("--llm-tokens-per-sec", type=float, default=50.0, help="DeepSeek 토큰 생성 속도")
+    parser.add_argument("--cost-mode", choices=["sleep", "cpu"], default="sleep", help="모의 엔진 비용 소모 방식")
+    parser.add_argument("--startup-timeout", type=float, default=120.0, help="서버 시작 대기 시간 (초)")
+    args = parser.parse_args()
+
+    if not args.spawn and not args.base_url:
+        parser.error("--base-url 또는 --spawn 중 하나를 지정해야 합니다")
+
+    process = None
+    stub_server = None
+    try:
+        if args.spawn:
+            base_url, process, stub_server = spawn_fake_stack(args)
+        else:
+            base_url = args.base_url.rstrip("/")
+
+        audio = make_test_wav(seconds=args.audio_seconds)
+        rows = []
+        for endpoint in args.endpoints:
+            for concurrency in args.concurrency:
+                logger.info(f"측정 중: {endpoint} (동시성 {concurrency}, 요청 {args.requests}개)")
+                rows.append(run_endpoint(base_url, endpoint, concurrency, args.requests, audio))
+
+        print_report(rows)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"base_url": base_url, "results": rows}, f, ensure_ascii=False, indent=2)
+            logger.info(f"결과 저장: {args.json}")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+        if stub_server is not None:
+            stub_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
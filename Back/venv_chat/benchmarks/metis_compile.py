@@ -0,0 +1,124 @@
+"""
+Metis 컴파일 실행 경로 벤치마크 (eager vs torch.compile)
+
+고정된 한국어 문장 코퍼스로 다음 세 가지 실행을 각각 새 프로세스에서 측정합니다.
+- eager: 컴파일 없이 실행
+- compiled-cold: 빈 캐시 디렉토리에서 컴파일 (첫 문장에 컴파일 비용 포함)
+- compiled-warm: 같은 캐시 디렉토리로 다시 시작 (재시작 시 컴파일 그래프 재사용)
+
+첫 문장 지연 시간(시작 후 첫 추론)과 이후 문장별 지연 시간(p50/p95), eager 대비 속도 향상을 보고합니다.
+
+사용 예 (Back/venv_chat 디렉토리에서):
+    python -m benchmarks.metis_compile
+    python -m benchmarks.metis_compile --fake --cpu-mode int8 --json compile.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import Dict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.metis_cpu_modes import DEFAULT_CORPUS, build_service, load_corpus, percentile
+
+
+def run_worker(args) -> Dict[str, object]:
+    """현재 프로세스에서 한 가지 실행 방식을 측정합니다 (METIS_COMPILE 등은 부모가 환경 변수로 지정)."""
+    from services import metis_runtime
+
+    sentences = load_corpus(args.corpus)
+    started = time.perf_counter()
+    service = build_service(args.cpu_mode, args.fake)
+    load_seconds = time.perf_counter() - started
+
+    # 첫 추론: 컴파일(또는 캐시 로드 후 그래프 준비) 비용 포함
+    start = time.perf_counter()
+    service.synthesize(sentences[0], use_cache=False)
+    first_seconds = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(args.repeat):
+        for sentence in sentences:
+            start = time.perf_counter()
+            service.synthesize(sentence, use_cache=False)
+            latencies.append(time.perf_counter() - start)
+
+    return {
+        "variant": args.worker,
+        "compile": metis_runtime.METIS_COMPILE,
+        "cache_loaded": bool(service.compile_cache and service.compile_cache.loaded),
+        "load_seconds": load_seconds,
+        "first_sentence_seconds": first_seconds,
+        "p50_ms": statistics.median(latencies) * 1000.0,
+        "p95_ms": percentile(latencies, 95) * 1000.0,
+        "mean_ms": statistics.mean(latencies) * 1000.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metis eager vs torch.compile 문장별 지연 시간 비교")
+    parser.add_argument("--corpus", type=str, default=DEFAULT_CORPUS, help="한 줄에 한 문장인 코퍼스 파일")
+    parser.add_argument("--repeat", type=int, default=2, help="코퍼스 반복 횟수")
+    parser.add_argument("--cpu-mode", type=str, default="fp32", help="함께 적용할 CPU 실행 모드")
+    parser.add_argument("--compile-mode", type=str, default="default", help="torch.compile 모드")
+    parser.add_argument("--cache-dir", type=str, default=None, help="컴파일 캐시 디렉토리 (기본: 임시 디렉토리)")
+    parser.add_argument("--fake", action="store_true", help="torch 기반 모의 Metis로 측정 (체크포인트 불필요)")
+    parser.add_argument("--json", type=str, default=None, help="결과를 저장할 JSON 경로")
+    parser.add_argument("--worker", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return
+
+    with tempfile.TemporaryDirectory(prefix="metis_compile_") as temp_dir:
+        cache_dir = args.cache_dir or temp_dir
+        base_env = dict(os.environ, METIS_COMPILE_CACHE_DIR=cache_dir, METIS_COMPILE_MODE=args.compile_mode)
+        # 측정 간섭을 막기 위해 외부에서 지정한 inductor 캐시 위치는 사용하지 않음
+        base_env.pop("TORCHINDUCTOR_CACHE_DIR", None)
+        variants = [
+            ("eager", dict(base_env, METIS_COMPILE="0")),
+            ("compiled-cold", dict(base_env, METIS_COMPILE="1")),
+            ("compiled-warm", dict(base_env, METIS_COMPILE="1")),
+        ]
+        results = []
+        for name, env in variants:
+            command = [
+                sys.executable, "-m", "benchmarks.metis_compile",
+                "--worker", name, "--corpus", args.corpus, "--repeat", str(args.repeat), "--cpu-mode", args.cpu_mode,
+            ]
+            if args.fake:
+                command.append("--fake")
+            print(f"[{name}] 측정 중...", flush=True)
+            completed = subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+            if completed.returncode != 0:
+                sys.stderr.write(completed.stderr[-4000:])
+                print(f"[{name}] 실패")
+                continue
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    eager = next((r for r in results if r["variant"] == "eager"), None)
+    print(f"\n{'variant':<15} {'cache':>6} {'load s':>8} {'first s':>8} {'p50 ms':>9} {'p95 ms':>9} {'speedup':>8}")
+    print("-" * 70)
+    for r in results:
+        speedup = eager["p50_ms"] / r["p50_ms"] if eager else float("nan")
+        print(
+            f"{r['variant']:<15} {'hit' if r['cache_loaded'] else '-':>6} {r['load_seconds']:>8.2f} "
+            f"{r['first_sentence_seconds']:>8.2f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {speedup:>7.2f}x"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"corpus": args.corpus, "fake": args.fake, "cpu_mode": args.cpu_mode, "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Metis CPU 실행 모드 비교 (품질/지연 시간)
+
+고정된 한국어 문장 코퍼스(benchmarks/corpus/ko_sentences.txt)로 CPU 실행 모드(fp32, int8, bf16, int8_bf16)별
+실시간 계수(RTF = 합성 시간 / 생성된 오디오 길이)와 문장별 지연 시간을 측정합니다.
+스레드 설정과 양자화는 프로세스 전역/비가역이므로 모드마다 새 프로세스에서 실행합니다.
+
+품질은 `--cer`를 주면 생성된 음성을 Whisper로 다시 인식하여 원문 대비 문자 오류율(CER)로 비교합니다.
+
+사용 예 (Back/venv_chat 디렉토리에서):
+    python -m benchmarks.metis_cpu_modes --modes fp32,int8,bf16 --cer
+    python -m benchmarks.metis_cpu_modes --fake --intra-op-threads 4 --json cpu_modes.json
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import statistics
+import subprocess
+import unicodedata
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "ko_sentences.txt")
+
+
+def load_corpus(path: str) -> List[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def build_service(mode: str, fake: bool):
+    """측정 대상 TTS 서비스를 생성합니다 (--fake면 torch 기반 모의 Metis 사용)."""
+    from routes import tts as tts_routes
+    from services import tts_service as tts_module
+
+    if fake:
+        from benchmarks.fakes import build_torch_fake_metis, make_test_wav
+        from services.amphion_loader import mock_load_config
+
+        fake_metis = build_torch_fake_metis()
+        tts_module.load_amphion = lambda: ((lambda **kwargs: fake_metis), mock_load_config)
+
+    service = tts_module.MetisTTSService(
+        ckpt_path=tts_routes.MODEL_CHECKPOINT,
+        config_path=tts_routes.MODEL_CONFIG,
+        device="cpu",
+        cpu_mode=mode,
+    )
+    if fake:
+        # 프롬프트 음성 파일이 없으면 합성이 건너뛰어지므로 임시 프롬프트를 생성
+        prompt_path = os.path.join(tempfile.gettempdir(), "venomvoice_bench_prompt.wav")
+        with open(prompt_path, "wb") as f:
+            f.write(make_test_wav(seconds=2.0, sample_rate=24000))
+        service.prompt_speech_path = prompt_path
+    return service
+
+
+def run_worker(args) -> Dict[str, object]:
+    """한 가지 모드를 현재 프로세스에서 측정합니다."""
+    import resource
+    import soundfile as sf
+
+    sentences = load_corpus(args.corpus)
+    service = build_service(args.worker, args.fake)
+
+    import torch
+
+    # 첫 호출의 지연 초기화 비용은 측정에서 제외
+    service.synthesize(sentences[0], use_cache=False)
+
+    latencies = []
+    audio_seconds = 0.0
+    for repeat in range(args.repeat):
+        for index, sentence in enumerate(sentences):
+            start = time.perf_counter()
+            audio = service.synthesize(sentence, use_cache=False)
+            latencies.append(time.perf_counter() - start)
+            audio_seconds += len(audio) / service.sample_rate
+            if repeat == 0 and args.audio_dir:
+                sf.write(os.path.join(args.audio_dir, f"{index:03d}.wav"), audio, service.sample_rate)
+
+    total = sum(latencies)
+    return {
+        "mode": args.worker,
+        "applied_mode": service.cpu_mode,
+        "intra_op_threads": torch.get_num_threads(),
+        "inter_op_threads": torch.get_num_interop_threads(),
+        "sentences": len(latencies),
+        "total_seconds": total,
+        "audio_seconds": audio_seconds,
+        "rtf": total / audio_seconds if audio_seconds else float("inf"),
+        "p50_ms": statistics.median(latencies) * 1000.0,
+        "p95_ms": percentile(latencies, 95) * 1000.0,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+    }
+
+
+def normalize_for_cer(text: str) -> str:
+    """공백과 문장 부호를 제거하여 문자 단위 비교용으로 정규화합니다."""
+    return "".join(ch for ch in text if not ch.isspace() and not unicodedata.category(ch).startswith("P"))
+
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    """레벤슈타인 거리 기반 문자 오류율"""
+    ref, hyp = normalize_for_cer(reference), normalize_for_cer(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def measure_cer(audio_dir: str, sentences: List[str], model_size: str) -> float:
+    """저장된 합성 음성을 Whisper로 인식하여 평균 CER을 계산합니다."""
+    from faster_whisper import WhisperModel
+
+    model = WhisperModel(model_size, device="cpu", compute_type="int8")
+    rates = []
+    for index, sentence in enumerate(sentences):
+        segments, _ = model.transcribe(os.path.join(audio_dir, f"{index:03d}.wav"), language="ko")
+        rates.append(character_error_rate(sentence, " ".join(segment.text for segment in segments)))
+    return statistics.mean(rates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metis CPU 실행 모드별 RTF/품질 비교")
+    parser.add_argument("--modes", type=str, default="fp32,int8,bf16,int8_bf16", help="비교할 모드 (쉼표 구분)")
+    parser.add_argument("--corpus", type=str, default=DEFAULT_CORPUS, help="한 줄에 한 문장인 코퍼스 파일")
+    parser.add_argument("--repeat", type=int, default=1, help="코퍼스 반복 횟수")
+    parser.add_argument("--intra-op-threads", type=int, default=0, help="intra-op 스레드 수 (0이면 사용 가능한 코어 수)")
+    parser.add_argument("--inter-op-threads", type=int, default=0, help="inter-op 스레드 수 (0이면 1)")
+    parser.add_argument("--fake", action="store_true", help="torch 기반 모의 Metis로 측정 (체크포인트 불필요)")
+    parser.add_argument("--cer", action="store_true", help="Whisper 재인식으로 문자 오류율(CER) 측정")
+    parser.add_argument("--cer-model", type=str, default="small", help="CER 측정용 Whisper 모델 크기")
+    parser.add_argument("--json", type=str, default=None, help="결과를 저장할 JSON 경로")
+    parser.add_argument("--worker", type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--audio-dir", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return
+
+    sentences = load_corpus(args.corpus)
+    env = dict(
+        os.environ,
+        METIS_INTRA_OP_THREADS=str(args.intra_op_threads),
+        METIS_INTER_OP_THREADS=str(args.inter_op_threads),
+    )
+    results = []
+    with tempfile.TemporaryDirectory(prefix="metis_cpu_modes_") as workdir:
+        for mode in [item.strip() for item in args.modes.split(",") if item.strip()]:
+            audio_dir = os.path.join(workdir, mode)
+            os.makedirs(audio_dir)
+            command = [
+                sys.executable, "-m", "benchmarks.metis_cpu_modes",
+                "--worker", mode, "--corpus", args.corpus, "--repeat", str(args.repeat), "--audio-dir", audio_dir,
+            ]
+            if args.fake:
+                command.append("--fake")
+            print(f"[{mode}] 측정 중...", flush=True)
+            completed = subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+            if completed.returncode != 0:
+                sys.stderr.write(completed.stderr[-4000:])
+                print(f"[{mode}] 실패")
+                continue
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            if args.cer:
+                result["cer"] = measure_cer(audio_dir, sentences, args.cer_model)
+            results.append(result)
+
+    baseline = next((r for r in results if r["mode"] == "fp32"), None)
+    print(f"\n{'mode':<10} {'applied':<10} {'threads':>8} {'RTF':>7} {'speedup':>8} {'p50 ms':>9} {'p95 ms':>9} {'dur ratio':>9} {'RSS MB':>8} {'CER':>6}")
+    print("-" * 95)
+    for r in results:
+        speedup = baseline["rtf"] / r["rtf"] if baseline else float("nan")
+        duration_ratio = r["audio_seconds"] / baseline["audio_seconds"] if baseline else float("nan")
+        cer = f"{r['cer']:.3f}" if "cer" in r else "-"
+        threads = f"{r['intra_op_threads']}/{r['inter_op_threads']}"
+        print(
+            f"{r['mode']:<10} {r['applied_mode']:<10} {threads:>8} {r['rtf']:>7.3f} {speedup:>7.2f}x "
+            f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {duration_ratio:>9.2f} {r['max_rss_mb']:>8.0f} {cer:>6}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"corpus": args.corpus, "fake": args.fake, "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+텍스트/오디오 핫 패스 마이크로벤치마크
+
+실제 한국어 응답 길이와 오디오 길이로 다음 함수들을 측정합니다.
+- utils.text_utils.segment_text (TTS 긴 텍스트 조각 분할)
+- utils.text_utils.split_text_into_sentences
+- services.tts_service.encode_audio_bytes (synthesize_to_bytes의 WAV 인코딩)
+- routes.chat.audio_to_base64 (voice_chat의 Base64 인코딩)
+
+기준값(baseline)은 JSON으로 저장하며, 비교 시 최솟값(노이즈가 가장 적은 라운드)이
+기준값보다 threshold 이상 느려지면 종료 코드 1로 실패합니다.
+
+사용 예 (Back/venv_chat 디렉토리에서):
+    python -m benchmarks.microbench --save-baseline
+    python -m benchmarks.microbench --threshold 0.3
+    python -m benchmarks.microbench --filter split
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import statistics
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "microbench.json")
+
+# 실제 어시스턴트 응답과 비슷한 한국어 문장
+KOREAN_SENTENCES = (
+    "좋은 질문이에요.",
+    "오늘 서울은 대체로 맑고 오후에는 기온이 조금 오를 예정입니다.",
+    "외출하실 때 가벼운 겉옷을 챙기시면 좋겠어요!",
+    "혹시 다른 지역의 날씨도 알려 드릴까요?",
+    "내일 오전 10시로 회의 일정을 등록해 두었습니다.",
+    "참석자에게 알림을 보내려면 말씀해 주세요.\n",
+    "근처에 평점이 높은 카페가 세 곳 있어요.",
+    "조용한 곳을 원하시면 두 번째 카페를 추천드립니다.",
+)
+
+
+def make_korean_text(target_chars: int) -> str:
+    """목표 길이 이상의 결정적 한국어 텍스트를 생성합니다."""
+    parts = []
+    length = 0
+    index = 0
+    while length < target_chars:
+        sentence = KOREAN_SENTENCES[index % len(KOREAN_SENTENCES)]
+        parts.append(sentence)
+        length += len(sentence) + 1
+        index += 1
+    return " ".join(parts)
+
+
+def make_audio(seconds: float, sample_rate: int = 24000) -> np.ndarray:
+    """결정적 float32 오디오 배열을 생성합니다 (Metis 출력과 같은 24kHz)."""
+    rng = np.random.default_rng(42)
+    t = np.arange(int(seconds * sample_rate), dtype=np.float32) / sample_rate
+    return (0.2 * np.sin(2 * np.pi * 220.0 * t) + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def build_cases() -> Dict[str, Callable[[], object]]:
+    """측정 대상 케이스를 생성합니다 (이름 -> 인자 없는 호출 함수)."""
+    from utils.text_utils import segment_text, split_text_into_sentences
+    from services.tts_service import encode_audio_bytes
+    from routes.chat import audio_to_base64
+
+    cases: Dict[str, Callable[[], object]] = {}
+
+    # 텍스트: 짧은 응답(~300자), 긴 응답(~2,000자), 읽기 모드(~10,000자)
+    for label, chars in (("300", 300), ("2k", 2000), ("10k", 10000)):
+        text = make_korean_text(chars)
+        cases[f"segment_text[{label}]"] = lambda text=text: segment_text(text)
+        cases[f"split_text_into_sentences[{label}]"] = lambda text=text: split_text_into_sentences(text)
+
+    # 오디오: 한 문장(5초), 긴 응답(30초)
+    for label, seconds in (("5s", 5.0), ("30s", 30.0)):
+        audio = make_audio(seconds)
+        wav_bytes = encode_audio_bytes(audio, 24000, "wav")
+        cases[f"encode_audio_bytes_wav[{label}]"] = lambda audio=audio: encode_audio_bytes(audio, 24000, "wav")
+        cases[f"audio_to_base64[{label}]"] = lambda wav_bytes=wav_bytes: audio_to_base64(wav_bytes)
+
+    return cases
+
+
+def measure(func: Callable[[], object], min_time: float = 0.2, rounds: int = 7) -> Dict[str, float]:
+    """함수 실행 시간을 측정합니다.
+
+    pytest-benchmark와 같이 한 라운드가 min_time 이상 걸리도록 반복 횟수를 보정한 뒤,
+    여러 라운드의 호출당 시간 통계를 반환합니다.
+    """
+    func()  # 워밍업
+
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / rounds or iterations >= 1_000_000:
+            break
+        iterations *= 2
+
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter() - start) / iterations)
+
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "max_s": max(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "iterations": iterations,
+        "rounds": rounds,
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[Tuple[str, float]]:
+    """기준값 대비 회귀 목록 [(케이스, 변화율)]을 반환합니다."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        change = result["min_s"] / base["min_s"] - 1.0
+        if change > threshold:
+            regressions.append((name, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="텍스트/오디오 핫 패스 마이크로벤치마크")
+    parser.add_argument("--baseline", type=str, default=DEFAULT_BASELINE, help="기준값 JSON 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="측정 결과를 기준값으로 저장")
+    parser.add_argument("--threshold", type=float, default=0.5, help="허용 회귀 비율 (0.5 = 50%%)")
+    parser.add_argument("--filter", type=str, default=None, help="이름에 이 문자열이 포함된 케이스만 실행")
+    parser.add_argument("--min-time", type=float, default=0.2, help="케이스당 최소 측정 시간 (초)")
+    parser.add_argument("--rounds", type=int, default=7, help="측정 라운드 수")
+    parser.add_argument("--json", type=str, default=None, help="측정 결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    cases = build_cases()
+    if args.filter:
+        cases = {name: func for name, func in cases.items() if args.filter in name}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("benchmarks", {})
+
+    results = {}
+    print(f"\n{'case':<40} {'median':>12} {'min':>12} {'base(min)':>12} {'change':>8}")
+    print("-" * 88)
+    for name, func in cases.items():
+        result = measure(func, min_time=args.min_time, rounds=args.rounds)
+        results[name] = result
+        base = baseline.get(name)
+        base_text = f"{base['min_s'] * 1e6:>10.1f}us" if base else f"{'-':>12}"
+        change_text = f"{(result['min_s'] / base['min_s'] - 1.0) * 100:>+7.1f}%" if base else f"{'-':>8}"
+        print(f"{name:<40} {result['median_s'] * 1e6:>10.1f}us {result['min_s'] * 1e6:>10.1f}us {base_text} {change_text}")
+
+    machine = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "numpy": np.__version__,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine, "benchmarks": results}, f, indent=2)
+
+    if args.save_baseline:
+        merged = dict(baseline)
+        merged.update(results)
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine, "benchmarks": merged}, f, indent=2, sort_keys=True)
+        print(f"\n기준값 저장: {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n회귀 감지 (허용치 {args.threshold * 100:.0f}% 초과):")
+        for name, change in regressions:
+            print(f"  - {name}: {change * 100:+.1f}%")
+        sys.exit(1)
+    print("\n회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+모의 엔진으로 API 서버 실행
+
+실제 Whisper/Metis/DeepSeek 대신 benchmarks.fakes의 모의 엔진과 로컬 DeepSeek 대체 서버를 사용하여
+FastAPI 앱을 띄웁니다. 네트워크나 GPU 없이 CPU에서 전체 요청 경로를 측정할 수 있습니다.
+
+사용 예 (Back/venv_chat 디렉토리에서):
+    python -m benchmarks.serve_fakes --port 8800 --deepseek-url http://127.0.0.1:8900/v1/chat/completions
+"""
+
+import os
+import sys
+import logging
+import argparse
+import tempfile
+
+# Back/venv_chat를 임포트 경로에 추가 (main.py와 같은 방식으로 routes/services 임포트)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.fakes import FakeMetis, FakeWhisperModel, install_fake_whisper, make_test_wav
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def build_app(
+    deepseek_url: str,
+    tts_base_ms: float = 50.0,
+    tts_per_char_ms: float = 4.0,
+    stt_base_ms: float = 30.0,
+    stt_per_second_ms: float = 40.0,
+    cost_mode: str = "sleep",
+):
+    """모의 엔진이 연결된 FastAPI 앱을 생성합니다."""
+    # STT: faster_whisper를 모의 모듈로 대체 (services.stt_service 임포트 전)
+    FakeWhisperModel.base_ms = stt_base_ms
+    FakeWhisperModel.per_audio_second_ms = stt_per_second_ms
+    FakeWhisperModel.mode = cost_mode
+    install_fake_whisper()
+
+    # DeepSeek: 로컬 대체 서버 사용 (routes.chat 임포트 전)
+    os.environ["DEEPSEEK_API_URL"] = deepseek_url
+    os.environ.setdefault("DEEPSEEK_API_KEY", "offline-benchmark")
+
+    import main
+    from routes import tts as tts_routes
+    from services import tts_service as tts_module
+    from services.amphion_loader import mock_load_config
+
+    # TTS: Metis 클래스를 모의 모델로 대체한 뒤 서비스 싱글톤 생성
+    fake_metis = FakeMetis(base_ms=tts_base_ms, per_char_ms=tts_per_char_ms, mode=cost_mode)
+    tts_module.load_amphion = lambda: ((lambda **kwargs: fake_metis), mock_load_config)
+    service = tts_module.MetisTTSService(
+        ckpt_path=tts_routes.MODEL_CHECKPOINT,
+        config_path=tts_routes.MODEL_CONFIG,
+        device="cpu",
+    )
+
+    # 프롬프트 음성 파일이 없으면 합성이 건너뛰어지므로 임시 프롬프트를 생성
+    prompt_path = os.path.join(tempfile.gettempdir(), "venomvoice_bench_prompt.wav")
+    with open(prompt_path, "wb") as f:
+        f.write(make_test_wav(seconds=2.0, sample_rate=24000))
+    service.prompt_speech_path = prompt_path
+    tts_routes._tts_service = service
+
+    logger.info("모의 엔진 연결 완료 (Whisper/Metis/DeepSeek)")
+    return main.app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모의 엔진으로 API 서버 실행")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="바인드 주소")
+    parser.add_argument("--port", type=int, default=8800, help="포트")
+    parser.add_argument("--deepseek-url", type=str, required=True, help="DeepSeek 대체 서버 URL")
+    parser.add_argument("--tts-base-ms", type=float, default=50.0, help="Metis 호출당 고정 비용 (ms)")
+    parser.add_argument("--tts-per-char-ms", type=float, default=4.0, help="Metis 글자당 비용 (ms)")
+    parser.add_argument("--stt-base-ms", type=float, default=30.0, help="Whisper 호출당 고정 비용 (ms)")
+    parser.add_argument("--stt-per-second-ms", type=float, default=40.0, help="Whisper 오디오 1초당 비용 (ms)")
+    parser.add_argument("--cost-mode", choices=["sleep", "cpu"], default="sleep", help="비용 소모 방식")
+    args = parser.parse_args()
+
+    app = build_app(
+        deepseek_url=args.deepseek_url,
+        tts_base_ms=args.tts_base_ms,
+        tts_per_char_ms=args.tts_per_char_ms,
+        stt_base_ms=args.stt_base_ms,
+        stt_per_second_ms=args.stt_per_second_ms,
+        cost_mode=args.cost_mode,
+    )
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
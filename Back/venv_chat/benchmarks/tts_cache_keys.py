@@ -0,0 +1,119 @@
+"""
+TTS 캐시 키 정규화 효과 측정
+
+기록된 TTS 요청 텍스트를 순서대로 재생하여, 원문을 캐시 키로 쓸 때와
+정규화된 텍스트(utils.text_normalizer.normalize_text)를 키로 쓸 때의 LRU 캐시 적중률을 비교합니다.
+정규화 비용(첫 호출/메모이제이션된 호출)도 함께 보고합니다.
+
+트래픽 파일은 한 줄에 한 텍스트인 텍스트 파일이나, "text" 필드가 있는 JSONL(요청 로그 등)을 받습니다.
+
+사용 예 (Back/venv_chat 디렉토리에서):
+    python -m benchmarks.tts_cache_keys
+    python -m benchmarks.tts_cache_keys --traffic tts_requests.jsonl --cache-size 256 --json cache_keys.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from utils.text_normalizer import normalize_text
+
+DEFAULT_TRAFFIC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "tts_traffic.txt")
+
+
+def load_traffic(path: str) -> List[str]:
+    """텍스트 파일 또는 JSONL("text" 필드)에서 요청 텍스트를 읽습니다."""
+    texts = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip():
+                continue
+            if line.lstrip().startswith("{"):
+                text = json.loads(line).get("text")
+                if text:
+                    texts.append(text)
+            else:
+                texts.append(line)
+    return texts
+
+
+def replay(texts: List[str], key_fn: Callable[[str], str], cache_size: int) -> Dict[str, object]:
+    """LRU 캐시를 흉내 내어 요청을 재생하고 적중률을 계산합니다."""
+    cache: "OrderedDict[str, None]" = OrderedDict()
+    hits = 0
+    for text in texts:
+        key = key_fn(text)
+        if key in cache:
+            hits += 1
+            cache.move_to_end(key)
+        else:
+            cache[key] = None
+            if len(cache) > cache_size:
+                cache.popitem(last=False)
+    unique = len({key_fn(text) for text in texts})
+    return {"requests": len(texts), "hits": hits, "hit_rate": hits / len(texts) if texts else 0.0, "unique_keys": unique}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="원문 vs 정규화 캐시 키의 TTS 캐시 적중률 비교")
+    parser.add_argument("--traffic", type=str, default=DEFAULT_TRAFFIC, help="기록된 요청 텍스트 (텍스트 또는 JSONL)")
+    parser.add_argument("--cache-size", type=int, default=32, help="LRU 캐시 크기 (MetisTTSService 기본값 32)")
+    parser.add_argument("--show", type=int, default=10, help="정규화로 합쳐진 키 예시 개수")
+    parser.add_argument("--json", type=str, default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    texts = load_traffic(args.traffic)
+    if not texts:
+        print("트래픽이 비어 있습니다")
+        return
+
+    # 정규화 비용: 첫 호출(계산)과 메모이제이션된 호출
+    normalize_text.cache_clear()
+    start = time.perf_counter()
+    for text in texts:
+        normalize_text(text)
+    cold_us = (time.perf_counter() - start) / len(texts) * 1e6
+    start = time.perf_counter()
+    for text in texts:
+        normalize_text(text)
+    warm_us = (time.perf_counter() - start) / len(texts) * 1e6
+
+    raw = replay(texts, lambda text: text, args.cache_size)
+    normalized = replay(texts, normalize_text, args.cache_size)
+
+    print(f"\n트래픽: {args.traffic} (요청 {len(texts)}개, 캐시 크기 {args.cache_size})")
+    print(f"{'key':<12} {'unique':>8} {'hits':>6} {'hit rate':>9}")
+    print("-" * 38)
+    for name, result in (("raw", raw), ("normalized", normalized)):
+        print(f"{name:<12} {result['unique_keys']:>8} {result['hits']:>6} {result['hit_rate']:>8.1%}")
+    print(f"\n적중률 변화: {raw['hit_rate']:.1%} -> {normalized['hit_rate']:.1%}")
+    print(f"정규화 비용: 첫 호출 {cold_us:.1f}us, 메모이제이션 {warm_us:.2f}us")
+
+    # 정규화로 합쳐진 표기 예시
+    groups: Dict[str, set] = {}
+    for text in texts:
+        groups.setdefault(normalize_text(text), set()).add(text)
+    merged = [(key, variants) for key, variants in groups.items() if len(variants) > 1]
+    for key, variants in merged[:args.show]:
+        print(f"  {key!r} <- {sorted(variants)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "traffic": args.traffic, "cache_size": args.cache_size,
+                "raw": raw, "normalized": normalized,
+                "normalize_cold_us": cold_us, "normalize_warm_us": warm_us,
+            }, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
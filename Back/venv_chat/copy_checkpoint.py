@@ -1,32 +1,63 @@
 """
-체크포인트 파일 복사 및 이름 변경 스크립트
+체크포인트 확인 스크립트
+
+예전에는 t2s_model/model.safetensors를 metis-korean-base.pth로 복사했지만,
+이제 TTS 서비스가 원래 위치의 safetensors를 직접 참조하여 mmap으로 로드하므로 복사하지 않습니다.
+이 스크립트는 사용할 체크포인트를 찾아 형식과 크기를 보여주고, 해시를 매니페스트에 기록합니다.
+원본과 같은 예전 복사본(metis-korean-base.pth)은 `--remove-legacy-copy`로 정리할 수 있습니다.
 """
 
 import os
-import shutil
+import sys
 import logging
+import argparse
+
+# Back/venv_chat를 임포트 경로에 추가 (services 임포트)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services import checkpoint_manager
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# 파일 경로
-src_file = r"C:\src\asd\Amphion\Amphion\pretrained\t2s_model\model.safetensors"
-dst_file = r"C:\src\asd\Amphion\Amphion\pretrained\metis-korean-base.pth"
 
-# 파일 복사
-if os.path.exists(src_file):
+def main():
+    parser = argparse.ArgumentParser(description="Metis 체크포인트 확인 (복사 없음)")
+    parser.add_argument("--pretrained-dir", type=str, default=checkpoint_manager.PRETRAINED_DIR, help="pretrained 디렉토리")
+    parser.add_argument("--expected-sha256", type=str, default=None, help="기대 해시 (지정하면 매니페스트에 고정)")
+    parser.add_argument("--remove-legacy-copy", action="store_true", help="원본과 같은 metis-korean-base.pth 복사본 삭제")
+    args = parser.parse_args()
+
+    checkpoint = checkpoint_manager.resolve_metis_checkpoint(args.pretrained_dir)
+    info = checkpoint_manager.describe(checkpoint)
+    if not info["exists"]:
+        logger.error(f"체크포인트 파일이 존재하지 않습니다: {checkpoint}")
+        sys.exit(1)
+
+    manifest = checkpoint_manager.get_manifest()
+    if args.expected_sha256:
+        manifest.pin(checkpoint, args.expected_sha256)
     try:
-        shutil.copy2(src_file, dst_file)
-        logger.info(f"파일 복사 성공: {src_file} -> {dst_file}")
-    except Exception as e:
-        logger.error(f"파일 복사 실패: {e}")
-else:
-    logger.error(f"소스 파일이 존재하지 않습니다: {src_file}")
-
-# 파일 존재 확인
-if os.path.exists(dst_file):
-    logger.info(f"체크포인트 파일 준비 완료: {dst_file}")
-    logger.info(f"파일 크기: {os.path.getsize(dst_file) / (1024 * 1024):.2f} MB")
-else:
-    logger.error(f"체크포인트 파일이 존재하지 않습니다: {dst_file}")
\ No newline at end of file
+        sha256 = manifest.verify(checkpoint)
+    except checkpoint_manager.CheckpointIntegrityError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    logger.info(f"체크포인트 준비 완료: {checkpoint}")
+    logger.info(f"형식: {info['format']}, 크기: {info['size_mb']:.2f} MB, 텐서 수: {info.get('tensors', '-')}")
+    logger.info(f"sha256: {sha256}")
+
+    # 예전 복사 방식으로 만든 파일 정리 (원본과 내용이 같을 때만)
+    legacy_copy = os.path.join(args.pretrained_dir, "metis-korean-base.pth")
+    if os.path.exists(legacy_copy) and os.path.abspath(legacy_copy) != os.path.abspath(checkpoint):
+        if manifest.checksum(legacy_copy) == sha256:
+            if args.remove_legacy_copy:
+                os.unlink(legacy_copy)
+                logger.info(f"예전 복사본 삭제: {legacy_copy}")
+            else:
+                logger.info(f"원본과 같은 예전 복사본이 있습니다 (--remove-legacy-copy로 삭제 가능): {legacy_copy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,31 @@
 """
 Metis TTS 체크포인트 다운로드 스크립트
 
-Hugging Face Hub에서 Metis TTS 모델 체크포인트를 다운로드합니다.
+Hugging Face Hub 또는 미러/로컬 HTTP 서버에서 Metis TTS 모델 체크포인트를 병렬로 다운로드합니다.
+중단된 파일은 Range 요청으로 이어 받고, 매니페스트의 sha256으로 검증한 뒤 체크포인트 매니페스트에 기록합니다.
+파일은 받은 위치 그대로 사용합니다 (이름 변경 없음).
+
+사용 예:
+    # Hugging Face Hub (HF_ENDPOINT 또는 --endpoint로 미러 지정 가능)
+    python download_checkpoint.py --model-id amphion/maskgct
+
+    # 미러/로컬 HTTP 서버 ({base_url}/manifest.json 기준, 오프라인 부트스트랩)
+    python download_checkpoint.py --base-url http://10.0.0.5:8700
+
+    # 받은 디렉토리를 다른 노드에 제공 (manifest.json 생성 후 Range 지원 서버 실행)
+    python download_checkpoint.py --serve --port 8700
 """
 
 import os
 import sys
+import json
 import logging
 import argparse
-from huggingface_hub import snapshot_download, hf_hub_download
+
+# Back/venv_chat를 임포트 경로에 추가 (services 임포트)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services import checkpoint_manager, checkpoint_downloader
 
 # 로깅 설정
 logging.basicConfig(
@@ -17,82 +34,88 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def download_metis_checkpoint(save_dir, model_id="openai/whisper-tiny"):
+DEFAULT_PATTERNS = ["*.pth", "*.safetensors", "*.bin"]
+
+
+def load_manifest(args):
+    """인자에 따라 다운로드 매니페스트를 준비합니다."""
+    if args.manifest:
+        # 로컬 매니페스트 파일 (base_url은 인자 또는 파일에서)
+        with open(args.manifest, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if args.base_url:
+            manifest["base_url"] = args.base_url
+        if not manifest.get("base_url"):
+            raise ValueError("매니페스트에 base_url이 없습니다 (--base-url 지정 필요)")
+        return manifest
+    if args.base_url:
+        return checkpoint_downloader.fetch_manifest(args.base_url)
+    return checkpoint_downloader.build_hf_manifest(
+        args.model_id, revision=args.revision, include=args.include, endpoint=args.endpoint,
+    )
+
+
+def download_metis_checkpoint(save_dir, manifest, workers=4):
     """체크포인트를 다운로드합니다.
-    
+
     Args:
         save_dir: 저장 디렉토리
-        model_id: 모델 ID (기본: "openai/whisper-tiny")
-        
+        manifest: 다운로드 매니페스트 ({"base_url", "files": [{"path", "size", "sha256"}]})
+        workers: 동시 다운로드 파일 수
+
     Returns:
-        str: 다운로드된 파일 경로
+        Dict[str, str]: 파일별 상태 ('cached' 또는 'downloaded')
     """
-    try:
-        # 저장 디렉토리 생성
-        os.makedirs(save_dir, exist_ok=True)
-        
-        # 체크포인트 다운로드
-        logger.info(f"체크포인트 다운로드 중: {model_id}")
-        
-        # 두 가지 방법 제공
-        try:
-            # 방법 1: snapshot_download 사용
-            checkpoint_dir = snapshot_download(
-                repo_id=model_id,
-                repo_type="model",
-                local_dir=save_dir,
-                allow_patterns=["*.pth", "*.safetensors", "*.bin"],
-            )
-            logger.info(f"체크포인트 다운로드 완료: {checkpoint_dir}")
-            return checkpoint_dir
-        except Exception as e:
-            logger.warning(f"snapshot_download 실패: {e}")
-            
-            # 방법 2: hf_hub_download 사용
-            file_path = hf_hub_download(
-                repo_id=model_id,
-                filename="model.safetensors",  # 파일 이름 수정 가능
-                repo_type="model",
-                local_dir=save_dir,
-            )
-            logger.info(f"체크포인트 다운로드 완료: {file_path}")
-            return file_path
-            
-    except Exception as e:
-        logger.error(f"체크포인트 다운로드 실패: {e}")
-        raise
+    os.makedirs(save_dir, exist_ok=True)
+    downloader = checkpoint_downloader.CheckpointDownloader(save_dir, workers=workers)
+    return downloader.download(manifest)
+
 
 def main():
     parser = argparse.ArgumentParser(description="Metis TTS 체크포인트 다운로드")
     parser.add_argument("--model-id", type=str, default="amphion/maskgct", help="모델 ID")
-    parser.add_argument("--save-dir", type=str, default="../Amphion/Amphion/pretrained", help="저장 디렉토리")
-    parser.add_argument("--output-name", type=str, default="metis-korean-base.pth", help="출력 파일 이름")
-    
+    parser.add_argument("--revision", type=str, default="main", help="모델 리비전")
+    parser.add_argument("--save-dir", type=str, default=checkpoint_manager.PRETRAINED_DIR, help="저장 디렉토리")
+    parser.add_argument("--endpoint", type=str, default=checkpoint_downloader.HF_ENDPOINT, help="Hugging Face 엔드포인트 (미러)")
+    parser.add_argument("--base-url", type=str, default=checkpoint_downloader.CHECKPOINT_MIRROR_URL or None, help="미러/로컬 HTTP 서버 URL")
+    parser.add_argument("--manifest", type=str, default=None, help="로컬 매니페스트 JSON 경로")
+    parser.add_argument("--include", type=str, nargs="*", default=DEFAULT_PATTERNS, help="받을 파일 패턴")
+    parser.add_argument("--workers", type=int, default=4, help="동시 다운로드 파일 수")
+    parser.add_argument("--serve", action="store_true", help="저장 디렉토리를 Range 지원 HTTP로 제공")
+    parser.add_argument("--host", type=str, default="0.0.0.0", help="--serve 바인드 주소")
+    parser.add_argument("--port", type=int, default=8700, help="--serve 포트")
+
     args = parser.parse_args()
-    
+
     # 경로 정규화
     save_dir = os.path.abspath(args.save_dir)
-    
+
+    if args.serve:
+        manifest = checkpoint_downloader.write_manifest(save_dir, include=args.include)
+        logger.info(f"매니페스트 생성: 파일 {len(manifest['files'])}개 ({os.path.join(save_dir, checkpoint_downloader.MANIFEST_NAME)})")
+        server = checkpoint_downloader.serve_directory(save_dir, args.host, args.port)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
     # 체크포인트 다운로드
     try:
-        checkpoint_path = download_metis_checkpoint(save_dir, args.model_id)
-        
+        manifest = load_manifest(args)
+        results = download_metis_checkpoint(save_dir, manifest, args.workers)
+
         # 결과 출력
-        logger.info(f"체크포인트 다운로드 완료: {checkpoint_path}")
+        downloaded = sum(1 for status in results.values() if status == "downloaded")
+        logger.info(f"체크포인트 다운로드 완료: 받음 {downloaded}개, 기존 파일 {len(results) - downloaded}개")
         logger.info(f"저장 디렉토리: {save_dir}")
-        
-        # 파일 이름 변경 (필요 시)
-        if args.output_name and not os.path.basename(checkpoint_path) == args.output_name:
-            output_path = os.path.join(save_dir, args.output_name)
-            try:
-                os.rename(checkpoint_path, output_path)
-                logger.info(f"파일 이름 변경: {checkpoint_path} -> {output_path}")
-            except Exception as e:
-                logger.warning(f"파일 이름 변경 실패: {e}")
-        
+        logger.info(f"사용할 체크포인트: {checkpoint_manager.resolve_metis_checkpoint(save_dir)}")
+
     except Exception as e:
         logger.error(f"체크포인트 다운로드 중 오류: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -5,15 +5,18 @@ FastAPI를 사용하여 Metis TTS 기반의 음성 챗봇 API를 제공합니다
 """
 
 import os
-import sys
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from routes import stt, tts, chat
-
-app = FastAPI()
+from routes import metrics, health
+from services.metrics_service import MetricsMiddleware
+from services.tracing_service import TracingMiddleware
+from services import model_manager, health_service, checkpoint_manager, filler_service
 
 # 로깅 설정
 logging.basicConfig(
@@ -22,11 +25,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """시작 시 STT/TTS 모델을 백그라운드에서 동시에 로드하고 워밍업합니다.
+
+    서버는 즉시 요청을 받기 시작하며, 두 모델이 준비될 때까지 `/ready`는 503을 반환합니다.
+    HEALTH_DEEP_CHECK_INTERVAL이 설정되면 느린 주기의 백그라운드 딥 체크도 시작합니다.
+    """
+    if model_manager.MODEL_PRELOAD:
+        model_manager.start_preload()
+    deep_check_task = None
+    if health_service.HEALTH_DEEP_CHECK_INTERVAL > 0:
+        deep_check_task = asyncio.create_task(health_service.deep_check_loop())
+    yield
+    if deep_check_task is not None:
+        deep_check_task.cancel()
+    model_manager.shutdown_preload()
+
 # 애플리케이션 초기화
 app = FastAPI(
     title="Metis 음성 챗봇 API",
     description="Metis TTS와 Whisper STT를 사용한 음성 챗봇 API",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS 미들웨어 설정 (프론트엔드에서 API 접근 허용)
@@ -36,20 +57,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # 모든 HTTP 메소드 허용
     allow_headers=["*"],  # 모든 헤더 허용
+    expose_headers=["Server-Timing", "X-Request-ID"],  # 프론트엔드에서 지연 시간 분석용 헤더 조회 허용
 )
 
+# 메트릭 미들웨어 (요청 지연 시간, 처리 중 요청 수, 엔드포인트 라벨)
+app.add_middleware(MetricsMiddleware)
+
+# 트레이싱 미들웨어 (Server-Timing 헤더, 요청 ID, 선택적 JSONL 트레이스 로그)
+app.add_middleware(TracingMiddleware)
+
+# Prometheus 메트릭 엔드포인트
+app.include_router(metrics.router)
+
+# 헬스 체크 프로브 (캐시된 상태만 사용)
+app.include_router(health.router)
+
 # 정적 파일 디렉토리 설정 (오디오 파일 등 제공)
 assets_dir = os.path.join(os.path.dirname(__file__), "assets")
 os.makedirs(assets_dir, exist_ok=True)
 app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
 
-# Amphion 경로를 Python 경로에 추가 (TTS 서비스보다 먼저)
-amphion_root = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(__file__)),  '..','Amphion', 'Amphion'))
-if amphion_root not in sys.path:
-    sys.path.insert(0, amphion_root)
-    logger.info(f"Python 경로에 Amphion 루트 추가됨: {amphion_root}")
-
-# TTS 라우터만 임포트 (에러가 발생하지 않도록)
+# 라우터 임포트 (하나가 실패해도 나머지는 로드되도록 개별 처리)
+# Amphion 경로 설정은 TTS 서비스의 지연 로더(services.amphion_loader)가 최초 사용 시 수행합니다.
 try:
     from routes import tts
     app.include_router(tts.router)
@@ -57,11 +86,6 @@ try:
 except Exception as e:
     logger.error(f"TTS 라우터 로드 실패: {e}")
 
-
-
-
-
-###### 이 부분 
 # STT와 Chat 라우터
 try:
     from routes import stt
@@ -81,33 +105,25 @@ except Exception as e:
 async def root():
     return {"message": "Chatbot API 서버가 실행 중입니다."}
 
-@app.get("/tts/check")
-async def check_tts():
-    return {"status": "ok", "message": "TTS 서비스가 실행 중입니다."}
-
-
-
-
-
+@app.get("/ready")
+async def ready():
+    """준비 상태 확인 엔드포인트 (STT/TTS 모델 로드 및 워밍업 완료, 추론 큐 포화 아님 시 200)"""
+    state = health_service.readiness()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
 
 @app.get("/status")
 async def status():
     """시스템 상태 확인 엔드포인트"""
     
-    # 모델 경로 확인
-    tts_model_path = os.path.abspath(os.path.join(
-        os.path.dirname(__file__), 
-        "..", "..", "Amphion", "Amphion", "pretrained", "metis-korean-base.pth"
-    ))
+    # 모델 경로 확인 (원래 위치의 체크포인트)
+    tts_model_path = checkpoint_manager.resolve_metis_checkpoint()
     tts_config_path = os.path.abspath(os.path.join(
         os.path.dirname(__file__), 
         "..", "..", "Amphion", "Amphion", "models", "tts", "metis", "config", "tts.json"
     ))
     
-    # CUDA 사용 가능 여부 확인
-    import torch
-    cuda_available = torch.cuda.is_available()
-    cuda_devices = torch.cuda.device_count() if cuda_available else 0
+    # CUDA 사용 가능 여부 확인 (torch는 모델 로드 시 임포트된 경우에만 조회)
+    system = health_service.system_info()
     
     return {
         "status": "running",
@@ -118,11 +134,9 @@ async def status():
                 "model_path": tts_model_path,
                 "config_exists": os.path.exists(tts_config_path),
             },
-            "system": {
-                "cuda_available": cuda_available,
-                "cuda_devices": cuda_devices,
-                "torch_version": torch.__version__,
-            }
+            "system": system,
+            "health": health_service.summary()["components"],
+            "fillers": filler_service.get_library().status(),
         }
     }
 
@@ -6,12 +6,21 @@ DeepSeek API를 사용한 채팅 및 통합 음성 대화 API를 제공합니다
 
 import logging
 import asyncio
-from typing import Optional, List, Dict, Any
-from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File, Form
-from pydantic import BaseModel, Field
-import requests
+import base64
+from typing import Optional, List, Dict, Any, Tuple
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request, Query
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, Field, ValidationError
 import json
 import os
+import time
+
+from services import health_service, filler_service
+from services.deepseek_client import DEEPSEEK_MODEL, DeepSeekError, get_client
+from services.metrics_service import observe_stage
+from services.audio_upload import UploadError, audio_form_openapi, read_audio_form
+from utils.sse import format_event, sse_response
+from utils.text_utils import segment_text
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -19,9 +28,8 @@ logger = logging.getLogger(__name__)
 # 라우터 초기화
 router = APIRouter(prefix="/api/chat", tags=["Chat"])
 
-# DeepSeek API 설정
-DEEPSEEK_API_URL = "https://api.deepseek.com/v1/chat/completions"
-DEEPSEEK_MODEL = "deepseek-chat"
+# 음성 대화에서 DeepSeek 응답을 기다릴 지연 예산 (초, 넘으면 헤지/재시도를 멈추고 504)
+VOICE_LLM_BUDGET_SECONDS = float(os.getenv("VOICE_LLM_BUDGET_SECONDS", "10"))
 
 # API 모델 정의
 class ChatMessage(BaseModel):
@@ -36,6 +44,7 @@ class ChatRequest(BaseModel):
     system_prompt: Optional[str] = Field(None, description="시스템 프롬프트")
     temperature: float = Field(0.7, description="창의성 정도 (0.0-2.0)")
     max_tokens: int = Field(500, description="최대 토큰 수")
+    timeout: Optional[float] = Field(None, gt=0, description="DeepSeek 응답 대기 예산 (초, 기본 DEEPSEEK_TIMEOUT_SECONDS)")
 
 class ChatResponse(BaseModel):
     """채팅 응답 모델"""
@@ -51,6 +60,44 @@ class VoiceChatRequest(BaseModel):
     system_prompt: Optional[str] = Field(None, description="시스템 프롬프트")
     temperature: float = Field(0.7, description="AI 창의성 정도")
 
+# 음성 채팅 폼 필드 설명 (오디오 업로드를 스트리밍으로 읽으므로 OpenAPI 문서에 직접 등록)
+VOICE_FORM_FIELDS = {
+    "history": "대화 기록 (JSON 문자열)",
+    "language": "STT 언어",
+    "system_prompt": "시스템 프롬프트",
+    "temperature": "AI 창의성",
+}
+
+async def read_voice_form(request: Request, stt_service) -> Tuple[Any, VoiceChatRequest, Dict[str, str]]:
+    """음성 채팅 폼을 스트리밍으로 읽어 디코딩된 오디오, 폼 값, 원본 필드를 반환합니다.
+
+    업로드 크기/길이 제한을 넘으면 413, 형식이 잘못되면 400, 폼 값이 잘못되면 422로 응답합니다.
+    """
+    try:
+        audio, fields = await read_audio_form(request, model_label=f"whisper-{stt_service.model_size}")
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    # 대화 기록 파싱
+    try:
+        history_list = json.loads(fields.get("history") or "[]")
+    except json.JSONDecodeError:
+        history_list = []
+    try:
+        form = VoiceChatRequest(
+            history=history_list,
+            language=fields.get("language") or "ko",
+            system_prompt=fields.get("system_prompt") or None,
+            temperature=fields.get("temperature") or 0.7,
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    return audio, form, fields
+
+def audio_to_base64(audio_bytes: bytes) -> str:
+    """오디오 바이트를 JSON 응답용 Base64 문자열로 인코딩합니다."""
+    return base64.b64encode(audio_bytes).decode('utf-8')
+
 def get_deepseek_api_key() -> str:
     """DeepSeek API 키를 가져옵니다."""
     api_key = os.getenv("DEEPSEEK_API_KEY")
@@ -61,15 +108,16 @@ def get_deepseek_api_key() -> str:
         )
     return api_key
 
-async def call_deepseek_api(messages: List[Dict[str, str]], temperature: float = 0.7, max_tokens: int = 500) -> Dict[str, Any]:
-    """DeepSeek API를 비동기로 호출합니다."""
+async def call_deepseek_api(
+    messages: List[Dict[str, str]], temperature: float = 0.7, max_tokens: int = 500, budget: Optional[float] = None
+) -> Dict[str, Any]:
+    """DeepSeek API를 비동기로 호출합니다.
+
+    budget(초) 안에 응답이 없으면 504로 실패합니다. 첫 바이트가 늦으면 헤지 요청을 보내고,
+    일시적인 오류는 마감 안에서 재시도합니다 (services.deepseek_client).
+    """
     api_key = get_deepseek_api_key()
     
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
-    }
-    
     payload = {
         "model": DEEPSEEK_MODEL,
         "messages": messages,
@@ -79,47 +127,47 @@ async def call_deepseek_api(messages: List[Dict[str, str]], temperature: float =
     }
     
     try:
-        # 비동기 요청을 위해 requests를 별도 스레드에서 실행
-        def sync_request():
-            response = requests.post(DEEPSEEK_API_URL, headers=headers, json=payload, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        
-        # asyncio.to_thread를 사용하여 비동기로 실행
-        import asyncio
-        result = await asyncio.to_thread(sync_request)
+        # 연결 풀을 공유하는 클라이언트로 호출 (마감/헤지/재시도 적용)
+        result = await get_client().request(api_key, payload, budget)
+        health_service.record_success("deepseek")
         return result
         
-    except requests.exceptions.RequestException as e:
+    except DeepSeekError as e:
         logger.error(f"DeepSeek API 호출 실패: {e}")
-        raise HTTPException(status_code=500, detail=f"DeepSeek API 호출 실패: {str(e)}")
+        health_service.record_failure("deepseek", e)
+        raise HTTPException(status_code=e.status_code, detail=f"DeepSeek API 호출 실패: {str(e)}")
     except Exception as e:
         logger.error(f"예상치 못한 오류: {e}")
+        health_service.record_failure("deepseek", e)
         raise HTTPException(status_code=500, detail=f"예상치 못한 오류: {str(e)}")
 
+def build_messages(request: ChatRequest) -> List[Dict[str, str]]:
+    """시스템 프롬프트, 최근 대화 기록, 현재 사용자 메시지로 DeepSeek 메시지를 구성합니다."""
+    messages = []
+    
+    # 시스템 프롬프트 추가
+    if request.system_prompt:
+        messages.append({"role": "system", "content": request.system_prompt})
+    else:
+        # 기본 시스템 프롬프트
+        messages.append({
+            "role": "system", 
+            "content": "당신은 도움이 되고 친근한 AI 어시스턴트입니다. 사용자의 질문에 정확하고 유용한 답변을 제공해주세요."
+        })
+    
+    # 대화 기록 추가
+    for msg in request.history[-10:]:  # 최근 10개 메시지만 사용
+        messages.append({"role": msg.role, "content": msg.content})
+    
+    # 현재 사용자 메시지 추가
+    messages.append({"role": "user", "content": request.message})
+    return messages
+
 @router.post("/", response_model=ChatResponse)
 async def chat_completion(request: ChatRequest):
     """텍스트 기반 채팅 완성 API"""
     try:
-        # 메시지 구성
-        messages = []
-        
-        # 시스템 프롬프트 추가
-        if request.system_prompt:
-            messages.append({"role": "system", "content": request.system_prompt})
-        else:
-            # 기본 시스템 프롬프트
-            messages.append({
-                "role": "system", 
-                "content": "당신은 도움이 되고 친근한 AI 어시스턴트입니다. 사용자의 질문에 정확하고 유용한 답변을 제공해주세요."
-            })
-        
-        # 대화 기록 추가
-        for msg in request.history[-10:]:  # 최근 10개 메시지만 사용
-            messages.append({"role": msg.role, "content": msg.content})
-        
-        # 현재 사용자 메시지 추가
-        messages.append({"role": "user", "content": request.message})
+        messages = build_messages(request)
         
         logger.info(f"DeepSeek API 호출: 메시지 수={len(messages)}, 온도={request.temperature}")
         
@@ -127,7 +175,8 @@ async def chat_completion(request: ChatRequest):
         result = await call_deepseek_api(
             messages=messages,
             temperature=request.temperature,
-            max_tokens=request.max_tokens
+            max_tokens=request.max_tokens,
+            budget=request.timeout
         )
         
         # 응답 추출
@@ -149,29 +198,83 @@ async def chat_completion(request: ChatRequest):
         logger.error(f"채팅 처리 중 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=f"채팅 처리 중 오류 발생: {str(e)}")
 
-@router.post("/voice", response_model=Dict[str, Any])
-async def voice_chat(
-    audio: UploadFile = File(..., description="음성 파일"),
-    history: str = Form("[]", description="대화 기록 (JSON 문자열)"),
-    language: str = Form("ko", description="STT 언어"),
-    system_prompt: Optional[str] = Form(None, description="시스템 프롬프트"),
-    temperature: float = Form(0.7, description="AI 창의성")
-):
-    """통합 음성 채팅 API (STT + Chat + TTS)"""
-    try:
-        # 대화 기록 파싱
+@router.post("/stream")
+async def chat_stream(request: ChatRequest):
+    """텍스트 채팅 스트리밍 API (SSE)
+
+    DeepSeek의 토큰 스트림을 공용 클라이언트로 받아 도착하는 대로 delta 이벤트로 전달합니다
+    (전체 응답을 모으지 않음). 클라이언트 연결이 끊기면 업스트림 요청도 닫습니다.
+
+    이벤트: delta ({"content"}), done (토큰 수, 사용량, 첫 토큰/전체 시간), error ({"status", "detail"})
+    """
+    api_key = get_deepseek_api_key()
+    messages = build_messages(request)
+    payload = {
+        "model": DEEPSEEK_MODEL,
+        "messages": messages,
+        "temperature": request.temperature,
+        "max_tokens": request.max_tokens,
+        "stream_options": {"include_usage": True}
+    }
+    logger.info(f"DeepSeek 스트리밍 호출: 메시지 수={len(messages)}, 온도={request.temperature}")
+
+    async def events():
+        start = time.perf_counter()
+        first_token = None
+        deltas = 0
+        usage = None
         try:
-            history_list = json.loads(history) if history else []
-        except json.JSONDecodeError:
-            history_list = []
-        
+            async for chunk in get_client().stream(api_key, payload, request.timeout):
+                if chunk.get("usage"):
+                    usage = chunk["usage"]
+                for choice in chunk.get("choices") or []:
+                    content = (choice.get("delta") or {}).get("content")
+                    if not content:
+                        continue
+                    if first_token is None:
+                        first_token = time.perf_counter() - start
+                        observe_stage("deepseek_first_token", first_token, DEEPSEEK_MODEL)
+                    deltas += 1
+                    yield format_event("delta", {"content": content})
+            health_service.record_success("deepseek")
+            elapsed = time.perf_counter() - start
+            observe_stage("deepseek_stream", elapsed, DEEPSEEK_MODEL)
+            yield format_event("done", {
+                "deltas": deltas,
+                "usage": usage,
+                "first_token_seconds": round(first_token, 3) if first_token is not None else None,
+                "elapsed_seconds": round(elapsed, 3),
+            })
+
+        except DeepSeekError as e:
+            logger.error(f"DeepSeek 스트리밍 실패: {e}")
+            health_service.record_failure("deepseek", e)
+            yield format_event("error", {"status": e.status_code, "detail": f"DeepSeek API 호출 실패: {str(e)}"})
+        except Exception as e:
+            logger.error(f"채팅 스트리밍 중 오류: {e}")
+            health_service.record_failure("deepseek", e)
+            yield format_event("error", {"status": 500, "detail": f"채팅 처리 중 오류 발생: {str(e)}"})
+
+    return sse_response(events())
+
+@router.post("/voice", response_model=Dict[str, Any], openapi_extra=audio_form_openapi(**VOICE_FORM_FIELDS))
+async def voice_chat(request: Request):
+    """통합 음성 채팅 API (STT + Chat + TTS)
+
+    폼 필드: audio (음성 파일), history, language, system_prompt, temperature
+    """
+    try:
         # 1. STT: 음성을 텍스트로 변환
-        from services.stt_service import stt_service
-        if stt_service is None:
+        from services.stt_service import get_stt_service, transcribe_decoded
+        try:
+            stt_service = get_stt_service()
+        except Exception as e:
+            logger.error(f"STT 서비스 초기화 실패: {e}")
             raise HTTPException(status_code=500, detail="STT 서비스를 사용할 수 없습니다")
         
-        audio_data = await audio.read()
-        user_text = await stt_service.transcribe(audio_data, language=language)
+        # 업로드를 받는 대로 디코딩 (전체 파일을 메모리에 올리지 않음)
+        audio, form, _ = await read_voice_form(request, stt_service)
+        user_text = await transcribe_decoded(stt_service, audio, language=form.language)
         
         if not user_text.strip():
             raise HTTPException(status_code=400, detail="음성에서 텍스트를 인식할 수 없습니다")
@@ -181,9 +284,10 @@ async def voice_chat(
         # 2. Chat: 텍스트 응답 생성
         chat_request = ChatRequest(
             message=user_text,
-            history=[ChatMessage(**msg) for msg in history_list],
-            system_prompt=system_prompt,
-            temperature=temperature
+            history=form.history,
+            system_prompt=form.system_prompt,
+            temperature=form.temperature,
+            timeout=VOICE_LLM_BUDGET_SECONDS
         )
         
         chat_response = await chat_completion(chat_request)
@@ -192,14 +296,15 @@ async def voice_chat(
         logger.info(f"AI 응답: '{ai_response}'")
         
         # 3. TTS: 응답을 음성으로 변환
-        from services.tts_service import get_tts_service
+        from routes.tts import get_tts_service
         try:
             tts_service = get_tts_service()
-            audio_bytes = tts_service.synthesize_to_bytes(ai_response, format="wav")
+            audio_bytes = await tts_service.executor.run(
+                tts_service.synthesize_to_bytes, ai_response, format="wav"
+            )
             
             # 음성 파일을 Base64로 인코딩하여 전송
-            import base64
-            audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
+            audio_base64 = audio_to_base64(audio_bytes)
             
         except Exception as e:
             logger.error(f"TTS 처리 실패: {e}")
@@ -213,33 +318,156 @@ async def voice_chat(
             "usage": chat_response.usage
         }
         
-    except HTTPException:
+    except (HTTPException, RequestValidationError):
         raise
     except Exception as e:
         logger.error(f"음성 채팅 처리 중 오류: {e}")
         raise HTTPException(status_code=500, detail=f"음성 채팅 처리 중 오류: {str(e)}")
 
+@router.post("/voice/stream", openapi_extra=audio_form_openapi(
+    **VOICE_FORM_FIELDS, filler="필러 사용 시점 (off/always/delayed, 기본값은 VOICE_FILLER_MODE)"
+))
+async def voice_chat_stream(request: Request):
+    """통합 음성 채팅 스트리밍 API (SSE)
+
+    STT와 DeepSeek 응답을 기다리는 동안 미리 합성된 필러 음성을 먼저 보내고,
+    응답은 문장 단위로 합성하는 대로 전송합니다.
+
+    폼 필드: audio (음성 파일), history, language, system_prompt, temperature, filler
+    이벤트: filler, transcript, response, audio (문장별), done, error
+    """
+    from services.stt_service import get_stt_service, transcribe_decoded
+    from services.tts_service import TTS_SEGMENT_MIN_CHARS, TTS_SEGMENT_MAX_CHARS
+    from routes.tts import get_tts_service
+    try:
+        stt_service = get_stt_service()
+        tts_service = get_tts_service()
+    except Exception as e:
+        logger.error(f"음성 서비스 초기화 실패: {e}")
+        raise HTTPException(status_code=500, detail="음성 서비스를 사용할 수 없습니다")
+
+    # 업로드를 받는 대로 디코딩 (전체 파일을 메모리에 올리지 않음)
+    audio, form, fields = await read_voice_form(request, stt_service)
+    filler_mode = fields.get("filler") or filler_service.VOICE_FILLER_MODE
+    if filler_mode not in filler_service.FILLER_MODES:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 필러 모드: {filler_mode}")
+
+    library = filler_service.get_library()
+    if filler_service.enabled(filler_mode):
+        # 시작 시 준비되지 않았으면 (사전 로드 꺼짐, 전역 모드 off, 추론 서버 사용 등) 백그라운드에서 준비
+        library.load_in_background(tts_service)
+
+    loop = asyncio.get_running_loop()
+    filler_deadline = loop.time() + filler_service.VOICE_FILLER_DELAY_MS / 1000.0
+
+    def filler_event() -> Optional[bytes]:
+        clip = library.pick()
+        if clip is None:
+            return None
+        return format_event("filler", {
+            "text": clip.text,
+            "audio_base64": audio_to_base64(clip.audio_bytes),
+            "format": clip.format,
+            "duration": round(clip.duration, 3),
+        })
+
+    async def events():
+        filler_pending = filler_mode == "delayed"
+        pending_tasks = []
+        try:
+            if filler_mode == "always":
+                event = filler_event()
+                if event:
+                    yield event
+
+            # 1. STT
+            stt_task = asyncio.create_task(transcribe_decoded(stt_service, audio, language=form.language))
+            pending_tasks.append(stt_task)
+            if filler_pending:
+                done, _ = await asyncio.wait({stt_task}, timeout=max(0.0, filler_deadline - loop.time()))
+                if not done:
+                    filler_pending = False
+                    event = filler_event()
+                    if event:
+                        yield event
+            user_text = await stt_task
+            if not user_text.strip():
+                raise HTTPException(status_code=400, detail="음성에서 텍스트를 인식할 수 없습니다")
+            yield format_event("transcript", {"text": user_text})
+
+            # 2. Chat
+            chat_request = ChatRequest(
+                message=user_text,
+                history=form.history,
+                system_prompt=form.system_prompt,
+                temperature=form.temperature,
+                timeout=VOICE_LLM_BUDGET_SECONDS
+            )
+            chat_task = asyncio.create_task(chat_completion(chat_request))
+            pending_tasks.append(chat_task)
+            if filler_pending:
+                done, _ = await asyncio.wait({chat_task}, timeout=max(0.0, filler_deadline - loop.time()))
+                if not done:
+                    filler_pending = False
+                    event = filler_event()
+                    if event:
+                        yield event
+            chat_response = await chat_task
+            ai_response = chat_response.response
+            yield format_event("response", {"text": ai_response, "usage": chat_response.usage})
+
+            # 3. TTS: 문장 단위로 합성하여 전송
+            sentences = segment_text(ai_response, TTS_SEGMENT_MIN_CHARS, TTS_SEGMENT_MAX_CHARS)
+            for index, sentence in enumerate(sentences):
+                audio_bytes = await tts_service.executor.run(
+                    tts_service.synthesize_to_bytes, sentence, format="wav"
+                )
+                yield format_event("audio", {
+                    "index": index,
+                    "text": sentence,
+                    "audio_base64": audio_to_base64(audio_bytes),
+                    "format": "wav",
+                })
+            yield format_event("done", {"sentences": len(sentences)})
+
+        except HTTPException as e:
+            yield format_event("error", {"status": e.status_code, "detail": e.detail})
+        except Exception as e:
+            logger.error(f"음성 채팅 스트리밍 중 오류: {e}")
+            yield format_event("error", {"status": 500, "detail": f"음성 채팅 처리 중 오류: {str(e)}"})
+        finally:
+            # 클라이언트 연결이 끊기면 진행 중인 작업 취소
+            for task in pending_tasks:
+                if not task.done():
+                    task.cancel()
+
+    return sse_response(events())
+
 @router.get("/check")
-async def check_chat_service():
-    """채팅 서비스 상태 확인"""
+async def check_chat_service(deep: bool = Query(False, description="실제 DeepSeek 호출로 확인 (최소 간격 제한)")):
+    """채팅 서비스 상태 확인
+
+    기본적으로 실제 트래픽에서 기록된 마지막 DeepSeek 성공/실패만 반환하며 유료 API를 호출하지 않습니다.
+    """
     try:
         # API 키 확인
-        api_key = get_deepseek_api_key()
+        get_deepseek_api_key()
         
-        # 간단한 테스트 요청
-        test_messages = [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": "Hello, this is a test message."}
-        ]
-        
-        await call_deepseek_api(test_messages, temperature=0.1, max_tokens=10)
+        if deep:
+            result = await health_service.run_deep_checks(components=("deepseek",))
+            deep_result = result["results"].get("deepseek", {})
+            if not deep_result.get("ok"):
+                raise HTTPException(status_code=500, detail=f"채팅 서비스 확인 실패: {deep_result.get('error')}")
         
+        state = health_service.component_status("deepseek")
         return {
-            "status": "ok",
+            "status": "ok" if state["healthy"] is not False else "degraded",
             "message": "채팅 서비스가 정상 작동 중입니다.",
-            "deepseek_api": "연결 성공"
+            "deepseek_api": state,
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"채팅 서비스 확인 실패: {e}")
         raise HTTPException(status_code=500, detail=f"채팅 서비스 확인 실패: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+헬스 체크 API 라우트
+
+로드밸런서/오케스트레이터용 프로브를 제공합니다.
+`/health/live`, `/health/ready`는 캐시된 상태만 읽으므로 추론이나 유료 API 호출 없이 즉시 응답합니다.
+실제 추론을 수행하는 딥 체크는 `/health/deep`에서만 실행되며 최소 간격으로 제한됩니다.
+"""
+
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+
+from services import health_service
+
+# 라우터 초기화
+router = APIRouter(prefix="/health", tags=["Health"])
+
+@router.get("")
+async def health():
+    """캐시된 전체 헬스 상태 (모델, 큐, 컴포넌트별 마지막 성공/실패)"""
+    return health_service.summary()
+
+@router.get("/live")
+async def live():
+    """Liveness 프로브 (프로세스가 이벤트 루프를 돌리고 있으면 200)"""
+    return health_service.liveness()
+
+@router.get("/ready")
+async def ready():
+    """Readiness 프로브 (모델 준비 완료 + 큐 포화 아님이면 200, 아니면 503)"""
+    state = health_service.readiness()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+@router.get("/deep")
+async def deep(
+    component: str = Query(None, description="확인할 컴포넌트 (stt, tts, deepseek). 생략하면 전체"),
+):
+    """실제 추론/외부 호출로 딥 체크를 수행합니다 (최소 간격 안에서는 직전 결과 반환).
+
+    최소 간격은 요청으로 우회할 수 없습니다 (인증 없는 호출이 추론과 유료 DeepSeek 호출을 반복하지 않도록).
+    """
+    if component is not None and component not in health_service.COMPONENTS:
+        return JSONResponse({"detail": f"알 수 없는 컴포넌트: {component}"}, status_code=400)
+    components = (component,) if component else health_service.COMPONENTS
+    result = await health_service.run_deep_checks(components=components)
+    ok = all(item.get("ok") for item in result["results"].values())
+    return JSONResponse(result, status_code=200 if ok else 503)
@@ -0,0 +1,24 @@
+"""
+메트릭 API 라우트
+
+Prometheus 스크레이프용 `/metrics` 엔드포인트를 제공합니다.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from services import load_controller
+from services.metrics_service import registry
+
+# 라우터 초기화
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 텍스트 포맷으로 메트릭을 반환합니다."""
+    # 요청이 끊긴 뒤에도 품질 단계가 회복되고 게이지가 갱신되도록 스크레이프마다 평가
+    load_controller.refresh()
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,22 +1,119 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from services.stt_service import stt_service
-import io
+from fastapi import APIRouter, Request, HTTPException
+from services.stt_service import get_stt_service, stream_segments, transcribe_decoded
+from services.audio_upload import UploadError, audio_form_openapi, read_audio_form
+from services.stt_batch import batch_form_openapi, close_files, read_batch_upload, transcribe_files
+from services import vad_service
+from utils.ndjson import format_line, ndjson_response
+from utils.sse import format_event, sse_response
+import asyncio
+import logging
+import time
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/api/stt")
-async def transcribe_audio(audio: UploadFile = File(...)):
+@router.post("/api/stt", openapi_extra=audio_form_openapi())
+async def transcribe_audio(request: Request):
     """
     오디오 파일을 받아서 텍스트로 변환합니다.
+
+    업로드는 받는 대로 디코딩하며, 크기/길이 제한을 넘으면 413으로 거절합니다.
     """
     try:
-        # 오디오 데이터 읽기
-        audio_data = await audio.read()
-        
+        service = get_stt_service()
+
+        # 오디오 업로드를 스트리밍으로 디코딩
+        audio, _ = await read_audio_form(request, model_label=f"whisper-{service.model_size}")
+
         # 텍스트 변환
-        transcript = await stt_service.transcribe(audio_data)
-        
+        transcript = await transcribe_decoded(service, audio)
+
         return {"text": transcript}
-    
+
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"STT 처리 중 오류: {str(e)}")
+
+
+@router.post("/api/stt/stream", openapi_extra=audio_form_openapi(language="STT 언어 (기본 ko)"))
+async def transcribe_audio_stream(request: Request):
+    """
+    긴 오디오를 침묵 경계에서 청크로 나누어 병렬로 인식하고, 세그먼트를 SSE로 순서대로 보냅니다.
+
+    이벤트: info (길이, 청크 수), segment (청크 번호, 시작/끝 시각, 텍스트), done (전체 텍스트), error
+    """
+    start = time.perf_counter()
+    try:
+        service = get_stt_service()
+        samples, fields = await read_audio_form(request, model_label=f"whisper-{service.model_size}")
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"STT 처리 중 오류: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"STT 처리 중 오류: {str(e)}")
+    language = fields.get("language") or "ko"
+
+    async def events():
+        try:
+            chunks = await asyncio.to_thread(vad_service.split_on_silence, samples)
+            duration = round(len(samples) / vad_service.SAMPLE_RATE, 2)
+            yield format_event("info", {"duration": duration, "chunks": len(chunks)})
+
+            texts = []
+            async for chunk, segments in stream_segments(service, samples, language, chunks):
+                for segment in segments:
+                    texts.append(segment["text"])
+                    yield format_event("segment", {"chunk": chunk.index, **segment})
+            yield format_event("done", {
+                "text": " ".join(texts),
+                "duration": duration,
+                "elapsed": round(time.perf_counter() - start, 3),
+            })
+        except Exception as e:
+            logger.error(f"STT 스트리밍 중 오류: {e}")
+            yield format_event("error", {"status": 500, "detail": f"STT 처리 중 오류: {str(e)}"})
+
+    return sse_response(events())
+
+
+@router.post("/api/stt/batch", openapi_extra=batch_form_openapi())
+async def transcribe_audio_batch(request: Request):
+    """
+    녹음 파일 여러 개(multipart 파일 목록 또는 zip/tar 아카이브)를 한 번에 인식하고 결과를 JSON Lines로 보냅니다.
+
+    파일은 병렬로 디코딩하고 배치 파이프라인으로 인식하며, 결과는 끝나는 순서대로 한 줄씩 보냅니다.
+    각 줄: {index, filename, text, duration, decode_seconds, queue_seconds, inference_seconds} 또는 실패 시 {index, filename, error, status}
+    마지막 줄: {done: true, files, succeeded, failed, elapsed}
+    """
+    start = time.perf_counter()
+    try:
+        service = get_stt_service()
+        files, fields = await read_batch_upload(request)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"STT 처리 중 오류: {str(e)}")
+    language = fields.get("language") or "ko"
+    logger.info(f"일괄 인식 시작: 파일 {len(files)}개")
+
+    async def lines():
+        failed = 0
+        try:
+            async for result in transcribe_files(service, files, language):
+                failed += "error" in result
+                yield format_line(result)
+            elapsed = round(time.perf_counter() - start, 3)
+            logger.info(f"일괄 인식 완료: 파일 {len(files)}개, 실패 {failed}개, {elapsed}초")
+            yield format_line({
+                "done": True,
+                "files": len(files),
+                "succeeded": len(files) - failed,
+                "failed": failed,
+                "elapsed": elapsed,
+            })
+        finally:
+            close_files(files)
+
+    return ndjson_response(lines())
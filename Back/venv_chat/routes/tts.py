@@ -6,17 +6,26 @@ TTS(Text-to-Speech) 관련 API 엔드포인트를 정의합니다.
 
 import os
 from typing import Optional, List
-from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks, Request
 from fastapi.responses import FileResponse, StreamingResponse, JSONResponse
 from pydantic import BaseModel, Field
 import logging
 import io
+import time
 import uuid
+import asyncio
+import threading
 from pathlib import Path
 
+from services import checkpoint_manager, tts_jobs
+from services.audio_upload import UploadError, audio_form_openapi, read_audio_form
+from services.inference_executor import PRIORITY_BACKGROUND
+from services.speaker_registry import PROMPT_SAMPLE_RATE, TTS_SPEAKER_MAX_PROMPT_SECONDS, get_speaker_registry
+from services.tts_disk_cache import ARTIFACT_ID_PATTERN, get_disk_cache
+from utils.sse import format_comment, format_event, sse_response
+
 # 로깅 설정
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 # 라우터 초기화
 router = APIRouter(prefix="/tts", tags=["TTS"])
@@ -26,30 +35,47 @@ TEMP_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "t
 os.makedirs(TEMP_DIR, exist_ok=True)
 
 # 모델 체크포인트와 설정 파일 경로
-# 실제 파일 경로는 프로젝트 설정에 맞게 수정해야 합니다
-MODEL_CHECKPOINT = os.path.abspath(os.path.join(
-    os.path.dirname(os.path.dirname(__file__)), 
-    "..", "..", "Amphion", "Amphion", "pretrained", "metis-korean-base.pth"
-))
+# 체크포인트는 복사/이름 변경 없이 pretrained 디렉토리의 safetensors를 그대로 참조 (METIS_CHECKPOINT로 지정 가능)
+MODEL_CHECKPOINT = checkpoint_manager.resolve_metis_checkpoint()
 MODEL_CONFIG = os.path.abspath(os.path.join(
     os.path.dirname(os.path.dirname(__file__)), 
     "..", "..", "Amphion", "Amphion", "models", "tts", "metis", "config", "tts.json"
 ))
 
+# 배치 합성: 요청당 최대 텍스트 수, 실행기 작업 하나에 묶는 텍스트 수
+TTS_BATCH_MAX_TEXTS = int(os.getenv("TTS_BATCH_MAX_TEXTS", "500"))
+TTS_BATCH_SIZE = int(os.getenv("TTS_BATCH_SIZE", "8"))
+
+# 작업 진행 SSE 연결 유지 주석 간격 (초, 프록시 유휴 타임아웃 방지)
+JOB_EVENTS_KEEPALIVE_SECONDS = 15.0
+
 # 경로 출력 (디버깅용)
-logger.info(f"MODEL_CHECKPOINT 경로: {MODEL_CHECKPOINT}")
-logger.info(f"MODEL_CONFIG 경로: {MODEL_CONFIG}")
-logger.info(f"TEMP_DIR 경로: {TEMP_DIR}")
+logger.debug(f"MODEL_CHECKPOINT 경로: {MODEL_CHECKPOINT}")
+logger.debug(f"MODEL_CONFIG 경로: {MODEL_CONFIG}")
+logger.debug(f"TEMP_DIR 경로: {TEMP_DIR}")
 
 # TTS 서비스 인스턴스 (싱글톤)
 _tts_service = None
+_tts_lock = threading.Lock()
 
 def get_tts_service():
     """TTS 서비스 싱글톤 인스턴스를 반환합니다."""
     global _tts_service
     
-    if _tts_service is None:
+    if _tts_service is not None:
+        return _tts_service
+    
+    # 시작 시 사전 로드 스레드와 요청이 동시에 생성하지 않도록 잠금
+    with _tts_lock:
+        if _tts_service is not None:
+            return _tts_service
         try:
+            # 추론 서버가 설정되어 있으면 모델을 로드하지 않고 클라이언트를 사용
+            from services import inference_client
+            if inference_client.remote_enabled():
+                _tts_service = inference_client.RemoteTTSService()
+                return _tts_service
+
             # TTS 서비스 모듈 임포트 (지연 임포트)
             from services.tts_service import MetisTTSService
             
@@ -71,7 +97,20 @@ class TTSRequest(BaseModel):
     """TTS 요청 모델"""
     text: str = Field(..., description="음성으로 변환할 텍스트")
     use_cache: bool = Field(True, description="캐시 사용 여부")
-    speaker_id: Optional[str] = Field(None, description="화자 ID (아직 미구현)")
+    speaker_id: Optional[str] = Field(None, description="등록된 화자 ID (기본값은 기본 프롬프트)")
+
+class TTSJobRequest(BaseModel):
+    """긴 텍스트 TTS 작업 요청 모델"""
+    text: str = Field(..., description="음성으로 변환할 긴 텍스트 (기사, 읽기 모드 등)")
+    use_cache: bool = Field(True, description="문장 캐시 사용 여부")
+    speaker_id: Optional[str] = Field(None, description="등록된 화자 ID (기본값은 기본 프롬프트)")
+
+class TTSBatchRequest(BaseModel):
+    """배치 TTS 요청 모델 (UI 안내 문구 등 미리 렌더링)"""
+    texts: List[str] = Field(..., description="음성으로 변환할 텍스트 목록")
+    tier: str = Field("standard", description="품질 단계 (fast, standard, high)")
+    speaker_id: Optional[str] = Field(None, description="등록된 화자 ID (기본값은 기본 프롬프트)")
+    overwrite: bool = Field(False, description="이미 캐시된 아티팩트도 다시 합성")
 
 class TTSResponse(BaseModel):
     """TTS 응답 모델"""
@@ -79,6 +118,11 @@ class TTSResponse(BaseModel):
     message: str = Field(..., description="응답 메시지")
     file_url: Optional[str] = Field(None, description="생성된 오디오 파일 URL")
 
+def _check_speaker(speaker_id: Optional[str]) -> None:
+    """등록되지 않은 화자 ID면 404 (모델을 호출하기 전에 확인)"""
+    if speaker_id is not None and get_speaker_registry().get(speaker_id) is None:
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 화자입니다: {speaker_id}")
+
 # 임시 파일 정리 함수
 def cleanup_temp_file(file_path: str):
     """임시 파일을 삭제합니다."""
@@ -100,7 +144,8 @@ async def synthesize_text(
     """
     try:
         # 요청 파라미터 로깅
-        logger.info(f"TTS 요청: 텍스트 길이={len(request.text)}, 캐시={request.use_cache}")
+        logger.info(f"TTS 요청: 텍스트 길이={len(request.text)}, 캐시={request.use_cache}, 화자={request.speaker_id}")
+        _check_speaker(request.speaker_id)
         
         # TTS 서비스 인스턴스 가져오기
         tts_service = get_tts_service()
@@ -109,11 +154,13 @@ async def synthesize_text(
         file_name = f"tts_{uuid.uuid4()}.wav"
         output_path = os.path.join(TEMP_DIR, file_name)
         
-        # 음성 합성 수행
-        tts_service.synthesize_to_file(
+        # 음성 합성 수행 (추론 실행기에서 실행)
+        await tts_service.executor.run(
+            tts_service.synthesize_to_file,
             text=request.text,
             output_path=output_path,
-            use_cache=request.use_cache
+            use_cache=request.use_cache,
+            speaker_id=request.speaker_id
         )
         
         # 임시 파일 삭제 태스크 예약
@@ -128,10 +175,110 @@ async def synthesize_text(
             file_url=file_url
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"음성 합성 중 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=f"음성 합성 중 오류 발생: {e}")
 
+@router.post("/synthesize/batch")
+async def synthesize_batch(request: TTSBatchRequest):
+    """여러 텍스트를 한 번에 합성하여 영구 TTS 캐시에 저장하고 아티팩트 매니페스트를 반환합니다.
+
+    텍스트는 정규화 후 (텍스트, 품질 단계, 음성) 기준으로 중복을 제거하고, 이미 캐시된 아티팩트는 건너뜁니다.
+    나머지는 TTS_BATCH_SIZE개씩 묶어 낮은 우선순위 실행기 작업으로 합성하므로 대화 요청을 막지 않습니다.
+    기본 품질/음성으로 만든 아티팩트는 일반 합성 요청(use_cache=True)에서도 디스크 캐시로 사용됩니다.
+    """
+    from services.tts_service import TTS_TEXT_NORMALIZE, TTS_TIERS
+    from utils.text_normalizer import normalize_text
+
+    if request.tier not in TTS_TIERS:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 품질 단계: {request.tier} (가능: {', '.join(TTS_TIERS)})")
+    if len(request.texts) > TTS_BATCH_MAX_TEXTS:
+        raise HTTPException(status_code=413, detail=f"텍스트가 너무 많습니다 (최대 {TTS_BATCH_MAX_TEXTS}개)")
+
+    try:
+        tts_service = get_tts_service()
+    except Exception as e:
+        logger.error(f"배치 합성 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"TTS 서비스를 사용할 수 없습니다: {e}")
+    if tts_service.mock_model:
+        # 모의 모델의 무음이 실제 모델과 같은 ID로 디스크에 남지 않도록 거부
+        raise HTTPException(status_code=503, detail="TTS 모델이 로드되지 않아 (모의 모델) 배치 합성을 할 수 없습니다")
+
+    start = time.perf_counter()
+    _check_speaker(request.speaker_id)
+    try:
+        voice_key = tts_service.voice_key(request.speaker_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    disk_cache = tts_service.disk_cache
+
+    # 정규화 후 중복 제거 (아티팩트 ID가 같으면 같은 음성)
+    items = []
+    pending = {}
+    for index, text in enumerate(request.texts):
+        normalized = normalize_text(text) if TTS_TEXT_NORMALIZE else text.strip()
+        if not normalized:
+            items.append({"index": index, "text": text, "artifact_id": None, "error": "빈 텍스트"})
+            continue
+        artifact_id = disk_cache.artifact_id(normalized, request.tier, voice_key, tts_service.model_key)
+        cached = not request.overwrite and disk_cache.exists(artifact_id)
+        if not cached:
+            pending.setdefault(artifact_id, normalized)
+        items.append({"index": index, "text": text, "artifact_id": artifact_id, "cached": cached})
+    unique = len({item["artifact_id"] for item in items if item["artifact_id"]})
+
+    try:
+        # 묶음 단위로 합성하여 바로 디스크에 저장 (전체 결과를 메모리에 모으지 않음)
+        failed = set()
+        pending_items = list(pending.items())
+        for offset in range(0, len(pending_items), TTS_BATCH_SIZE):
+            batch = pending_items[offset:offset + TTS_BATCH_SIZE]
+            results = await tts_service.executor.run_with_priority(
+                PRIORITY_BACKGROUND, tts_service.synthesize_batch, [text for _, text in batch], request.tier, request.speaker_id
+            )
+            for (artifact_id, normalized), audio in zip(batch, results):
+                if audio is None:
+                    failed.add(artifact_id)
+                    continue
+                metadata = {"text": normalized, "tier": request.tier, "speaker_id": request.speaker_id, "voice_key": voice_key,
+                            "model_key": tts_service.model_key,
+                            "sample_rate": tts_service.sample_rate, "duration": round(len(audio) / tts_service.sample_rate, 3)}
+                await asyncio.to_thread(disk_cache.save, artifact_id, audio, tts_service.sample_rate, metadata)
+    except Exception as e:
+        logger.error(f"배치 합성 중 오류 발생: {e}")
+        raise HTTPException(status_code=500, detail=f"배치 합성 중 오류 발생: {e}")
+
+    for item in items:
+        artifact_id = item["artifact_id"]
+        if artifact_id is None:
+            continue
+        if artifact_id in failed:
+            item.update(artifact_id=None, error="합성 실패")
+            continue
+        metadata = disk_cache.metadata(artifact_id) or {}
+        item.update(url=f"/tts/artifacts/{artifact_id}", duration=metadata.get("duration"))
+
+    return {
+        "tier": request.tier,
+        "speaker_id": request.speaker_id,
+        "count": len(request.texts),
+        "unique": unique,
+        "synthesized": len(pending) - len(failed),
+        "failed": len(failed),
+        "elapsed": round(time.perf_counter() - start, 3),
+        "items": items,
+    }
+
+@router.get("/artifacts/{artifact_id}")
+async def download_artifact(artifact_id: str):
+    """영구 TTS 캐시의 아티팩트 오디오를 반환합니다."""
+    disk_cache = get_disk_cache()
+    if not ARTIFACT_ID_PATTERN.fullmatch(artifact_id) or not disk_cache.exists(artifact_id):
+        raise HTTPException(status_code=404, detail="아티팩트를 찾을 수 없습니다")
+    return FileResponse(path=disk_cache.path(artifact_id), filename=f"{artifact_id}.wav", media_type="audio/wav")
+
 @router.get("/download/{file_name}")
 async def download_audio(file_name: str):
     """생성된 음성 파일을 다운로드합니다."""
@@ -150,14 +297,18 @@ async def download_audio(file_name: str):
 async def synthesize_text_stream(request: TTSRequest):
     """텍스트를 음성으로 변환하여 스트리밍으로 반환합니다."""
     try:
+        _check_speaker(request.speaker_id)
+
         # TTS 서비스 인스턴스 가져오기
         tts_service = get_tts_service()
         
         # 오디오 바이트 생성
-        audio_bytes = tts_service.synthesize_to_bytes(
+        audio_bytes = await tts_service.executor.run(
+            tts_service.synthesize_to_bytes,
             text=request.text,
             format="wav",
-            use_cache=request.use_cache
+            use_cache=request.use_cache,
+            speaker_id=request.speaker_id
         )
         
         # 스트리밍 응답 반환
@@ -166,20 +317,207 @@ async def synthesize_text_stream(request: TTSRequest):
             media_type="audio/wav"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"음성 합성 스트리밍 중 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=f"음성 합성 스트리밍 중 오류 발생: {e}")
 
 @router.get("/check")
-async def check_tts_service():
-    """TTS 서비스 상태를 확인합니다."""
+async def check_tts_service(deep: bool = Query(False, description="실제 합성으로 확인 (최소 간격 제한)")):
+    """TTS 서비스 상태를 확인합니다.
+
+    기본적으로 캐시된 상태(모델 로드 여부, 마지막 합성 성공 시각)만 반환하며 추론을 실행하지 않습니다.
+    """
     try:
-        # TTS 서비스 인스턴스 가져오기
-        tts_service = get_tts_service()
-        
-        # 간단한 텍스트로 서비스 작동 확인
-        tts_service.synthesize("안녕하세요, 메티스 TTS입니다.")
-        return {"status": "ok", "message": "TTS 서비스가 정상 작동 중입니다."}
+        from services import health_service, model_manager
+
+        if deep:
+            result = await health_service.run_deep_checks(components=("tts",))
+            deep_result = result["results"].get("tts", {})
+            if not deep_result.get("ok"):
+                raise HTTPException(status_code=500, detail=f"TTS 서비스 확인 실패: {deep_result.get('error')}")
+
+        model_state = model_manager.model_states["tts"].to_dict()
+        if model_state["status"] == "failed":
+            raise HTTPException(status_code=500, detail=f"TTS 서비스 확인 실패: {model_state['error']}")
+        return {
+            "status": "ok",
+            "message": "TTS 서비스가 정상 작동 중입니다.",
+            "model": model_state,
+            "inference": health_service.component_status("tts"),
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"TTS 서비스 확인 실패: {e}")
-        raise HTTPException(status_code=500, detail=f"TTS 서비스 확인 실패: {e}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"TTS 서비스 확인 실패: {e}")
+
+@router.get("/cache/stats")
+async def tts_cache_stats():
+    """TTS 캐시 적중률을 반환합니다 (문장 단위/응답 단위 문장 캐시, 전체 텍스트 캐시).
+
+    모델을 로드하지 않으며, 서비스가 아직 생성되지 않았거나 추론 서버에 연결할 수 없으면 available=False입니다.
+    별도 추론 서버를 쓰면 서버 프로세스의 캐시 통계를 반환합니다.
+    """
+    service = _tts_service
+    if service is None:
+        return {"available": False}
+    try:
+        stats = await asyncio.to_thread(service.cache_stats)
+    except Exception as e:
+        logger.warning(f"TTS 캐시 통계 조회 실패: {e}")
+        return {"available": False}
+    return {"available": True, **stats}
+
+@router.post("/speakers", status_code=201, openapi_extra=audio_form_openapi(
+    speaker_id="화자 ID (영문/숫자/한글, _, - 최대 64자)",
+    prompt_text="참조 음성의 대본",
+    overwrite="이미 있는 ID를 덮어쓸지 여부 (true/false, 기본 false)",
+))
+async def register_speaker(request: Request):
+    """참조 음성과 대본을 화자 ID로 등록합니다.
+
+    프롬프트 특징은 이 화자로 처음 합성할 때 한 번 인코딩되어 메모리/디스크에 캐시되며,
+    이후 요청은 참조 음성을 다시 인코딩하지 않습니다. 같은 ID로 다시 등록하면 이전 특징은 폐기됩니다.
+    참조 음성은 STT용 16kHz가 아니라 Metis 샘플 레이트(24kHz)로 디코딩하여 저장합니다.
+    """
+    try:
+        audio, fields = await read_audio_form(
+            request, max_seconds=TTS_SPEAKER_MAX_PROMPT_SECONDS, model_label="metis", sample_rate=PROMPT_SAMPLE_RATE
+        )
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    overwrite = fields.get("overwrite", "").strip().lower() in ("1", "true", "yes")
+    try:
+        speaker = await asyncio.to_thread(
+            get_speaker_registry().register,
+            fields.get("speaker_id", "").strip(), audio, PROMPT_SAMPLE_RATE, fields.get("prompt_text", ""), overwrite,
+        )
+    except FileExistsError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"화자 등록 중 오류 발생: {e}")
+        raise HTTPException(status_code=500, detail=f"화자 등록 중 오류 발생: {e}")
+    return speaker.to_dict()
+
+@router.get("/speakers")
+async def list_speakers():
+    """등록된 화자 목록과 프롬프트 특징 캐시 통계를 반환합니다 (추론 서버 모드에서는 이 워커의 캐시)."""
+    registry = get_speaker_registry()
+    speakers = await asyncio.to_thread(registry.list)
+    return {
+        "speakers": [speaker.to_dict() for speaker in speakers],
+        "feature_cache": registry.features.stats(),
+    }
+
+@router.get("/speakers/{speaker_id}")
+async def get_speaker(speaker_id: str):
+    """등록된 화자 정보를 반환합니다."""
+    speaker = get_speaker_registry().get(speaker_id)
+    if speaker is None:
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 화자입니다: {speaker_id}")
+    return speaker.to_dict()
+
+@router.delete("/speakers/{speaker_id}")
+async def delete_speaker(speaker_id: str):
+    """화자와 캐시된 프롬프트 특징을 삭제합니다."""
+    if not await asyncio.to_thread(get_speaker_registry().delete, speaker_id):
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 화자입니다: {speaker_id}")
+    return {"speaker_id": speaker_id, "deleted": True}
+
+def _job_links(job_id: str) -> dict:
+    return {
+        "status_url": f"/tts/jobs/{job_id}",
+        "events_url": f"/tts/jobs/{job_id}/events",
+        "result_url": f"/tts/jobs/{job_id}/result",
+    }
+
+def _get_job_or_404(job_id: str) -> tts_jobs.TTSJob:
+    job = tts_jobs.get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다 (만료되었거나 없는 작업)")
+    return job
+
+@router.post("/jobs", status_code=202)
+async def create_tts_job(request: TTSJobRequest):
+    """긴 텍스트 합성 작업을 만들고 작업 ID를 바로 반환합니다.
+
+    작업은 문장 조각마다 낮은 우선순위로 실행되어 대화 요청을 막지 않습니다.
+    진행 상황은 status_url(폴링) 또는 events_url(SSE)로, 완성된 오디오는 result_url로 받습니다.
+    """
+    try:
+        tts_service = get_tts_service()
+    except Exception as e:
+        logger.error(f"TTS 작업 생성 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"TTS 서비스를 사용할 수 없습니다: {e}")
+    _check_speaker(request.speaker_id)
+
+    try:
+        job = tts_jobs.get_job_manager().submit(tts_service, request.text, request.use_cache, request.speaker_id)
+    except tts_jobs.JobLimitExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {**job.to_dict(), **_job_links(job.id)}
+
+@router.get("/jobs/{job_id}")
+async def get_tts_job(job_id: str):
+    """작업 상태와 진행률을 반환합니다."""
+    job = _get_job_or_404(job_id)
+    return {**job.to_dict(), **_job_links(job.id)}
+
+@router.get("/jobs/{job_id}/events")
+async def tts_job_events(job_id: str):
+    """작업 진행 상황을 SSE로 보냅니다.
+
+    이벤트: status (구독 시점 상태), sentence (조각마다), done, error (실패/취소)
+    """
+    job = _get_job_or_404(job_id)
+
+    async def events():
+        yield format_event("status", job.to_dict())
+        sent = 0
+        while True:
+            version = job.version
+            # 구독이 늦었거나 밀린 조각도 하나씩 보냄
+            while sent < job.completed:
+                yield format_event("sentence", {
+                    "index": sent,
+                    "total": len(job.sentences),
+                    "text": job.sentences[sent],
+                    "duration": job.segment_seconds[sent],
+                })
+                sent += 1
+            if job.finished:
+                if job.status == "done":
+                    yield format_event("done", {**job.to_dict(), **_job_links(job.id)})
+                else:
+                    yield format_event("error", {
+                        "status": 500 if job.status == "failed" else 409,
+                        "detail": job.error or "작업이 취소되었습니다",
+                        "job": job.to_dict(),
+                    })
+                return
+            if not await job.wait_for_change(version, JOB_EVENTS_KEEPALIVE_SECONDS):
+                yield format_comment("keepalive")
+
+    return sse_response(events())
+
+@router.get("/jobs/{job_id}/result")
+async def get_tts_job_result(job_id: str):
+    """완성된 작업의 오디오 파일을 반환합니다 (끝나지 않았거나 실패한 작업은 409)."""
+    job = _get_job_or_404(job_id)
+    if job.status != "done" or not job.path or not os.path.exists(job.path):
+        raise HTTPException(status_code=409, detail=f"작업 결과가 없습니다 (상태: {job.status})")
+    return FileResponse(path=job.path, filename=f"tts_{job.id}.wav", media_type="audio/wav")
+
+@router.delete("/jobs/{job_id}")
+async def cancel_tts_job(job_id: str):
+    """작업을 취소하거나, 끝난 작업이면 결과를 삭제합니다."""
+    job = tts_jobs.get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다 (만료되었거나 없는 작업)")
+    return {"job_id": job.id, "status": job.status}
@@ -0,0 +1,138 @@
+"""
+Amphion 모듈 지연 로더
+
+Amphion(Metis) 모듈 경로 해석과 임포트를 최초 호출 시 한 번만 수행합니다.
+모듈 임포트 시점에는 경로 계산 외의 부수 효과(sys.path 변경, 파일 시스템 탐색, 로그 출력)가 없습니다.
+
+환경 변수:
+    AMPHION_DEBUG: "1"이면 sys.path와 Amphion 디렉토리 구성을 진단 로그로 출력
+"""
+
+import os
+import sys
+import logging
+import threading
+import importlib.util
+from typing import Any, Callable, Tuple
+
+import numpy as np
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 진단 로그 활성화 여부
+AMPHION_DEBUG = os.getenv("AMPHION_DEBUG", "0") == "1"
+
+# Amphion 루트 디렉토리 절대 경로
+amphion_root = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '..', 'Amphion', 'Amphion'))
+parent_amphion_dir = os.path.dirname(amphion_root)
+
+_lock = threading.Lock()
+_loaded = None
+
+
+class MockMetis:
+    """Amphion 임포트 실패 시 사용하는 최소 기능 모의 Metis 클래스"""
+
+    def __init__(self, **kwargs):
+        logger.info("모의 Metis 클래스 초기화됨")
+
+    def __call__(self, **kwargs):
+        # 더미 오디오 데이터 반환 (1초 침묵)
+        logger.info("모의 Metis 클래스 호출됨 - 더미 오디오 반환")
+        return np.zeros(24000, dtype=np.float32)
+
+
+def mock_load_config(path):
+    """Amphion 임포트 실패 시 사용하는 모의 load_config 함수"""
+    logger.info(f"모의 load_config 함수 호출됨: {path}")
+    return {"sample_rate": 24000}
+
+
+def _log_diagnostics(metis_path: str, util_path: str) -> None:
+    """Amphion 경로 진단 정보를 출력합니다 (AMPHION_DEBUG=1일 때만)."""
+    models_dir = os.path.join(amphion_root, 'models')
+    metis_dir = os.path.join(models_dir, 'tts', 'metis')
+    utils_dir = os.path.join(amphion_root, 'utils')
+
+    logger.info(f"Amphion 루트 경로: {amphion_root}")
+    logger.info(f"현재 Python 경로: {sys.path}")
+    logger.info(f"models 디렉토리 존재: {os.path.exists(models_dir)}")
+    logger.info(f"metis 디렉토리 존재: {os.path.exists(metis_dir)}")
+    logger.info(f"utils 디렉토리 존재: {os.path.exists(utils_dir)}")
+    logger.info(f"Metis 파일 존재: {os.path.exists(metis_path)}")
+    logger.info(f"Util 파일 존재: {os.path.exists(util_path)}")
+
+    try:
+        amphion_root_files = os.listdir(amphion_root)
+        logger.info(f"Amphion 루트 디렉토리 내용: {amphion_root_files}")
+        if 'models' in amphion_root_files:
+            models_files = os.listdir(models_dir)
+            logger.info(f"models 디렉토리 내용: {models_files}")
+            if 'tts' in models_files:
+                logger.info(f"tts 디렉토리 내용: {os.listdir(os.path.join(models_dir, 'tts'))}")
+    except Exception as e:
+        logger.error(f"디렉토리 탐색 중 오류: {e}")
+
+
+def _ensure_sys_path() -> None:
+    """Amphion 루트와 상위 디렉토리를 Python 경로에 추가합니다."""
+    # Amphion 루트와 상위 디렉토리는 앞쪽에 (우선순위 높게)
+    for path in (parent_amphion_dir, amphion_root):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+            logger.debug(f"Python 경로에 추가됨: {path}")
+    # models/utils 디렉토리는 뒤쪽에 (Amphion 내부 상대 임포트용)
+    for path in (os.path.join(amphion_root, 'models'), os.path.join(amphion_root, 'utils')):
+        if path not in sys.path:
+            sys.path.append(path)
+
+
+def _import_amphion() -> Tuple[Callable[..., Any], Callable[[str], Any]]:
+    """Amphion 모듈을 임포트합니다. 실패하면 모의 구현을 반환합니다."""
+    metis_path = os.path.join(amphion_root, 'models', 'tts', 'metis', 'metis.py')
+    util_path = os.path.join(amphion_root, 'utils', 'util.py')
+
+    _ensure_sys_path()
+    if AMPHION_DEBUG:
+        _log_diagnostics(metis_path, util_path)
+
+    # 방법 1: 파일 경로로 직접 임포트
+    if os.path.exists(metis_path) and os.path.exists(util_path):
+        try:
+            spec = importlib.util.spec_from_file_location("Metis", metis_path)
+            metis_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(metis_module)
+
+            spec = importlib.util.spec_from_file_location("load_config", util_path)
+            util_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(util_module)
+
+            logger.info("Amphion 모듈 직접 임포트 성공")
+            return metis_module.Metis, util_module.load_config
+        except Exception as e:
+            logger.error(f"직접 임포트 실패: {e}")
+    else:
+        logger.error(f"Amphion Metis 모듈 파일을 찾을 수 없습니다: {metis_path}")
+
+    # 방법 2: 표준 방식 (Amphion 패키지) 임포트
+    try:
+        from Amphion.models.tts.metis.metis import Metis
+        from Amphion.utils.util import load_config
+        logger.info("Amphion 모듈 표준 방식 임포트 성공")
+        return Metis, load_config
+    except Exception as e:
+        logger.error(f"표준 방식 임포트 실패: {e}")
+
+    logger.warning("두 가지 임포트 방법 모두 실패. 최소 기능 모의 클래스를 사용합니다.")
+    return MockMetis, mock_load_config
+
+
+def load_amphion() -> Tuple[Callable[..., Any], Callable[[str], Any]]:
+    """(Metis 클래스, load_config 함수)를 반환합니다. 임포트는 프로세스당 한 번만 수행됩니다."""
+    global _loaded
+    if _loaded is None:
+        with _lock:
+            if _loaded is None:
+                _loaded = _import_amphion()
+    return _loaded
@@ -0,0 +1,386 @@
+"""
+오디오 업로드 스트리밍 디코딩 모듈
+
+multipart/form-data 요청 본문을 받는 대로 파싱하여 오디오 파트를 조각 단위로 디코더 스레드에 넘기고,
+업로드가 진행되는 동안 16kHz 모노로 디코딩/리샘플링합니다 (TTS 참조 음성처럼 다른 샘플 레이트가 필요하면 지정).
+업로드 전체를 하나의 bytes 객체로 메모리에 올리지 않으며, 크기/길이 제한을 넘으면 업로드 도중에 거절합니다.
+
+- Content-Length가 UPLOAD_MAX_MB를 넘으면 본문을 읽기 전에 거절
+- 받은 바이트 수가 UPLOAD_MAX_MB를 넘거나 디코딩한 길이가 UPLOAD_MAX_AUDIO_SECONDS를 넘으면 즉시 거절
+- 파일 끝에 인덱스가 있어 탐색이 필요한 MP4/M4A는 임시 파일(1MB 초과 시 디스크)에 받은 뒤 디코딩
+
+환경 변수:
+    UPLOAD_MAX_MB: 오디오 업로드 최대 크기 (기본 25MB)
+    UPLOAD_MAX_AUDIO_SECONDS: 디코딩된 오디오 최대 길이 (기본 1800초)
+"""
+
+import os
+import time
+import queue
+import asyncio
+import logging
+import tempfile
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+from services.metrics_service import observe_stage
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+UPLOAD_MAX_MB = float(os.getenv("UPLOAD_MAX_MB", "25"))
+UPLOAD_MAX_AUDIO_SECONDS = float(os.getenv("UPLOAD_MAX_AUDIO_SECONDS", "1800"))
+
+SAMPLE_RATE = 16000
+# 디코더 스레드로 넘기는 대기열 길이 (조각 수, 업로드가 디코딩보다 빠를 때의 메모리 상한)
+DECODE_QUEUE_CHUNKS = 16
+# 오디오 외 폼 필드 전체 최대 크기
+MAX_FIELD_BYTES = 1024 * 1024
+# 탐색 없이 디코딩할 수 없는 형식의 임시 파일 메모리 한도 (넘으면 디스크로)
+SPOOL_MAX_MEMORY = 1024 * 1024
+# 형식 판별에 필요한 앞부분 바이트 수
+SNIFF_BYTES = 12
+
+
+class UploadError(ValueError):
+    """잘못된 업로드 (라우트에서 status_code로 HTTP 오류를 만듦)"""
+
+    status_code = 400
+
+
+class UploadTooLarge(UploadError):
+    """크기 또는 길이 제한을 넘은 업로드"""
+
+    status_code = 413
+
+
+def _needs_seek(head: bytes) -> bool:
+    """MP4/M4A/MOV(ISO BMFF)는 moov 박스가 끝에 있을 수 있어 탐색 가능한 입력이 필요합니다."""
+    return head[4:8] == b"ftyp"
+
+
+class _ChunkPipe:
+    """대기열에서 조각을 꺼내 읽는 파일 객체 (PyAV 입력용, 탐색 불가)"""
+
+    def __init__(self):
+        self.queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=DECODE_QUEUE_CHUNKS)
+        self._buffer = memoryview(b"")
+        self._eof = False
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._buffer and not self._eof:
+            item = self.queue.get()
+            if item is None:
+                self._eof = True
+            else:
+                self._buffer = memoryview(item)
+        if size < 0 or size >= len(self._buffer):
+            data, self._buffer = self._buffer, memoryview(b"")
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return bytes(data)
+
+    def seekable(self) -> bool:
+        return False
+
+
+def _decode_stream(file_obj, max_samples: int, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """PyAV로 오디오를 모노로 디코딩합니다 (faster_whisper.audio.decode_audio와 같은 변환).
+
+    프레임을 디코딩하는 대로 sample_rate로 리샘플링하고, 길이가 max_samples를 넘으면 바로 중단합니다.
+    """
+    import av
+
+    pieces: List[np.ndarray] = []
+    total = 0
+    resampler = av.audio.resampler.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+    try:
+        with av.open(file_obj, mode="r", metadata_errors="ignore") as container:
+            frames = container.decode(audio=0)
+            try:
+                for frame in frames:
+                    for resampled in resampler.resample(frame):
+                        array = resampled.to_ndarray().reshape(-1)
+                        total += len(array)
+                        if total > max_samples:
+                            raise UploadTooLarge(f"오디오가 너무 깁니다 (최대 {max_samples / sample_rate:.0f}초)")
+                        pieces.append(array)
+            except av.error.InvalidDataError:
+                # faster_whisper와 마찬가지로 끝부분의 손상된 프레임은 무시
+                pass
+            for resampled in resampler.resample(None):
+                pieces.append(resampled.to_ndarray().reshape(-1))
+    except UploadTooLarge:
+        raise
+    except av.error.FFmpegError as e:
+        raise UploadError(f"오디오를 디코딩할 수 없습니다: {e}") from e
+
+    if not pieces:
+        return np.zeros(0, dtype=np.float32)
+    audio = np.concatenate(pieces)[:max_samples]
+    return audio.astype(np.float32) / 32768.0
+
+
+def decode_audio_file(file_obj, max_seconds: float = UPLOAD_MAX_AUDIO_SECONDS, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """탐색 가능한 파일 객체의 오디오를 모노 float32로 디코딩합니다 (블로킹, 스레드에서 호출, 기본 16kHz).
+
+    PyAV가 없으면(모의 환경 등) faster_whisper 디코더로 디코딩한 뒤 길이를 검사합니다.
+
+    Raises:
+        UploadTooLarge: 디코딩한 길이가 max_seconds를 넘음
+        UploadError: 디코딩 실패
+    """
+    max_samples = int(max_seconds * sample_rate)
+    try:
+        return _decode_stream(file_obj, max_samples, sample_rate)
+    except ImportError:
+        from faster_whisper.audio import decode_audio
+
+        audio = decode_audio(file_obj, sampling_rate=sample_rate)
+        if len(audio) > max_samples:
+            raise UploadTooLarge(f"오디오가 너무 깁니다 (최대 {max_samples / sample_rate:.0f}초)")
+        return audio
+
+
+class StreamingAudioDecoder:
+    """업로드 조각을 받는 대로 디코딩하는 디코더
+
+    `feed()`로 조각을 넘기고 `finish()`로 디코딩 결과를 받습니다.
+    PyAV가 없으면(모의 환경 등) 임시 파일에 받은 뒤 faster_whisper 디코더로 디코딩합니다.
+    """
+
+    def __init__(self, max_seconds: float = UPLOAD_MAX_AUDIO_SECONDS, model_label: str = "", sample_rate: int = SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.max_samples = int(max_seconds * sample_rate)
+        self.model_label = model_label
+        self.bytes_received = 0
+        self._head = b""
+        self._pipe: Optional[_ChunkPipe] = None
+        self._spool = None
+        self._future: Optional[Future] = None
+
+    def _start(self, head: bytes) -> None:
+        """앞부분으로 형식을 판별하여 스트리밍 디코딩 또는 임시 파일 방식을 고릅니다."""
+        try:
+            import av  # noqa: F401
+            streaming = not _needs_seek(head)
+        except ImportError:
+            streaming = False
+
+        if not streaming:
+            self._spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+            self._spool.write(head)
+            return
+
+        self._pipe = _ChunkPipe()
+        self._future = Future()
+
+        def run():
+            try:
+                self._future.set_result(_decode_stream(self._pipe, self.max_samples, self.sample_rate))
+            except BaseException as e:
+                self._future.set_exception(e)
+
+        threading.Thread(target=run, name="upload-decode", daemon=True).start()
+        self._put(head)
+
+    def _put(self, data: Optional[bytes]) -> None:
+        """디코더 대기열에 넣습니다 (가득 차면 디코더가 비울 때까지 대기, 디코더가 끝났으면 중단)."""
+        while not self._future.done():
+            try:
+                self._pipe.queue.put(data, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        # 디코더가 먼저 끝났으면 (길이 초과, 디코딩 실패) 그 오류를 바로 전달
+        if self._future.exception() is not None:
+            raise self._future.exception()
+
+    async def feed(self, data: bytes) -> None:
+        """업로드 조각 하나를 디코더에 넘깁니다."""
+        if not data:
+            return
+        self.bytes_received += len(data)
+        if self._pipe is None and self._spool is None:
+            self._head += data
+            if len(self._head) < SNIFF_BYTES:
+                return
+            head, self._head = self._head, b""
+            self._start(head)
+            return
+        if self._spool is not None:
+            self._spool.write(data)
+            return
+        try:
+            self._pipe.queue.put_nowait(data)
+        except queue.Full:
+            await asyncio.to_thread(self._put, data)
+        if self._future.done() and self._future.exception() is not None:
+            raise self._future.exception()
+
+    async def finish(self) -> np.ndarray:
+        """업로드가 끝난 뒤 남은 디코딩을 마치고 모노 float32 오디오(sample_rate)를 반환합니다."""
+        start = time.perf_counter()
+        if self._pipe is None and self._spool is None:
+            if not self._head:
+                raise UploadError("오디오 파일이 비어 있습니다")
+            self._start(self._head)
+            self._head = b""
+
+        if self._spool is not None:
+            audio = await asyncio.to_thread(self._decode_spool)
+        else:
+            await asyncio.to_thread(self._put, None)
+            audio = await asyncio.wrap_future(self._future)
+        # 업로드 완료 후 추가로 걸린 디코딩 시간
+        observe_stage("audio_decode", time.perf_counter() - start, self.model_label)
+        return audio
+
+    def _decode_spool(self) -> np.ndarray:
+        self._spool.seek(0)
+        try:
+            return decode_audio_file(self._spool, self.max_samples / self.sample_rate, self.sample_rate)
+        finally:
+            self._spool.close()
+
+    def close(self) -> None:
+        """중단된 업로드의 디코더 스레드와 임시 파일을 정리합니다."""
+        if self._pipe is not None and not self._future.done():
+            try:
+                self._pipe.queue.put_nowait(None)
+            except queue.Full:
+                # 대기열을 비워 디코더가 EOF를 읽을 수 있게 함
+                while True:
+                    try:
+                        self._pipe.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                self._pipe.queue.put_nowait(None)
+        if self._spool is not None:
+            self._spool.close()
+
+
+async def read_audio_form(
+    request,
+    field: str = "audio",
+    max_bytes: int = int(UPLOAD_MAX_MB * 1024 * 1024),
+    max_seconds: float = UPLOAD_MAX_AUDIO_SECONDS,
+    model_label: str = "",
+    sample_rate: int = SAMPLE_RATE,
+) -> Tuple[np.ndarray, Dict[str, str]]:
+    """multipart/form-data 요청을 스트리밍으로 읽어 오디오를 디코딩하고 나머지 폼 필드를 반환합니다.
+
+    Args:
+        request: FastAPI Request
+        field: 오디오 파일 필드 이름
+        max_bytes: 요청 본문 최대 크기
+        max_seconds: 디코딩된 오디오 최대 길이 (초)
+        model_label: 디코딩 시간 메트릭 라벨
+        sample_rate: 디코딩할 샘플 레이트 (기본 16kHz, STT 입력)
+
+    Returns:
+        Tuple[np.ndarray, Dict[str, str]]: (sample_rate 모노 float32 오디오, 폼 필드)
+
+    Raises:
+        UploadTooLarge: 크기 또는 길이 제한 초과 (413)
+        UploadError: multipart 형식 오류, 오디오 필드 없음, 디코딩 실패 (400)
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MAX_FIELD_BYTES:
+        raise UploadTooLarge(f"업로드가 너무 큽니다 (최대 {max_bytes / 1024 / 1024:g}MB)")
+
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadError("multipart/form-data 요청이 필요합니다")
+
+    decoder = StreamingAudioDecoder(max_seconds, model_label, sample_rate)
+    fields: Dict[str, str] = {}
+    field_bytes = 0
+    found_audio = False
+
+    # 파서 콜백은 동기이므로 이벤트를 모아 두었다가 조각마다 처리
+    events: List[Tuple[str, bytes]] = []
+    header_field = bytearray()
+    header_value = bytearray()
+    headers: Dict[bytes, bytes] = {}
+
+    def on_header_end():
+        headers[bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(headers.get(b"content-disposition", b""))
+        events.append(("part", disposition.get(b"name", b"")))
+        headers.clear()
+
+    parser = MultipartParser(boundary, {
+        "on_header_field": lambda data, start, end: header_field.extend(data[start:end]),
+        "on_header_value": lambda data, start, end: header_value.extend(data[start:end]),
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": lambda data, start, end: events.append(("data", bytes(data[start:end]))),
+    })
+
+    received = 0
+    current = b""
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes + MAX_FIELD_BYTES or decoder.bytes_received > max_bytes:
+                raise UploadTooLarge(f"업로드가 너무 큽니다 (최대 {max_bytes / 1024 / 1024:g}MB)")
+            parser.write(chunk)
+            for kind, value in events:
+                if kind == "part":
+                    current = value
+                    found_audio = found_audio or current == field.encode()
+                    if current != field.encode():
+                        fields.setdefault(current.decode("utf-8", "replace"), "")
+                elif current == field.encode():
+                    await decoder.feed(value)
+                else:
+                    field_bytes += len(value)
+                    if field_bytes > MAX_FIELD_BYTES:
+                        raise UploadTooLarge("폼 필드가 너무 큽니다")
+                    name = current.decode("utf-8", "replace")
+                    fields[name] += value.decode("utf-8", "replace")
+            events.clear()
+        parser.finalize()
+
+        if decoder.bytes_received > max_bytes:
+            raise UploadTooLarge(f"업로드가 너무 큽니다 (최대 {max_bytes / 1024 / 1024:g}MB)")
+        if not found_audio:
+            raise UploadError(f"'{field}' 파일 필드가 없습니다")
+        audio = await decoder.finish()
+    except BaseException:
+        decoder.close()
+        raise
+    return audio, fields
+
+
+def audio_form_openapi(**fields: str) -> Dict[str, object]:
+    """스트리밍으로 읽는 오디오 업로드 라우트의 OpenAPI 요청 본문 스키마 (문서화용)
+
+    Args:
+        **fields: 오디오 외 폼 필드 이름과 설명
+
+    Returns:
+        dict: 라우트 데코레이터의 openapi_extra 값
+    """
+    properties = {"audio": {"type": "string", "format": "binary", "description": "음성 파일"}}
+    properties.update({name: {"type": "string", "description": description} for name, description in fields.items()})
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"multipart/form-data": {"schema": {"type": "object", "properties": properties, "required": ["audio"]}}},
+        }
+    }
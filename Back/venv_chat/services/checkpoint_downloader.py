@@ -0,0 +1,335 @@
+"""
+체크포인트 다운로더 모듈
+
+매니페스트(파일 경로, 크기, sha256)를 기준으로 체크포인트 파일을 병렬로 받고,
+중단된 전송은 `.part` 파일에서 HTTP Range 요청으로 이어 받으며, 완료 후 sha256을 확인합니다.
+검증된 해시는 체크포인트 매니페스트(services.checkpoint_manager)에 고정(pin)되어 서비스 시작 시 다시 계산하지 않습니다.
+
+다운로드 출처:
+- Hugging Face Hub (HF_ENDPOINT 또는 미러 엔드포인트): 저장소 메타데이터에서 LFS sha256을 읽어 매니페스트 생성
+- 미러/로컬 HTTP 서버: `{base_url}/manifest.json`과 `{base_url}/{path}`
+
+`serve_directory()`는 Range를 지원하는 로컬 HTTP 대체 서버로, 한 노드의 pretrained 디렉토리를
+다른 노드들이 오프라인으로 빠르게 받아갈 수 있게 합니다.
+
+환경 변수:
+    CHECKPOINT_MIRROR_URL: 기본 미러 URL (매니페스트와 파일 제공)
+    HF_ENDPOINT: Hugging Face 엔드포인트 (기본 https://huggingface.co)
+"""
+
+import os
+import json
+import time
+import fnmatch
+import hashlib
+import logging
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from services import checkpoint_manager
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_MIRROR_URL = os.getenv("CHECKPOINT_MIRROR_URL", "")
+HF_ENDPOINT = os.getenv("HF_ENDPOINT", "https://huggingface.co")
+MANIFEST_NAME = "manifest.json"
+CHUNK_BYTES = 1 << 20
+USER_AGENT = "venomvoice-checkpoint-downloader/1.0"
+
+
+class DownloadError(RuntimeError):
+    """다운로드 또는 검증 실패"""
+
+
+def _hash_prefix(path: str, digest) -> int:
+    """이미 받은 부분 파일을 해시에 반영하고 크기를 반환합니다."""
+    size = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(4 << 20), b""):
+            digest.update(block)
+            size += len(block)
+    return size
+
+
+def build_hf_manifest(
+    repo_id: str,
+    revision: str = "main",
+    include: Optional[List[str]] = None,
+    endpoint: str = HF_ENDPOINT,
+) -> Dict[str, object]:
+    """Hugging Face 저장소 메타데이터로 매니페스트를 만듭니다.
+
+    LFS 파일은 sha256이 제공되며, 일반 파일(작은 설정 파일 등)은 크기만 확인합니다.
+    """
+    from huggingface_hub import HfApi
+
+    info = HfApi(endpoint=endpoint).model_info(repo_id, revision=revision, files_metadata=True)
+    files = []
+    for sibling in info.siblings:
+        if include and not any(fnmatch.fnmatch(sibling.rfilename, pattern) for pattern in include):
+            continue
+        lfs = sibling.lfs
+        files.append({
+            "path": sibling.rfilename,
+            "size": lfs.size if lfs else sibling.size,
+            "sha256": lfs.sha256 if lfs else None,
+        })
+    base_url = f"{endpoint.rstrip('/')}/{repo_id}/resolve/{info.sha or revision}"
+    return {"base_url": base_url, "files": files}
+
+
+def fetch_manifest(base_url: str, timeout: float = 30.0) -> Dict[str, object]:
+    """미러/로컬 서버의 manifest.json을 받아옵니다."""
+    url = f"{base_url.rstrip('/')}/{MANIFEST_NAME}"
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        manifest = json.loads(response.read().decode("utf-8"))
+    manifest.setdefault("base_url", base_url.rstrip("/"))
+    return manifest
+
+
+def write_manifest(directory: str, include: Optional[List[str]] = None) -> Dict[str, object]:
+    """디렉토리의 파일로 manifest.json을 생성합니다 (미러 서버 준비용).
+
+    해시는 체크포인트 매니페스트 캐시를 사용하므로 바뀌지 않은 파일은 다시 계산하지 않습니다.
+    """
+    manifest_checksums = checkpoint_manager.get_manifest()
+    files = []
+    for root, _, names in os.walk(directory):
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, directory).replace(os.sep, "/")
+            if relative == MANIFEST_NAME or name.endswith(".part"):
+                continue
+            if include and not any(fnmatch.fnmatch(relative, pattern) for pattern in include):
+                continue
+            files.append({"path": relative, "size": os.path.getsize(path), "sha256": manifest_checksums.checksum(path)})
+    manifest = {"files": files}
+    with open(os.path.join(directory, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+class CheckpointDownloader:
+    """매니페스트 기반 병렬/이어받기/검증 다운로더"""
+
+    def __init__(self, save_dir: str, workers: int = 4, retries: int = 3, timeout: float = 60.0, headers: Optional[Dict[str, str]] = None):
+        self.save_dir = os.path.abspath(save_dir)
+        self.workers = workers
+        self.retries = retries
+        self.timeout = timeout
+        self.headers = {"User-Agent": USER_AGENT, **(headers or {})}
+
+    def _target_path(self, relative: str) -> str:
+        """매니페스트의 상대 경로를 save_dir 아래의 절대 경로로 바꿉니다.
+
+        매니페스트는 미러/HTTP 서버가 주므로 그대로 믿지 않습니다.
+
+        Raises:
+            DownloadError: 절대 경로, ".." 구성 요소 등 save_dir 밖을 가리키는 경로
+        """
+        parts = relative.replace("\\", "/").split("/")
+        if not relative or relative.startswith("/") or os.path.isabs(relative) or ".." in parts:
+            raise DownloadError(f"허용되지 않는 매니페스트 경로: {relative!r}")
+        path = os.path.normpath(os.path.join(self.save_dir, *parts))
+        if path == self.save_dir or os.path.commonpath([self.save_dir, path]) != self.save_dir:
+            raise DownloadError(f"허용되지 않는 매니페스트 경로: {relative!r}")
+        return path
+
+    def _is_complete(self, path: str, entry: Dict[str, object]) -> bool:
+        """이미 받은 파일이 매니페스트와 일치하는지 확인합니다 (해시는 캐시 사용)."""
+        if not os.path.isfile(path):
+            return False
+        if entry.get("size") is not None and os.path.getsize(path) != entry["size"]:
+            return False
+        if entry.get("sha256"):
+            return checkpoint_manager.get_manifest().checksum(path) == entry["sha256"].lower()
+        return True
+
+    def _fetch_once(self, url: str, part_path: str) -> Tuple[int, str]:
+        """부분 파일에 이어서 받습니다.
+
+        Returns:
+            Tuple[int, str]: (부분 파일의 총 바이트 수, 전체 sha256)
+        """
+        digest = hashlib.sha256()
+        offset = _hash_prefix(part_path, digest) if os.path.exists(part_path) else 0
+        headers = dict(self.headers)
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and offset:
+                # 이미 끝까지 받은 상태
+                return offset, digest.hexdigest()
+            raise
+
+        with response:
+            if offset and response.status != 206:
+                # 서버가 Range를 지원하지 않으면 처음부터 다시 받음
+                logger.warning(f"Range 미지원 응답({response.status}), 처음부터 다시 받습니다: {url}")
+                digest = hashlib.sha256()
+                offset = 0
+            with open(part_path, "ab" if offset else "wb") as f:
+                for block in iter(lambda: response.read(CHUNK_BYTES), b""):
+                    f.write(block)
+                    digest.update(block)
+                    offset += len(block)
+        return offset, digest.hexdigest()
+
+    def download_file(self, base_url: str, entry: Dict[str, object]) -> Tuple[str, str]:
+        """파일 하나를 받아 검증합니다.
+
+        Returns:
+            Tuple[str, str]: (저장 경로, 상태: 'cached' 또는 'downloaded')
+
+        Raises:
+            DownloadError: save_dir 밖을 가리키는 경로, 다운로드 또는 검증 실패
+        """
+        relative = entry["path"]
+        path = self._target_path(relative)
+        if self._is_complete(path, entry):
+            if entry.get("sha256"):
+                checkpoint_manager.get_manifest().pin(path, entry["sha256"])
+            return path, "cached"
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part_path = f"{path}.part"
+        url = f"{base_url.rstrip('/')}/{urllib.parse.quote(relative)}"
+        expected_sha256 = (entry.get("sha256") or "").lower()
+
+        for attempt in range(1, self.retries + 1):
+            try:
+                start = time.perf_counter()
+                size, sha256 = self._fetch_once(url, part_path)
+            except (urllib.error.URLError, OSError) as e:
+                if attempt == self.retries:
+                    raise DownloadError(f"다운로드 실패: {relative} ({e})")
+                wait = min(30.0, 2 ** attempt)
+                logger.warning(f"다운로드 중단 ({attempt}/{self.retries}), {wait:.0f}초 후 이어받기: {relative} ({e})")
+                time.sleep(wait)
+                continue
+
+            if entry.get("size") is not None and size < entry["size"]:
+                # 연결이 조용히 끊긴 경우 이어받기
+                logger.warning(f"받은 크기 부족 ({size}/{entry['size']}), 이어받기: {relative}")
+                continue
+            if (entry.get("size") is not None and size != entry["size"]) or (expected_sha256 and sha256 != expected_sha256):
+                # 손상된 부분 파일은 버리고 처음부터 다시 받음
+                os.unlink(part_path)
+                if attempt == self.retries:
+                    raise DownloadError(f"검증 실패: {relative} (크기 {size}, sha256 {sha256[:12]}...)")
+                logger.warning(f"검증 실패, 다시 받습니다 ({attempt}/{self.retries}): {relative}")
+                continue
+
+            os.replace(part_path, path)
+            elapsed = time.perf_counter() - start
+            logger.info(f"다운로드 완료: {relative} ({size / (1024 * 1024):.1f} MB, {size / (1024 * 1024) / max(elapsed, 1e-6):.1f} MB/s)")
+            manifest = checkpoint_manager.get_manifest()
+            if expected_sha256:
+                manifest.pin(path, expected_sha256)
+            # 방금 계산한 해시를 기록하여 서비스 시작 시 다시 계산하지 않도록 함
+            manifest.record(path, sha256)
+            return path, "downloaded"
+        raise DownloadError(f"다운로드 실패: {relative} (재시도 횟수 초과)")
+
+    def download(self, manifest: Dict[str, object]) -> Dict[str, str]:
+        """매니페스트의 모든 파일을 병렬로 받습니다.
+
+        Returns:
+            Dict[str, str]: 상대 경로별 상태
+        """
+        base_url = manifest["base_url"]
+        files = manifest["files"]
+        total_mb = sum(entry.get("size") or 0 for entry in files) / (1024 * 1024)
+        logger.info(f"다운로드 시작: 파일 {len(files)}개, {total_mb:.1f} MB, 동시 {self.workers}개 ({base_url})")
+
+        results: Dict[str, str] = {}
+        errors = []
+        # 큰 파일부터 시작하여 전체 완료 시간을 줄임
+        ordered = sorted(files, key=lambda entry: -(entry.get("size") or 0))
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ckpt-download") as pool:
+            futures = {pool.submit(self.download_file, base_url, entry): entry["path"] for entry in ordered}
+            for future in as_completed(futures):
+                relative = futures[future]
+                try:
+                    _, results[relative] = future.result()
+                except DownloadError as e:
+                    errors.append(str(e))
+                    results[relative] = "failed"
+        if errors:
+            raise DownloadError("; ".join(errors))
+        return results
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Range 요청(이어받기)을 지원하는 정적 파일 핸들러"""
+
+    def send_head(self):
+        range_header = self.headers.get("Range")
+        path = self.translate_path(self.path)
+        if not range_header or not range_header.startswith("bytes=") or not os.path.isfile(path):
+            return super().send_head()
+
+        size = os.path.getsize(path)
+        start_text, sep, end_text = range_header[len("bytes="):].strip().partition("-")
+        start_text, end_text = start_text.strip(), end_text.strip()
+        if not sep or not (start_text or end_text) or not all(t.isdigit() for t in (start_text, end_text) if t):
+            # 형식이 잘못되었거나 여러 구간 요청이면 Range를 무시하고 전체 파일을 보냄
+            return super().send_head()
+        if not start_text:
+            # bytes=-N: 마지막 N바이트
+            suffix = int(end_text)
+            start = max(0, size - suffix) if suffix else size
+            end = size - 1
+        else:
+            start = int(start_text)
+            end = min(int(end_text), size - 1) if end_text else size - 1
+            if end < start and start < size:
+                return super().send_head()
+        if start >= size:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.end_headers()
+            return None
+
+        f = open(path, "rb")
+        f.seek(start)
+        self._range_remaining = end - start + 1
+        self.send_response(206)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(self._range_remaining))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        return f
+
+    def copyfile(self, source, outputfile):
+        remaining = getattr(self, "_range_remaining", None)
+        if remaining is None:
+            return super().copyfile(source, outputfile)
+        while remaining > 0:
+            block = source.read(min(CHUNK_BYTES, remaining))
+            if not block:
+                break
+            outputfile.write(block)
+            remaining -= len(block)
+        self._range_remaining = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def serve_directory(directory: str, host: str = "0.0.0.0", port: int = 8700) -> ThreadingHTTPServer:
+    """디렉토리를 Range 지원 HTTP로 제공하는 서버를 만듭니다 (serve_forever는 호출자가 실행)."""
+    handler = lambda *args, **kwargs: RangeRequestHandler(*args, directory=directory, **kwargs)
+    server = ThreadingHTTPServer((host, port), handler)
+    logger.info(f"체크포인트 미러 서버: http://{host}:{server.server_address[1]}/ ({directory})")
+    return server
@@ -0,0 +1,351 @@
+"""
+체크포인트 관리 모듈
+
+Metis 체크포인트를 복사하거나 이름을 바꾸지 않고 원래 위치의 safetensors 파일을 그대로 참조하며,
+메모리 매핑으로 텐서를 지연 로드(zero-copy)하고, 캐시된 해시 매니페스트로 무결성을 확인합니다.
+
+- 파일 형식은 확장자가 아니라 파일 내용으로 판별 (예전에 safetensors를 .pth로 복사한 파일도 지원)
+- safetensors: 헤더만 읽고 파일을 mmap하여 텐서별로 페이지가 접근될 때 읽힘 (여러 프로세스가 페이지 캐시 공유)
+- torch zip(.pth): torch.load(mmap=True)
+- 해시 매니페스트: 파일 크기/수정 시각이 같으면 sha256을 다시 계산하지 않음. 기대 해시(pin)가 있으면 불일치 시 로드 거부
+
+환경 변수:
+    METIS_CHECKPOINT: 체크포인트 경로 (지정하지 않으면 pretrained 디렉토리에서 자동 탐색)
+    CHECKPOINT_MANIFEST_PATH: 해시 매니페스트 경로 (기본 Back/venv_chat/.cache/checkpoint_manifest.json)
+    CHECKPOINT_VERIFY: "0"이면 로드 전 무결성 확인을 건너뜀 (기본 "1")
+"""
+
+import os
+import json
+import mmap
+import time
+import struct
+import hashlib
+import logging
+import threading
+import contextlib
+from typing import Dict, Iterator, List, Optional
+
+from services.amphion_loader import amphion_root
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+PRETRAINED_DIR = os.path.join(amphion_root, "pretrained")
+
+# 자동 탐색 순서 (원래 위치의 safetensors 우선, 예전 복사본은 하위 호환용)
+CHECKPOINT_CANDIDATES = (
+    os.path.join("t2s_model", "model.safetensors"),
+    "metis-korean-base.safetensors",
+    "metis-korean-base.pth",
+)
+
+METIS_CHECKPOINT = os.getenv("METIS_CHECKPOINT", "")
+CHECKPOINT_MANIFEST_PATH = os.getenv(
+    "CHECKPOINT_MANIFEST_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "checkpoint_manifest.json"),
+)
+CHECKPOINT_VERIFY = os.getenv("CHECKPOINT_VERIFY", "1") != "0"
+
+
+class CheckpointIntegrityError(RuntimeError):
+    """체크포인트 해시가 기대값과 다를 때 발생"""
+
+
+def resolve_metis_checkpoint(pretrained_dir: str = PRETRAINED_DIR) -> str:
+    """사용할 Metis 체크포인트 경로를 반환합니다 (복사/이름 변경 없이 원래 위치 참조).
+
+    후보가 모두 없으면 첫 번째 후보 경로를 반환합니다 (로드 시 경고).
+    """
+    if METIS_CHECKPOINT:
+        return os.path.abspath(METIS_CHECKPOINT)
+    for candidate in CHECKPOINT_CANDIDATES:
+        path = os.path.join(pretrained_dir, candidate)
+        if os.path.exists(path):
+            return path
+    return os.path.join(pretrained_dir, CHECKPOINT_CANDIDATES[0])
+
+
+class HashManifest:
+    """체크포인트 파일 해시 매니페스트 (JSON)
+
+    항목: {절대 경로: {"size", "mtime_ns", "sha256", "expected_sha256"(선택)}}
+    """
+
+    def __init__(self, path: str = CHECKPOINT_MANIFEST_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, object]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, object]]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(4 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def checksum(self, path: str) -> str:
+        """파일 sha256 (크기/수정 시각이 기록과 같으면 캐시된 값)"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self._lock:
+            entry = self._load().get(path)
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                return entry["sha256"]
+
+        start = time.perf_counter()
+        sha256 = self._hash_file(path)
+        logger.info(f"체크포인트 해시 계산: {os.path.basename(path)} ({time.perf_counter() - start:.1f}초)")
+        with self._lock:
+            entry = self._load().setdefault(path, {})
+            entry.update({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256})
+            self._save()
+        return sha256
+
+    def record(self, path: str, sha256: str) -> None:
+        """이미 계산한 sha256을 현재 크기/수정 시각과 함께 기록합니다 (다운로드 중 스트리밍 해시 등)."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self._lock:
+            entry = self._load().setdefault(path, {})
+            entry.update({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256.lower()})
+            self._save()
+
+    def pin(self, path: str, sha256: str) -> None:
+        """파일의 기대 해시를 기록합니다 (다운로드 매니페스트 등 신뢰할 수 있는 출처의 값)."""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._load().setdefault(path, {})["expected_sha256"] = sha256.lower()
+            self._save()
+
+    def verify(self, path: str, expected_sha256: Optional[str] = None) -> str:
+        """파일 무결성을 확인하고 sha256을 반환합니다.
+
+        Raises:
+            CheckpointIntegrityError: 기대 해시(인자 또는 기록된 pin)와 다를 때
+        """
+        sha256 = self.checksum(path)
+        with self._lock:
+            pinned = self._load().get(os.path.abspath(path), {}).get("expected_sha256")
+        expected = (expected_sha256 or pinned or "").lower()
+        if expected and sha256 != expected:
+            raise CheckpointIntegrityError(
+                f"체크포인트 해시 불일치: {path} (기대 {expected[:12]}..., 실제 {sha256[:12]}...)"
+            )
+        return sha256
+
+
+_manifest: Optional[HashManifest] = None
+_manifest_lock = threading.Lock()
+
+
+def get_manifest() -> HashManifest:
+    """프로세스 공용 해시 매니페스트를 반환합니다."""
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                _manifest = HashManifest()
+    return _manifest
+
+
+def file_checksum(path: str) -> Optional[str]:
+    """파일 sha256 (캐시 사용), 파일이 없으면 None"""
+    if not os.path.isfile(path):
+        return None
+    return get_manifest().checksum(path)
+
+
+def detect_format(path: str) -> str:
+    """파일 내용으로 형식을 판별합니다 ('safetensors', 'torch_zip', 'torch_legacy')."""
+    with open(path, "rb") as f:
+        head = f.read(9)
+    if head[:4] == b"PK\x03\x04":
+        return "torch_zip"
+    if len(head) == 9 and head[8:9] == b"{":
+        header_len = struct.unpack("<Q", head[:8])[0]
+        if 0 < header_len < os.path.getsize(path):
+            return "safetensors"
+    return "torch_legacy"
+
+
+def _safetensors_dtypes():
+    import torch
+
+    return {
+        "F64": torch.float64, "F32": torch.float32, "F16": torch.float16, "BF16": torch.bfloat16,
+        "I64": torch.int64, "I32": torch.int32, "I16": torch.int16, "I8": torch.int8,
+        "U8": torch.uint8, "BOOL": torch.bool,
+    }
+
+
+def load_safetensors_mmap(path: str) -> Dict[str, object]:
+    """safetensors 파일을 mmap하여 복사 없이 텐서 뷰를 반환합니다.
+
+    헤더만 읽고, 각 텐서의 데이터는 처음 접근될 때 페이지 단위로 읽힙니다.
+    copy-on-write 매핑이므로 텐서를 수정해도 파일은 바뀌지 않습니다.
+    """
+    import torch
+
+    dtypes = _safetensors_dtypes()
+    with open(path, "rb") as f:
+        header_len = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_len))
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    base = 8 + header_len
+
+    tensors = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = dtypes[info["dtype"]]
+        start, end = info["data_offsets"]
+        count = (end - start) // dtype.itemsize
+        if count:
+            tensor = torch.frombuffer(mapped, dtype=dtype, count=count, offset=base + start)
+        else:
+            tensor = torch.empty(0, dtype=dtype)
+        tensors[name] = tensor.view(info["shape"])
+    return tensors
+
+
+def load_state_dict(path: str, device: str = "cpu") -> Dict[str, object]:
+    """체크포인트를 형식에 맞게 mmap으로 로드합니다."""
+    import torch
+
+    file_format = detect_format(path)
+    if file_format == "safetensors":
+        state_dict = load_safetensors_mmap(path)
+    elif file_format == "torch_zip":
+        state_dict = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    else:
+        # 예전 직렬화 형식은 mmap을 지원하지 않음
+        state_dict = torch.load(path, map_location="cpu", weights_only=True)
+    if device != "cpu":
+        state_dict = {name: tensor.to(device) for name, tensor in state_dict.items()}
+    return state_dict
+
+
+def load_into(module, state_dict: Dict[str, object], strict: bool = True):
+    """state_dict를 모듈에 로드합니다.
+
+    공유(tied) 파라미터가 없으면 assign=True로 mmap 텐서를 그대로 파라미터로 사용합니다 (복사 없음).
+    공유 파라미터가 있으면 묶음이 끊어지지 않도록 기존 파라미터에 복사합니다.
+
+    Returns:
+        Tuple[List[str], List[str]]: (missing, unexpected) 키 목록
+    """
+    # 같은 저장소를 가리키는 파라미터 이름 묶음 (tied weights)
+    groups: Dict[object, List[str]] = {}
+    for name, tensor in module.state_dict().items():
+        if tensor.numel():
+            groups.setdefault((tensor.untyped_storage().data_ptr(), tensor.storage_offset()), []).append(name)
+    aliases = {name: group for group in groups.values() if len(group) > 1 for name in group}
+
+    result = module.load_state_dict(state_dict, strict=False, assign=not aliases)
+    unexpected = list(result.unexpected_keys)
+    # 공유 파라미터 중 하나만 저장된 경우 나머지 이름은 누락이 아님
+    missing = [
+        name for name in result.missing_keys
+        if not any(alias in state_dict for alias in aliases.get(name, ()))
+    ]
+    if strict and (missing or unexpected):
+        raise RuntimeError(f"체크포인트 키 불일치 (missing: {missing[:10]}, unexpected: {unexpected[:10]})")
+    return missing, unexpected
+
+
+_patch_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def mmap_loading() -> Iterator[None]:
+    """블록 안에서 safetensors/torch 체크포인트 로드를 mmap 로더로 바꿉니다.
+
+    Amphion의 Metis는 생성자 안에서 직접 체크포인트를 읽으므로,
+    모델 생성 동안만 `safetensors.torch.load_file/load_model`과 `torch.load`를 감쌉니다.
+    """
+    import torch
+
+    try:
+        import safetensors.torch as st
+    except ImportError:
+        st = None
+
+    original_torch_load = torch.load
+
+    def torch_load(f, *args, **kwargs):
+        if isinstance(f, (str, os.PathLike)) and os.path.isfile(f):
+            file_format = detect_format(os.fspath(f))
+            if file_format == "safetensors":
+                # safetensors 파일이 .pth 이름으로 전달된 경우 (예전 복사본)
+                return load_safetensors_mmap(os.fspath(f))
+            if file_format == "torch_zip":
+                kwargs.setdefault("mmap", True)
+        return original_torch_load(f, *args, **kwargs)
+
+    def load_file(filename, device="cpu"):
+        return load_state_dict(os.fspath(filename), device=str(device))
+
+    def load_model(model, filename, strict=True, device="cpu"):
+        return load_into(model, load_state_dict(os.fspath(filename), device=str(device)), strict=strict)
+
+    with _patch_lock:
+        torch.load = torch_load
+        if st is not None:
+            original_load_file, original_load_model = st.load_file, st.load_model
+            st.load_file, st.load_model = load_file, load_model
+        try:
+            yield
+        finally:
+            torch.load = original_torch_load
+            if st is not None:
+                st.load_file, st.load_model = original_load_file, original_load_model
+
+
+def verify_checkpoint(path: str, expected_sha256: Optional[str] = None) -> Optional[str]:
+    """CHECKPOINT_VERIFY가 켜져 있으면 무결성을 확인합니다 (파일이 없으면 None)."""
+    if not CHECKPOINT_VERIFY or not os.path.isfile(path):
+        return None
+    return get_manifest().verify(path, expected_sha256)
+
+
+def describe(path: str) -> Dict[str, object]:
+    """체크포인트 정보 (형식, 크기, 텐서 수)"""
+    info = {"path": path, "exists": os.path.isfile(path)}
+    if not info["exists"]:
+        return info
+    info["format"] = detect_format(path)
+    info["size_mb"] = round(os.path.getsize(path) / (1024 * 1024), 2)
+    if info["format"] == "safetensors":
+        with open(path, "rb") as f:
+            header_len = struct.unpack("<Q", f.read(8))[0]
+            header = json.loads(f.read(header_len))
+        info["tensors"] = len([name for name in header if name != "__metadata__"])
+    return info
+
+
+def list_checkpoint_files(directory: str) -> List[str]:
+    """디렉토리 아래의 체크포인트 파일 목록"""
+    found = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith((".safetensors", ".pth", ".bin", ".pt")):
+                found.append(os.path.join(root, name))
+    return sorted(found)
@@ -0,0 +1,351 @@
+"""
+DeepSeek API 클라이언트 모듈
+
+연결 풀을 공유하는 requests.Session으로 DeepSeek API를 호출하며, 꼬리 지연을 줄이기 위해
+호출자의 지연 예산에서 마감 시각을 정하고 그 안에서 헤지 요청과 재시도를 수행합니다.
+
+- 마감: 호출자가 준 예산(초)과 DEEPSEEK_TIMEOUT_SECONDS 중 작은 값. 각 시도의 타임아웃은 남은 시간
+- 헤지: 첫 바이트(응답 헤더)가 최근 첫 바이트 지연의 DEEPSEEK_HEDGE_PERCENTILE 백분위 안에 오지 않으면
+  같은 요청을 하나 더 보내고, 먼저 응답한 쪽을 쓰고 나머지는 취소 (응답이 오는 즉시 연결을 닫음)
+- 재시도: 연결 오류, 429, 5xx는 지터를 준 지수 백오프로 재시도하되 마감을 넘기지 않음
+- 스트리밍: 마감/헤지/재시도는 첫 바이트까지만 적용하고, 이후 SSE 청크는 네트워크에서 읽는 대로 전달
+
+환경 변수:
+    DEEPSEEK_API_URL: API 주소 (로컬 대체 서버나 프록시 지정 가능)
+    DEEPSEEK_TIMEOUT_SECONDS: 예산이 없을 때와 예산의 최대 마감 (기본 30초)
+    DEEPSEEK_POOL_SIZE: 연결 풀 크기 (기본 16)
+    DEEPSEEK_HEDGE: "0"이면 헤지 요청을 보내지 않음 (기본 "1")
+    DEEPSEEK_HEDGE_PERCENTILE: 헤지 기준 첫 바이트 지연 백분위 (기본 0.95)
+    DEEPSEEK_HEDGE_DELAY_SECONDS: 표본이 부족할 때 헤지 대기 시간 (기본 2.0초)
+    DEEPSEEK_HEDGE_MIN_DELAY_SECONDS: 헤지 대기 시간 하한 (기본 0.2초)
+    DEEPSEEK_MAX_RETRIES: 재시도 횟수 (기본 2)
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from services.load_controller import LatencyWindow
+from services.metrics_service import Counter, observe_stage, registry
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+DEEPSEEK_API_URL = os.getenv("DEEPSEEK_API_URL", "https://api.deepseek.com/v1/chat/completions")
+DEEPSEEK_MODEL = "deepseek-chat"
+DEEPSEEK_TIMEOUT_SECONDS = float(os.getenv("DEEPSEEK_TIMEOUT_SECONDS", "30"))
+DEEPSEEK_POOL_SIZE = int(os.getenv("DEEPSEEK_POOL_SIZE", "16"))
+DEEPSEEK_HEDGE = os.getenv("DEEPSEEK_HEDGE", "1") != "0"
+DEEPSEEK_HEDGE_PERCENTILE = float(os.getenv("DEEPSEEK_HEDGE_PERCENTILE", "0.95"))
+DEEPSEEK_HEDGE_DELAY_SECONDS = float(os.getenv("DEEPSEEK_HEDGE_DELAY_SECONDS", "2.0"))
+DEEPSEEK_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("DEEPSEEK_HEDGE_MIN_DELAY_SECONDS", "0.2"))
+DEEPSEEK_MAX_RETRIES = int(os.getenv("DEEPSEEK_MAX_RETRIES", "2"))
+
+# 백분위를 믿을 수 있는 최소 첫 바이트 표본 수
+HEDGE_MIN_SAMPLES = 20
+# 첫 바이트 지연 표본 보관 구간 (초)
+FIRST_BYTE_WINDOW_SECONDS = 300.0
+# 재시도 백오프 (초): 시도 n마다 uniform(0, min(최대, 기본 * 2**n))
+RETRY_BACKOFF_BASE = 0.2
+RETRY_BACKOFF_MAX = 2.0
+# 남은 시간이 이보다 짧으면 재시도/헤지를 보내지 않음 (초)
+MIN_ATTEMPT_SECONDS = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# 스트리밍 응답을 한 번에 읽는 최대 바이트 (도착한 만큼만 읽으므로 토큰을 모아 두지 않음)
+STREAM_READ_BYTES = 8192
+
+# 시도 결과 (kind: primary/hedge/retry, outcome: win/cancelled/error)
+DEEPSEEK_ATTEMPTS = registry.register(Counter(
+    "deepseek_attempts_total",
+    "DeepSeek HTTP attempts by kind and outcome",
+    ("kind", "outcome"),
+))
+
+
+class DeepSeekError(Exception):
+    """DeepSeek 호출 실패 (status_code는 라우트가 돌려줄 HTTP 상태)"""
+
+    def __init__(self, message: str, status_code: int = 502, retryable: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
+
+class DeepSeekTimeout(DeepSeekError):
+    """마감 안에 응답을 받지 못함"""
+
+    def __init__(self, message: str):
+        super().__init__(message, status_code=504)
+
+
+class DeepSeekClient:
+    """연결 풀을 공유하는 DeepSeek 클라이언트 (헤지/재시도/마감 적용)"""
+
+    def __init__(
+        self,
+        url: str = DEEPSEEK_API_URL,
+        pool_size: int = DEEPSEEK_POOL_SIZE,
+        hedge: bool = DEEPSEEK_HEDGE,
+        max_retries: int = DEEPSEEK_MAX_RETRIES,
+    ):
+        self.url = url
+        self.hedge = hedge
+        self.max_retries = max_retries
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # 취소된 시도도 응답이 올 때까지 스레드를 차지하므로 기본 실행기와 분리 (헤지 여유분 포함)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size * 2, thread_name_prefix="deepseek")
+        self.first_byte = LatencyWindow(FIRST_BYTE_WINDOW_SECONDS)
+        self._samples = 0
+        self._rng = random.Random()
+
+    def close(self) -> None:
+        """연결 풀과 스레드를 정리합니다 (진행 중인 시도는 기다리지 않음)."""
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def hedge_delay(self) -> float:
+        """헤지 요청을 보내기 전 기다릴 시간 (최근 첫 바이트 지연 백분위)"""
+        delay = self.first_byte.percentile(DEEPSEEK_HEDGE_PERCENTILE) if self._samples >= HEDGE_MIN_SAMPLES else None
+        if delay is None:
+            delay = DEEPSEEK_HEDGE_DELAY_SECONDS
+        return max(DEEPSEEK_HEDGE_MIN_DELAY_SECONDS, delay)
+
+    def _open(self, headers: Dict[str, str], payload: Dict[str, Any], timeout: float) -> requests.Response:
+        """요청을 보내고 응답 헤더를 받으면 반환합니다 (본문은 읽지 않음, 실행기 스레드에서 호출)."""
+        start = time.perf_counter()
+        response = self.session.post(self.url, headers=headers, json=payload, timeout=timeout, stream=True)
+        elapsed = time.perf_counter() - start
+        self.first_byte.observe(elapsed)
+        self._samples += 1
+        return response
+
+    async def _attempt(self, headers, payload, deadline: float, first_byte: asyncio.Event, stream: bool):
+        """시도 하나: 헤더를 받으면 first_byte를 알리고, 스트리밍이 아니면 본문까지 읽어 JSON을 반환합니다.
+
+        취소되면 응답 헤더가 도착하는 즉시 연결을 닫습니다.
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeepSeekTimeout("DeepSeek 응답 마감 초과")
+        future = asyncio.get_running_loop().run_in_executor(self._executor, self._open, headers, payload, remaining)
+        try:
+            response = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(_close_response)
+            raise
+        except requests.exceptions.Timeout as e:
+            raise DeepSeekTimeout(f"DeepSeek 응답 마감 초과: {e}")
+        except requests.exceptions.RequestException as e:
+            raise DeepSeekError(f"DeepSeek API 호출 실패: {e}", retryable=True)
+        first_byte.set()
+
+        if response.status_code >= 400:
+            response.close()
+            raise DeepSeekError(
+                f"DeepSeek API 오류: HTTP {response.status_code}",
+                status_code=502,
+                retryable=response.status_code in RETRY_STATUS_CODES,
+            )
+        if stream:
+            return response
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, _read_json, response)
+        except asyncio.CancelledError:
+            response.close()
+            raise
+
+    async def _hedged(self, headers, payload, deadline: float, stream: bool, kind: str):
+        """헤지를 포함한 시도 한 번: 먼저 성공한 응답을 반환하고 나머지를 취소합니다."""
+        first_byte = asyncio.Event()
+        tasks = {asyncio.create_task(self._attempt(headers, payload, deadline, first_byte, stream)): kind}
+        hedge_delay = self.hedge_delay()
+        winner = None
+        try:
+            if self.hedge and deadline - time.monotonic() > hedge_delay + MIN_ATTEMPT_SECONDS:
+                waiter = asyncio.create_task(first_byte.wait())
+                try:
+                    await asyncio.wait({waiter, *tasks}, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    waiter.cancel()
+                if not first_byte.is_set() and not any(task.done() for task in tasks):
+                    logger.info(f"DeepSeek 첫 바이트가 {hedge_delay:.2f}초 안에 오지 않아 헤지 요청 전송")
+                    tasks[asyncio.create_task(self._attempt(headers, payload, deadline, first_byte, stream))] = "hedge"
+
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                remaining = deadline - time.monotonic()
+                done, pending = await asyncio.wait(pending, timeout=max(0.0, remaining), return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise DeepSeekTimeout("DeepSeek 응답 마감 초과")
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        DEEPSEEK_ATTEMPTS.inc(kind=tasks[task], outcome="win")
+                        return task.result()
+                    DEEPSEEK_ATTEMPTS.inc(kind=tasks[task], outcome="error")
+                    error = task.exception()
+            raise error
+        finally:
+            for task, task_kind in tasks.items():
+                if not task.done():
+                    task.cancel()
+                    DEEPSEEK_ATTEMPTS.inc(kind=task_kind, outcome="cancelled")
+                elif task is not winner and not task.cancelled() and task.exception() is None:
+                    # 같은 순간에 끝난 다른 스트리밍 응답은 닫음
+                    result = task.result()
+                    if isinstance(result, requests.Response):
+                        result.close()
+
+    async def request(self, api_key: str, payload: Dict[str, Any], budget: Optional[float] = None, stream: bool = False):
+        """마감 안에서 헤지/재시도하며 요청합니다.
+
+        Args:
+            api_key: DeepSeek API 키
+            payload: chat/completions 요청 본문
+            budget: 호출자의 지연 예산 (초, None이면 DEEPSEEK_TIMEOUT_SECONDS)
+            stream: True면 본문을 읽지 않은 응답(requests.Response)을 반환 (호출자가 닫아야 함)
+
+        Returns:
+            dict 또는 requests.Response
+
+        Raises:
+            DeepSeekTimeout: 마감 초과 (504)
+            DeepSeekError: 재시도 후에도 실패 (502)
+        """
+        budget = min(budget, DEEPSEEK_TIMEOUT_SECONDS) if budget else DEEPSEEK_TIMEOUT_SECONDS
+        deadline = time.monotonic() + budget
+        headers = {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                result = await self._hedged(headers, payload, deadline, stream, "primary" if attempt == 0 else "retry")
+                observe_stage("deepseek_first_byte" if stream else "deepseek_roundtrip", time.perf_counter() - start, DEEPSEEK_MODEL)
+                return result
+            except DeepSeekTimeout:
+                raise
+            except DeepSeekError as e:
+                remaining = deadline - time.monotonic()
+                backoff = self._rng.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
+                if not e.retryable or attempt >= self.max_retries or remaining - backoff < MIN_ATTEMPT_SECONDS:
+                    raise
+                attempt += 1
+                logger.warning(f"DeepSeek 재시도 {attempt}/{self.max_retries} ({backoff:.2f}초 후): {e}")
+                await asyncio.sleep(backoff)
+
+    async def stream(self, api_key: str, payload: Dict[str, Any], budget: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """스트리밍 요청을 보내고 SSE 청크(JSON)를 도착하는 대로 내보냅니다.
+
+        응답 헤더까지는 request()와 같이 마감 안에서 헤지/재시도하고, 본문은 읽기마다
+        남은 예산과 같은 타임아웃을 적용합니다 (전체 생성 시간은 제한하지 않음).
+        중간에 닫으면 (클라이언트 연결 끊김 등) 업스트림 연결도 닫아 생성을 멈춥니다.
+
+        Raises:
+            DeepSeekTimeout: 첫 바이트 마감 초과 (504)
+            DeepSeekError: 호출 또는 수신 실패, [DONE] 전에 스트림이 끊김 (502)
+        """
+        response = await self.request(api_key, {**payload, "stream": True}, budget, stream=True)
+        loop = asyncio.get_running_loop()
+        reads = _read_events(response)
+        try:
+            while True:
+                try:
+                    events = await loop.run_in_executor(self._executor, next, reads, None)
+                except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, OSError) as e:
+                    raise DeepSeekError(f"DeepSeek 스트림 수신 실패: {e}")
+                if events is None:
+                    return
+                for event in events:
+                    yield event
+        finally:
+            response.close()
+
+
+def _read_json(response: requests.Response) -> Dict[str, Any]:
+    try:
+        return response.json()
+    except ValueError as e:
+        raise DeepSeekError(f"DeepSeek 응답 파싱 실패: {e}")
+    finally:
+        response.close()
+
+
+def _read_chunks(response: requests.Response) -> Iterator[bytes]:
+    """도착한 바이트를 바로 돌려줍니다 (iter_content는 청크 인코딩이 아니면 chunk_size만큼 모을 때까지 막힘)."""
+    read1 = getattr(response.raw, "read1", None)
+    if read1 is None:
+        # urllib3 1.x: 청크 인코딩 응답은 HTTP 청크 단위로 돌려줌
+        yield from response.iter_content(chunk_size=None)
+        return
+    while True:
+        data = read1(STREAM_READ_BYTES, decode_content=True)
+        if not data:
+            return
+        yield data
+
+
+def _read_events(response: requests.Response) -> Iterator[List[Dict[str, Any]]]:
+    """네트워크 읽기 한 번마다 그 사이 완성된 SSE data 청크들을 파싱해 돌려줍니다 ([DONE]에서 종료).
+
+    Raises:
+        DeepSeekError: [DONE]도 finish_reason도 없이 스트림이 끝남 (연결 끊김 등으로 잘린 생성)
+    """
+    buffer = b""
+    finished = False
+    for data in _read_chunks(response):
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        events = []
+        for line in lines:
+            line = line.strip()
+            if not line.startswith(b"data:"):
+                continue
+            body = line[5:].strip()
+            if body == b"[DONE]":
+                if events:
+                    yield events
+                return
+            try:
+                event = json.loads(body)
+            except ValueError as e:
+                raise DeepSeekError(f"DeepSeek 스트림 파싱 실패: {e}")
+            finished = finished or any(choice.get("finish_reason") for choice in event.get("choices") or [])
+            events.append(event)
+        if events:
+            yield events
+    if not finished:
+        raise DeepSeekError("DeepSeek 스트림이 [DONE] 전에 끊어졌습니다 (stream ended before [DONE])")
+
+
+def _close_response(future) -> None:
+    """취소된 시도의 응답이 도착하면 연결을 닫습니다 (업스트림 생성 중단)."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+_client: Optional[DeepSeekClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> DeepSeekClient:
+    """프로세스 공용 DeepSeek 클라이언트를 반환합니다."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = DeepSeekClient()
+    return _client
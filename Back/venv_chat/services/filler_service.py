@@ -0,0 +1,197 @@
+"""
+응답 대기용 필러/맞장구 음성 모듈
+
+"네, 잠시만요.", "음..." 같은 짧은 문구를 현재 프롬프트 음성으로 미리 합성해 인코딩된 WAV 바이트로
+메모리에 올려 두고, 음성 대화 파이프라인이 STT와 DeepSeek 응답을 기다리는 동안 바로 보낼 수 있게 합니다.
+합성 결과는 디스크에 캐시하여 재시작 시 다시 합성하지 않습니다 (프롬프트 음성/문구가 바뀌면 키가 달라짐).
+
+환경 변수:
+    VOICE_FILLER_MODE: 필러 사용 시점
+        - "off": 사용하지 않음
+        - "always": 요청을 받으면 바로 전송
+        - "delayed": 응답 준비가 VOICE_FILLER_DELAY_MS보다 오래 걸릴 때만 전송 (기본)
+    VOICE_FILLER_DELAY_MS: delayed 모드 대기 시간 (기본 700ms)
+    VOICE_FILLER_PHRASES: 문구 목록 ("|" 구분, 기본값은 FILLER_PHRASES)
+    VOICE_FILLER_CACHE_DIR: 디스크 캐시 디렉토리 (기본 Back/venv_chat/.cache/fillers)
+"""
+
+import os
+import io
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import soundfile as sf
+
+from services.inference_executor import PRIORITY_BACKGROUND
+
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+FILLER_MODES = ("off", "always", "delayed")
+FILLER_PHRASES = ("네, 잠시만요.", "음...", "네, 확인해 볼게요.", "좋아요, 잠깐만요.")
+# 필러는 디스크에 캐시되어 계속 재사용되므로 부하와 관계없이 기본 품질로 합성
+FILLER_TIER = "standard"
+
+VOICE_FILLER_MODE = os.getenv("VOICE_FILLER_MODE", "delayed")
+VOICE_FILLER_DELAY_MS = float(os.getenv("VOICE_FILLER_DELAY_MS", "700"))
+VOICE_FILLER_PHRASES = tuple(
+    phrase.strip() for phrase in os.getenv("VOICE_FILLER_PHRASES", "|".join(FILLER_PHRASES)).split("|") if phrase.strip()
+)
+VOICE_FILLER_CACHE_DIR = os.getenv(
+    "VOICE_FILLER_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "fillers"),
+)
+
+if VOICE_FILLER_MODE not in FILLER_MODES:
+    logger.warning(f"알 수 없는 VOICE_FILLER_MODE: {VOICE_FILLER_MODE}, 'delayed'를 사용합니다")
+    VOICE_FILLER_MODE = "delayed"
+
+
+@dataclass
+class FillerClip:
+    """미리 합성된 필러 음성"""
+
+    text: str
+    audio_bytes: bytes
+    duration: float
+    format: str = "wav"
+
+
+def voice_key(tts_service) -> str:
+    """기본 프롬프트의 음성 지문과 모델 지문으로 디스크 캐시 키를 만듭니다 (추론 서버 모드에서는 서버가 알려준 지문)."""
+    return f"{tts_service.voice_key()}-{tts_service.model_key}"
+
+
+class FillerLibrary:
+    """필러 음성 라이브러리 (메모리 상주, 디스크 캐시)"""
+
+    def __init__(self, phrases: tuple = VOICE_FILLER_PHRASES, cache_dir: str = VOICE_FILLER_CACHE_DIR):
+        self.phrases = phrases
+        self.cache_dir = cache_dir
+        self.clips: List[FillerClip] = []
+        self.load_seconds: Optional[float] = None
+        self._next = 0
+        self._lock = threading.Lock()
+        self._loading = False
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.clips)
+
+    def _clip_path(self, key: str, phrase: str) -> str:
+        name = hashlib.sha1(phrase.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{key}-{FILLER_TIER}", f"{name}.wav")
+
+    def load(self, tts_service) -> int:
+        """문구별 음성을 디스크 캐시에서 읽거나 합성하여 메모리에 올립니다.
+
+        합성은 TTS 실행기 스레드에서 실행하여 요청 처리와 모델을 동시에 호출하지 않습니다.
+        부하 제어기가 확산 스텝을 낮춘 상태여도 FILLER_TIER 품질로 합성합니다 (낮춘 품질이 디스크에 남지 않도록).
+
+        Returns:
+            int: 준비된 필러 수
+        """
+        start = time.perf_counter()
+        if tts_service.mock_model:
+            # 모의 모델의 무음은 필러로 쓰지도, 디스크에 남기지도 않음
+            logger.warning("TTS 모델이 로드되지 않아 (모의 모델) 필러를 준비하지 않습니다")
+            self.load_seconds = round(time.perf_counter() - start, 3)
+            return 0
+        key = voice_key(tts_service)
+        clips = []
+        synthesized = 0
+        for phrase in self.phrases:
+            path = self._clip_path(key, phrase)
+            try:
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        audio_bytes = f.read()
+                    info = sf.info(io.BytesIO(audio_bytes))
+                    clips.append(FillerClip(phrase, audio_bytes, info.duration))
+                    continue
+
+                audio = tts_service.executor.submit_with_priority(
+                    PRIORITY_BACKGROUND, tts_service.synthesize, phrase, use_cache=False, tier=FILLER_TIER
+                ).result()
+                if audio is None or not np.any(audio):
+                    # 합성 실패 시 반환되는 무음은 필러로 쓰지 않음
+                    logger.warning(f"필러 합성 실패, 건너뜀: {phrase}")
+                    continue
+                buffer = io.BytesIO()
+                sf.write(buffer, audio, tts_service.sample_rate, format="WAV")
+                audio_bytes = buffer.getvalue()
+
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(audio_bytes)
+                os.replace(temp_path, path)
+                clips.append(FillerClip(phrase, audio_bytes, len(audio) / tts_service.sample_rate))
+                synthesized += 1
+            except Exception as e:
+                logger.warning(f"필러 준비 실패: {phrase} ({e})")
+
+        with self._lock:
+            self.clips = clips
+        self.load_seconds = round(time.perf_counter() - start, 3)
+        logger.info(f"필러 준비 완료: {len(clips)}개 (새로 합성 {synthesized}개, {self.load_seconds:.2f}초)")
+        return len(clips)
+
+    def load_in_background(self, tts_service) -> None:
+        """필러가 아직 없으면 백그라운드 스레드에서 준비합니다 (요청을 막지 않음, 한 번만 시도)."""
+        with self._lock:
+            if self.clips or self._loading or self.load_seconds is not None:
+                return
+            self._loading = True
+
+        def run():
+            try:
+                self.load(tts_service)
+            finally:
+                with self._lock:
+                    self._loading = False
+
+        threading.Thread(target=run, name="filler-load", daemon=True).start()
+
+    def pick(self) -> Optional[FillerClip]:
+        """필러 하나를 순서대로 돌아가며 반환합니다 (준비되지 않았으면 None)."""
+        with self._lock:
+            if not self.clips:
+                return None
+            clip = self.clips[self._next % len(self.clips)]
+            self._next += 1
+            return clip
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "mode": VOICE_FILLER_MODE,
+            "delay_ms": VOICE_FILLER_DELAY_MS,
+            "ready": self.ready,
+            "clips": [clip.text for clip in self.clips],
+            "load_seconds": self.load_seconds,
+        }
+
+
+_library: Optional[FillerLibrary] = None
+_library_lock = threading.Lock()
+
+
+def get_library() -> FillerLibrary:
+    """프로세스 공용 필러 라이브러리를 반환합니다."""
+    global _library
+    if _library is None:
+        with _library_lock:
+            if _library is None:
+                _library = FillerLibrary()
+    return _library
+
+
+def enabled(mode: Optional[str] = None) -> bool:
+    """필러 사용 여부 (mode는 요청별 모드, None이면 VOICE_FILLER_MODE)"""
+    return (mode or VOICE_FILLER_MODE) != "off" and bool(VOICE_FILLER_PHRASES)
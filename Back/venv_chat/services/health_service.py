@@ -0,0 +1,237 @@
+"""
+헬스 체크 서비스 모듈
+
+프로브(liveness/readiness)는 캐시된 상태만으로 응답하며 추론이나 외부 API 호출을 하지 않습니다.
+상태는 실제 트래픽에서 갱신됩니다.
+- 모델 로드 상태 (model_manager)
+- 컴포넌트별 마지막 성공/실패 시각 (stt, tts, deepseek)
+- 추론 큐 포화 여부
+
+실제 추론/외부 호출을 수행하는 딥 체크는 요청 시(최소 간격 제한) 또는 느린 백그라운드 주기로만 실행됩니다.
+
+환경 변수:
+    HEALTH_QUEUE_SATURATION: 이 깊이 이상이면 큐 포화로 판단 (기본 8)
+    HEALTH_DEEP_CHECK_INTERVAL: 백그라운드 딥 체크 주기 (초, 0이면 비활성화, 기본 0)
+    HEALTH_DEEP_CHECK_MIN_INTERVAL: 요청 시 딥 체크 최소 간격 (초, 기본 60)
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional
+
+from services import model_manager
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+HEALTH_QUEUE_SATURATION = int(os.getenv("HEALTH_QUEUE_SATURATION", "8"))
+HEALTH_DEEP_CHECK_INTERVAL = float(os.getenv("HEALTH_DEEP_CHECK_INTERVAL", "0"))
+HEALTH_DEEP_CHECK_MIN_INTERVAL = float(os.getenv("HEALTH_DEEP_CHECK_MIN_INTERVAL", "60"))
+
+COMPONENTS = ("stt", "tts", "deepseek")
+
+
+class ComponentHealth:
+    """컴포넌트별 마지막 성공/실패 기록"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.last_success: Optional[float] = None
+        self.last_failure: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def healthy(self) -> Optional[bool]:
+        """마지막 결과가 성공이면 True, 실패면 False, 기록이 없으면 None"""
+        if self.last_success is None and self.last_failure is None:
+            return None
+        return (self.last_success or 0.0) >= (self.last_failure or 0.0)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "healthy": self.healthy,
+            "last_success": self.last_success,
+            "last_failure": self.last_failure,
+            "last_error": self.last_error,
+        }
+
+
+_components: Dict[str, ComponentHealth] = {name: ComponentHealth(name) for name in COMPONENTS}
+_deep_lock = threading.Lock()
+_last_deep_check: Dict[str, object] = {"timestamp": None, "results": None}
+
+
+def record_success(component: str) -> None:
+    """실제 트래픽에서 성공한 호출을 기록합니다 (핫 패스, 시각만 갱신)."""
+    _components[component].last_success = time.time()
+
+
+def record_failure(component: str, error: object) -> None:
+    """실제 트래픽에서 실패한 호출을 기록합니다."""
+    health = _components[component]
+    health.last_failure = time.time()
+    health.last_error = str(error)[:500]
+
+
+def _queue_depths() -> Dict[str, int]:
+    """로드된 서비스의 추론 큐 깊이를 반환합니다 (모델을 새로 로드하지 않음)."""
+    depths = {}
+    stt_module = sys.modules.get("services.stt_service")
+    stt = getattr(stt_module, "_stt_service", None)
+    if stt is not None:
+        depths["stt"] = stt.executor.depth
+    tts_routes = sys.modules.get("routes.tts")
+    tts = getattr(tts_routes, "_tts_service", None)
+    if tts is not None:
+        depths["tts"] = tts.executor.depth
+    return depths
+
+
+def liveness() -> Dict[str, object]:
+    """프로세스 생존 여부 (항상 성공)"""
+    return {"status": "alive", "timestamp": time.time()}
+
+
+def readiness() -> Dict[str, object]:
+    """준비 상태: 모델 로드 완료 + 큐 포화 아님"""
+    models = model_manager.readiness()
+    depths = _queue_depths()
+    saturated = {name: depth for name, depth in depths.items() if depth >= HEALTH_QUEUE_SATURATION}
+    return {
+        "ready": models["ready"] and not saturated,
+        "models": models["models"],
+        "queues": {
+            "depths": depths,
+            "saturation_threshold": HEALTH_QUEUE_SATURATION,
+            "saturated": sorted(saturated),
+        },
+    }
+
+
+def summary() -> Dict[str, object]:
+    """캐시된 전체 헬스 상태"""
+    state = readiness()
+    state["components"] = {name: health.to_dict() for name, health in _components.items()}
+    state["last_deep_check"] = dict(_last_deep_check)
+    return state
+
+
+def component_status(component: str) -> Dict[str, object]:
+    """컴포넌트 하나의 캐시된 상태"""
+    return _components[component].to_dict()
+
+
+async def _deep_check_stt() -> None:
+    from services.stt_service import get_stt_service
+    service = get_stt_service()
+    await service.executor.run(
+        service._transcribe_sync,
+        model_manager._warmup_audio_bytes(model_manager.STT_WARMUP_SECONDS),
+        "ko",
+    )
+
+
+async def _deep_check_tts() -> None:
+    from routes.tts import get_tts_service
+    service = get_tts_service()
+    await service.executor.run(service.synthesize, model_manager.TTS_WARMUP_TEXT, False)
+
+
+async def _deep_check_deepseek() -> None:
+    from routes.chat import call_deepseek_api
+    await call_deepseek_api(
+        [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": "Hello, this is a test message."},
+        ],
+        temperature=0.1,
+        max_tokens=10,
+        budget=10.0,
+    )
+
+
+_DEEP_CHECKS = {
+    "stt": _deep_check_stt,
+    "tts": _deep_check_tts,
+    "deepseek": _deep_check_deepseek,
+}
+
+
+async def run_deep_checks(components=COMPONENTS, force: bool = False) -> Dict[str, object]:
+    """실제 추론/외부 호출로 딥 체크를 수행합니다.
+
+    최소 간격(HEALTH_DEEP_CHECK_MIN_INTERVAL) 안에 다시 호출되면 직전 결과를 반환합니다.
+    force는 내부 백그라운드 주기(deep_check_loop)만 사용합니다 (HTTP 요청으로는 최소 간격을 무시할 수 없음).
+    """
+    now = time.time()
+    last = _last_deep_check["timestamp"]
+    if not force and last is not None and now - last < HEALTH_DEEP_CHECK_MIN_INTERVAL and _last_deep_check["results"]:
+        cached = _last_deep_check["results"]
+        if all(name in cached for name in components):
+            return {"cached": True, "timestamp": last, "results": {name: cached[name] for name in components}}
+
+    # 동시에 여러 딥 체크가 돌지 않도록 함 (진행 중이면 캐시 반환)
+    if not _deep_lock.acquire(blocking=False):
+        return {"cached": True, "timestamp": last, "results": _last_deep_check["results"] or {}}
+    try:
+        results = {}
+        for name in components:
+            start = time.perf_counter()
+            started_at = time.time()
+            try:
+                await _DEEP_CHECKS[name]()
+                # 서비스가 오류를 삼키고 기본값(무음 등)을 반환했어도 그 사이 기록된 실패는 실패로 판단
+                health = _components[name]
+                if health.last_failure is not None and health.last_failure >= started_at:
+                    raise RuntimeError(health.last_error or "딥 체크 중 실패가 기록됨")
+                results[name] = {"ok": True, "duration_seconds": round(time.perf_counter() - start, 3)}
+                record_success(name)
+            except Exception as e:
+                results[name] = {"ok": False, "error": str(e)[:500]}
+                record_failure(name, e)
+                logger.warning(f"[{name}] 딥 체크 실패: {e}")
+        merged = dict(_last_deep_check["results"] or {})
+        merged.update(results)
+        _last_deep_check["timestamp"] = time.time()
+        _last_deep_check["results"] = merged
+        return {"cached": False, "timestamp": _last_deep_check["timestamp"], "results": results}
+    finally:
+        _deep_lock.release()
+
+
+async def deep_check_loop(interval: float = HEALTH_DEEP_CHECK_INTERVAL) -> None:
+    """느린 주기로 딥 체크를 반복합니다 (lifespan에서 태스크로 실행)."""
+    logger.info(f"백그라운드 딥 체크 시작 (주기: {interval}초)")
+    while True:
+        await asyncio.sleep(interval)
+        if not model_manager.is_ready():
+            continue
+        try:
+            await run_deep_checks(force=True)
+        except Exception as e:
+            logger.error(f"백그라운드 딥 체크 오류: {e}")
+
+
+_system_info: Optional[Dict[str, object]] = None
+
+
+def system_info() -> Dict[str, object]:
+    """장치 정보 (torch가 이미 로드된 경우에만 조회, 결과는 캐시)"""
+    global _system_info
+    if _system_info is not None:
+        return _system_info
+    torch = sys.modules.get("torch")
+    if torch is None:
+        # 프로브 때문에 torch를 임포트하지 않음 (모델 로드 후 다시 조회)
+        return {"cuda_available": None, "cuda_devices": None, "torch_version": None}
+    cuda_available = torch.cuda.is_available()
+    _system_info = {
+        "cuda_available": cuda_available,
+        "cuda_devices": torch.cuda.device_count() if cuda_available else 0,
+        "torch_version": torch.__version__,
+    }
+    return _system_info
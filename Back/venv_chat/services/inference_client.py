@@ -0,0 +1,422 @@
+"""
+추론 서버 클라이언트 모듈
+
+INFERENCE_SERVER_ADDRESS가 설정되면 API 워커는 Whisper/Metis 모델을 직접 로드하지 않고
+별도 추론 서버 프로세스(services.inference_server)에 로컬 IPC로 요청합니다.
+`uvicorn --workers N`으로 HTTP 계층을 늘려도 모델 메모리는 추론 서버 수만큼만 사용합니다.
+
+- 요청/응답 메타데이터는 multiprocessing.connection으로, 오디오는 공유 메모리로 전달 (피클링 없음)
+- 오디오 디코딩과 인코딩은 API 워커에서 수행하고 추론 서버는 모델 호출만 담당
+- 실행기 스레드마다 연결을 하나씩 유지하며, 주소가 여러 개면 연결을 라운드로빈으로 분산
+- 배치 합성과 캐시 통계는 추론 서버로 전달하고, 화자 지문(TTS_SPEAKERS_DIR)과 미리 렌더링한 아티팩트
+  (TTS_DISK_CACHE_DIR)는 같은 호스트의 같은 디렉토리를 API 워커가 직접 읽음 (TCP도 루프백만 허용)
+
+환경 변수:
+    INFERENCE_SERVER_ADDRESS: 추론 서버 주소 (Unix 소켓 경로 또는 host:port, 쉼표로 여러 개). 비어 있으면 프로세스 내 추론
+    INFERENCE_SERVER_AUTHKEY: 연결 인증 키. 비어 있으면 INFERENCE_SERVER_AUTHKEY_FILE을 사용
+    INFERENCE_SERVER_AUTHKEY_FILE: 인증 키 파일 (기본 .cache/inference.key). 추론 서버가 처음 뜰 때 임의 키로 만들고(0600),
+        같은 호스트의 API 워커가 읽음. 다른 사용자가 읽을 수 있는 파일은 거부
+    INFERENCE_CLIENT_CONCURRENCY: 모델별 동시 요청(연결) 수 (기본 2)
+    INFERENCE_CONNECT_TIMEOUT: 서버가 뜰 때까지 연결을 재시도하는 시간 (초, 기본 120)
+"""
+
+import os
+import stat
+import time
+import secrets
+import asyncio
+import logging
+import threading
+from multiprocessing.connection import Client
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+
+from services.inference_executor import PRIORITY_BACKGROUND, InferenceExecutor
+from services.metrics_service import observe_stage
+from services.tracing_service import set_attribute
+from services.shared_audio import SharedAudioReader, SharedAudioWriter
+from services.tts_disk_cache import get_disk_cache
+from services import health_service
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+INFERENCE_SERVER_ADDRESS = os.getenv("INFERENCE_SERVER_ADDRESS", "")
+INFERENCE_SERVER_AUTHKEY = os.getenv("INFERENCE_SERVER_AUTHKEY", "")
+INFERENCE_SERVER_AUTHKEY_FILE = os.getenv(
+    "INFERENCE_SERVER_AUTHKEY_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "inference.key"),
+)
+INFERENCE_CLIENT_CONCURRENCY = int(os.getenv("INFERENCE_CLIENT_CONCURRENCY", "2"))
+INFERENCE_CONNECT_TIMEOUT = float(os.getenv("INFERENCE_CONNECT_TIMEOUT", "120"))
+
+Address = Union[str, Tuple[str, int]]
+
+
+def parse_address(address: str) -> Address:
+    """"host:port"는 TCP 주소로, 나머지는 Unix 소켓 경로(Windows는 named pipe)로 해석합니다."""
+    host, sep, port = address.rpartition(":")
+    if sep and host and port.isdigit():
+        return host, int(port)
+    return address
+
+
+def load_authkey(create: bool = False) -> bytes:
+    """연결 인증 키를 반환합니다.
+
+    multiprocessing.connection은 받은 메시지를 언피클하므로 키를 아는 쪽은 상대 프로세스에서 코드를 실행할 수 있습니다.
+    공개된 기본 키는 두지 않고, INFERENCE_SERVER_AUTHKEY가 없으면 소유자만 읽을 수 있는 키 파일을 사용합니다.
+
+    Args:
+        create: 키 파일이 없으면 임의 키로 새로 만듦 (추론 서버만 사용)
+
+    Raises:
+        FileNotFoundError: 키 파일이 없음 (create=False)
+        PermissionError: 키 파일을 그룹/다른 사용자가 읽거나 쓸 수 있음
+    """
+    if INFERENCE_SERVER_AUTHKEY:
+        return INFERENCE_SERVER_AUTHKEY.encode()
+    path = INFERENCE_SERVER_AUTHKEY_FILE
+    if create and not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass  # 다른 풀 프로세스가 먼저 만듦
+        else:
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_hex(32))
+            logger.info(f"추론 서버 인증 키 생성: {path}")
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"추론 서버 인증 키가 없습니다: {path} (추론 서버를 먼저 실행하거나 INFERENCE_SERVER_AUTHKEY를 설정하세요)"
+        )
+    if os.name == "posix" and mode & (stat.S_IRWXG | stat.S_IRWXO):
+        raise PermissionError(f"추론 서버 인증 키 파일을 소유자 외에도 접근할 수 있습니다: {path} (chmod 600 필요)")
+    with open(path, "r", encoding="utf-8") as f:
+        key = f.read().strip()
+    if not key:
+        raise PermissionError(f"추론 서버 인증 키 파일이 비어 있습니다: {path}")
+    return key.encode()
+
+
+def remote_enabled() -> bool:
+    """추론 서버 사용 여부"""
+    return bool(INFERENCE_SERVER_ADDRESS.strip())
+
+
+class _Channel:
+    """연결 하나와 방향별 공유 메모리 버퍼 (한 스레드에서만 사용)"""
+
+    def __init__(self, address: Address, authkey: bytes):
+        self.address = address
+        self.conn = Client(address, authkey=authkey)
+        self.writer = SharedAudioWriter()
+        self.reader = SharedAudioReader()
+
+    def request(self, message: Dict[str, object], audio: Optional[np.ndarray] = None) -> Dict[str, object]:
+        if audio is not None:
+            message["shm"], message["samples"] = self.writer.write(audio)
+        self.conn.send(message)
+        return self.conn.recv()
+
+    def close(self) -> None:
+        self.reader.close()
+        self.writer.close()
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+
+
+class InferenceClient:
+    """추론 서버 연결 관리자"""
+
+    def __init__(
+        self,
+        addresses: Optional[List[str]] = None,
+        authkey: Optional[bytes] = None,
+        connect_timeout: float = INFERENCE_CONNECT_TIMEOUT,
+    ):
+        if addresses is None:
+            addresses = [item.strip() for item in INFERENCE_SERVER_ADDRESS.split(",") if item.strip()]
+        if not addresses:
+            raise ValueError("추론 서버 주소가 설정되지 않았습니다 (INFERENCE_SERVER_ADDRESS)")
+        self.addresses = [parse_address(item) for item in addresses]
+        self.authkey = authkey
+        self.connect_timeout = connect_timeout
+        self._local = threading.local()
+        self._channels: List[_Channel] = []
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def _connect(self) -> _Channel:
+        """다음 서버에 연결합니다 (서버가 모델을 로드하거나 인증 키를 만드는 동안에는 재시도)."""
+        with self._lock:
+            address = self.addresses[self._next % len(self.addresses)]
+            self._next += 1
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            try:
+                channel = _Channel(address, self.authkey or load_authkey())
+                break
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                if time.monotonic() >= deadline:
+                    raise ConnectionError(f"추론 서버에 연결할 수 없습니다: {address} ({e})")
+                time.sleep(0.5)
+        with self._lock:
+            self._channels.append(channel)
+        logger.info(f"추론 서버 연결: {address}")
+        return channel
+
+    def _drop(self, channel: _Channel) -> None:
+        channel.close()
+        with self._lock:
+            if channel in self._channels:
+                self._channels.remove(channel)
+        self._local.channel = None
+
+    def call(self, op: str, audio: Optional[np.ndarray] = None, **fields) -> Tuple[Dict[str, object], _Channel]:
+        """요청을 보내고 (응답, 채널)을 반환합니다.
+
+        응답 오디오 뷰(`channel.reader.view`)는 같은 스레드에서 다음 요청을 보내기 전까지만 유효합니다.
+        연결이 끊기면 한 번 다시 연결하여 재시도합니다.
+        """
+        for attempt in range(2):
+            channel = getattr(self._local, "channel", None)
+            if channel is None:
+                channel = self._local.channel = self._connect()
+            try:
+                response = channel.request(dict(fields, op=op), audio)
+                break
+            except (EOFError, OSError) as e:
+                self._drop(channel)
+                if attempt:
+                    raise ConnectionError(f"추론 서버 연결 오류: {e}")
+                logger.warning(f"추론 서버 연결이 끊어져 다시 연결합니다: {e}")
+        if not response.get("ok"):
+            raise RuntimeError(f"추론 서버 오류: {response.get('error')}")
+        # 서버에서 모델 호출 중 기록된 속성(부하 제어기 단계 등)을 이 요청의 트레이스에 옮김
+        for key, value in (response.get("attributes") or {}).items():
+            set_attribute(key, value)
+        return response, channel
+
+    def close(self) -> None:
+        """모든 연결과 버퍼를 정리합니다."""
+        with self._lock:
+            channels, self._channels = self._channels, []
+        for channel in channels:
+            channel.close()
+
+
+_client: Optional[InferenceClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> InferenceClient:
+    """프로세스 공용 클라이언트를 반환합니다."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = InferenceClient()
+    return _client
+
+
+class RemoteSTTService:
+    """추론 서버를 사용하는 STT 서비스 (STTService와 같은 인터페이스)"""
+
+    remote = True
+
+    def __init__(self, client: Optional[InferenceClient] = None):
+        self.client = client or get_client()
+        # 서버 준비(모델 로드 완료)를 기다리며 모델 정보를 조회
+        info, _ = self.client.call("ping")
+        self.model_size = info["stt"]["model_size"]
+        self.executor = InferenceExecutor(
+            "stt", model=f"whisper-{self.model_size}", max_workers=INFERENCE_CLIENT_CONCURRENCY
+        )
+
+    async def transcribe(self, audio_bytes, language="ko"):
+        """오디오 파일을 텍스트로 변환합니다 (긴 오디오는 청크로 나누어 병렬 요청)."""
+        from services import stt_service
+
+        audio = await asyncio.to_thread(stt_service.decode_audio_bytes, audio_bytes, f"whisper-{self.model_size}")
+        return await stt_service.transcribe_decoded(self, audio, language)
+
+    def _transcribe_sync(self, audio_bytes, language="ko"):
+        """API 워커에서 디코딩한 뒤 추론 서버로 인식을 요청합니다 (실행기 스레드에서 호출)."""
+        from services import stt_service
+
+        audio = stt_service.decode_audio_bytes(audio_bytes, f"whisper-{self.model_size}")
+        return self.transcribe_array(audio, language)
+
+    def transcribe_array(self, audio, language="ko"):
+        """16kHz 모노 float32 오디오를 공유 메모리로 넘겨 인식합니다."""
+        start = time.perf_counter()
+        try:
+            response, _ = self.client.call("transcribe", audio=audio, language=language)
+        except Exception as e:
+            health_service.record_failure("stt", e)
+            raise
+        # 서버 측 추론 시간 + IPC 왕복 시간
+        observe_stage("whisper_inference", time.perf_counter() - start, f"whisper-{self.model_size}")
+        health_service.record_success("stt")
+        return response["text"]
+
+    def transcribe_segments(self, audio, language="ko", offset=0.0):
+        """청크 하나를 공유 메모리로 넘겨 타임스탬프가 있는 세그먼트 목록을 받습니다."""
+        start = time.perf_counter()
+        try:
+            response, _ = self.client.call("transcribe_segments", audio=audio, language=language, offset=offset)
+        except Exception as e:
+            health_service.record_failure("stt", e)
+            raise
+        observe_stage("whisper_inference", time.perf_counter() - start, f"whisper-{self.model_size}")
+        health_service.record_success("stt")
+        return response["segments"]
+
+    def transcribe_batched(self, audio, language="ko"):
+        """파일 하나를 공유 메모리로 넘겨 추론 서버의 배치 파이프라인으로 인식합니다 (일괄 인식용)."""
+        start = time.perf_counter()
+        try:
+            response, _ = self.client.call(
+                "transcribe_batched", audio=audio, language=language, priority=PRIORITY_BACKGROUND
+            )
+        except Exception as e:
+            health_service.record_failure("stt", e)
+            raise
+        observe_stage("whisper_batch_inference", time.perf_counter() - start, f"whisper-{self.model_size}")
+        health_service.record_success("stt")
+        return response["text"]
+
+
+class RemoteTTSService:
+    """추론 서버를 사용하는 TTS 서비스 (MetisTTSService와 같은 인터페이스)"""
+
+    remote = True
+
+    def __init__(self, client: Optional[InferenceClient] = None):
+        self.client = client or get_client()
+        info, _ = self.client.call("ping")
+        self.sample_rate = info["tts"]["sample_rate"]
+        self._default_voice_key = info["tts"]["voice_key"]
+        self.model_key = info["tts"]["model_key"]
+        self.mock_model = info["tts"]["mock_model"]
+        self.executor = InferenceExecutor("tts", model="metis", max_workers=INFERENCE_CLIENT_CONCURRENCY)
+        # 배치 엔드포인트가 아티팩트를 저장/조회하는 디렉토리 (추론 서버가 합성 전에 조회하는 곳과 같음)
+        self.disk_cache = get_disk_cache()
+
+    def voice_key(self, speaker_id: Optional[str] = None) -> str:
+        """음성 지문 (기본 프롬프트는 추론 서버가 알려준 지문, 등록된 화자는 화자 디렉토리에서 조회)
+
+        Raises:
+            ValueError: 등록되지 않은 화자 ID
+        """
+        from services.speaker_registry import get_speaker_registry
+
+        if speaker_id is None:
+            return self._default_voice_key
+        speaker = get_speaker_registry().get(speaker_id)
+        if speaker is None:
+            raise ValueError(f"등록되지 않은 화자입니다: {speaker_id}")
+        return speaker.fingerprint
+
+    def artifact_id(self, text: str, tier: str = "standard", speaker_id: Optional[str] = None) -> str:
+        """정규화된 텍스트의 영구 캐시 아티팩트 ID (추론 서버가 조회하는 ID와 같음)"""
+        return self.disk_cache.artifact_id(text, tier, self.voice_key(speaker_id), self.model_key)
+
+    def cache_stats(self) -> Dict[str, object]:
+        """추론 서버의 문장 캐시/전체 텍스트 캐시 통계"""
+        response, _ = self.client.call("cache_stats")
+        return {"sentence_cache": response["sentence_cache"], "text_cache": response["text_cache"]}
+
+    def _synthesize_view(self, op: str = "synthesize", **fields) -> np.ndarray:
+        """합성 결과를 공유 메모리 뷰로 반환합니다 (같은 스레드의 다음 요청 전까지 유효)."""
+        start = time.perf_counter()
+        try:
+            response, channel = self.client.call(op, **fields)
+        except Exception as e:
+            health_service.record_failure("tts", e)
+            raise
+        observe_stage("tts_sentence", time.perf_counter() - start, "metis")
+        health_service.record_success("tts")
+        return channel.reader.view(response["shm"], response["samples"])
+
+    def synthesize(
+        self, text: str, use_cache: bool = True, speaker_id: Optional[str] = None, tier: Optional[str] = None
+    ) -> np.ndarray:
+        """텍스트를 음성으로 변환
+
+        Args:
+            text: 음성으로 변환할 텍스트
+            use_cache: 캐시 사용 여부 (추론 서버의 캐시)
+            speaker_id: 등록된 화자 ID (추론 서버가 같은 화자 디렉토리에서 조회)
+            tier: 품질 단계 (지정하면 추론 서버의 부하 제어기를 거치지 않음)
+
+        Returns:
+            numpy.ndarray: 생성된 음성 데이터 (복사본)
+        """
+        return np.array(self._synthesize_view(text=text, use_cache=use_cache, speaker_id=speaker_id, tier=tier))
+
+    def synthesize_segment(self, text: str, use_cache: bool = True, speaker_id: Optional[str] = None) -> np.ndarray:
+        """문장 조각 하나를 추론 서버의 문장 캐시를 거쳐 합성합니다 (긴 텍스트 작업용).
+
+        추론 서버의 모델 실행기에서도 백그라운드 우선순위로 실행되어 대화 요청보다 뒤로 밀립니다.
+        """
+        return np.array(self._synthesize_view(
+            "synthesize_segment", text=text, use_cache=use_cache, speaker_id=speaker_id, priority=PRIORITY_BACKGROUND
+        ))
+
+    def synthesize_batch(
+        self, texts: List[str], tier: str = "standard", speaker_id: Optional[str] = None
+    ) -> List[Optional[np.ndarray]]:
+        """여러 텍스트를 추론 서버에서 한 번에 합성합니다 (결과는 이어 붙인 공유 메모리 하나로 받음).
+
+        Returns:
+            List[Optional[numpy.ndarray]]: 텍스트별 음성 데이터 (복사본, 합성 실패 시 None)
+
+        Raises:
+            ValueError: 등록되지 않은 화자 ID
+        """
+        self.voice_key(speaker_id)
+        try:
+            response, channel = self.client.call("synthesize_batch", texts=list(texts), tier=tier, speaker_id=speaker_id)
+        except Exception as e:
+            health_service.record_failure("tts", e)
+            raise
+        health_service.record_success("tts")
+        audio = channel.reader.view(response["shm"], response["samples"])
+        results: List[Optional[np.ndarray]] = []
+        offset = 0
+        for length in response["lengths"]:
+            if length < 0:
+                results.append(None)
+                continue
+            results.append(np.array(audio[offset:offset + length]))
+            offset += length
+        return results
+
+    def synthesize_to_file(self, text: str, output_path: str, use_cache: bool = True, speaker_id: Optional[str] = None) -> str:
+        """텍스트를 음성으로 변환하여 파일로 저장"""
+        audio = self._synthesize_view(text=text, use_cache=use_cache, speaker_id=speaker_id)
+        start = time.perf_counter()
+        sf.write(output_path, audio, self.sample_rate)
+        observe_stage("audio_encode", time.perf_counter() - start, "metis")
+        return output_path
+
+    def synthesize_to_bytes(
+        self, text: str, format: str = "wav", use_cache: bool = True, speaker_id: Optional[str] = None
+    ) -> bytes:
+        """텍스트를 음성으로 변환하여 바이트로 반환 (공유 메모리에서 바로 인코딩)"""
+        from services.tts_service import encode_audio_bytes
+
+        audio = self._synthesize_view(text=text, use_cache=use_cache, speaker_id=speaker_id)
+        start = time.perf_counter()
+        audio_bytes = encode_audio_bytes(audio, self.sample_rate, format)
+        observe_stage("audio_encode", time.perf_counter() - start, "metis")
+        return audio_bytes
@@ -0,0 +1,144 @@
+"""
+추론 실행기 모듈
+
+블로킹 모델 추론을 전용 스레드 풀에서 실행하여 이벤트 루프를 막지 않도록 하고,
+큐 깊이와 대기 시간을 메트릭으로 기록합니다.
+
+대기 중인 작업은 우선순위 순서로 실행됩니다. 대화 요청은 기본 우선순위(PRIORITY_INTERACTIVE)로,
+긴 텍스트 작업 같은 백그라운드 작업은 PRIORITY_BACKGROUND로 제출하면
+대기 중인 대화 요청이 항상 먼저 실행됩니다 (실행 중인 작업은 중단하지 않음).
+"""
+
+import time
+import queue
+import asyncio
+import itertools
+import contextvars
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+from services.metrics_service import QUEUE_DEPTH, QUEUE_WAIT, current_endpoint
+from services.tracing_service import record_span
+
+# 작업 우선순위 (작을수록 먼저 실행)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+class InferenceExecutor:
+    """모델별 추론 실행기
+
+    모델 객체는 대부분 스레드 안전하지 않으므로 기본 워커 수는 1입니다.
+    큐 깊이(대기 + 실행 중 작업 수)는 `depth`로 조회할 수 있습니다.
+    latency에 지연 시간 창(load_controller.LatencyWindow)을 두면 대화 요청의 대기 + 실행 시간을 기록합니다.
+    """
+
+    def __init__(self, name: str, model: str = "", max_workers: int = 1):
+        self.name = name
+        self.model = model
+        self.max_workers = max_workers
+        # (우선순위, 제출 순서, 작업): 같은 우선순위는 제출 순서대로 실행
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._depth = 0
+        self._lock = threading.Lock()
+        self.latency = None
+
+    @property
+    def depth(self) -> int:
+        """대기 중이거나 실행 중인 작업 수"""
+        return self._depth
+
+    def _change_depth(self, delta: int) -> None:
+        with self._lock:
+            self._depth += delta
+            depth = self._depth
+        QUEUE_DEPTH.set(depth, queue=self.name, model=self.model)
+
+    def _ensure_workers(self) -> None:
+        """워커 스레드를 필요할 때 max_workers까지 만듭니다 (ThreadPoolExecutor와 같은 방식)."""
+        with self._lock:
+            if len(self._threads) >= min(self.max_workers, self._depth):
+                return
+            thread = threading.Thread(
+                target=self._worker, name=f"{self.name}-infer_{len(self._threads)}", daemon=True
+            )
+            self._threads.append(thread)
+        thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            _, _, (future, fn, args, kwargs) = self._queue.get()
+            # 대기 중에 취소된 작업은 건너뜀
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            finally:
+                del future, fn, args, kwargs
+
+    def _enqueue(self, priority: int, fn: Callable[..., Any], args, kwargs) -> Future:
+        future: Future = Future()
+        self._queue.put((priority, next(self._sequence), (future, fn, args, kwargs)))
+        self._ensure_workers()
+        return future
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """동기 코드(추론 서버의 연결 스레드 등)에서 대화 우선순위로 작업을 제출합니다."""
+        return self.submit_with_priority(PRIORITY_INTERACTIVE, fn, *args, **kwargs)
+
+    def submit_with_priority(self, priority: int, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """우선순위를 지정하여 동기 코드에서 작업을 제출합니다.
+
+        run_with_priority와 같이 호출 스레드의 컨텍스트(트레이스 등)를 워커 스레드로 전달하고,
+        대화 요청은 대기 + 실행 시간을 latency에 기록합니다 (워밍업 등은 PRIORITY_BACKGROUND로 제출).
+        """
+        submitted = time.perf_counter()
+        ctx = contextvars.copy_context()
+
+        def done(future: Future) -> None:
+            self._change_depth(-1)
+            if self.latency is not None and priority == PRIORITY_INTERACTIVE and not future.cancelled() and future.exception() is None:
+                self.latency.observe(time.perf_counter() - submitted)
+
+        self._change_depth(1)
+        future = self._enqueue(priority, ctx.run, (fn, *args), kwargs)
+        future.add_done_callback(done)
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """함수를 실행기 스레드에서 실행하고 결과를 반환합니다."""
+        return await self.run_with_priority(PRIORITY_INTERACTIVE, fn, *args, **kwargs)
+
+    async def run_with_priority(self, priority: int, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """우선순위를 지정하여 함수를 실행기 스레드에서 실행하고 결과를 반환합니다.
+
+        Args:
+            priority: 작업 우선순위 (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND 등, 작을수록 먼저 실행)
+            fn: 실행할 함수
+        """
+        submitted = time.perf_counter()
+        # 요청 컨텍스트(엔드포인트 라벨 등)를 워커 스레드로 전달
+        ctx = contextvars.copy_context()
+
+        def job():
+            waited = time.perf_counter() - submitted
+            QUEUE_WAIT.observe(waited, queue=self.name, endpoint=current_endpoint(), model=self.model)
+            record_span("queue_wait", waited)
+            return fn(*args, **kwargs)
+
+        self._change_depth(1)
+        try:
+            # 대기 중에 취소되면 concurrent Future도 취소되어 실행되지 않음
+            result = await asyncio.wrap_future(self._enqueue(priority, ctx.run, (job,), {}))
+        finally:
+            self._change_depth(-1)
+        if self.latency is not None and priority == PRIORITY_INTERACTIVE:
+            self.latency.observe(time.perf_counter() - submitted)
+        return result
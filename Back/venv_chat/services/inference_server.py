@@ -0,0 +1,300 @@
+"""
+전용 추론 서버 프로세스
+
+Whisper(STT)와 Metis(TTS) 모델을 한 번만 로드하고, 여러 API 워커의 요청을 로컬 IPC로 처리합니다.
+API 워커는 INFERENCE_SERVER_ADDRESS를 설정하면 services.inference_client를 통해 이 서버를 사용합니다.
+
+- 연결마다 스레드 하나가 요청을 받고, 모델 호출은 모델별 InferenceExecutor에서 직렬화
+- 입력/출력 오디오는 연결별 공유 메모리 버퍼로 전달 (피클링 없음)
+- `--processes N`이면 서버 프로세스 N개를 띄우는 작은 풀로 동작 (주소 뒤에 번호/포트 증가)
+- 받은 메시지를 언피클하므로 인증 키 없이 시작하지 않고 (services.inference_client.load_authkey),
+  TCP는 루프백 주소만 허용하며 Unix 소켓은 소유자만 접근하도록 0600으로 설정
+
+사용 예 (Back/venv_chat 디렉토리에서):
+    python -m services.inference_server --address /tmp/venomvoice-inference.sock
+    INFERENCE_SERVER_ADDRESS=/tmp/venomvoice-inference.sock uvicorn main:app --workers 4
+
+    python -m services.inference_server --address 127.0.0.1:8600 --processes 2
+    INFERENCE_SERVER_ADDRESS=127.0.0.1:8600,127.0.0.1:8601 uvicorn main:app --workers 4
+"""
+
+import os
+import sys
+import stat
+import ipaddress
+import logging
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Listener, AuthenticationError
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Back/venv_chat를 임포트 경로에 추가 (main.py와 같은 방식으로 routes/services 임포트)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from services.inference_client import load_authkey, parse_address
+from services.inference_executor import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from services.tracing_service import collect_attributes
+from services.shared_audio import SharedAudioReader, SharedAudioWriter
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+
+def check_loopback(address) -> None:
+    """TCP 주소가 루프백이 아니면 ValueError (다른 호스트에서 언피클 요청을 보낼 수 없도록)"""
+    if not isinstance(address, tuple):
+        return
+    host = address[0]
+    if host == "localhost":
+        return
+    try:
+        if ipaddress.ip_address(host).is_loopback:
+            return
+    except ValueError:
+        pass
+    raise ValueError(f"추론 서버는 루프백 주소에서만 대기할 수 있습니다: {host} (127.0.0.1 또는 Unix 소켓 사용)")
+
+
+class InferenceServer:
+    """STT/TTS 서비스를 IPC로 제공하는 서버"""
+
+    def __init__(self, address: str, stt, tts, authkey: Optional[bytes] = None):
+        self.address = parse_address(address)
+        check_loopback(self.address)
+        self.stt = stt
+        self.tts = tts
+        self.authkey = authkey or load_authkey(create=True)
+        self._listener = None
+
+    def serve_forever(self) -> None:
+        """연결을 받아 연결별 스레드에서 처리합니다."""
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            # 이전 실행에서 남은 Unix 소켓 파일 정리
+            if stat.S_ISSOCK(os.stat(self.address).st_mode):
+                os.unlink(self.address)
+        self._listener = Listener(self.address, authkey=self.authkey)
+        if isinstance(self.address, str) and os.name == "posix":
+            # 인증 전 단계의 연결도 소유자만 가능하도록 제한
+            os.chmod(self.address, 0o600)
+        logger.info(f"추론 서버 대기 중: {self.address} (pid {os.getpid()})")
+        try:
+            while True:
+                try:
+                    conn = self._listener.accept()
+                except AuthenticationError as e:
+                    logger.warning(f"인증 실패한 연결 거부: {e}")
+                    continue
+                except OSError:
+                    # close()로 리스너가 닫힘
+                    break
+                threading.Thread(target=self._handle, args=(conn,), name="inference-conn", daemon=True).start()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+    def _handle(self, conn) -> None:
+        """연결 하나의 요청을 순서대로 처리합니다."""
+        writer = SharedAudioWriter()
+        reader = SharedAudioReader()
+        try:
+            while True:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    break
+                try:
+                    response = self._dispatch(message, writer, reader)
+                except Exception as e:
+                    logger.error(f"추론 요청 처리 실패 ({message.get('op')}): {e}")
+                    response = {"ok": False, "error": str(e)}
+                conn.send(response)
+        finally:
+            reader.close()
+            writer.close()
+            conn.close()
+
+    def _call(self, executor, priority: int, fn, *args):
+        """실행기에 제출하고 (결과, 모델 호출 중 기록된 트레이스 속성)을 반환합니다.
+
+        속성(부하 제어기가 정한 단계/설정 등)은 응답에 담아 API 워커의 트레이스에 옮깁니다.
+        """
+        with collect_attributes() as attributes:
+            result = executor.submit_with_priority(priority, fn, *args).result()
+        return result, attributes
+
+    def _dispatch(self, message: Dict[str, object], writer: SharedAudioWriter, reader: SharedAudioReader) -> Dict[str, object]:
+        op = message.get("op")
+        if op == "ping":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "stt": {"model_size": self.stt.model_size},
+                "tts": {
+                    "sample_rate": self.tts.sample_rate,
+                    "voice_key": self.tts.voice_key(),
+                    "model_key": self.tts.model_key,
+                    "mock_model": self.tts.mock_model,
+                },
+            }
+        if op == "transcribe":
+            # API 워커가 쓴 공유 메모리를 복사 없이 모델에 전달
+            audio = reader.view(message["shm"], message["samples"])
+            try:
+                text, attributes = self._call(
+                    self.stt.executor, PRIORITY_INTERACTIVE, self.stt.transcribe_array, audio, message.get("language", "ko")
+                )
+            finally:
+                del audio
+            return {"ok": True, "text": text, "attributes": attributes}
+        if op == "transcribe_segments":
+            audio = reader.view(message["shm"], message["samples"])
+            try:
+                segments, attributes = self._call(
+                    self.stt.executor, PRIORITY_INTERACTIVE, self.stt.transcribe_segments,
+                    audio, message.get("language", "ko"), message.get("offset", 0.0),
+                )
+            finally:
+                del audio
+            return {"ok": True, "segments": segments, "attributes": attributes}
+        if op == "transcribe_batched":
+            audio = reader.view(message["shm"], message["samples"])
+            try:
+                # 일괄 인식은 모델 실행기에서도 대화 요청보다 뒤로 (API 워커의 우선순위는 클라이언트 실행기에만 적용됨)
+                text, attributes = self._call(
+                    self.stt.executor, message.get("priority", PRIORITY_BACKGROUND), self.stt.transcribe_batched,
+                    audio, message.get("language", "ko"),
+                )
+            finally:
+                del audio
+            return {"ok": True, "text": text, "attributes": attributes}
+        if op == "synthesize":
+            audio, attributes = self._call(
+                self.tts.executor, message.get("priority", PRIORITY_INTERACTIVE), self.tts.synthesize,
+                message["text"], message.get("use_cache", True), message.get("speaker_id"), message.get("tier"),
+            )
+            name, samples = writer.write(audio)
+            return {"ok": True, "shm": name, "samples": samples, "sample_rate": self.tts.sample_rate, "attributes": attributes}
+        if op == "synthesize_segment":
+            # 긴 텍스트 작업의 문장 조각은 모델 실행기에서도 대화 요청보다 뒤로
+            audio, attributes = self._call(
+                self.tts.executor, message.get("priority", PRIORITY_BACKGROUND), self.tts.synthesize_segment,
+                message["text"], message.get("use_cache", True), message.get("speaker_id"),
+            )
+            name, samples = writer.write(audio)
+            return {"ok": True, "shm": name, "samples": samples, "sample_rate": self.tts.sample_rate, "attributes": attributes}
+        if op == "synthesize_batch":
+            results, attributes = self._call(
+                self.tts.executor, PRIORITY_BACKGROUND, self.tts.synthesize_batch,
+                message["texts"], message["tier"], message.get("speaker_id"),
+            )
+            # 텍스트별 오디오를 이어 붙여 한 번에 보내고 길이로 나눔 (합성 실패는 -1)
+            lengths = [-1 if audio is None else len(audio) for audio in results]
+            pieces = [audio for audio in results if audio is not None]
+            name, samples = writer.write(np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32))
+            return {"ok": True, "shm": name, "samples": samples, "lengths": lengths, "attributes": attributes}
+        if op == "cache_stats":
+            return {"ok": True, **self.tts.cache_stats()}
+        raise ValueError(f"알 수 없는 요청: {op}")
+
+
+def _load_local_stt():
+    from services import stt_service
+    # 싱글톤에도 등록하여 서버 프로세스 안의 get_stt_service()가 같은 모델을 사용하도록 함
+    stt_service._stt_service = stt_service.STTService()
+    return stt_service._stt_service
+
+
+def _load_local_tts():
+    from routes import tts as tts_routes
+    from services.tts_service import MetisTTSService
+    tts_routes._tts_service = MetisTTSService(
+        ckpt_path=tts_routes.MODEL_CHECKPOINT,
+        config_path=tts_routes.MODEL_CONFIG,
+    )
+    return tts_routes._tts_service
+
+
+def load_local_services(run_warmup: bool = True):
+    """STT/TTS 모델을 이 프로세스에 동시에 로드하고 워밍업합니다.
+
+    Returns:
+        Tuple: (stt, tts) 서비스
+    """
+    from services import model_manager
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="model-preload") as pool:
+        pool.submit(model_manager._load_and_warm, "stt", _load_local_stt, model_manager._warmup_stt, run_warmup)
+        pool.submit(model_manager._load_and_warm, "tts", _load_local_tts, model_manager._warmup_tts, run_warmup)
+
+    failed = {name: state.error for name, state in model_manager.model_states.items() if not state.ready}
+    if failed:
+        raise RuntimeError(f"모델 로드 실패: {failed}")
+
+    from services import stt_service
+    from routes import tts as tts_routes
+    return stt_service._stt_service, tts_routes._tts_service
+
+
+def run_server(address: str, run_warmup: bool = True) -> None:
+    """모델을 로드한 뒤 서버를 실행합니다 (풀의 자식 프로세스 진입점)."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    stt, tts = load_local_services(run_warmup)
+    InferenceServer(address, stt, tts).serve_forever()
+
+
+def pool_addresses(address: str, processes: int) -> List[str]:
+    """풀 프로세스별 주소 (TCP는 포트 증가, Unix 소켓은 번호 접미사)"""
+    if processes <= 1:
+        return [address]
+    parsed = parse_address(address)
+    if isinstance(parsed, tuple):
+        host, port = parsed
+        return [f"{host}:{port + i}" for i in range(processes)]
+    return [f"{address}.{i}" for i in range(processes)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STT/TTS 전용 추론 서버")
+    parser.add_argument("--address", type=str, default="/tmp/venomvoice-inference.sock", help="Unix 소켓 경로 또는 host:port")
+    parser.add_argument("--processes", type=int, default=1, help="추론 서버 프로세스 수 (모델 사본 수)")
+    parser.add_argument("--no-warmup", action="store_true", help="워밍업 추론 건너뛰기")
+    args = parser.parse_args()
+
+    addresses = pool_addresses(args.address, args.processes)
+    # 모델을 로드하기 전에 주소와 인증 키를 확인 (키 파일은 풀 프로세스가 나눠 쓰도록 여기서 생성)
+    for address in addresses:
+        check_loopback(parse_address(address))
+    load_authkey(create=True)
+    print(f"INFERENCE_SERVER_ADDRESS={','.join(addresses)}")
+    if len(addresses) == 1:
+        run_server(addresses[0], not args.no_warmup)
+        return
+
+    # CUDA/torch 상태를 물려받지 않도록 spawn으로 자식 프로세스 생성
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(target=run_server, args=(address, not args.no_warmup), name=f"inference-{i}")
+        for i, address in enumerate(addresses)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+부하 기반 품질 단계 조절 모듈
+
+추론 큐 깊이와 최근 지연 시간 p95를 보고, 부하가 높으면 STT는 더 작은 Whisper 모델로,
+TTS는 더 적은 확산 스텝으로 단계를 낮추고, 부하가 줄면 다시 올립니다.
+
+- 내리기: 큐 깊이 >= 높은 깊이 또는 p95 >= 높은 임계값 (마지막 변경 후 DEGRADE_MIN_DWELL_SECONDS 경과 시)
+- 올리기: 큐 깊이 <= 낮은 깊이이고 p95 <= 낮은 임계값인 상태가 DEGRADE_RECOVER_SECONDS 동안 유지될 때
+  (내리기/올리기 임계값을 따로 두어 경계에서 단계가 오가지 않도록 함)
+
+p95는 대화 요청(PRIORITY_INTERACTIVE)의 대기 + 실행 시간으로 계산하며, 평가는 최대 1초에 한 번만 합니다.
+요청마다 받은 단계는 트레이스 속성과 메트릭으로 기록합니다.
+
+환경 변수:
+    DEGRADE_ENABLED: "0"이면 항상 최고 단계 사용 (기본 "1")
+    DEGRADE_HIGH_DEPTH / DEGRADE_LOW_DEPTH: 내리기/올리기 큐 깊이 (기본 4 / 1)
+    DEGRADE_WINDOW_SECONDS: p95를 계산할 최근 구간 (기본 30초)
+    DEGRADE_MIN_DWELL_SECONDS: 단계를 내린 뒤 다시 바꾸기까지 최소 시간 (기본 10초)
+    DEGRADE_RECOVER_SECONDS: 올리기 전에 낮은 부하가 유지되어야 하는 시간 (기본 30초)
+    STT_DEGRADE_MODELS: 단계별 Whisper 모델 (기본 "<WHISPER_MODEL_SIZE>,tiny")
+    STT_DEGRADE_RETRY_SECONDS: 작은 Whisper 모델 로드 실패 후 다시 시도하기까지 시간 (기본 300초, stt_service)
+    STT_DEGRADE_P95_HIGH / STT_DEGRADE_P95_LOW: STT p95 임계값 (기본 3.0 / 1.5초)
+    TTS_DEGRADE_TIMESTEPS: 단계별 Metis 확산 스텝 수 (기본 "25,16,10")
+    TTS_DEGRADE_P95_HIGH / TTS_DEGRADE_P95_LOW: TTS 문장 p95 임계값 (기본 4.0 / 2.0초)
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from services.metrics_service import Counter, Gauge, registry
+from services.tracing_service import set_attribute
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+DEGRADE_ENABLED = os.getenv("DEGRADE_ENABLED", "1") != "0"
+DEGRADE_HIGH_DEPTH = int(os.getenv("DEGRADE_HIGH_DEPTH", "4"))
+DEGRADE_LOW_DEPTH = int(os.getenv("DEGRADE_LOW_DEPTH", "1"))
+DEGRADE_WINDOW_SECONDS = float(os.getenv("DEGRADE_WINDOW_SECONDS", "30"))
+DEGRADE_MIN_DWELL_SECONDS = float(os.getenv("DEGRADE_MIN_DWELL_SECONDS", "10"))
+DEGRADE_RECOVER_SECONDS = float(os.getenv("DEGRADE_RECOVER_SECONDS", "30"))
+
+# 평가 최소 간격 (초, 핫 패스에서 정렬 비용을 줄임)
+EVALUATE_INTERVAL = 1.0
+# 지연 시간 창에 보관하는 최대 표본 수
+WINDOW_MAX_SAMPLES = 512
+
+# 현재 단계 (0이 최고 품질)
+DEGRADATION_LEVEL = registry.register(Gauge(
+    "degradation_level",
+    "Current quality level chosen by the load controller (0 = full quality)",
+    ("component",),
+))
+
+# 제어기가 본 최근 p95 지연 시간
+DEGRADATION_P95 = registry.register(Gauge(
+    "degradation_p95_seconds",
+    "Recent p95 latency of interactive jobs seen by the load controller",
+    ("component",),
+))
+
+# 단계 변경 횟수
+DEGRADATION_TRANSITIONS = registry.register(Counter(
+    "degradation_transitions_total",
+    "Quality level changes made by the load controller",
+    ("component", "direction"),
+))
+
+# 단계별 처리한 요청 수
+DEGRADATION_REQUESTS = registry.register(Counter(
+    "degradation_requests_total",
+    "Inference calls served at each quality level",
+    ("component", "level", "setting"),
+))
+
+
+class LatencyWindow:
+    """최근 지연 시간 표본 (시각, 초)을 보관하고 백분위를 계산합니다 (스레드 안전)."""
+
+    def __init__(self, seconds: float = DEGRADE_WINDOW_SECONDS, max_samples: int = WINDOW_MAX_SAMPLES):
+        self.seconds = seconds
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        # deque.append는 원자적이지만 percentile의 순회와 겹치지 않도록 잠금
+        with self._lock:
+            self._samples.append((time.monotonic(), seconds))
+
+    def percentile(self, q: float, now: Optional[float] = None) -> Optional[float]:
+        """최근 구간의 q 백분위 (표본이 없으면 None)"""
+        cutoff = (now if now is not None else time.monotonic()) - self.seconds
+        with self._lock:
+            while self._samples and self._samples[0][0] < cutoff:
+                self._samples.popleft()
+            values = sorted(value for _, value in self._samples)
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class LoadController:
+    """컴포넌트 하나의 품질 단계 제어기
+
+    levels[0]이 최고 품질 설정이며, 인덱스가 클수록 가벼운 설정입니다.
+    """
+
+    def __init__(
+        self,
+        component: str,
+        levels: Sequence[object],
+        p95_high: float,
+        p95_low: float,
+        high_depth: int = DEGRADE_HIGH_DEPTH,
+        low_depth: int = DEGRADE_LOW_DEPTH,
+        enabled: bool = DEGRADE_ENABLED,
+    ):
+        self.component = component
+        self.levels = list(levels)
+        self.p95_high = p95_high
+        self.p95_low = p95_low
+        self.high_depth = high_depth
+        self.low_depth = low_depth
+        self.enabled = enabled and len(self.levels) > 1
+        self.latency = LatencyWindow()
+        self.level = 0
+        self.p95: Optional[float] = None
+        self.depth = 0
+        self._executors: List[object] = []
+        self._changed_at = 0.0
+        self._calm_since: Optional[float] = None
+        self._evaluated_at = 0.0
+        self._lock = threading.Lock()
+        DEGRADATION_LEVEL.set(0, component=component)
+
+    def attach(self, executor) -> None:
+        """큐 깊이를 볼 실행기를 등록하고, 대화 요청 지연 시간을 이 제어기로 기록하게 합니다."""
+        self._executors.append(executor)
+        executor.latency = self.latency
+
+    def evaluate(self, now: Optional[float] = None) -> int:
+        """큐 깊이와 p95로 단계를 다시 정하고 현재 단계를 반환합니다 (최대 EVALUATE_INTERVAL에 한 번)."""
+        if not self.enabled:
+            return 0
+        now = now if now is not None else time.monotonic()
+        if now - self._evaluated_at < EVALUATE_INTERVAL:
+            return self.level
+        with self._lock:
+            if now - self._evaluated_at < EVALUATE_INTERVAL:
+                return self.level
+            self._evaluated_at = now
+            self.depth = sum(executor.depth for executor in self._executors)
+            self.p95 = self.latency.percentile(0.95, now)
+            DEGRADATION_P95.set(self.p95 or 0.0, component=self.component)
+
+            p95 = self.p95 or 0.0
+            pressured = self.depth >= self.high_depth or p95 >= self.p95_high
+            calm = self.depth <= self.low_depth and p95 <= self.p95_low
+            if pressured:
+                self._calm_since = None
+                if self.level < len(self.levels) - 1 and now - self._changed_at >= DEGRADE_MIN_DWELL_SECONDS:
+                    self._change(self.level + 1, now, "down")
+            elif calm and self.level > 0:
+                if self._calm_since is None:
+                    self._calm_since = now
+                elif now - self._calm_since >= DEGRADE_RECOVER_SECONDS:
+                    self._change(self.level - 1, now, "up")
+                    # 한 단계씩 올리고 다음 단계는 다시 유지 시간을 기다림
+                    self._calm_since = now
+            else:
+                self._calm_since = None
+            return self.level
+
+    def _change(self, level: int, now: float, direction: str) -> None:
+        logger.info(
+            f"[{self.component}] 품질 단계 {self.level} -> {level} ({self.levels[level]}, "
+            f"큐 깊이 {self.depth}, p95 {self.p95 or 0.0:.2f}초)"
+        )
+        self.level = level
+        self._changed_at = now
+        DEGRADATION_LEVEL.set(level, component=self.component)
+        DEGRADATION_TRANSITIONS.inc(component=self.component, direction=direction)
+
+    def select(self) -> Tuple[int, object]:
+        """요청 하나가 쓸 (단계, 설정)을 정하고 트레이스와 메트릭에 기록합니다."""
+        level = self.evaluate()
+        setting = self.levels[level]
+        self.record(level, setting)
+        return level, setting
+
+    def record(self, level: int, setting: object) -> None:
+        """요청 하나가 실제로 쓴 (단계, 설정)을 트레이스와 메트릭에 기록합니다.
+
+        정한 설정을 그대로 쓰지 못하는 호출자(작은 모델을 아직 로드 중인 STT 등)는
+        evaluate()로 단계를 받고, 실제로 쓴 설정을 이 메서드로 기록합니다.
+        """
+        set_attribute(f"{self.component}_level", level)
+        set_attribute(f"{self.component}_setting", setting)
+        DEGRADATION_REQUESTS.inc(component=self.component, level=str(level), setting=str(setting))
+
+    def state(self) -> Dict[str, object]:
+        return {
+            "enabled": self.enabled,
+            "level": self.level,
+            "setting": self.levels[self.level],
+            "levels": self.levels,
+            "queue_depth": self.depth,
+            "p95_seconds": self.p95,
+            "thresholds": {
+                "high_depth": self.high_depth,
+                "low_depth": self.low_depth,
+                "p95_high": self.p95_high,
+                "p95_low": self.p95_low,
+            },
+        }
+
+
+def _stt_levels() -> List[str]:
+    from services.stt_service import WHISPER_MODEL_SIZE
+
+    models = os.getenv("STT_DEGRADE_MODELS", f"{WHISPER_MODEL_SIZE},tiny").split(",")
+    levels: List[str] = []
+    for model in (m.strip() for m in models):
+        if model and model not in levels:
+            levels.append(model)
+    return levels
+
+
+def _tts_levels() -> List[int]:
+    steps = [int(s) for s in os.getenv("TTS_DEGRADE_TIMESTEPS", "25,16,10").split(",") if s.strip()]
+    return sorted(set(steps), reverse=True)
+
+
+_controllers: Dict[str, LoadController] = {}
+_controllers_lock = threading.Lock()
+
+
+def get_controller(component: str) -> LoadController:
+    """컴포넌트("stt", "tts")의 프로세스 공용 제어기를 반환합니다."""
+    controller = _controllers.get(component)
+    if controller is not None:
+        return controller
+    with _controllers_lock:
+        if component not in _controllers:
+            if component == "stt":
+                _controllers[component] = LoadController(
+                    "stt", _stt_levels(),
+                    float(os.getenv("STT_DEGRADE_P95_HIGH", "3.0")), float(os.getenv("STT_DEGRADE_P95_LOW", "1.5")),
+                )
+            elif component == "tts":
+                _controllers[component] = LoadController(
+                    "tts", _tts_levels(),
+                    float(os.getenv("TTS_DEGRADE_P95_HIGH", "4.0")), float(os.getenv("TTS_DEGRADE_P95_LOW", "2.0")),
+                )
+            else:
+                raise ValueError(f"알 수 없는 컴포넌트: {component}")
+        return _controllers[component]
+
+
+def refresh() -> None:
+    """만들어진 제어기를 모두 평가합니다 (요청이 없을 때도 단계를 올릴 수 있도록)."""
+    for controller in list(_controllers.values()):
+        controller.evaluate()
+
+
+def controller_states() -> Dict[str, Dict[str, object]]:
+    """만들어진 제어기의 상태 (헬스 체크 등 조회용)"""
+    return {name: controller.state() for name, controller in list(_controllers.items())}
@@ -0,0 +1,401 @@
+"""
+Metis 실행 최적화 모듈
+
+CPU 전용 노드에서 Metis 추론 비용을 줄이기 위한 선택적 실행 모드를 제공합니다.
+
+- int8: 선형(nn.Linear) 위주 서브모듈에 동적 int8 양자화 적용
+- bf16: CPU가 bf16을 지원하면 서브모듈을 bf16 autocast로 실행 (출력은 float32로 복원)
+- int8_bf16: 두 가지를 함께 적용
+- intra/inter-op 스레드 수를 명시적으로 설정
+
+코덱(보코더) 계열 서브모듈은 음질에 민감하므로 기본적으로 제외합니다.
+
+선택적으로 서브모듈을 torch.compile로 컴파일하며, 컴파일 결과는 디스크에 캐시합니다.
+캐시 디렉토리는 체크포인트 체크섬, torch 버전, 장치, CPU 모드로 키를 만들어 구분하므로
+재시작 시 같은 모델이면 다시 최적화하지 않고 컴파일된 그래프를 재사용합니다.
+
+환경 변수:
+    METIS_CPU_MODE: fp32(기본) / int8 / bf16 / int8_bf16
+    METIS_CPU_OPT_EXCLUDE: 최적화에서 제외할 서브모듈 이름 패턴 (쉼표 구분, 기본 "codec")
+    METIS_INTRA_OP_THREADS: 연산 내부 스레드 수 (0이면 CPU 모드에서 사용 가능한 코어 수)
+    METIS_INTER_OP_THREADS: 연산 간 스레드 수 (0이면 CPU 모드에서 1)
+    METIS_COMPILE: "1"이면 torch.compile 실행 경로 사용 (기본 "0")
+    METIS_COMPILE_MODE: torch.compile 모드 (기본 "default")
+    METIS_COMPILE_CACHE_DIR: 컴파일 캐시 디렉토리 (기본 Back/venv_chat/.cache/metis_compile)
+
+프롬프트 인코딩(w2v-bert 특징, 의미/음향 코드 추출) 결과를 기록했다가 같은 프롬프트로 합성할 때
+재사용하는 실행 범위(prompt_feature_scope)도 제공합니다.
+"""
+
+import os
+import hashlib
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+CPU_MODES = ("fp32", "int8", "bf16", "int8_bf16")
+
+METIS_CPU_MODE = os.getenv("METIS_CPU_MODE", "fp32")
+METIS_CPU_OPT_EXCLUDE = [item.strip() for item in os.getenv("METIS_CPU_OPT_EXCLUDE", "codec").split(",") if item.strip()]
+METIS_INTRA_OP_THREADS = int(os.getenv("METIS_INTRA_OP_THREADS", "0"))
+METIS_INTER_OP_THREADS = int(os.getenv("METIS_INTER_OP_THREADS", "0"))
+
+METIS_COMPILE = os.getenv("METIS_COMPILE", "0") == "1"
+METIS_COMPILE_MODE = os.getenv("METIS_COMPILE_MODE", "default")
+METIS_COMPILE_CACHE_DIR = os.getenv(
+    "METIS_COMPILE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "metis_compile"),
+)
+
+
+def available_cpus() -> int:
+    """이 프로세스가 사용할 수 있는 CPU 수 (컨테이너 CPU 제한 반영)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def configure_cpu_threads(intra_op: int = METIS_INTRA_OP_THREADS, inter_op: int = METIS_INTER_OP_THREADS) -> Tuple[int, int]:
+    """torch 스레드 수를 설정합니다 (프로세스 전역 설정).
+
+    Returns:
+        Tuple[int, int]: 적용된 (intra-op, inter-op) 스레드 수
+    """
+    import torch
+
+    intra_op = intra_op or available_cpus()
+    inter_op = inter_op or 1
+    torch.set_num_threads(intra_op)
+    try:
+        torch.set_num_interop_threads(inter_op)
+    except RuntimeError:
+        # 병렬 작업이 한 번이라도 실행된 뒤에는 변경할 수 없음
+        logger.warning(f"inter-op 스레드 수를 변경할 수 없습니다 (현재 {torch.get_num_interop_threads()})")
+        inter_op = torch.get_num_interop_threads()
+    logger.info(f"torch 스레드 설정: intra-op={intra_op}, inter-op={inter_op}")
+    return intra_op, inter_op
+
+
+def bf16_supported() -> bool:
+    """CPU가 bf16 연산을 네이티브로 지원하는지 확인합니다 (AVX512-BF16 / AMX)."""
+    import torch
+
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def target_modules(model, exclude: Optional[List[str]] = None) -> List[Tuple[str, object]]:
+    """최적화 대상 서브모듈 목록 (모델 속성 중 nn.Module, 제외 패턴에 맞는 이름은 건너뜀)"""
+    import torch
+
+    exclude = METIS_CPU_OPT_EXCLUDE if exclude is None else exclude
+    if isinstance(model, torch.nn.Module):
+        candidates = list(model.named_children())
+    else:
+        candidates = [(name, value) for name, value in vars(model).items() if isinstance(value, torch.nn.Module)]
+    return [(name, module) for name, module in candidates if not any(pattern in name for pattern in exclude)]
+
+
+def _select_quantized_engine() -> None:
+    import torch
+
+    engines = torch.backends.quantized.supported_engines
+    for engine in ("x86", "fbgemm", "qnnpack"):
+        if engine in engines:
+            torch.backends.quantized.engine = engine
+            return
+
+
+def quantize_int8(model, modules: List[Tuple[str, object]]) -> List[str]:
+    """서브모듈의 nn.Linear를 동적 int8 양자화로 교체합니다 (제자리 변경).
+
+    Returns:
+        List[str]: 양자화한 서브모듈 이름
+    """
+    import torch
+
+    _select_quantized_engine()
+    quantized = []
+    for name, module in modules:
+        if not any(isinstance(child, torch.nn.Linear) for child in module.modules()):
+            continue
+        replaced = torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        setattr(model, name, replaced)
+        quantized.append(name)
+    return quantized
+
+
+def _to_float32(output):
+    import torch
+
+    if isinstance(output, torch.Tensor):
+        return output.float() if output.dtype == torch.bfloat16 else output
+    if isinstance(output, (tuple, list)):
+        return type(output)(_to_float32(item) for item in output)
+    return output
+
+
+def enable_bf16(modules: List[Tuple[str, object]]) -> List[str]:
+    """서브모듈과 그 직계 자식의 forward를 bf16 autocast로 감쌉니다.
+
+    Metis는 서브모듈의 forward 외 메서드(예: 역확산 루프)도 호출하므로 직계 자식까지 감쌉니다.
+    출력 텐서는 float32로 되돌려 이후 연산(코덱, numpy 변환)에 bf16이 새지 않도록 합니다.
+    """
+    import torch
+
+    def wrap(target) -> None:
+        forward = target.forward
+
+        @functools.wraps(forward)
+        def bf16_forward(*args, **kwargs):
+            with torch.autocast("cpu", dtype=torch.bfloat16):
+                output = forward(*args, **kwargs)
+            return _to_float32(output)
+
+        target.forward = bf16_forward
+        target._metis_bf16 = True
+
+    enabled = []
+    for name, module in modules:
+        for target in [module, *module.children()]:
+            if not getattr(target, "_metis_bf16", False):
+                wrap(target)
+        enabled.append(name)
+    return enabled
+
+
+def optimize_for_cpu(model, mode: str = METIS_CPU_MODE) -> str:
+    """CPU 실행 모드를 모델에 적용합니다.
+
+    Args:
+        model: Metis 모델 (서브모듈을 속성으로 가진 객체 또는 nn.Module)
+        mode: fp32 / int8 / bf16 / int8_bf16
+
+    Returns:
+        str: 실제 적용된 모드 (bf16 미지원 CPU에서는 bf16이 빠짐)
+    """
+    if mode not in CPU_MODES:
+        raise ValueError(f"지원하지 않는 METIS_CPU_MODE: {mode} (가능: {', '.join(CPU_MODES)})")
+    if mode == "fp32":
+        return mode
+
+    modules = target_modules(model)
+    if not modules:
+        logger.warning("CPU 최적화 대상 서브모듈이 없습니다 (모의 모델이거나 구조가 다름)")
+        return "fp32"
+
+    applied = []
+    if "int8" in mode:
+        quantized = quantize_int8(model, modules)
+        logger.info(f"동적 int8 양자화 적용: {quantized}")
+        applied.append("int8")
+        # 양자화로 교체된 모듈을 bf16으로 감싸도록 목록 갱신
+        modules = target_modules(model)
+    if "bf16" in mode:
+        if bf16_supported():
+            logger.info(f"bf16 autocast 적용: {enable_bf16(modules)}")
+            applied.append("bf16")
+        else:
+            logger.warning("이 CPU는 bf16을 지원하지 않아 bf16 모드를 건너뜁니다")
+    return "_".join(applied) or "fp32"
+
+
+def compile_cache_key(ckpt_path: str, device: str, cpu_mode: str, model=None) -> str:
+    """컴파일 캐시 키 (체크포인트 체크섬 + torch 버전 + 장치 + CPU 모드 + 컴파일 모드)"""
+    import torch
+
+    from services.checkpoint_manager import file_checksum
+
+    checksum = file_checksum(ckpt_path)
+    if checksum is None:
+        # 체크포인트가 없는 모의 모델은 클래스 이름으로 구분
+        checksum = f"nockpt-{type(model).__name__}"
+    raw = f"{checksum}|torch={torch.__version__}|device={device}|cpu_mode={cpu_mode}|mode={METIS_COMPILE_MODE}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+
+class CompileCache:
+    """컴파일된 Metis 그래프의 디스크 캐시
+
+    - inductor 캐시 디렉토리를 키별 디렉토리로 지정 (FX 그래프/커널 캐시)
+    - torch가 지원하면 첫 추론 뒤 컴파일 산출물 전체를 artifacts.bin으로 저장하고, 시작 시 먼저 불러옴
+    """
+
+    def __init__(self, key: str, cache_dir: str = METIS_COMPILE_CACHE_DIR):
+        self.key = key
+        self.directory = os.path.join(cache_dir, key)
+        self.artifacts_path = os.path.join(self.directory, "artifacts.bin")
+        self.loaded = False
+        self._persisted = False
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def activate(self) -> None:
+        """컴파일 전에 호출하여 캐시 디렉토리 지정과 저장된 산출물 로드를 수행합니다."""
+        import torch
+
+        if "TORCHINDUCTOR_CACHE_DIR" in os.environ:
+            logger.info(f"TORCHINDUCTOR_CACHE_DIR가 이미 설정되어 있어 그대로 사용합니다: {os.environ['TORCHINDUCTOR_CACHE_DIR']}")
+        else:
+            os.environ["TORCHINDUCTOR_CACHE_DIR"] = os.path.join(self.directory, "inductor")
+
+        load_artifacts = getattr(torch.compiler, "load_cache_artifacts", None)
+        if load_artifacts is not None and os.path.exists(self.artifacts_path):
+            try:
+                with open(self.artifacts_path, "rb") as f:
+                    load_artifacts(f.read())
+                self.loaded = True
+                self._persisted = True
+                logger.info(f"컴파일 캐시 로드: {self.artifacts_path}")
+            except Exception as e:
+                logger.warning(f"컴파일 캐시 로드 실패 (다시 컴파일합니다): {e}")
+
+    def persist_once(self) -> None:
+        """첫 추론(컴파일) 뒤 한 번만 산출물을 저장합니다."""
+        if self._persisted:
+            return
+        with self._lock:
+            if self._persisted:
+                return
+            self._persisted = True
+            import torch
+
+            save_artifacts = getattr(torch.compiler, "save_cache_artifacts", None)
+            if save_artifacts is None:
+                return
+            try:
+                result = save_artifacts()
+                if result is None:
+                    return
+                artifacts, _ = result
+                temp_path = f"{self.artifacts_path}.{os.getpid()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(artifacts)
+                os.replace(temp_path, self.artifacts_path)
+                logger.info(f"컴파일 캐시 저장: {self.artifacts_path} ({len(artifacts) / 1024:.0f}KB)")
+            except Exception as e:
+                logger.warning(f"컴파일 캐시 저장 실패: {e}")
+
+
+def compile_for_inference(model, ckpt_path: str, device: str, cpu_mode: str = "fp32") -> Optional[CompileCache]:
+    """Metis 서브모듈을 torch.compile로 감싸고 디스크 캐시를 연결합니다.
+
+    실제 컴파일은 첫 추론(시작 시 워밍업)에서 일어나며, 문장 길이가 매번 다르므로 dynamic shape로 컴파일합니다.
+
+    Returns:
+        Optional[CompileCache]: 컴파일 캐시 (대상 서브모듈이 없으면 None)
+    """
+    modules = target_modules(model, exclude=[])
+    if not modules:
+        logger.warning("컴파일 대상 서브모듈이 없습니다 (모의 모델이거나 구조가 다름)")
+        return None
+
+    import torch
+
+    # 컴파일 실패 시 추론이 실패하지 않고 eager로 실행되도록 함
+    torch._dynamo.config.suppress_errors = True
+
+    cache = CompileCache(compile_cache_key(ckpt_path, device, cpu_mode, model))
+    cache.activate()
+    for _, module in modules:
+        # Metis는 서브모듈의 forward 외 메서드도 호출하므로 직계 자식도 함께 컴파일
+        for target in [module, *module.children()]:
+            target.compile(mode=METIS_COMPILE_MODE, dynamic=True)
+    logger.info(
+        f"torch.compile 적용: {[name for name, _ in modules]} "
+        f"(모드: {METIS_COMPILE_MODE}, 캐시: {cache.directory}, 캐시 로드: {cache.loaded})"
+    )
+    return cache
+
+
+# Metis가 합성마다 프롬프트 음성에 호출하는 인코딩 메서드 (호출 순서대로 기록/재생)
+PROMPT_ENCODER_METHODS = ("extract_features", "extract_semantic_code", "extract_acoustic_code")
+
+
+def _to_host(value):
+    """텐서를 CPU로 옮겨 (텐서, 원래 장치)로 바꿉니다 (캐시 보관/직렬화용)."""
+    if hasattr(value, "detach") and hasattr(value, "device"):
+        return ("tensor", value.detach().cpu(), str(value.device))
+    if isinstance(value, (tuple, list)):
+        return (type(value).__name__, [_to_host(item) for item in value])
+    return ("value", value)
+
+
+def _to_device(entry):
+    kind, value = entry[0], entry[1]
+    if kind == "tensor":
+        return value.to(entry[2])
+    if kind in ("tuple", "list"):
+        items = [_to_device(item) for item in value]
+        return tuple(items) if kind == "tuple" else items
+    return value
+
+
+def feature_nbytes(entry) -> int:
+    """기록된 프롬프트 특징의 메모리 크기 (바이트)"""
+    kind, value = entry[0], entry[1]
+    if kind == "tensor":
+        return value.element_size() * value.nelement()
+    if kind in ("tuple", "list"):
+        return sum(feature_nbytes(item) for item in value)
+    return int(getattr(value, "nbytes", 0))
+
+
+def has_prompt_encoder(model) -> bool:
+    """모델에 가로챌 프롬프트 인코딩 메서드가 있는지 여부 (없으면 특징 캐시를 조회하지 않음)"""
+    return any(getattr(model, name, None) is not None for name in PROMPT_ENCODER_METHODS)
+
+
+@contextmanager
+def prompt_feature_scope(model, cached: Optional[List[tuple]] = None) -> Iterator[List[tuple]]:
+    """합성 한 번 동안 프롬프트 인코딩 메서드를 가로채 결과를 기록하거나 재사용합니다.
+
+    cached가 없으면 인코딩 결과를 (메서드 이름, CPU 텐서) 목록으로 기록하고,
+    있으면 같은 순서의 호출에 기록된 결과를 원래 장치로 옮겨 돌려주어 프롬프트를 다시 인코딩하지 않습니다.
+    호출 순서가 기록과 다르면 그 호출부터는 원래 메서드를 실행합니다.
+    인코딩 메서드가 없는 모델(모의 모델 등)은 아무것도 기록하지 않습니다.
+    모델 인스턴스를 일시적으로 바꾸므로 같은 모델을 쓰는 추론 실행기 스레드에서만 호출해야 합니다.
+
+    Yields:
+        List[tuple]: 이번 합성에서 기록한 특징 (cached를 재생했으면 빈 목록)
+    """
+    recorded: List[tuple] = []
+    replay = list(cached or [])
+    state = {"position": 0, "diverged": not replay}
+    patched = []
+
+    def wrap(name, method):
+        @functools.wraps(method)
+        def encoder(*args, **kwargs):
+            position = state["position"]
+            state["position"] += 1
+            if not state["diverged"] and position < len(replay) and replay[position][0] == name:
+                return _to_device(replay[position][1])
+            state["diverged"] = True
+            result = method(*args, **kwargs)
+            if not replay:
+                recorded.append((name, _to_host(result)))
+            return result
+        return encoder
+
+    for name in PROMPT_ENCODER_METHODS:
+        method = getattr(model, name, None)
+        if method is None:
+            continue
+        patched.append((name, name in getattr(model, "__dict__", {}), method))
+        setattr(model, name, wrap(name, method))
+    try:
+        yield recorded
+    finally:
+        for name, own, method in patched:
+            if own:
+                setattr(model, name, method)
+            else:
+                delattr(model, name)
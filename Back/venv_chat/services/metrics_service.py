@@ -0,0 +1,329 @@
+"""
+메트릭 서비스 모듈
+
+Prometheus 텍스트 포맷으로 노출되는 경량 메트릭 레지스트리를 제공합니다.
+외부 의존성 없이 히스토그램/카운터/게이지를 지원하며, 관측 비용은
+락 한 번과 이진 탐색 한 번 수준으로 핫 패스에 거의 영향을 주지 않습니다.
+"""
+
+import time
+import bisect
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from services.tracing_service import record_span
+
+# 메트릭 이름 접두사
+METRIC_PREFIX = "venomvoice"
+
+# 기본 히스토그램 버킷 (초 단위, 5ms ~ 60s)
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """라벨 값을 Prometheus 텍스트 포맷에 맞게 이스케이프합니다."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """라벨 이름/값을 `{a="x",b="y"}` 형식 문자열로 변환합니다."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """메트릭 공통 기반 클래스"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = f"{METRIC_PREFIX}_{name}"
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def collect(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self.collect())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """증감 가능한 게이지"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 조합별 [버킷별 카운트..., +Inf 카운트], 합계
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            snapshot = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+
+        lines = []
+        for key, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += counts[-1]
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 레지스트리"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                return self._metrics[metric.name]
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """모든 메트릭을 Prometheus 텍스트 포맷으로 반환합니다."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+# 전역 레지스트리
+registry = MetricsRegistry()
+
+# 단계별 지연 시간 (audio_decode, whisper_inference, deepseek_roundtrip, tts_sentence, audio_encode)
+STAGE_LATENCY = registry.register(Histogram(
+    "stage_duration_seconds",
+    "Per-stage latency of the voice pipeline",
+    ("stage", "endpoint", "model"),
+))
+
+# HTTP 요청 전체 지연 시간
+REQUEST_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "End-to-end HTTP request latency",
+    ("endpoint", "method", "status"),
+))
+
+# 엔드포인트별 처리 중인 요청 수
+IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled",
+    ("endpoint",),
+))
+
+# 캐시 조회 결과 (hit/miss) - 적중률은 hit / (hit + miss)로 계산합니다
+CACHE_REQUESTS = registry.register(Counter(
+    "cache_requests_total",
+    "Cache lookups by result",
+    ("cache", "result", "endpoint", "model"),
+))
+
+# 추론 큐 대기 작업 수 (실행 중 작업 포함)
+QUEUE_DEPTH = registry.register(Gauge(
+    "queue_depth",
+    "Jobs waiting or running on an inference queue",
+    ("queue", "model"),
+))
+
+# 큐 대기 시간
+QUEUE_WAIT = registry.register(Histogram(
+    "queue_wait_seconds",
+    "Time a job spent waiting on an inference queue",
+    ("queue", "endpoint", "model"),
+))
+
+
+def resolve_endpoint(scope: dict) -> str:
+    """요청 scope에 해당하는 라우트 경로 템플릿을 반환합니다.
+
+    원시 경로 대신 `/tts/download/{file_name}` 같은 템플릿을 라벨로 사용하여
+    라벨 조합이 무한히 늘어나는 것을 막습니다.
+    """
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match.name == "FULL":
+            return getattr(route, "path", scope.get("path", ""))
+    return "unmatched"
+
+
+class RequestContext:
+    """요청 단위 컨텍스트"""
+
+    __slots__ = ("endpoint",)
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+
+
+_request_context: contextvars.ContextVar[Optional[RequestContext]] = contextvars.ContextVar(
+    "metrics_request_context", default=None
+)
+
+
+def current_endpoint() -> str:
+    """현재 요청의 엔드포인트 라벨을 반환합니다 (요청 밖에서는 'background')."""
+    ctx = _request_context.get()
+    return ctx.endpoint if ctx is not None else "background"
+
+
+def observe_stage(stage: str, seconds: float, model: str = "") -> None:
+    """단계 지연 시간을 기록합니다 (현재 요청 트레이스에도 구간으로 추가)."""
+    STAGE_LATENCY.observe(seconds, stage=stage, endpoint=current_endpoint(), model=model)
+    record_span(stage, seconds)
+
+
+@contextmanager
+def stage_timer(stage: str, model: str = "") -> Iterator[None]:
+    """블록 실행 시간을 단계 히스토그램에 기록하는 컨텍스트 매니저"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start, model)
+
+
+def record_cache(cache: str, hit: bool, model: str = "") -> None:
+    """캐시 조회 결과를 기록합니다."""
+    CACHE_REQUESTS.inc(
+        cache=cache,
+        result="hit" if hit else "miss",
+        endpoint=current_endpoint(),
+        model=model,
+    )
+
+
+class MetricsMiddleware:
+    """요청 수/지연 시간/처리 중 요청 수를 기록하는 ASGI 미들웨어
+
+    BaseHTTPMiddleware 대신 순수 ASGI 미들웨어로 구현하여
+    스트리밍 응답을 버퍼링하지 않고 요청당 오버헤드를 최소화합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(resolve_endpoint(scope))
+        token = _request_context.set(ctx)
+        status_holder = {"status": "500"}
+        IN_FLIGHT.inc(endpoint=ctx.endpoint)
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec(endpoint=ctx.endpoint)
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - start,
+                endpoint=ctx.endpoint,
+                method=scope.get("method", ""),
+                status=status_holder["status"],
+            )
+            _request_context.reset(token)
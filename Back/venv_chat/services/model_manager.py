@@ -0,0 +1,174 @@
+"""
+모델 사전 로드 및 워밍업 모듈
+
+서버 시작 시 STT(Whisper)와 TTS(Metis) 모델을 백그라운드 스레드에서 동시에 로드하고,
+설정된 워밍업 추론(할당자 초기화, 커널 선택 등)을 실행합니다.
+두 모델이 모두 워밍업을 마친 뒤에만 준비 완료(ready)로 보고합니다.
+
+환경 변수:
+    MODEL_PRELOAD: "0"이면 시작 시 사전 로드를 하지 않음 (기본 "1")
+    MODEL_WARMUP: "0"이면 워밍업 추론을 건너뜀 (기본 "1")
+    TTS_WARMUP_TEXT: TTS 워밍업 문장
+    STT_WARMUP_SECONDS: STT 워밍업 오디오 길이 (초, 기본 1.0)
+"""
+
+import io
+import os
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import soundfile as sf
+
+from services.inference_executor import PRIORITY_BACKGROUND
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+MODEL_PRELOAD = os.getenv("MODEL_PRELOAD", "1") != "0"
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "1") != "0"
+TTS_WARMUP_TEXT = os.getenv("TTS_WARMUP_TEXT", "안녕하세요, 메티스 TTS입니다.")
+STT_WARMUP_SECONDS = float(os.getenv("STT_WARMUP_SECONDS", "1.0"))
+
+
+class ModelState:
+    """모델 로드 상태"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = "pending"  # pending -> loading -> warming -> ready / failed
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "status": self.status,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds,
+            "error": self.error,
+        }
+
+
+# 모델별 상태
+model_states: Dict[str, ModelState] = {
+    "stt": ModelState("stt"),
+    "tts": ModelState("tts"),
+}
+
+_preload_lock = threading.Lock()
+_preload_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _warmup_audio_bytes(seconds: float) -> bytes:
+    """STT 워밍업용 WAV 바이트 (약한 노이즈)를 생성합니다."""
+    rng = np.random.default_rng(0)
+    samples = (0.01 * rng.standard_normal(int(16000 * seconds))).astype(np.float32)
+    buffer = io.BytesIO()
+    sf.write(buffer, samples, 16000, format="WAV")
+    return buffer.getvalue()
+
+
+def _load_stt():
+    from services.stt_service import get_stt_service
+    return get_stt_service()
+
+
+def _warmup_stt(service) -> None:
+    # 요청 처리와 같은 실행기 스레드에서 실행하여 모델 동시 호출을 막음
+    audio = _warmup_audio_bytes(STT_WARMUP_SECONDS)
+    # 부하 제어기의 지연 시간 창에 첫 호출 시간이 들어가지 않도록 백그라운드 우선순위로 제출
+    service.executor.submit_with_priority(PRIORITY_BACKGROUND, service._transcribe_sync, audio, "ko").result()
+
+
+def _load_tts():
+    from routes.tts import get_tts_service
+    return get_tts_service()
+
+
+def _warmup_tts(service) -> None:
+    service.executor.submit_with_priority(PRIORITY_BACKGROUND, service.synthesize, TTS_WARMUP_TEXT, use_cache=False).result()
+
+    # 음성 대화용 필러를 준비 (디스크 캐시가 없으면 합성하며, 이것도 워밍업 역할)
+    from services import filler_service
+    if filler_service.enabled():
+        filler_service.get_library().load(service)
+
+
+def _load_and_warm(name: str, load: Callable[[], object], warmup: Callable[[object], None], run_warmup: bool) -> None:
+    """모델 하나를 로드하고 워밍업합니다 (백그라운드 스레드에서 실행)."""
+    state = model_states[name]
+    try:
+        state.status = "loading"
+        start = time.perf_counter()
+        service = load()
+        state.load_seconds = round(time.perf_counter() - start, 3)
+        logger.info(f"[{name}] 모델 로드 완료: {state.load_seconds:.2f}초")
+
+        # 추론 서버 클라이언트는 서버가 이미 워밍업을 마쳤으므로 건너뜀
+        if run_warmup and not getattr(service, "remote", False):
+            state.status = "warming"
+            start = time.perf_counter()
+            warmup(service)
+            state.warmup_seconds = round(time.perf_counter() - start, 3)
+            logger.info(f"[{name}] 워밍업 완료: {state.warmup_seconds:.2f}초")
+
+        state.status = "ready"
+        if all(other.ready for other in model_states.values()):
+            logger.info("모든 모델 준비 완료 (STT/TTS)")
+    except Exception as e:
+        state.status = "failed"
+        state.error = str(e)
+        logger.error(f"[{name}] 모델 사전 로드 실패: {e}")
+
+
+def start_preload(run_warmup: bool = MODEL_WARMUP) -> Dict[str, Future]:
+    """STT/TTS 모델을 백그라운드 스레드에서 동시에 로드/워밍업합니다.
+
+    Returns:
+        Dict[str, Future]: 모델별 작업 Future
+    """
+    global _preload_pool
+    with _preload_lock:
+        if _preload_pool is None:
+            _preload_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="model-preload")
+
+    logger.info(f"모델 사전 로드 시작 (워밍업: {run_warmup})")
+    return {
+        "stt": _preload_pool.submit(_load_and_warm, "stt", _load_stt, _warmup_stt, run_warmup),
+        "tts": _preload_pool.submit(_load_and_warm, "tts", _load_tts, _warmup_tts, run_warmup),
+    }
+
+
+def shutdown_preload() -> None:
+    """사전 로드 스레드 풀을 정리합니다 (진행 중 작업은 기다리지 않음)."""
+    global _preload_pool
+    with _preload_lock:
+        if _preload_pool is not None:
+            _preload_pool.shutdown(wait=False, cancel_futures=True)
+            _preload_pool = None
+
+
+def is_ready() -> bool:
+    """모든 모델이 로드와 워밍업을 마쳤는지 반환합니다.
+
+    사전 로드가 꺼져 있으면 모델은 첫 요청에서 지연 로드되므로 항상 준비 완료로 봅니다.
+    """
+    if not MODEL_PRELOAD:
+        return True
+    return all(state.ready for state in model_states.values())
+
+
+def readiness() -> Dict[str, object]:
+    """준비 상태 요약을 반환합니다."""
+    return {
+        "ready": is_ready(),
+        "models": {name: state.to_dict() for name, state in model_states.items()},
+    }
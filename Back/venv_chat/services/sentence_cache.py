@@ -0,0 +1,121 @@
+"""
+문장 단위 TTS 오디오 캐시 모듈
+
+긴 응답을 문장(정규화된 조각) 단위로 합성할 때, 조각별 오디오를 캐시하여
+서로 다른 응답이 같은 문장("좋은 질문이에요." 등)을 공유하면 다시 합성하지 않습니다.
+항목 수와 바이트 예산을 모두 넘지 않도록 LRU로 제거하며, 문장 단위/응답 단위 적중률을 집계합니다.
+
+환경 변수:
+    TTS_SENTENCE_CACHE_ENTRIES: 최대 항목 수 (기본 1024, 0이면 비활성화)
+    TTS_SENTENCE_CACHE_MB: 최대 오디오 바이트 (기본 128MB)
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+TTS_SENTENCE_CACHE_ENTRIES = int(os.getenv("TTS_SENTENCE_CACHE_ENTRIES", "1024"))
+TTS_SENTENCE_CACHE_MB = float(os.getenv("TTS_SENTENCE_CACHE_MB", "128"))
+
+
+class SentenceAudioCache:
+    """문장 오디오 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries: int = TTS_SENTENCE_CACHE_ENTRIES, max_bytes: int = int(TTS_SENTENCE_CACHE_MB * 1024 * 1024)):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        # 문장 단위 통계
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # 응답 단위 통계
+        self.replies = 0
+        self.full_hit_replies = 0
+        self.partial_hit_replies = 0
+        self._reply_hit_ratio_sum = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """캐시된 문장 오디오를 반환합니다 (없으면 None)."""
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return audio
+
+    def put(self, key: str, audio: np.ndarray) -> None:
+        """문장 오디오를 저장합니다 (바이트 예산보다 큰 오디오는 저장하지 않음)."""
+        if not self.enabled or audio.nbytes > self.max_bytes:
+            return
+        # 호출자가 반환받은 배열을 수정해도 캐시가 바뀌지 않도록 읽기 전용으로 보관
+        audio = np.array(audio, copy=True)
+        audio.setflags(write=False)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = audio
+            self._bytes += audio.nbytes
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def record_reply(self, hits: int, sentences: int) -> None:
+        """응답 하나의 문장 적중 결과를 집계합니다."""
+        if sentences <= 0:
+            return
+        with self._lock:
+            self.replies += 1
+            if hits == sentences:
+                self.full_hit_replies += 1
+            elif hits:
+                self.partial_hit_replies += 1
+            self._reply_hit_ratio_sum += hits / sentences
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, object]:
+        """문장 단위/응답 단위 적중률과 사용량"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "sentence": {
+                    "hits": self.hits,
+                    "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0,
+                },
+                "reply": {
+                    "replies": self.replies,
+                    "full_hits": self.full_hit_replies,
+                    "partial_hits": self.partial_hit_replies,
+                    "full_hit_rate": self.full_hit_replies / self.replies if self.replies else 0.0,
+                    "mean_sentence_hit_ratio": self._reply_hit_ratio_sum / self.replies if self.replies else 0.0,
+                },
+            }
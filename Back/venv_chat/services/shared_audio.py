@@ -0,0 +1,109 @@
+"""
+공유 메모리 오디오 버퍼 모듈
+
+API 워커와 추론 서버 프로세스 사이에서 오디오(float32 PCM)를 피클링 없이 주고받기 위한
+공유 메모리 버퍼입니다. 연결마다 방향별 버퍼를 하나씩 두고 재사용하며,
+더 큰 오디오가 오면 새 세그먼트로 키웁니다 (이름이 바뀌면 읽는 쪽이 다시 연결).
+"""
+
+import sys
+import logging
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+DTYPE = np.float32
+MIN_BUFFER_BYTES = 1 << 20  # 1MB (16kHz 모노 약 16초)
+
+# 세그먼트 생성과 추적 없는 연결이 서로 겹치지 않도록 보호
+_track_lock = threading.Lock()
+
+
+def _create(size: int) -> shared_memory.SharedMemory:
+    with _track_lock:
+        return shared_memory.SharedMemory(create=True, size=size)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """resource_tracker에 등록하지 않고 기존 세그먼트에 연결합니다.
+
+    소유자(쓰는 쪽)가 삭제를 책임지므로 읽는 쪽은 추적하면 안 됩니다.
+    Python 3.13 미만은 연결만 해도 등록되어 읽는 쪽 종료 시 세그먼트가 지워지므로 등록을 잠시 막습니다.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    with _track_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _close_quietly(shm: shared_memory.SharedMemory) -> None:
+    """매핑을 닫습니다. 아직 참조 중인 뷰가 있으면 GC가 정리하도록 둡니다."""
+    try:
+        shm.close()
+    except BufferError:
+        logger.debug(f"공유 메모리 뷰가 남아 있어 닫기를 미룹니다: {shm.name}")
+
+
+class SharedAudioWriter:
+    """쓰는 쪽(소유자)의 재사용 버퍼 (생성/삭제 책임)"""
+
+    def __init__(self):
+        self._shm: Optional[shared_memory.SharedMemory] = None
+
+    def write(self, audio: np.ndarray) -> Tuple[str, int]:
+        """오디오를 버퍼에 복사하고 (세그먼트 이름, 샘플 수)를 반환합니다.
+
+        Args:
+            audio: 1차원 오디오 배열 (float32로 변환)
+
+        Returns:
+            Tuple[str, int]: 공유 메모리 이름, 샘플 수
+        """
+        audio = np.ascontiguousarray(audio, dtype=DTYPE).reshape(-1)
+        if self._shm is None or self._shm.size < audio.nbytes:
+            # 크기가 부족하면 2배 이상으로 키워 재할당 횟수를 줄임
+            size = max(MIN_BUFFER_BYTES, audio.nbytes, 2 * (self._shm.size if self._shm else 0))
+            self.close()
+            self._shm = _create(size)
+        np.ndarray(audio.shape, dtype=DTYPE, buffer=self._shm.buf)[:] = audio
+        return self._shm.name, audio.size
+
+    def close(self) -> None:
+        """세그먼트를 닫고 삭제합니다."""
+        if self._shm is not None:
+            _close_quietly(self._shm)
+            self._shm.unlink()
+            self._shm = None
+
+
+class SharedAudioReader:
+    """읽는 쪽의 매핑 캐시 (상대가 버퍼를 키우면 새 이름으로 다시 연결)"""
+
+    def __init__(self):
+        self._shm: Optional[shared_memory.SharedMemory] = None
+
+    def view(self, name: str, samples: int) -> np.ndarray:
+        """공유 메모리의 오디오를 복사 없이 배열 뷰로 반환합니다.
+
+        반환된 뷰는 같은 연결에서 다음 요청을 보내기 전까지만 유효합니다.
+        """
+        if self._shm is None or self._shm.name != name:
+            self.close()
+            self._shm = _attach(name)
+        return np.ndarray((samples,), dtype=DTYPE, buffer=self._shm.buf)
+
+    def close(self) -> None:
+        """매핑을 닫습니다 (세그먼트는 삭제하지 않음)."""
+        if self._shm is not None:
+            _close_quietly(self._shm)
+            self._shm = None
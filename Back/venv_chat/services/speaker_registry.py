@@ -0,0 +1,317 @@
+"""
+화자 등록 모듈
+
+참조 음성과 그 대본을 화자 ID로 등록하고, 합성할 때 필요한 프롬프트 특징을 캐시합니다.
+
+- 화자: TTS_SPEAKERS_DIR/<화자 ID>/ 아래에 참조 음성(prompt.wav)과 메타데이터(speaker.json)를 저장
+- 프롬프트 특징: 음성 지문(프롬프트 음성/텍스트/샘플 레이트의 해시)을 키로
+  메모리 LRU(바이트 예산) → 디스크(TTS_SPEAKER_FEATURES_DIR) 순으로 조회하고,
+  둘 다 없으면 첫 합성에서 인코딩한 결과를 두 곳에 저장합니다.
+  메모리에서 밀려난 화자는 디스크에서 다시 읽으므로 많은 화자를 써도 참조 음성을 다시 인코딩하지 않고
+  모든 화자를 메모리에 두지도 않습니다.
+
+같은 ID로 다시 등록하면 음성 지문이 바뀌므로 이전 특징과 캐시된 합성 결과는 쓰이지 않습니다.
+
+환경 변수:
+    TTS_SPEAKERS_DIR: 등록된 화자 디렉토리 (기본 Back/venv_chat/assets/speakers)
+    TTS_SPEAKER_FEATURES_DIR: 프롬프트 특징 디스크 캐시 (기본 Back/venv_chat/.cache/speaker_features, 빈 값이면 메모리만)
+    TTS_SPEAKER_CACHE_MB: 메모리에 둘 프롬프트 특징 최대 크기 (기본 256MB)
+    TTS_SPEAKER_MAX_PROMPT_SECONDS: 참조 음성 최대 길이 (기본 30초)
+"""
+
+import os
+import re
+import json
+import time
+import pickle
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from services.metis_runtime import feature_nbytes
+from services.metrics_service import record_cache
+from services.tts_disk_cache import voice_fingerprint
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TTS_SPEAKERS_DIR = os.getenv("TTS_SPEAKERS_DIR", os.path.join(_BASE_DIR, "assets", "speakers"))
+TTS_SPEAKER_FEATURES_DIR = os.getenv("TTS_SPEAKER_FEATURES_DIR", os.path.join(_BASE_DIR, ".cache", "speaker_features"))
+TTS_SPEAKER_CACHE_MB = float(os.getenv("TTS_SPEAKER_CACHE_MB", "256"))
+TTS_SPEAKER_MAX_PROMPT_SECONDS = float(os.getenv("TTS_SPEAKER_MAX_PROMPT_SECONDS", "30"))
+
+# 참조 음성 저장 샘플 레이트 (Metis 코덱 입력과 같은 24kHz, STT용 16kHz로 낮추면 8kHz 이상 대역이 사라짐)
+PROMPT_SAMPLE_RATE = 24000
+# 참조 음성 최소 길이 (이보다 짧으면 음색을 잡기 어려움)
+MIN_PROMPT_SECONDS = 1.0
+SPEAKER_ID_PATTERN = re.compile(r"[\w-]{1,64}")
+
+
+@dataclass
+class Speaker:
+    """등록된 화자"""
+
+    speaker_id: str
+    prompt_text: str
+    fingerprint: str
+    duration: float
+    created_at: float
+    prompt_path: str = ""
+
+    def to_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        data.pop("prompt_path")
+        return data
+
+
+class PromptFeatureCache:
+    """음성 지문별 프롬프트 특징 캐시 (메모리 LRU + 디스크, 스레드 안전)"""
+
+    def __init__(self, directory: str = TTS_SPEAKER_FEATURES_DIR, max_bytes: int = int(TTS_SPEAKER_CACHE_MB * 1024 * 1024)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[List[tuple], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self.directory, f"{fingerprint}.pkl")
+
+    def get(self, fingerprint: str) -> Optional[List[tuple]]:
+        """특징을 메모리, 디스크 순으로 찾습니다 (디스크에서 읽으면 메모리로 올림)."""
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                self._entries.move_to_end(fingerprint)
+                self.memory_hits += 1
+        record_cache("speaker_features_memory", entry is not None)
+        if entry is not None:
+            return entry[0]
+
+        features = self._load(fingerprint)
+        record_cache("speaker_features_disk", features is not None)
+        with self._lock:
+            if features is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._remember(fingerprint, features)
+        return features
+
+    def put(self, fingerprint: str, features: List[tuple]) -> None:
+        """새로 인코딩한 특징을 메모리와 디스크에 저장합니다."""
+        if not features:
+            return
+        self._remember(fingerprint, features)
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                path = self._path(fingerprint)
+                temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_path, "wb") as f:
+                    pickle.dump(features, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, path)
+            except Exception as e:
+                logger.warning(f"프롬프트 특징 저장 실패: {fingerprint} ({e})")
+
+    def _load(self, fingerprint: str) -> Optional[List[tuple]]:
+        if not self.directory:
+            return None
+        try:
+            # 서버가 직접 쓴 캐시 파일만 읽음 (외부 입력 아님)
+            with open(self._path(fingerprint), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"프롬프트 특징 읽기 실패: {fingerprint} ({e})")
+            return None
+
+    def _remember(self, fingerprint: str, features: List[tuple]) -> None:
+        """메모리 LRU에 넣고 바이트 예산을 넘는 오래된 항목을 제거합니다 (디스크에는 남음)."""
+        size = sum(feature_nbytes(entry) for _, entry in features)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(fingerprint, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[fingerprint] = (features, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def discard(self, fingerprint: str) -> None:
+        """특징을 메모리와 디스크에서 지웁니다."""
+        with self._lock:
+            entry = self._entries.pop(fingerprint, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+        if self.directory:
+            try:
+                os.unlink(self._path(fingerprint))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class SpeakerRegistry:
+    """화자 등록/조회 (메타데이터는 디스크가 기준, 메모리에는 조회 결과만 캐시)"""
+
+    def __init__(self, directory: str = TTS_SPEAKERS_DIR, features: Optional[PromptFeatureCache] = None):
+        self.directory = directory
+        self.features = features or PromptFeatureCache()
+        self._speakers: Dict[str, Tuple[int, Speaker]] = {}
+        self._lock = threading.Lock()
+
+    def _dir(self, speaker_id: str) -> str:
+        return os.path.join(self.directory, speaker_id)
+
+    def get(self, speaker_id: str) -> Optional[Speaker]:
+        """등록된 화자를 반환합니다 (없거나 잘못된 ID면 None).
+
+        다른 프로세스(추론 서버, 다른 워커)가 다시 등록한 경우도 반영하도록 메타데이터 파일의 수정 시각을 확인합니다.
+        """
+        if not SPEAKER_ID_PATTERN.fullmatch(speaker_id or ""):
+            return None
+        meta_path = os.path.join(self._dir(speaker_id), "speaker.json")
+        try:
+            mtime = os.stat(meta_path).st_mtime_ns
+        except FileNotFoundError:
+            with self._lock:
+                self._speakers.pop(speaker_id, None)
+            return None
+        with self._lock:
+            cached = self._speakers.get(speaker_id)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                speaker = Speaker(**json.load(f))
+        except Exception as e:
+            logger.warning(f"화자 메타데이터 읽기 실패: {speaker_id} ({e})")
+            return None
+        speaker.prompt_path = os.path.join(self._dir(speaker_id), "prompt.wav")
+        with self._lock:
+            self._speakers[speaker_id] = (mtime, speaker)
+        return speaker
+
+    def list(self) -> List[Speaker]:
+        if not os.path.isdir(self.directory):
+            return []
+        speakers = [self.get(name) for name in sorted(os.listdir(self.directory))]
+        return [speaker for speaker in speakers if speaker is not None]
+
+    def register(self, speaker_id: str, audio: np.ndarray, sample_rate: int, prompt_text: str, overwrite: bool = False) -> Speaker:
+        """참조 음성과 대본을 화자로 등록합니다 (프롬프트 특징은 첫 합성에서 인코딩).
+
+        Args:
+            speaker_id: 화자 ID (영문/숫자/한글, _, -)
+            audio: 모노 float32 참조 음성
+            sample_rate: audio의 샘플 레이트
+            prompt_text: 참조 음성의 대본
+            overwrite: 이미 있는 ID를 덮어쓸지 여부
+
+        Raises:
+            ValueError: 잘못된 ID, 빈 대본, 너무 짧은 음성
+            FileExistsError: 이미 등록된 ID (overwrite가 아닐 때)
+        """
+        if not SPEAKER_ID_PATTERN.fullmatch(speaker_id or ""):
+            raise ValueError(f"잘못된 화자 ID: {speaker_id} (영문/숫자/한글, _, - 최대 64자)")
+        prompt_text = (prompt_text or "").strip()
+        if not prompt_text:
+            raise ValueError("참조 음성의 대본(prompt_text)이 필요합니다")
+        duration = len(audio) / sample_rate
+        if duration < MIN_PROMPT_SECONDS:
+            raise ValueError(f"참조 음성이 너무 짧습니다 (최소 {MIN_PROMPT_SECONDS:g}초)")
+
+        previous = self.get(speaker_id)
+        if previous is not None and not overwrite:
+            raise FileExistsError(f"이미 등록된 화자입니다: {speaker_id}")
+
+        directory = self._dir(speaker_id)
+        os.makedirs(directory, exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        prompt_path = os.path.join(directory, "prompt.wav")
+        sf.write(prompt_path + suffix, audio, sample_rate, format="WAV")
+        with open(prompt_path + suffix, "rb") as f:
+            prompt_checksum = hashlib.sha256(f.read()).hexdigest()
+        os.replace(prompt_path + suffix, prompt_path)
+
+        speaker = Speaker(
+            speaker_id=speaker_id,
+            prompt_text=prompt_text,
+            fingerprint=voice_fingerprint(prompt_path, prompt_text, sample_rate, prompt_checksum),
+            duration=round(duration, 3),
+            created_at=time.time(),
+            prompt_path=prompt_path,
+        )
+        meta_path = os.path.join(directory, "speaker.json")
+        with open(meta_path + suffix, "w", encoding="utf-8") as f:
+            json.dump(speaker.to_dict(), f, ensure_ascii=False)
+        # 메타데이터를 마지막에 교체하여 조회 시 항상 새 음성과 짝이 맞도록 함
+        os.replace(meta_path + suffix, meta_path)
+        if previous is not None and previous.fingerprint != speaker.fingerprint:
+            self.features.discard(previous.fingerprint)
+        logger.info(f"화자 등록: {speaker_id} ({duration:.1f}초, 지문 {speaker.fingerprint})")
+        return speaker
+
+    def delete(self, speaker_id: str) -> bool:
+        """화자와 그 프롬프트 특징을 삭제합니다."""
+        speaker = self.get(speaker_id)
+        if speaker is None:
+            return False
+        directory = self._dir(speaker_id)
+        for name in ("speaker.json", "prompt.wav"):
+            try:
+                os.unlink(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass
+        with self._lock:
+            self._speakers.pop(speaker_id, None)
+        self.features.discard(speaker.fingerprint)
+        logger.info(f"화자 삭제: {speaker_id}")
+        return True
+
+
+_registry: Optional[SpeakerRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_speaker_registry() -> SpeakerRegistry:
+    """프로세스 공용 화자 레지스트리를 반환합니다."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = SpeakerRegistry()
+    return _registry
@@ -0,0 +1,412 @@
+"""
+STT 일괄 인식 모듈
+
+오프라인 분석용으로 녹음 파일 여러 개를 한 요청으로 받아 인식합니다.
+파일 목록(multipart 파일 파트 여러 개) 또는 zip/tar 아카이브를 받아 파일마다 임시 파일(1MB 초과 시 디스크)에 두고,
+디코딩은 스레드 여러 개에서 병렬로, 인식은 STT 실행기에서 BatchedInferencePipeline으로 수행하여
+끝나는 순서대로 파일별 결과(시간, 오류 포함)를 내보냅니다.
+
+인식 작업은 낮은 우선순위(PRIORITY_BACKGROUND)로 제출되므로 대화 요청의 STT가 먼저 실행됩니다.
+
+환경 변수:
+    STT_BATCH_MAX_FILES: 요청당 최대 파일 수 (기본 256)
+    STT_BATCH_MAX_MB: 요청 본문 최대 크기, 아카이브는 압축을 푼 크기 기준 (기본 500MB)
+    STT_BATCH_DECODE_WORKERS: 동시에 디코딩할 파일 수 (기본 CPU 수, 최대 8)
+"""
+
+import os
+import time
+import asyncio
+import logging
+import tarfile
+import zipfile
+import tempfile
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, IO, List, Tuple
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+from services.audio_upload import (
+    MAX_FIELD_BYTES,
+    SAMPLE_RATE,
+    SPOOL_MAX_MEMORY,
+    UPLOAD_MAX_AUDIO_SECONDS,
+    UploadError,
+    UploadTooLarge,
+    decode_audio_file,
+)
+from services.inference_executor import PRIORITY_BACKGROUND
+from services.metrics_service import observe_stage
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+STT_BATCH_MAX_FILES = int(os.getenv("STT_BATCH_MAX_FILES", "256"))
+STT_BATCH_MAX_MB = float(os.getenv("STT_BATCH_MAX_MB", "500"))
+STT_BATCH_DECODE_WORKERS = int(os.getenv("STT_BATCH_DECODE_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+# 요청 본문 전체를 아카이브로 받을 때의 Content-Type
+ARCHIVE_CONTENT_TYPES = (
+    b"application/zip",
+    b"application/x-zip-compressed",
+    b"application/x-tar",
+    b"application/gzip",
+    b"application/x-gzip",
+    b"application/x-gtar",
+)
+
+
+@dataclass
+class BatchFile:
+    """일괄 인식할 파일 하나 (index는 요청 안에서의 순서)"""
+
+    index: int
+    filename: str
+    file: IO[bytes]
+
+
+def _new_spool() -> IO[bytes]:
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+
+
+def _too_large(max_bytes: int) -> UploadTooLarge:
+    return UploadTooLarge(f"업로드가 너무 큽니다 (최대 {max_bytes / 1024 / 1024:g}MB)")
+
+
+def _copy_limited(source: IO[bytes], budget: int, max_bytes: int) -> Tuple[IO[bytes], int]:
+    """아카이브 항목을 새 임시 파일로 복사합니다 (압축을 푼 크기가 남은 한도를 넘으면 중단).
+
+    Returns:
+        Tuple[IO[bytes], int]: (임시 파일, 복사한 바이트 수)
+    """
+    spool = _new_spool()
+    copied = 0
+    while True:
+        data = source.read(64 * 1024)
+        if not data:
+            break
+        copied += len(data)
+        if copied > budget:
+            spool.close()
+            raise _too_large(max_bytes)
+        spool.write(data)
+    spool.seek(0)
+    return spool, copied
+
+
+def _is_member_audio(name: str) -> bool:
+    """디렉토리, 숨김 파일, macOS 메타데이터 항목은 건너뜀"""
+    base = os.path.basename(name.rstrip("/"))
+    return bool(base) and not base.startswith(".") and not name.startswith("__MACOSX/")
+
+
+def _expand_archive(name: str, spool: IO[bytes], budget: int, max_bytes: int) -> List[Tuple[str, IO[bytes], int]]:
+    """zip/tar 아카이브면 항목을 임시 파일로 풀고, 아니면 파일 그대로 반환합니다 (블로킹, 스레드에서 호출).
+
+    중첩된 아카이브는 풀지 않습니다.
+
+    Returns:
+        List[Tuple[str, IO[bytes], int]]: [(파일 이름, 임시 파일, 압축을 푼 크기)]
+    """
+    spool.seek(0)
+    if zipfile.is_zipfile(spool):
+        members = []
+        try:
+            with zipfile.ZipFile(spool) as archive:
+                for info in archive.infolist():
+                    if info.is_dir() or not _is_member_audio(info.filename):
+                        continue
+                    with archive.open(info) as source:
+                        member, size = _copy_limited(source, budget, max_bytes)
+                    members.append((info.filename, member, size))
+                    budget -= size
+        except zipfile.BadZipFile as e:
+            for _, member, _ in members:
+                member.close()
+            raise UploadError(f"zip 아카이브를 읽을 수 없습니다 ({name}): {e}") from e
+        except BaseException:
+            for _, member, _ in members:
+                member.close()
+            raise
+        spool.close()
+        return members
+
+    spool.seek(0)
+    try:
+        archive = tarfile.open(fileobj=spool, mode="r:*")
+    except tarfile.TarError:
+        # 아카이브가 아니면 오디오 파일로 취급
+        size = spool.seek(0, os.SEEK_END)
+        spool.seek(0)
+        return [(name, spool, size)]
+
+    members = []
+    try:
+        with archive:
+            for info in archive:
+                if not info.isfile() or not _is_member_audio(info.name):
+                    continue
+                if info.size > budget:
+                    raise _too_large(max_bytes)
+                member, size = _copy_limited(archive.extractfile(info), budget, max_bytes)
+                members.append((info.name, member, size))
+                budget -= size
+    except tarfile.TarError as e:
+        for _, member, _ in members:
+            member.close()
+        raise UploadError(f"tar 아카이브를 읽을 수 없습니다 ({name}): {e}") from e
+    except BaseException:
+        for _, member, _ in members:
+            member.close()
+        raise
+    spool.close()
+    return members
+
+
+def _collect_files(uploads: List[Tuple[str, IO[bytes]]], max_bytes: int, max_files: int) -> List[BatchFile]:
+    """업로드된 파일의 아카이브를 풀어 인식할 파일 목록을 만듭니다 (블로킹, 스레드에서 호출)."""
+    files: List[BatchFile] = []
+    # 압축을 푼 크기를 포함한 전체 크기 한도
+    budget = max_bytes
+    position = 0
+    try:
+        for position, (name, spool) in enumerate(uploads):
+            for member_name, member, size in _expand_archive(name, spool, budget, max_bytes):
+                files.append(BatchFile(len(files), member_name, member))
+                budget -= size
+                if len(files) > max_files:
+                    raise UploadTooLarge(f"파일이 너무 많습니다 (최대 {max_files}개)")
+    except BaseException:
+        close_files(files)
+        for _, spool in uploads[position:]:
+            spool.close()
+        raise
+    if not files:
+        raise UploadError("인식할 파일이 없습니다")
+    return files
+
+
+def close_files(files: List[BatchFile]) -> None:
+    """남은 임시 파일을 정리합니다."""
+    for item in files:
+        item.file.close()
+
+
+async def read_batch_upload(
+    request,
+    field: str = "files",
+    max_bytes: int = int(STT_BATCH_MAX_MB * 1024 * 1024),
+    max_files: int = STT_BATCH_MAX_FILES,
+) -> Tuple[List[BatchFile], Dict[str, str]]:
+    """일괄 인식 요청 본문을 스트리밍으로 읽어 파일 목록과 폼 필드를 반환합니다.
+
+    multipart/form-data면 field 이름의 파일 파트를 모두 받고, 본문이 zip/tar 아카이브면 그 자체를 받습니다.
+    업로드한 파일 중 zip/tar 아카이브는 항목별 파일로 풉니다.
+
+    Args:
+        request: FastAPI Request
+        field: 파일 필드 이름 (같은 이름으로 여러 파일)
+        max_bytes: 요청 본문 최대 크기 (아카이브는 압축을 푼 크기 기준)
+        max_files: 최대 파일 수
+
+    Returns:
+        Tuple[List[BatchFile], Dict[str, str]]: (파일 목록, 폼 필드)
+
+    Raises:
+        UploadTooLarge: 크기 또는 파일 수 제한 초과 (413)
+        UploadError: 요청 형식 오류, 파일 없음, 손상된 아카이브 (400)
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MAX_FIELD_BYTES:
+        raise _too_large(max_bytes)
+
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    uploads: List[Tuple[str, IO[bytes]]] = []
+    fields: Dict[str, str] = {}
+    received = 0
+
+    try:
+        if content_type in ARCHIVE_CONTENT_TYPES:
+            spool = _new_spool()
+            uploads.append(("upload", spool))
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > max_bytes:
+                    raise _too_large(max_bytes)
+                spool.write(chunk)
+        elif content_type == b"multipart/form-data" and options.get(b"boundary"):
+            await _read_multipart(request, options[b"boundary"], field, max_bytes, max_files, uploads, fields)
+        else:
+            raise UploadError("multipart/form-data 또는 zip/tar 아카이브 요청이 필요합니다")
+
+        if not uploads:
+            raise UploadError(f"'{field}' 파일 필드가 없습니다")
+        files = await asyncio.to_thread(_collect_files, uploads, max_bytes, max_files)
+    except BaseException:
+        for _, spool in uploads:
+            spool.close()
+        raise
+    return files, fields
+
+
+async def _read_multipart(request, boundary: bytes, field: str, max_bytes: int, max_files: int, uploads, fields) -> None:
+    """multipart 본문을 읽어 파일 파트를 임시 파일에, 나머지 파트를 fields에 넣습니다."""
+    # 파서 콜백은 동기이므로 이벤트를 모아 두었다가 조각마다 처리 (read_audio_form과 같은 방식)
+    events: List[Tuple[str, object]] = []
+    header_field = bytearray()
+    header_value = bytearray()
+    headers: Dict[bytes, bytes] = {}
+
+    def on_header_end():
+        headers[bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(headers.get(b"content-disposition", b""))
+        events.append(("part", (disposition.get(b"name", b""), disposition.get(b"filename"))))
+        headers.clear()
+
+    parser = MultipartParser(boundary, {
+        "on_header_field": lambda data, start, end: header_field.extend(data[start:end]),
+        "on_header_value": lambda data, start, end: header_value.extend(data[start:end]),
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": lambda data, start, end: events.append(("data", bytes(data[start:end]))),
+    })
+
+    received = 0
+    file_bytes = 0
+    field_bytes = 0
+    current = None
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes + MAX_FIELD_BYTES:
+            raise _too_large(max_bytes)
+        parser.write(chunk)
+        for kind, value in events:
+            if kind == "part":
+                name, filename = value
+                if name == field.encode():
+                    if len(uploads) >= max_files:
+                        raise UploadTooLarge(f"파일이 너무 많습니다 (최대 {max_files}개)")
+                    label = (filename or b"").decode("utf-8", "replace") or f"file{len(uploads)}"
+                    uploads.append((label, _new_spool()))
+                    current = uploads[-1][1]
+                else:
+                    current = name.decode("utf-8", "replace")
+                    fields.setdefault(current, "")
+            elif isinstance(current, str):
+                field_bytes += len(value)
+                if field_bytes > MAX_FIELD_BYTES:
+                    raise UploadTooLarge("폼 필드가 너무 큽니다")
+                fields[current] += value.decode("utf-8", "replace")
+            else:
+                file_bytes += len(value)
+                if file_bytes > max_bytes:
+                    raise _too_large(max_bytes)
+                current.write(value)
+        events.clear()
+    parser.finalize()
+
+
+async def transcribe_files(
+    service,
+    files: List[BatchFile],
+    language: str = "ko",
+    max_seconds: float = UPLOAD_MAX_AUDIO_SECONDS,
+) -> AsyncIterator[Dict[str, object]]:
+    """파일들을 병렬로 디코딩/인식하고 끝나는 순서대로 파일별 결과를 내보냅니다.
+
+    디코딩은 STT_BATCH_DECODE_WORKERS개 스레드에서, 인식은 STT 실행기에서 낮은 우선순위로 수행합니다.
+    디코딩한 오디오가 인식을 기다리며 메모리에 쌓이지 않도록 동시에 처리하는 파일 수를 제한합니다.
+
+    Args:
+        service: STTService 또는 RemoteSTTService
+        files: read_batch_upload가 반환한 파일 목록 (처리가 끝나면 닫음)
+        language: 인식 언어
+        max_seconds: 파일당 최대 오디오 길이 (초)
+
+    Yields:
+        dict: {"index", "filename", "text", "duration", "decode_seconds", "queue_seconds", "inference_seconds"}
+              또는 실패 시 {"index", "filename", "error", "status"}
+    """
+    model_label = f"whisper-{service.model_size}"
+    decode_slots = asyncio.Semaphore(max(1, STT_BATCH_DECODE_WORKERS))
+    in_flight = asyncio.Semaphore(max(1, STT_BATCH_DECODE_WORKERS) + service.executor.max_workers)
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def process(item: BatchFile) -> None:
+        result: Dict[str, object] = {"index": item.index, "filename": item.filename}
+        try:
+            async with in_flight:
+                start = time.perf_counter()
+                async with decode_slots:
+                    audio = await asyncio.to_thread(decode_audio_file, item.file, max_seconds)
+                item.file.close()
+                decode_seconds = time.perf_counter() - start
+                observe_stage("audio_decode", decode_seconds, model_label)
+                if not len(audio):
+                    raise UploadError("오디오가 비어 있습니다")
+
+                def infer():
+                    # 실행기 대기 시간을 빼고 인식 시간만 측정
+                    started = time.perf_counter()
+                    return service.transcribe_batched(audio, language), time.perf_counter() - started
+
+                start = time.perf_counter()
+                text, inference_seconds = await service.executor.run_with_priority(PRIORITY_BACKGROUND, infer)
+                result.update({
+                    "text": text,
+                    "duration": round(len(audio) / SAMPLE_RATE, 2),
+                    "decode_seconds": round(decode_seconds, 3),
+                    "queue_seconds": round(time.perf_counter() - start - inference_seconds, 3),
+                    "inference_seconds": round(inference_seconds, 3),
+                })
+        except UploadError as e:
+            result.update({"error": str(e), "status": e.status_code})
+        except Exception as e:
+            logger.warning(f"일괄 인식 실패: {item.filename} ({e})")
+            result.update({"error": f"STT 처리 중 오류: {str(e)}", "status": 500})
+        finally:
+            item.file.close()
+        results.put_nowait(result)
+
+    tasks = [asyncio.create_task(process(item)) for item in files]
+    try:
+        for _ in files:
+            yield await results.get()
+    finally:
+        # 클라이언트 연결 종료 등으로 중단되면 남은 파일을 취소하고 임시 파일을 정리
+        for task in tasks:
+            task.cancel()
+        close_files(files)
+
+
+def batch_form_openapi() -> Dict[str, object]:
+    """일괄 인식 라우트의 OpenAPI 요청 본문 스키마 (문서화용)"""
+    archive = {"schema": {"type": "string", "format": "binary"}}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {"schema": {
+                    "type": "object",
+                    "properties": {
+                        "files": {
+                            "type": "array",
+                            "items": {"type": "string", "format": "binary"},
+                            "description": "음성 파일 또는 zip/tar 아카이브 (여러 개)",
+                        },
+                        "language": {"type": "string", "description": "STT 언어 (기본 ko)"},
+                    },
+                    "required": ["files"],
+                }},
+                "application/zip": archive,
+                "application/x-tar": archive,
+            },
+        }
+    }
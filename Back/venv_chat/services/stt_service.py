@@ -1,41 +1,279 @@
+import io
 import os
-import tempfile
-import torch
-from faster_whisper import WhisperModel
+import time
+import asyncio
+import threading
+from typing import AsyncIterator, Dict, List, Tuple
+
+from services.inference_executor import InferenceExecutor
+from services.metrics_service import observe_stage
+from services.load_controller import get_controller
+from services import health_service, vad_service
+
+# Whisper 모델 크기 (환경 변수로 변경 가능)
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")
+# 동시에 인식할 수 있는 워커 수 (WhisperModel num_workers, 실행기 스레드 수)
+# 기본값은 CPU 4코어당 1개 (CTranslate2 워커가 각각 여러 스레드를 쓰므로), 긴 오디오 청크를 병렬로 인식하도록 최소 2, 최대 4
+STT_NUM_WORKERS = int(os.getenv("STT_NUM_WORKERS", str(min(4, max(2, (os.cpu_count() or 1) // 4)))))
+# 이보다 긴 오디오는 침묵 경계에서 나누어 병렬로 인식 (초)
+STT_CHUNK_THRESHOLD_SECONDS = float(os.getenv("STT_CHUNK_THRESHOLD_SECONDS", "60"))
+# 일괄 인식에서 BatchedInferencePipeline이 한 번에 디코더에 넣는 30초 창 수
+STT_BATCH_SIZE = int(os.getenv("STT_BATCH_SIZE", "8"))
+# 작은 모델 로드에 실패하면 이 시간 동안 다시 시도하지 않음 (초, 요청마다 로드 스레드를 만들지 않도록)
+STT_DEGRADE_RETRY_SECONDS = float(os.getenv("STT_DEGRADE_RETRY_SECONDS", "300"))
+
+
+def decode_audio_bytes(audio_bytes, model_label=""):
+    """오디오 파일 바이트를 16kHz 모노 float32 배열로 디코딩합니다 (임시 파일 없음)."""
+    from faster_whisper.audio import decode_audio
+
+    start = time.perf_counter()
+    audio = decode_audio(io.BytesIO(audio_bytes))
+    observe_stage("audio_decode", time.perf_counter() - start, model_label)
+    return audio
+
+
+async def stream_segments(service, audio, language="ko", chunks=None) -> AsyncIterator[Tuple[vad_service.AudioChunk, List[Dict[str, object]]]]:
+    """오디오를 침묵 경계에서 청크로 나누어 병렬로 인식하고, 청크 순서대로 세그먼트를 내보냅니다.
+
+    실행기 워커 수만큼의 청크만 동시에 제출하여 긴 오디오도 큐를 한 번에 채우지 않습니다.
+    세그먼트 시각은 원본 오디오 기준입니다.
+
+    Args:
+        service: STTService 또는 RemoteSTTService
+        audio: 16kHz 모노 float32 오디오
+        language: 인식 언어
+        chunks: 미리 나눈 청크 목록 (None이면 vad_service.split_on_silence로 나눔)
+
+    Yields:
+        Tuple[AudioChunk, List[dict]]: (청크, 세그먼트 목록 [{"start", "end", "text"}])
+    """
+    if chunks is None:
+        chunks = vad_service.split_on_silence(audio)
+    window = max(1, service.executor.max_workers)
+    pending: Dict[int, asyncio.Task] = {}
+
+    def schedule(chunk):
+        pending[chunk.index] = asyncio.create_task(service.executor.run(
+            service.transcribe_segments, audio[chunk.start:chunk.end], language, chunk.start_seconds
+        ))
+
+    try:
+        for chunk in chunks[:window]:
+            schedule(chunk)
+        for chunk in chunks:
+            segments = await pending.pop(chunk.index)
+            if chunk.index + window < len(chunks):
+                schedule(chunks[chunk.index + window])
+            yield chunk, segments
+    finally:
+        # 클라이언트 연결 종료 등으로 중단되면 아직 시작하지 않은 청크를 취소
+        for task in pending.values():
+            task.cancel()
+
+
+async def transcribe_decoded(service, audio, language="ko") -> str:
+    """디코딩된 오디오를 인식합니다. 긴 오디오는 청크로 나누어 병렬로 인식한 뒤 순서대로 합칩니다."""
+    if len(audio) <= STT_CHUNK_THRESHOLD_SECONDS * vad_service.SAMPLE_RATE:
+        return await service.executor.run(service.transcribe_array, audio, language)
+    texts = []
+    async for _, segments in stream_segments(service, audio, language):
+        texts.extend(segment["text"] for segment in segments)
+    return " ".join(texts)
+
 
 class STTService:
-    def __init__(self, model_size="base"):
+    def __init__(self, model_size=WHISPER_MODEL_SIZE):
+        # torch/faster_whisper는 무거우므로 모델을 만들 때 임포트
+        import torch
+        from faster_whisper import WhisperModel
+
         # GPU가 있으면 사용, 없으면 CPU로 실행
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.compute_type = "float16" if self.device == "cuda" else "int8"
-        
+        self.model_size = model_size
+
         print(f"Loading Whisper model: {model_size} on {self.device}")
-        self.model = WhisperModel(model_size, device=self.device, compute_type=self.compute_type)
-    
-    async def transcribe(self, audio_bytes, language="ko"):
-        """오디오 파일을 텍스트로 변환합니다."""
-        # 임시 파일 생성
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            temp_path = temp_file.name
-            temp_file.write(audio_bytes)
-        
+        self.model = WhisperModel(
+            model_size, device=self.device, compute_type=self.compute_type, num_workers=STT_NUM_WORKERS
+        )
+        # 추론 전용 실행기 (이벤트 루프 블로킹 방지, 워커 수만큼 동시에 인식)
+        self.executor = InferenceExecutor("stt", model=f"whisper-{model_size}", max_workers=STT_NUM_WORKERS)
+        # 일괄 인식용 배치 파이프라인 (처음 사용할 때 생성, 모델 가중치는 공유)
+        self._batched_pipeline = None
+        self._batched_lock = threading.Lock()
+        # 부하가 높을 때 쓰는 작은 모델 (단계를 처음 내릴 때 백그라운드에서 로드)
+        self.load = get_controller("stt")
+        self.load.attach(self.executor)
+        self._models = {model_size: self.model}
+        self._models_loading = set()
+        self._models_failed = {}
+        self._models_lock = threading.Lock()
+
+    def _load_degraded_model(self, model_size):
+        from faster_whisper import WhisperModel
+
         try:
-            # 음성 인식 실행
-            segments, info = self.model.transcribe(
-                temp_path, 
-                language=language, 
-                vad_filter=True,  # 음성 감지 기능 활성화
-                vad_parameters={"min_silence_duration_ms": 500}  # 0.5초 이상 침묵 시 분리
+            start = time.perf_counter()
+            model = WhisperModel(
+                model_size, device=self.device, compute_type=self.compute_type, num_workers=STT_NUM_WORKERS
             )
-            
-            # 결과 텍스트 합치기
-            transcript = " ".join([segment.text for segment in segments])
-            return transcript.strip()
-            
+            self._models[model_size] = model
+            print(f"Loaded degraded Whisper model: {model_size} ({time.perf_counter() - start:.1f}s)")
+        except Exception as e:
+            print(f"Failed to load degraded Whisper model {model_size} (retry in {STT_DEGRADE_RETRY_SECONDS:.0f}s): {e}")
+            with self._models_lock:
+                self._models_failed[model_size] = time.monotonic()
         finally:
-            # 임시 파일 삭제
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            with self._models_lock:
+                self._models_loading.discard(model_size)
+
+    def _select_model(self):
+        """부하 제어기가 정한 단계의 (모델, 모델 크기)를 반환합니다.
+
+        작은 모델이 아직 로드되지 않았으면 백그라운드에서 로드를 시작하고 그동안 기본 모델을 사용합니다.
+        로드에 실패한 모델은 STT_DEGRADE_RETRY_SECONDS 동안 다시 로드하지 않습니다.
+        트레이스와 메트릭에는 실제로 쓴 모델을 기록합니다.
+        """
+        level = self.load.evaluate()
+        model_size = self.load.levels[level]
+        model = self._models.get(model_size)
+        if model is not None:
+            self.load.record(level, model_size)
+            return model, model_size
+        with self._models_lock:
+            failed_at = self._models_failed.get(model_size)
+            retry = failed_at is None or time.monotonic() - failed_at >= STT_DEGRADE_RETRY_SECONDS
+            if retry and model_size not in self._models_loading:
+                self._models_loading.add(model_size)
+                threading.Thread(
+                    target=self._load_degraded_model, args=(model_size,), name="stt-degraded-load", daemon=True
+                ).start()
+        self.load.record(0, self.model_size)
+        return self.model, self.model_size
+
+    async def transcribe(self, audio_bytes, language="ko"):
+        """오디오 파일을 텍스트로 변환합니다.
+
+        디코딩은 모델 실행기를 차지하지 않도록 별도 스레드에서 수행하고,
+        STT_CHUNK_THRESHOLD_SECONDS보다 긴 오디오는 청크로 나누어 병렬로 인식합니다.
+        """
+        audio = await asyncio.to_thread(decode_audio_bytes, audio_bytes, f"whisper-{self.model_size}")
+        return await transcribe_decoded(self, audio, language)
+
+    def _transcribe_sync(self, audio_bytes, language="ko"):
+        """디코딩과 음성 인식을 한 번에 수행합니다 (실행기 스레드에서 호출, 워밍업/헬스 체크용)."""
+        audio = decode_audio_bytes(audio_bytes, f"whisper-{self.model_size}")
+        return self.transcribe_array(audio, language)
+
+    def transcribe_array(self, audio, language="ko"):
+        """디코딩된 16kHz 모노 float32 오디오로 음성 인식을 수행합니다 (실행기 스레드에서 호출).
+
+        추론 서버는 API 워커가 공유 메모리로 넘긴 배열을 이 메서드로 바로 인식합니다.
+        부하가 높으면 부하 제어기가 고른 더 작은 모델로 인식합니다.
+        """
+        model, model_size = self._select_model()
+        model_label = f"whisper-{model_size}"
+
+        # 음성 인식 실행 (segments는 제너레이터이므로 순회하는 동안 추론이 진행됨)
+        start = time.perf_counter()
+        segments, info = model.transcribe(
+            audio,
+            language=language,
+            vad_filter=True,  # 음성 감지 기능 활성화
+            vad_parameters={"min_silence_duration_ms": 500}  # 0.5초 이상 침묵 시 분리
+        )
+
+        # 결과 텍스트 합치기
+        try:
+            transcript = " ".join([segment.text for segment in segments])
+        except Exception as e:
+            health_service.record_failure("stt", e)
+            raise
+        observe_stage("whisper_inference", time.perf_counter() - start, model_label)
+        health_service.record_success("stt")
+        return transcript.strip()
+
+    def transcribe_segments(self, audio, language="ko", offset=0.0):
+        """청크 하나를 인식하여 타임스탬프가 있는 세그먼트 목록을 반환합니다 (실행기 스레드에서 호출).
+
+        Args:
+            audio: 16kHz 모노 float32 청크 오디오
+            language: 인식 언어
+            offset: 원본 오디오에서 청크가 시작하는 시각 (초)
+
+        Returns:
+            List[dict]: [{"start", "end", "text"}] (원본 오디오 기준 시각)
+        """
+        model, model_size = self._select_model()
+        model_label = f"whisper-{model_size}"
+
+        start = time.perf_counter()
+        segments, info = model.transcribe(
+            audio,
+            language=language,
+            vad_filter=True,
+            vad_parameters={"min_silence_duration_ms": 500}
+        )
+        try:
+            results = [
+                {"start": round(offset + segment.start, 2), "end": round(offset + segment.end, 2), "text": segment.text.strip()}
+                for segment in segments
+                if segment.text.strip()
+            ]
+        except Exception as e:
+            health_service.record_failure("stt", e)
+            raise
+        observe_stage("whisper_inference", time.perf_counter() - start, model_label)
+        health_service.record_success("stt")
+        return results
+
+    def transcribe_batched(self, audio, language="ko"):
+        """파일 하나를 BatchedInferencePipeline으로 인식합니다 (실행기 스레드에서 호출, 일괄 인식용).
+
+        음성 구간을 30초 창으로 묶어 STT_BATCH_SIZE개씩 한 번에 디코딩하므로
+        긴 녹음일수록 transcribe_array보다 빠릅니다.
+        """
+        model_label = f"whisper-{self.model_size}"
+        if self._batched_pipeline is None:
+            with self._batched_lock:
+                if self._batched_pipeline is None:
+                    from faster_whisper import BatchedInferencePipeline
+                    self._batched_pipeline = BatchedInferencePipeline(model=self.model)
+
+        start = time.perf_counter()
+        segments, info = self._batched_pipeline.transcribe(
+            audio,
+            language=language,
+            batch_size=STT_BATCH_SIZE,
+            vad_filter=True,
+            vad_parameters={"min_silence_duration_ms": 500}
+        )
+        try:
+            transcript = " ".join([segment.text.strip() for segment in segments])
+        except Exception as e:
+            health_service.record_failure("stt", e)
+            raise
+        observe_stage("whisper_batch_inference", time.perf_counter() - start, model_label)
+        health_service.record_success("stt")
+        return transcript.strip()
+
+# 싱글톤 인스턴스 (최초 사용 또는 시작 시 사전 로드에서 생성)
+_stt_service = None
+_stt_lock = threading.Lock()
+
+def get_stt_service() -> STTService:
+    """STT 서비스 싱글톤 인스턴스를 반환합니다.
 
-# 싱글톤 인스턴스
-stt_service = STTService()
\ No newline at end of file
+    INFERENCE_SERVER_ADDRESS가 설정되어 있으면 모델을 로드하지 않고 추론 서버 클라이언트를 반환합니다.
+    """
+    global _stt_service
+    if _stt_service is None:
+        with _stt_lock:
+            if _stt_service is None:
+                from services import inference_client
+                if inference_client.remote_enabled():
+                    _stt_service = inference_client.RemoteSTTService()
+                else:
+                    _stt_service = STTService()
+    return _stt_service
@@ -0,0 +1,235 @@
+"""
+트레이싱 서비스 모듈
+
+요청 단위로 단계별 구간(span)을 수집하여 `Server-Timing` 헤더로 노출하고,
+선택적으로 요청별 구조화 트레이스 레코드를 회전(rotating) JSONL 파일에 기록합니다.
+
+환경 변수:
+    TRACE_LOG_PATH: 트레이스 JSONL 파일 경로 (미설정 시 파일 기록 비활성화)
+    TRACE_LOG_MAX_BYTES: 파일 회전 크기 (기본 10MB)
+    TRACE_LOG_BACKUP_COUNT: 보관할 회전 파일 수 (기본 5)
+"""
+
+import os
+import json
+import time
+import uuid
+import queue
+import logging
+import logging.handlers
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 트레이스 로그 설정
+TRACE_LOG_PATH = os.getenv("TRACE_LOG_PATH")
+TRACE_LOG_MAX_BYTES = int(os.getenv("TRACE_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+TRACE_LOG_BACKUP_COUNT = int(os.getenv("TRACE_LOG_BACKUP_COUNT", "5"))
+
+# 요청 ID 헤더
+REQUEST_ID_HEADER = "x-request-id"
+
+# Server-Timing 헤더에 노출할 단계 (순서 유지)
+TIMING_STAGES = ("stt", "llm", "tts", "encode", "queue")
+
+# 세부 단계 이름 -> Server-Timing 단계 매핑
+STAGE_TO_TIMING = {
+    "audio_decode": "stt",
+    "whisper_inference": "stt",
+    "deepseek_roundtrip": "llm",
+    "tts_sentence": "tts",
+    "audio_encode": "encode",
+    "queue_wait": "queue",
+}
+
+
+class Trace:
+    """요청 단위 트레이스"""
+
+    __slots__ = ("request_id", "method", "path", "started_at", "_t0", "spans", "attributes")
+
+    def __init__(self, request_id: str, method: str, path: str):
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.spans: List[Dict[str, float]] = []
+        self.attributes: Dict[str, object] = {}
+
+    def add_span(self, name: str, start: float, duration: float) -> None:
+        """구간을 추가합니다 (start는 perf_counter 기준 시각)."""
+        # list.append는 원자적이므로 실행기 스레드에서 호출해도 안전합니다
+        self.spans.append({
+            "name": name,
+            "start_ms": round((start - self._t0) * 1000, 3),
+            "duration_ms": round(duration * 1000, 3),
+        })
+
+    def timings(self) -> Dict[str, float]:
+        """Server-Timing 단계별 누적 시간(ms)을 반환합니다."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            stage = STAGE_TO_TIMING.get(span["name"])
+            if stage is not None:
+                totals[stage] = totals.get(stage, 0.0) + span["duration_ms"]
+        return totals
+
+    def server_timing(self) -> str:
+        """`Server-Timing` 헤더 값을 생성합니다."""
+        totals = self.timings()
+        return ", ".join(
+            f"{stage};dur={totals[stage]:.1f}" for stage in TIMING_STAGES if stage in totals
+        )
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+
+
+def current_trace() -> Optional[Trace]:
+    """현재 요청의 트레이스를 반환합니다 (요청 밖에서는 None)."""
+    return _current_trace.get()
+
+
+def record_span(name: str, duration: float, end: Optional[float] = None) -> None:
+    """현재 트레이스에 구간을 기록합니다."""
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    if end is None:
+        end = time.perf_counter()
+    trace.add_span(name, end - duration, duration)
+
+
+def set_attribute(key: str, value) -> None:
+    """현재 트레이스에 속성(모델 이름 등)을 기록합니다."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.attributes[key] = value
+
+
+@contextmanager
+def collect_attributes() -> Iterator[Dict[str, object]]:
+    """요청 밖(추론 서버 등)에서 블록 안에서 기록된 트레이스 속성을 모읍니다 (구간은 버림)."""
+    trace = Trace("", "", "")
+    token = _current_trace.set(trace)
+    try:
+        yield trace.attributes
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """블록 실행 시간을 현재 트레이스에 기록하는 컨텍스트 매니저"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        record_span(name, end - start, end)
+
+
+def _build_trace_logger() -> Optional[logging.Logger]:
+    """트레이스 JSONL 로거를 생성합니다.
+
+    파일 쓰기는 QueueListener 스레드에서 수행하여 이벤트 루프에서 디스크 I/O가 발생하지 않습니다.
+    """
+    if not TRACE_LOG_PATH:
+        return None
+
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(TRACE_LOG_PATH)), exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            TRACE_LOG_PATH,
+            maxBytes=TRACE_LOG_MAX_BYTES,
+            backupCount=TRACE_LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+    except Exception as e:
+        logger.error(f"트레이스 로그 파일 초기화 실패: {e}")
+        return None
+
+    log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+
+    trace_logger = logging.getLogger("venomvoice.trace")
+    trace_logger.setLevel(logging.INFO)
+    trace_logger.propagate = False
+    trace_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.info(f"요청 트레이스 기록 활성화: {TRACE_LOG_PATH}")
+    return trace_logger
+
+
+_trace_logger = _build_trace_logger()
+
+
+def write_trace(trace: Trace, endpoint: str, status: int) -> None:
+    """트레이스 레코드를 JSONL로 기록합니다."""
+    if _trace_logger is None:
+        return
+    record = {
+        "request_id": trace.request_id,
+        "timestamp": trace.started_at,
+        "method": trace.method,
+        "path": trace.path,
+        "endpoint": endpoint,
+        "status": status,
+        "duration_ms": round(trace.elapsed_ms(), 3),
+        "timings_ms": trace.timings(),
+        "spans": trace.spans,
+        "attributes": trace.attributes,
+    }
+    _trace_logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+class TracingMiddleware:
+    """요청 트레이스를 생성하고 `Server-Timing`/`X-Request-ID` 헤더를 추가하는 ASGI 미들웨어
+
+    헤더는 응답 시작 시점까지 수집된 구간으로 계산됩니다.
+    스트리밍 응답의 경우 본문 전송 중에 발생한 구간은 트레이스 로그에만 기록됩니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", ()):
+            if name == REQUEST_ID_HEADER.encode("latin-1"):
+                request_id = value.decode("latin-1")[:128]
+                break
+        trace = Trace(request_id or uuid.uuid4().hex, scope.get("method", ""), scope.get("path", ""))
+        token = _current_trace.set(trace)
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                timing = trace.server_timing()
+                if timing:
+                    headers.append((b"server-timing", timing.encode("latin-1")))
+                headers.append((REQUEST_ID_HEADER.encode("latin-1"), trace.request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            write_trace(trace, getattr(route, "path", None) or "unmatched", status_holder["status"])
+            _current_trace.reset(token)
@@ -0,0 +1,125 @@
+"""
+영구 TTS 캐시 모듈
+
+미리 렌더링한 음성(UI 안내 문구, 알림 문구 등)을 디스크에 아티팩트로 저장합니다.
+아티팩트 ID는 정규화된 텍스트, 품질 단계, 음성 지문(프롬프트 음성/텍스트/샘플 레이트),
+모델 지문(체크포인트 내용/CPU 실행 모드)의 해시이므로 같은 입력은 재시작 후에도 같은 파일을 가리키고,
+프롬프트 음성이나 체크포인트가 바뀌면 다른 ID가 됩니다.
+
+환경 변수:
+    TTS_DISK_CACHE_DIR: 아티팩트 디렉토리 (기본 Back/venv_chat/.cache/tts, 빈 값이면 비활성화)
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+import soundfile as sf
+
+from services import checkpoint_manager
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+TTS_DISK_CACHE_DIR = os.getenv(
+    "TTS_DISK_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "tts"),
+)
+
+ARTIFACT_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+def voice_fingerprint(prompt_path: Optional[str], prompt_text: str, sample_rate: int, prompt_checksum: Optional[str] = None) -> str:
+    """프롬프트 음성 내용, 프롬프트 텍스트, 샘플 레이트로 음성 지문을 만듭니다.
+
+    prompt_checksum을 주면 파일을 다시 해시하지 않습니다 (등록 시 이미 계산한 경우).
+    """
+    digest = hashlib.sha256()
+    if prompt_checksum is None and prompt_path:
+        prompt_checksum = checkpoint_manager.file_checksum(prompt_path)
+    digest.update((prompt_checksum or "default").encode())
+    digest.update(str(prompt_text).encode("utf-8"))
+    digest.update(str(sample_rate).encode())
+    return digest.hexdigest()[:16]
+
+
+def model_fingerprint(ckpt_path: Optional[str], cpu_mode: str) -> str:
+    """체크포인트 내용과 CPU 실행 모드로 모델 지문을 만듭니다 (모델을 바꾸면 이전 아티팩트를 쓰지 않도록)."""
+    digest = hashlib.sha256()
+    checksum = checkpoint_manager.file_checksum(ckpt_path) if ckpt_path else None
+    digest.update((checksum or "missing").encode())
+    digest.update(str(cpu_mode).encode())
+    return digest.hexdigest()[:16]
+
+
+class TTSDiskCache:
+    """아티팩트 ID로 주소를 정하는 WAV 파일 캐시 (원자적 쓰기, 메타데이터 JSON 동반)"""
+
+    def __init__(self, directory: str = TTS_DISK_CACHE_DIR):
+        self.directory = directory
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    @staticmethod
+    def artifact_id(text: str, tier: str, voice_key: str, model_key: str) -> str:
+        """정규화된 텍스트, 품질 단계, 음성 지문, 모델 지문으로 아티팩트 ID를 만듭니다."""
+        return hashlib.sha256(f"{model_key}\0{voice_key}\0{tier}\0{text}".encode("utf-8")).hexdigest()[:32]
+
+    def path(self, artifact_id: str) -> str:
+        # 한 디렉토리에 파일이 너무 많아지지 않도록 앞 두 글자로 나눔
+        return os.path.join(self.directory, artifact_id[:2], f"{artifact_id}.wav")
+
+    def exists(self, artifact_id: str) -> bool:
+        return self.enabled and os.path.exists(self.path(artifact_id))
+
+    def load(self, artifact_id: str) -> Optional[np.ndarray]:
+        """저장된 오디오를 읽습니다 (없거나 손상되었으면 None)."""
+        if not self.exists(artifact_id):
+            return None
+        try:
+            audio, _ = sf.read(self.path(artifact_id), dtype="float32")
+            return audio
+        except Exception as e:
+            logger.warning(f"TTS 캐시 파일 읽기 실패: {artifact_id} ({e})")
+            return None
+
+    def metadata(self, artifact_id: str) -> Optional[Dict[str, object]]:
+        try:
+            with open(self.path(artifact_id)[:-4] + ".json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save(self, artifact_id: str, audio: np.ndarray, sample_rate: int, metadata: Dict[str, object]) -> str:
+        """오디오와 메타데이터를 임시 파일에 쓴 뒤 교체합니다 (동시에 같은 ID를 써도 안전)."""
+        path = self.path(artifact_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        sf.write(path + suffix, audio, sample_rate, format="WAV")
+        with open(path[:-4] + ".json" + suffix, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False)
+        # 메타데이터를 먼저 교체하여 WAV가 보이면 메타데이터도 항상 있도록 함
+        os.replace(path[:-4] + ".json" + suffix, path[:-4] + ".json")
+        os.replace(path + suffix, path)
+        return path
+
+
+_disk_cache: Optional[TTSDiskCache] = None
+_disk_cache_lock = threading.Lock()
+
+
+def get_disk_cache() -> TTSDiskCache:
+    """프로세스 공용 영구 TTS 캐시를 반환합니다."""
+    global _disk_cache
+    if _disk_cache is None:
+        with _disk_cache_lock:
+            if _disk_cache is None:
+                _disk_cache = TTSDiskCache()
+    return _disk_cache
@@ -0,0 +1,212 @@
+"""
+긴 텍스트 TTS 작업 모듈
+
+기사나 읽기 모드처럼 긴 텍스트를 비동기 작업으로 합성합니다.
+요청은 작업 ID를 바로 받고, 작업은 문장 조각마다 TTS 실행기에 낮은 우선순위로 제출되어
+대화 요청이 조각 사이사이에 먼저 실행됩니다. 진행 상황은 폴링 또는 SSE로 조각마다 받고,
+완성된 오디오는 결과 저장소(디스크)에서 TTL 동안 받을 수 있습니다.
+
+작업 상태는 프로세스 메모리에 있으므로 `uvicorn --workers N`에서는 작업을 만든 워커에서만 조회됩니다.
+
+환경 변수:
+    TTS_JOB_TTL_SECONDS: 끝난 작업과 결과 파일 보관 시간 (기본 3600초)
+    TTS_JOB_MAX_PENDING: 대기/실행 중인 작업 최대 수 (기본 16, 넘으면 새 작업 거절)
+    TTS_JOB_DIR: 결과 파일 디렉토리 (기본 Back/venv_chat/.cache/tts_jobs)
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import soundfile as sf
+
+from services.inference_executor import PRIORITY_BACKGROUND
+from services.metrics_service import observe_stage
+from services.tts_service import MODEL_LABEL, TTS_SEGMENT_MIN_CHARS, TTS_SEGMENT_MAX_CHARS
+from utils.text_utils import segment_text
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+TTS_JOB_TTL_SECONDS = float(os.getenv("TTS_JOB_TTL_SECONDS", "3600"))
+TTS_JOB_MAX_PENDING = int(os.getenv("TTS_JOB_MAX_PENDING", "16"))
+TTS_JOB_DIR = os.getenv(
+    "TTS_JOB_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "tts_jobs"),
+)
+
+FINISHED_STATES = ("done", "failed", "cancelled")
+
+
+class JobLimitExceeded(RuntimeError):
+    """대기/실행 중인 작업이 TTS_JOB_MAX_PENDING에 도달함"""
+
+
+@dataclass
+class TTSJob:
+    """긴 텍스트 합성 작업"""
+
+    id: str
+    sentences: List[str]
+    use_cache: bool = True
+    speaker_id: Optional[str] = None
+    status: str = "queued"
+    completed: int = 0
+    segment_seconds: List[float] = field(default_factory=list)
+    error: Optional[str] = None
+    path: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # 상태가 바뀔 때마다 증가 (SSE 구독자가 새 상태를 감지)
+    version: int = 0
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def notify(self) -> None:
+        """상태 변경을 구독자에게 알립니다 (이벤트 루프에서 호출)."""
+        self.version += 1
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait_for_change(self, version: int, timeout: float) -> bool:
+        """version 이후 상태가 바뀔 때까지 기다립니다 (timeout 동안 변화가 없으면 False)."""
+        if self.version != version:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def to_dict(self, ttl: float = TTS_JOB_TTL_SECONDS) -> Dict[str, object]:
+        total = len(self.sentences)
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "sentences": total,
+            "completed": self.completed,
+            "progress": round(self.completed / total, 3) if total else 1.0,
+            "audio_seconds": round(sum(self.segment_seconds), 3),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "expires_at": self.finished_at + ttl if self.finished_at else None,
+        }
+
+
+class TTSJobManager:
+    """TTS 작업 실행과 결과 저장소 (TTL이 지난 작업과 파일은 조회/생성 시 정리)"""
+
+    def __init__(self, directory: str = TTS_JOB_DIR, ttl: float = TTS_JOB_TTL_SECONDS, max_pending: int = TTS_JOB_MAX_PENDING):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self._jobs: Dict[str, TTSJob] = {}
+
+    def submit(self, service, text: str, use_cache: bool = True, speaker_id: Optional[str] = None) -> TTSJob:
+        """작업을 만들고 백그라운드 태스크로 시작합니다 (이벤트 루프에서 호출).
+
+        Raises:
+            ValueError: 합성할 텍스트가 없음
+            JobLimitExceeded: 대기/실행 중인 작업이 너무 많음
+        """
+        self.expire()
+        if sum(not job.finished for job in self._jobs.values()) >= self.max_pending:
+            raise JobLimitExceeded(f"대기 중인 TTS 작업이 너무 많습니다 (최대 {self.max_pending}개)")
+        sentences = segment_text(text, TTS_SEGMENT_MIN_CHARS, TTS_SEGMENT_MAX_CHARS)
+        if not sentences:
+            raise ValueError("합성할 텍스트가 없습니다")
+
+        job = TTSJob(uuid.uuid4().hex, sentences, use_cache, speaker_id)
+        self._jobs[job.id] = job
+        job._task = asyncio.create_task(self._run(service, job))
+        logger.info(f"TTS 작업 생성: {job.id} (조각 {len(sentences)}개, {len(text)}자)")
+        return job
+
+    def get(self, job_id: str) -> Optional[TTSJob]:
+        self.expire()
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[TTSJob]:
+        """작업을 취소하고 결과 파일을 지웁니다 (끝난 작업은 목록에서 제거)."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if job._task is not None and not job._task.done():
+            job._task.cancel()
+        else:
+            self._remove(job)
+        return job
+
+    def expire(self) -> None:
+        """TTL이 지난 작업과 결과 파일을 정리합니다."""
+        deadline = time.time() - self.ttl
+        for job in [job for job in self._jobs.values() if job.finished_at and job.finished_at < deadline]:
+            self._remove(job)
+
+    def _remove(self, job: TTSJob) -> None:
+        self._jobs.pop(job.id, None)
+        if job.path:
+            try:
+                os.unlink(job.path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"TTS 작업 결과 삭제 실패: {job.path} ({e})")
+
+    async def _run(self, service, job: TTSJob) -> None:
+        """조각마다 낮은 우선순위로 합성하여 결과 파일에 이어 씁니다 (전체 오디오를 메모리에 모으지 않음)."""
+        path = os.path.join(self.directory, f"{job.id}.wav")
+        temp_path = f"{path}.part"
+        job.status = "running"
+        job.started_at = time.time()
+        job.notify()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with sf.SoundFile(temp_path, "w", samplerate=service.sample_rate, channels=1, format="WAV") as output:
+                for sentence in job.sentences:
+                    audio = await service.executor.run_with_priority(
+                        PRIORITY_BACKGROUND, service.synthesize_segment, sentence, job.use_cache, job.speaker_id
+                    )
+                    await asyncio.to_thread(output.write, audio)
+                    job.segment_seconds.append(round(len(audio) / service.sample_rate, 3))
+                    job.completed += 1
+                    job.notify()
+            os.replace(temp_path, path)
+            job.path = path
+            job.status = "done"
+            observe_stage("tts_job", time.time() - job.started_at, MODEL_LABEL)
+            logger.info(f"TTS 작업 완료: {job.id} ({sum(job.segment_seconds):.1f}초 오디오)")
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"TTS 작업 실패: {job.id} ({e})")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            job.finished_at = time.time()
+            job.notify()
+
+
+_manager: Optional[TTSJobManager] = None
+
+
+def get_job_manager() -> TTSJobManager:
+    """프로세스 공용 작업 관리자를 반환합니다 (이벤트 루프에서만 사용하므로 잠금 없음)."""
+    global _manager
+    if _manager is None:
+        _manager = TTSJobManager()
+    return _manager
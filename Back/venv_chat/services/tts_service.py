@@ -2,156 +2,72 @@
 Metis TTS 서비스 모듈
 
 Metis (오픈소스 Amphion TTS) 기반 텍스트-음성 변환 서비스를 제공합니다.
+등록된 화자(speaker_registry)를 화자 ID로 골라 합성할 수 있으며,
+프롬프트 특징은 음성 지문별로 캐시하여 참조 음성을 합성마다 다시 인코딩하지 않습니다.
+부하가 높으면 부하 제어기(load_controller)가 정한 더 적은 확산 스텝으로 합성합니다.
 """
 
 import os
 import io
-import torch
 import numpy as np
 import soundfile as sf
-import sys
-from typing import Union, Optional, Tuple
+import time
+from typing import Dict, List, Union, Optional, Tuple
 import logging
-from functools import lru_cache
+
+from services.inference_executor import InferenceExecutor
+from services.load_controller import get_controller
+from services.metrics_service import observe_stage, record_cache
+from services import health_service, metis_runtime, checkpoint_manager
+from services.sentence_cache import SentenceAudioCache
+from services.speaker_registry import get_speaker_registry
+from services.tts_disk_cache import get_disk_cache, model_fingerprint, voice_fingerprint
+from services.amphion_loader import MockMetis, amphion_root, parent_amphion_dir, load_amphion
+from utils.text_normalizer import normalize_text
+from utils.text_utils import segment_text
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
-
-# 1. Amphion 루트 디렉토리 절대 경로 찾기
-amphion_root = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '..', 'Amphion', 'Amphion'))
-logger.info(f"Amphion 루트 경로: {amphion_root}")
-
-# 상위 경로도 추가
-parent_amphion_dir = os.path.dirname(amphion_root)
-if parent_amphion_dir not in sys.path:
-    sys.path.insert(0, parent_amphion_dir)
-    logger.info(f"Python 경로에 Amphion 상위 디렉토리 추가됨: {parent_amphion_dir}")
-
-# 2. Amphion 루트를 Python 경로 앞쪽에 추가 (우선순위 높게)
-if amphion_root not in sys.path:
-    sys.path.insert(0, amphion_root)
-    logger.info(f"Python 경로에 Amphion 루트 추가됨: {amphion_root}")
-
-# 3. 현재 Python 경로 출력 (디버깅용)
-logger.info(f"현재 Python 경로: {sys.path}")
-
-# 4. 필수 모듈 파일 존재 여부 확인
-try:
-    # 임포트하기 전에 파일이 실제로 존재하는지 확인
-    models_dir = os.path.join(amphion_root, 'models')
-    if not os.path.exists(models_dir) or not os.path.isdir(models_dir):
-        logger.error(f"'models' 디렉토리가 존재하지 않습니다: {models_dir}")
-    
-    tts_dir = os.path.join(models_dir, 'tts')
-    metis_dir = os.path.join(tts_dir, 'metis')
-    
-    utils_dir = os.path.join(amphion_root, 'utils')
-    
-    logger.info(f"models 디렉토리 존재: {os.path.exists(models_dir)}")
-    logger.info(f"tts 디렉토리 존재: {os.path.exists(tts_dir)}")
-    logger.info(f"metis 디렉토리 존재: {os.path.exists(metis_dir)}")
-    logger.info(f"utils 디렉토리 존재: {os.path.exists(utils_dir)}")
-    
-    # 5. 직접 모듈 파일 경로 찾기
-    audio_tokenizer_path = os.path.join(metis_dir, 'audio_tokenizer.py')
-    metis_path = os.path.join(metis_dir, 'metis.py')
-    util_path = os.path.join(utils_dir, 'util.py')
-    
-    logger.info(f"AudioTokenizer 파일 존재: {os.path.exists(audio_tokenizer_path)}")
-    logger.info(f"Metis 파일 존재: {os.path.exists(metis_path)}")
-    logger.info(f"Util 파일 존재: {os.path.exists(util_path)}")
-    
-    # 6. 직접 파일 시스템 탐색
-    try:
-        # 몇 가지 주요 디렉토리 탐색
-        amphion_root_files = os.listdir(amphion_root)
-        logger.info(f"Amphion 루트 디렉토리 내용: {amphion_root_files}")
-        
-        if 'models' in amphion_root_files:
-            models_files = os.listdir(os.path.join(amphion_root, 'models'))
-            logger.info(f"models 디렉토리 내용: {models_files}")
-            
-            if 'tts' in models_files:
-                tts_files = os.listdir(os.path.join(amphion_root, 'models', 'tts'))
-                logger.info(f"tts 디렉토리 내용: {tts_files}")
-    except Exception as e:
-        logger.error(f"디렉토리 탐색 중 오류: {e}")
-    
-    # 7. 모듈 임포트 시도 - 상대 경로 사용
-    sys.path.append(os.path.join(amphion_root, 'models'))
-    sys.path.append(os.path.join(amphion_root, 'utils'))
-    
-    # 예외 처리를 포함한 임포트
-    try:
-        # 방법 1: 직접 경로 수정으로 임포트 시도
-        try:
-            import importlib.util
-            spec = importlib.util.spec_from_file_location("Metis", metis_path)
-            metis_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(metis_module)
-            Metis = metis_module.Metis
-            
-            spec = importlib.util.spec_from_file_location("load_config", util_path)
-            util_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(util_module)
-            load_config = util_module.load_config
-            
-            logger.info("Amphion 모듈 직접 임포트 성공!")
-        except Exception as e:
-            logger.error(f"직접 임포트 실패: {e}")
-            
-            # 방법 2: 표준 방식으로 임포트 시도
-            try:
-                # 경로에 상위 디렉토리 추가
-                parent_dir = os.path.dirname(amphion_root)
-                if parent_dir not in sys.path:
-                    sys.path.insert(0, parent_dir)
-                
-                # 다시 임포트 시도
-                from Amphion.models.tts.metis.metis import Metis
-                from Amphion.utils.util import load_config
-                logger.info("Amphion 모듈 표준 방식 임포트 성공!")
-            except Exception as e2:
-                logger.error(f"표준 방식 임포트 실패: {e2}")
-                
-                # 두 가지 방법 모두 실패한 경우 모의 클래스 생성
-                logger.warning("두 가지 임포트 방법 모두 실패. 최소 기능 모의 클래스를 사용합니다.")
-                
-                # 간단한 모의 클래스 정의
-                class Metis:
-                    def __init__(self, **kwargs):
-                        logger.info("모의 Metis 클래스 초기화됨")
-                        
-                    def __call__(self, **kwargs):
-                        # 더미 오디오 데이터 반환 (1초 침묵)
-                        logger.info("모의 Metis 클래스 호출됨 - 더미 오디오 반환")
-                        import numpy as np
-                        return np.zeros(24000, dtype=np.float32)
-                
-                def load_config(path):
-                    logger.info(f"모의 load_config 함수 호출됨: {path}")
-                    return {"sample_rate": 24000}
-                
-    except Exception as e:
-        logger.error(f"Amphion 모듈 임포트 실패: {e}")
-        raise ImportError(f"Amphion 모듈을 임포트할 수 없습니다: {e}")
-        
-except Exception as e:
-    logger.error(f"Amphion 모듈 초기화 실패: {e}")
-    # 오류 발생 시 모의 클래스 정의
-    class Metis:
-        def __init__(self, **kwargs):
-            logger.info("모의 Metis 클래스 초기화됨 (오류 발생 후)")
-            
-        def __call__(self, **kwargs):
-            # 더미 오디오 데이터 반환 (1초 침묵)
-            logger.info("모의 Metis 클래스 호출됨 - 더미 오디오 반환")
-            return np.zeros(24000, dtype=np.float32)
-    
-    def load_config(path):
-        logger.info(f"모의 load_config 함수 호출됨 (오류 발생 후): {path}")
-        return {"sample_rate": 24000}
+
+# 메트릭 라벨용 모델 이름
+MODEL_LABEL = "metis"
+
+# 합성 전 텍스트 정규화 사용 여부 (정규화 결과가 캐시 키가 됨)
+TTS_TEXT_NORMALIZE = os.getenv("TTS_TEXT_NORMALIZE", "1") != "0"
+
+# 긴 텍스트 분할 조각 길이 (이보다 긴 텍스트는 조각별로 합성)
+# 최소 길이가 크면 짧은 인사말이 다음 문장과 합쳐져 문장 캐시를 공유하지 못하므로 작게 둠
+TTS_SEGMENT_MIN_CHARS = int(os.getenv("TTS_SEGMENT_MIN_CHARS", "6"))
+TTS_SEGMENT_MAX_CHARS = int(os.getenv("TTS_SEGMENT_MAX_CHARS", "100"))
+
+# 품질 단계별 확산 추론 스텝 수 (standard가 기존 기본값)
+TTS_TIERS = {"fast": 12, "standard": 25, "high": 50}
+DEFAULT_TIER = "standard"
+
+# 합성에 쓰는 프롬프트: (프롬프트 음성 경로, 프롬프트 텍스트, 음성 지문)
+Prompt = Tuple[str, str, str]
+
+
+class SynthesisError(RuntimeError):
+    """모델 합성 실패 (무음을 반환하면 캐시에 남으므로 예외로 알림)"""
+
+
+def encode_audio_bytes(audio: np.ndarray, sample_rate: int, format: str = "wav") -> bytes:
+    """오디오 배열을 지정된 포맷의 바이트로 인코딩
+
+    Args:
+        audio: 오디오 데이터
+        sample_rate: 샘플 레이트
+        format: 오디오 포맷 ('wav', 'ogg', 'flac')
+
+    Returns:
+        bytes: 인코딩된 오디오 바이트
+    """
+    # 메모리에 오디오 데이터 쓰기
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, sample_rate, format=format)
+    buffer.seek(0)
+    return buffer.read()
 
 
 class MetisTTSService:
@@ -161,22 +77,45 @@ class MetisTTSService:
         self,
         ckpt_path: str,
         config_path: str,
-        device: str = "cuda" if torch.cuda.is_available() else "cpu",
+        device: Optional[str] = None,
         cache_size: int = 32,  # LRU 캐시 크기
         sample_rate: int = 24000,  # Metis 기본 샘플레이트
+        cpu_mode: Optional[str] = None,  # CPU 실행 모드 (기본값은 METIS_CPU_MODE)
+        use_compile: Optional[bool] = None,  # torch.compile 사용 여부 (기본값은 METIS_COMPILE)
     ):
         """Metis TTS 서비스 초기화
 
         Args:
-            ckpt_path: 체크포인트 경로 (.pth 파일)
+            ckpt_path: 체크포인트 경로 (safetensors 또는 .pth, 원래 위치 그대로 참조)
             config_path: 설정 파일 경로 (.json 파일)
-            device: 모델 실행 장치 ('cuda' 또는 'cpu')
+            device: 모델 실행 장치 ('cuda' 또는 'cpu', 기본값은 자동 선택)
             cache_size: LRU 캐시 크기
             sample_rate: 샘플 레이트 (기본 24000Hz)
+            cpu_mode: CPU 실행 모드 ('fp32', 'int8', 'bf16', 'int8_bf16'), CPU 장치에서만 적용
+            use_compile: torch.compile 실행 경로 사용 여부 (컴파일 결과는 디스크에 캐시)
         """
+        # torch는 무거우므로 서비스 생성 시점에 임포트
+        import torch
+
+        if device is None:
+            device = "cuda" if torch.cuda.is_available() else "cpu"
         self.device = device
         self.sample_rate = sample_rate
         self.cache_size = cache_size
+        # 전체 텍스트 오디오 캐시 (부하와 관계없이 합성 전에 먼저 조회)
+        self.text_cache = SentenceAudioCache(max_entries=cache_size)
+        # 긴 응답의 문장 조각 오디오 캐시 (응답 간 공유)
+        self.sentence_cache = SentenceAudioCache()
+        # 미리 렌더링한 아티팩트 캐시 (재시작 후에도 유지)
+        self.disk_cache = get_disk_cache()
+        self._default_voice_key: Optional[str] = None
+        # 등록된 화자와 프롬프트 특징 캐시 (메모리 LRU + 디스크)
+        self.speakers = get_speaker_registry()
+        # 추론 전용 실행기 (이벤트 루프 블로킹 방지)
+        self.executor = InferenceExecutor("tts", model=MODEL_LABEL)
+        # 큐 깊이와 p95로 확산 스텝 수를 낮추거나 되돌리는 부하 제어기
+        self.load = get_controller("tts")
+        self.load.attach(self.executor)
 
         # 체크포인트와 설정 파일 경로 검증
         if not os.path.exists(config_path):
@@ -186,7 +125,13 @@ class MetisTTSService:
         if not os.path.exists(ckpt_path):
             logger.warning(f"체크포인트 파일을 찾을 수 없습니다: {ckpt_path}")
             # 파일이 없어도 계속 진행
+        else:
+            # 해시 매니페스트로 무결성 확인 (불일치 시 로드하지 않고 예외)
+            checkpoint_manager.verify_checkpoint(ckpt_path)
         
+        # Amphion 모듈 지연 로드 (프로세스당 한 번)
+        Metis, load_config = load_amphion()
+
         # 체크포인트와 설정 파일 로드
         try:
             self.cfg = load_config(config_path)
@@ -197,19 +142,45 @@ class MetisTTSService:
             self.ckpt_path = ckpt_path
         
         # 모델 초기화
+        model_loaded = False
         try:
             logger.info(f"Metis TTS 모델을 {device} 장치에 로드합니다...")
-            self.model = Metis(
-                ckpt_path=ckpt_path,
-                cfg=self.cfg,
-                device=device,
-                model_type="tts"
-            )
+            # 체크포인트를 mmap으로 지연 로드 (전체 파일을 메모리로 읽지 않음)
+            with checkpoint_manager.mmap_loading():
+                self.model = Metis(
+                    ckpt_path=ckpt_path,
+                    cfg=self.cfg,
+                    device=device,
+                    model_type="tts"
+                )
             logger.info("Metis TTS 모델 로드 완료!")
+            model_loaded = True
         except Exception as e:
             logger.error(f"모델 로드 중 오류 발생: {e}")
             # 모의 모델로 계속 진행
             self.model = lambda **kwargs: np.zeros(24000, dtype=np.float32)
+        # 모의 모델(Amphion 임포트 또는 체크포인트 로드 실패)이 만든 무음은 영구 캐시에 남기지 않음
+        self.mock_model = not model_loaded or isinstance(self.model, MockMetis)
+
+        # CPU 전용 노드 최적화 (스레드 수, 동적 int8 양자화, bf16)
+        self.cpu_mode = "fp32"
+        if device == "cpu":
+            requested_mode = cpu_mode or metis_runtime.METIS_CPU_MODE
+            if requested_mode != "fp32" or metis_runtime.METIS_INTRA_OP_THREADS or metis_runtime.METIS_INTER_OP_THREADS:
+                metis_runtime.configure_cpu_threads()
+            self.cpu_mode = metis_runtime.optimize_for_cpu(self.model, requested_mode)
+            logger.info(f"Metis CPU 실행 모드: {self.cpu_mode}")
+        # 영구 캐시 아티팩트 ID에 넣는 모델 지문 (체크포인트나 실행 모드가 바뀌면 다른 ID)
+        self.model_key = "mock" if self.mock_model else model_fingerprint(ckpt_path, self.cpu_mode)
+
+        # 컴파일 실행 경로 (첫 추론에서 컴파일하거나 디스크 캐시에서 불러옴)
+        self.compile_cache = None
+        compile_enabled = metis_runtime.METIS_COMPILE if use_compile is None else use_compile
+        if compile_enabled:
+            try:
+                self.compile_cache = metis_runtime.compile_for_inference(self.model, ckpt_path, device, self.cpu_mode)
+            except Exception as e:
+                logger.error(f"torch.compile 적용 실패 (eager 모드로 실행): {e}")
 
         # 프롬프트 음성 준비 (기본 프롬프트 사용)
         self.prompt_speech_path = os.path.join(
@@ -238,115 +209,229 @@ class MetisTTSService:
         # 프롬프트 텍스트 (English 기본값, 한국어 프롬프트로 대체 가능)
         self.prompt_text = "안녕하세요, 저는 메티스 음성 비서입니다. 무엇을 도와드릴까요?"
 
-    @lru_cache(maxsize=32)
-    def synthesize_cached(self, text: str) -> np.ndarray:
-        """텍스트를 음성으로 변환 (캐시 적용)
+    def _load_artifact(self, text: str, prompt: Optional[Prompt] = None) -> Optional[np.ndarray]:
+        """배치 엔드포인트로 미리 렌더링한 기본 품질 오디오를 디스크에서 읽습니다 (없으면 None)."""
+        if not self.disk_cache.enabled:
+            return None
+        voice_key = prompt[2] if prompt else self.voice_key()
+        audio = self.disk_cache.load(self.disk_cache.artifact_id(text, DEFAULT_TIER, voice_key, self.model_key))
+        record_cache("tts_disk", audio is not None, MODEL_LABEL)
+        return audio
 
-        Args:
-            text: 음성으로 변환할 텍스트
+    def resolve_speaker(self, speaker_id: Optional[str] = None) -> Optional[Prompt]:
+        """화자 ID를 프롬프트로 바꿉니다 (None이면 기본 프롬프트를 뜻하는 None).
 
-        Returns:
-            numpy.ndarray: 생성된 음성 데이터
+        Raises:
+            ValueError: 등록되지 않은 화자 ID
         """
-        return self._synthesize_internal(text)
-
-    def synthesize(self, text: str, use_cache: bool = True) -> np.ndarray:
+        if speaker_id is None:
+            return None
+        speaker = self.speakers.get(speaker_id)
+        if speaker is None:
+            raise ValueError(f"등록되지 않은 화자입니다: {speaker_id}")
+        return speaker.prompt_path, speaker.prompt_text, speaker.fingerprint
+
+    def voice_key(self, speaker_id: Optional[str] = None) -> str:
+        """음성 지문 (프롬프트가 바뀌면 달라지므로 캐시 키에 사용, 등록된 화자는 등록 시 계산한 지문)
+
+        Raises:
+            ValueError: 등록되지 않은 화자 ID
+        """
+        if speaker_id is not None:
+            return self.resolve_speaker(speaker_id)[2]
+        if self._default_voice_key is None:
+            self._default_voice_key = voice_fingerprint(self.prompt_speech_path, self.prompt_text, self.sample_rate)
+        return self._default_voice_key
+
+    def artifact_id(self, text: str, tier: str = DEFAULT_TIER, speaker_id: Optional[str] = None) -> str:
+        """정규화된 텍스트의 영구 캐시 아티팩트 ID (synthesize(speaker_id=...)가 조회하는 ID와 같음)"""
+        return self.disk_cache.artifact_id(text, tier, self.voice_key(speaker_id), self.model_key)
+
+    def synthesize(
+        self, text: str, use_cache: bool = True, speaker_id: Optional[str] = None, tier: Optional[str] = None
+    ) -> np.ndarray:
         """텍스트를 음성으로 변환
 
         Args:
             text: 음성으로 변환할 텍스트
             use_cache: 캐시 사용 여부
+            speaker_id: 등록된 화자 ID (None이면 기본 프롬프트)
+            tier: 품질 단계 (TTS_TIERS의 키). 지정하면 부하 제어기를 거치지 않음 (디스크에 남길 필러 등)
 
         Returns:
             numpy.ndarray: 생성된 음성 데이터
+
+        Raises:
+            ValueError: 등록되지 않은 화자 ID
+            SynthesisError: 모델 합성 실패 (결과는 캐시되지 않음)
         """
+        prompt = self.resolve_speaker(speaker_id)
+        # 모의 모델의 무음은 어떤 캐시에도 넣거나 꺼내지 않음
+        use_cache = use_cache and not self.mock_model
+        # 표기만 다른 텍스트가 같은 캐시 항목을 쓰도록 정규화한 텍스트로 합성
+        if TTS_TEXT_NORMALIZE:
+            text = normalize_text(text)
+        # 등록된 화자의 텍스트는 음성 지문으로 구분 (문장 캐시와 같은 키 규칙)
+        key = f"{prompt[2]}:{text}" if prompt else text
         if use_cache:
-            return self.synthesize_cached(text)
+            # 이미 기본 품질로 만들어 둔 오디오가 있으면 부하와 관계없이 그대로 사용 (메모리 → 디스크 순)
+            audio = self.text_cache.get(key)
+            record_cache("tts", audio is not None, MODEL_LABEL)
+            if audio is None:
+                audio = self._load_artifact(text, prompt)
+                if audio is not None:
+                    self.text_cache.put(key, audio)
+            if audio is not None:
+                return audio
+
+        # 캐시에 없을 때만 부하에 따라 품질을 낮춤
+        if tier is not None:
+            n_timesteps = TTS_TIERS[tier]
         else:
-            return self._synthesize_internal(text)
-
-    def _synthesize_internal(self, text: str) -> np.ndarray:
+            _, n_timesteps = self.load.select()
+        audio = self._synthesize_internal(text, use_sentence_cache=use_cache, prompt=prompt, n_timesteps=n_timesteps)
+        # 낮춘 품질의 오디오는 캐시에 남기지 않음
+        if use_cache and n_timesteps == TTS_TIERS[DEFAULT_TIER]:
+            self.text_cache.put(key, audio)
+        return audio
+
+    def _synthesize_internal(
+        self,
+        text: str,
+        use_sentence_cache: bool = True,
+        prompt: Optional[Prompt] = None,
+        n_timesteps: int = TTS_TIERS[DEFAULT_TIER],
+    ) -> np.ndarray:
         """실제 음성 합성을 수행하는 내부 메서드
 
         Args:
             text: 음성으로 변환할 텍스트
+            use_sentence_cache: 긴 텍스트를 나눈 문장 조각에 문장 캐시 사용 여부
+            prompt: 화자 프롬프트 (None이면 기본 프롬프트)
+            n_timesteps: 확산 추론 스텝 수 (기본 품질보다 적으면 문장 캐시에 저장하지 않음)
 
         Returns:
             numpy.ndarray: 생성된 음성 데이터
+
+        Raises:
+            SynthesisError: 모델 합성 실패 (조각 하나라도 실패하면 전체 실패)
         """
         # 긴 텍스트는 문장 단위로 분할
-        if len(text) > 100:
-            return self._synthesize_long_text(text)
-        
+        if len(text) > TTS_SEGMENT_MAX_CHARS:
+            return self._synthesize_long_text(text, use_sentence_cache, prompt=prompt, n_timesteps=n_timesteps)
+        # 여러 문장으로 된 응답도 문장 캐시를 공유하도록 문장 단위로 합성
+        if use_sentence_cache and self.sentence_cache.enabled:
+            sentences = segment_text(text, TTS_SEGMENT_MIN_CHARS, TTS_SEGMENT_MAX_CHARS)
+            if len(sentences) > 1:
+                return self._synthesize_long_text(text, use_sentence_cache, sentences, prompt, n_timesteps)
+            if n_timesteps != TTS_TIERS[DEFAULT_TIER]:
+                # 품질을 낮추기 전에 다른 응답의 조각으로 기본 품질로 캐시된 문장인지 확인
+                return self._synthesize_segment(text, use_sentence_cache, prompt, n_timesteps)[0]
+
+        audio = self._synthesize_sentence(text, n_timesteps, prompt)
+        if audio is None:
+            raise SynthesisError(f"음성 합성 실패: {text[:50]}")
+        return audio
+
+    def _synthesize_sentence(
+        self, text: str, n_timesteps: int = TTS_TIERS[DEFAULT_TIER], prompt: Optional[Prompt] = None
+    ) -> Optional[np.ndarray]:
+        """모델로 한 조각을 합성합니다 (실패하면 None, 캐시에 저장하지 않기 위해 구분).
+
+        프롬프트 특징은 음성 지문으로 캐시를 조회하여 있으면 재사용하고, 없으면 이번 합성에서 인코딩한 결과를 저장합니다.
+
+        Args:
+            text: 음성으로 변환할 텍스트 (TTS_SEGMENT_MAX_CHARS 이하)
+            n_timesteps: 확산 추론 스텝 수 (품질 단계)
+            prompt: (프롬프트 음성 경로, 프롬프트 텍스트, 음성 지문), 없으면 기본 프롬프트
+
+        Returns:
+            Optional[numpy.ndarray]: 생성된 음성 데이터
+        """
+        import torch
+
+        prompt_speech_path, prompt_text, voice_key = prompt or (self.prompt_speech_path, self.prompt_text, self.voice_key())
         try:
             # Metis 모델로 음성 합성
             with torch.no_grad():
                 # 프롬프트 음성 경로 확인
-                if not os.path.exists(self.prompt_speech_path):
-                    logger.warning(f"프롬프트 음성 파일을 찾을 수 없습니다: {self.prompt_speech_path}")
-                    # 더미 오디오 반환
-                    return np.zeros(24000, dtype=np.float32)
+                if not os.path.exists(prompt_speech_path):
+                    logger.warning(f"프롬프트 음성 파일을 찾을 수 없습니다: {prompt_speech_path}")
+                    return None
                 
                 try:
-                    gen_speech = self.model(
-                        prompt_speech_path=self.prompt_speech_path,
-                        text=text,
-                        prompt_text=self.prompt_text,
-                        model_type="tts",
-                        n_timesteps=25,  # 품질과 속도 간 균형을 위한 추론 스텝 수
-                        cfg=2.5,         # 분류기 자유 안내 스케일
-                    )
+                    # 모의 모델처럼 인코딩 메서드가 없으면 특징 캐시를 조회하지 않음
+                    features = self.speakers.features if metis_runtime.has_prompt_encoder(self.model) else None
+                    cached = features.get(voice_key) if features is not None else None
+                    start = time.perf_counter()
+                    with metis_runtime.prompt_feature_scope(self.model, cached) as recorded:
+                        gen_speech = self.model(
+                            prompt_speech_path=prompt_speech_path,
+                            text=text,
+                            prompt_text=prompt_text,
+                            model_type="tts",
+                            n_timesteps=n_timesteps,  # 품질과 속도 간 균형을 위한 추론 스텝 수
+                            cfg=2.5,         # 분류기 자유 안내 스케일
+                        )
+                    observe_stage("tts_sentence", time.perf_counter() - start, MODEL_LABEL)
+                    if recorded and features is not None:
+                        features.put(voice_key, recorded)
+                    if self.mock_model:
+                        # 무음을 돌려주는 모의 모델은 성공으로 기록하지 않음 (헬스 체크에 실패로 표시)
+                        health_service.record_failure("tts", "TTS 모델이 로드되지 않아 모의 모델(무음)을 사용 중입니다")
+                    else:
+                        health_service.record_success("tts")
+                    if self.compile_cache is not None:
+                        self.compile_cache.persist_once()
                     
                     return gen_speech
                 except Exception as e:
                     logger.error(f"모델 호출 중 오류: {e}")
-                    # 더미 오디오 반환
-                    return np.zeros(24000, dtype=np.float32)
+                    health_service.record_failure("tts", e)
+                    return None
                 
         except Exception as e:
             logger.error(f"음성 합성 중 오류 발생: {e}")
-            # 더미 오디오 반환
-            return np.zeros(24000, dtype=np.float32)
+            return None
 
-    def _synthesize_long_text(self, text: str) -> np.ndarray:
+    def _synthesize_long_text(
+        self,
+        text: str,
+        use_sentence_cache: bool = True,
+        sentences: Optional[list] = None,
+        prompt: Optional[Prompt] = None,
+        n_timesteps: int = TTS_TIERS[DEFAULT_TIER],
+    ) -> np.ndarray:
         """긴 텍스트를 문장 단위로 분할하여 합성
 
+        문장 조각마다 정규화된 텍스트를 키로 문장 캐시를 조회하고,
+        캐시된 조각과 새로 합성한 조각을 이어 붙여 응답 오디오를 만듭니다.
+
         Args:
             text: 음성으로 변환할 긴 텍스트
+            use_sentence_cache: 문장 캐시 사용 여부
+            sentences: 이미 분할한 조각 (없으면 분할)
+            prompt: 화자 프롬프트 (None이면 기본 프롬프트)
+            n_timesteps: 확산 추론 스텝 수
 
         Returns:
             numpy.ndarray: 결합된 음성 데이터
         """
-        # 문장 구분자
-        delimiters = ['. ', '? ', '! ', '\n']
-        
-        # 문장 단위로 텍스트 분할
-        sentences = []
-        remaining = text
+        # 각 조각은 TTS_SEGMENT_MAX_CHARS 이하이므로 다시 분할되지 않음
+        if sentences is None:
+            sentences = segment_text(text, TTS_SEGMENT_MIN_CHARS, TTS_SEGMENT_MAX_CHARS)
+        use_sentence_cache = use_sentence_cache and self.sentence_cache.enabled
         
-        while remaining:
-            # 가장 가까운 구분자 찾기
-            min_pos = len(remaining)
-            for delim in delimiters:
-                pos = remaining.find(delim)
-                if pos != -1 and pos < min_pos:
-                    min_pos = pos + len(delim)
-            
-            # 구분자가 없으면 남은 텍스트를 하나의 문장으로 처리
-            if min_pos == len(remaining):
-                sentences.append(remaining)
-                break
-            
-            # 문장 추출 및 남은 텍스트 업데이트
-            sentences.append(remaining[:min_pos])
-            remaining = remaining[min_pos:]
-        
-        # 각 문장에 대해 음성 합성
+        # 각 문장에 대해 음성 합성 (캐시된 문장은 재사용)
         audio_segments = []
+        hits = 0
         for sentence in sentences:
-            if sentence.strip():  # 빈 문장 제외
-                audio = self._synthesize_internal(sentence)
-                audio_segments.append(audio)
+            audio, hit = self._synthesize_segment(sentence, use_sentence_cache, prompt, n_timesteps)
+            hits += hit
+            audio_segments.append(audio)
+        if use_sentence_cache:
+            self.sentence_cache.record_reply(hits, len(sentences))
+            record_cache("tts_reply", hits == len(sentences), MODEL_LABEL)
         
         # 합성된 음성 세그먼트 결합
         if audio_segments:
@@ -355,38 +440,140 @@ class MetisTTSService:
         else:
             return np.array([])
 
-    def synthesize_to_file(self, text: str, output_path: str, use_cache: bool = True) -> str:
+    def _synthesize_segment(
+        self,
+        sentence: str,
+        use_sentence_cache: bool,
+        prompt: Optional[Prompt] = None,
+        n_timesteps: int = TTS_TIERS[DEFAULT_TIER],
+    ) -> Tuple[np.ndarray, bool]:
+        """문장 조각 하나를 문장 캐시를 거쳐 합성합니다 (기본 품질로 합성한 조각만 캐시에 저장).
+
+        Returns:
+            Tuple[numpy.ndarray, bool]: (음성 데이터, 문장 캐시 적중 여부)
+
+        Raises:
+            SynthesisError: 모델 합성 실패
+        """
+        # 분할 위치에 따라 끝 문장 부호가 달라질 수 있으므로 조각 단위로 다시 정규화
+        text = normalize_text(sentence) if TTS_TEXT_NORMALIZE else sentence
+        # 등록된 화자의 문장은 음성 지문으로 구분 (기본 프롬프트의 키는 그대로)
+        key = f"{prompt[2]}:{text}" if prompt else text
+        audio = self.sentence_cache.get(key) if use_sentence_cache else None
+        if use_sentence_cache:
+            record_cache("tts_sentence", audio is not None, MODEL_LABEL)
+        if audio is not None:
+            return audio, True
+        audio = self._synthesize_sentence(text, n_timesteps, prompt)
+        if audio is None:
+            raise SynthesisError(f"음성 합성 실패: {text[:50]}")
+        if use_sentence_cache and n_timesteps == TTS_TIERS[DEFAULT_TIER]:
+            self.sentence_cache.put(key, audio)
+        return audio, False
+
+    def synthesize_segment(self, text: str, use_cache: bool = True, speaker_id: Optional[str] = None) -> np.ndarray:
+        """segment_text로 나눈 조각 하나를 합성합니다 (긴 텍스트 작업이 조각마다 호출).
+
+        Args:
+            text: 문장 조각 (TTS_SEGMENT_MAX_CHARS 이하)
+            use_cache: 문장 캐시 사용 여부
+            speaker_id: 등록된 화자 ID (None이면 기본 프롬프트)
+
+        Returns:
+            numpy.ndarray: 생성된 음성 데이터
+
+        Raises:
+            SynthesisError: 모델 합성 실패
+        """
+        prompt = self.resolve_speaker(speaker_id)
+        use_cache = use_cache and self.sentence_cache.enabled and not self.mock_model
+        audio, _ = self._synthesize_segment(text, use_cache, prompt)
+        return audio
+
+    def synthesize_batch(
+        self, texts: List[str], tier: str = DEFAULT_TIER, speaker_id: Optional[str] = None
+    ) -> List[Optional[np.ndarray]]:
+        """정규화된 텍스트 여러 개를 한 번의 실행기 작업으로 합성합니다 (미리 렌더링용).
+
+        Metis는 배치 입력을 받지 않으므로 텍스트를 차례로 합성하되, 요청마다 큐를 거치지 않고
+        프롬프트/품질 설정을 한 번만 확인합니다. 문장 캐시와 메모리 캐시는 건너뜁니다.
+
+        Args:
+            texts: 정규화된 텍스트 목록 (중복 제거는 호출자가 수행)
+            tier: 품질 단계 (TTS_TIERS의 키)
+            speaker_id: 등록된 화자 ID (None이면 기본 프롬프트)
+
+        Returns:
+            List[Optional[numpy.ndarray]]: 텍스트별 음성 데이터 (합성 실패 시 None)
+
+        Raises:
+            ValueError: 등록되지 않은 화자 ID
+        """
+        n_timesteps = TTS_TIERS[tier]
+        prompt = self.resolve_speaker(speaker_id)
+        results = []
+        for text in texts:
+            pieces = []
+            for sentence in segment_text(text, TTS_SEGMENT_MIN_CHARS, TTS_SEGMENT_MAX_CHARS):
+                audio = self._synthesize_sentence(sentence, n_timesteps, prompt)
+                if audio is None:
+                    pieces = None
+                    break
+                pieces.append(audio)
+            results.append(np.concatenate(pieces) if pieces else None)
+        return results
+
+    def cache_stats(self) -> Dict[str, object]:
+        """문장 캐시(문장 단위/응답 단위)와 전체 텍스트 캐시의 적중률과 사용량"""
+        text_cache = self.text_cache.stats()
+        return {
+            "sentence_cache": self.sentence_cache.stats(),
+            "text_cache": {
+                "hits": text_cache["sentence"]["hits"],
+                "misses": text_cache["sentence"]["misses"],
+                "entries": text_cache["entries"],
+                "max_entries": text_cache["max_entries"],
+                "bytes": text_cache["bytes"],
+            },
+        }
+
+    def synthesize_to_file(self, text: str, output_path: str, use_cache: bool = True, speaker_id: Optional[str] = None) -> str:
         """텍스트를 음성으로 변환하여 파일로 저장
 
         Args:
             text: 음성으로 변환할 텍스트
             output_path: 출력 파일 경로 (.wav)
             use_cache: 캐시 사용 여부
+            speaker_id: 등록된 화자 ID (None이면 기본 프롬프트)
 
         Returns:
             str: 저장된 파일 경로
         """
-        audio = self.synthesize(text, use_cache)
+        audio = self.synthesize(text, use_cache, speaker_id)
+        start = time.perf_counter()
         sf.write(output_path, audio, self.sample_rate)
+        observe_stage("audio_encode", time.perf_counter() - start, MODEL_LABEL)
         return output_path
 
-    def synthesize_to_bytes(self, text: str, format: str = "wav", use_cache: bool = True) -> bytes:
+    def synthesize_to_bytes(
+        self, text: str, format: str = "wav", use_cache: bool = True, speaker_id: Optional[str] = None
+    ) -> bytes:
         """텍스트를 음성으로 변환하여 바이트로 반환
 
         Args:
             text: 음성으로 변환할 텍스트
             format: 오디오 포맷 ('wav', 'ogg', 'flac')
             use_cache: 캐시 사용 여부
+            speaker_id: 등록된 화자 ID (None이면 기본 프롬프트)
 
         Returns:
             bytes: 오디오 바이트 데이터
         """
-        audio = self.synthesize(text, use_cache)
+        audio = self.synthesize(text, use_cache, speaker_id)
         
-        # 메모리에 오디오 데이터 쓰기
-        buffer = io.BytesIO()
-        sf.write(buffer, audio, self.sample_rate, format=format)
-        buffer.seek(0)
+        start = time.perf_counter()
+        audio_bytes = encode_audio_bytes(audio, self.sample_rate, format)
+        observe_stage("audio_encode", time.perf_counter() - start, MODEL_LABEL)
         
-        return buffer.read()
+        return audio_bytes
     
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+VAD(음성 구간 감지) 서비스 모듈
+
+긴 오디오를 침묵 경계에서 청크로 나누어 STT 워커들이 병렬로 인식할 수 있게 합니다.
+faster_whisper의 Silero VAD를 사용할 수 있으면 사용하고, 없으면 프레임 에너지 기반 VAD로 대체합니다.
+
+환경 변수:
+    VAD_BACKEND: "auto"(기본, Silero 가능 시 사용), "silero", "energy"
+    STT_CHUNK_SECONDS: 청크 최대 길이 (기본 30초, Whisper 입력 창 길이)
+    STT_CHUNK_MIN_SILENCE_MS: 청크 경계로 쓸 최소 침묵 길이 (기본 300ms)
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+VAD_BACKEND = os.getenv("VAD_BACKEND", "auto")
+STT_CHUNK_SECONDS = float(os.getenv("STT_CHUNK_SECONDS", "30"))
+STT_CHUNK_MIN_SILENCE_MS = float(os.getenv("STT_CHUNK_MIN_SILENCE_MS", "300"))
+
+# 에너지 VAD 설정
+ENERGY_FRAME_MS = 30
+ENERGY_PEAK_RATIO_DB = -35.0  # 최대 프레임 에너지 대비 임계값
+ENERGY_NOISE_FACTOR = 2.0     # 잡음 바닥(하위 10% 프레임) 대비 임계값
+
+
+@dataclass
+class AudioChunk:
+    """인식 단위 청크 (샘플 인덱스 구간)"""
+
+    index: int
+    start: int
+    end: int
+
+    @property
+    def start_seconds(self) -> float:
+        return self.start / SAMPLE_RATE
+
+    @property
+    def end_seconds(self) -> float:
+        return self.end / SAMPLE_RATE
+
+
+def _silero_regions(audio: np.ndarray, min_silence_ms: float) -> List[Tuple[int, int]]:
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    options = VadOptions(min_silence_duration_ms=int(min_silence_ms))
+    return [(item["start"], item["end"]) for item in get_speech_timestamps(audio, options)]
+
+
+def _energy_regions(audio: np.ndarray, sample_rate: int, min_silence_ms: float) -> List[Tuple[int, int]]:
+    """프레임 RMS가 임계값을 넘는 구간을 음성으로 봅니다 (짧은 침묵은 메움)."""
+    frame = int(sample_rate * ENERGY_FRAME_MS / 1000)
+    frames = len(audio) // frame
+    if frames == 0:
+        return [(0, len(audio))] if np.any(audio) else []
+
+    rms = np.sqrt(np.mean(np.square(audio[:frames * frame].reshape(frames, frame), dtype=np.float32), axis=1))
+    peak = float(rms.max())
+    if peak <= 1e-6:
+        return []
+    # 침묵 없이 계속 말하는 오디오는 잡음 바닥이 음성 수준이므로 최대값의 절반을 넘지 않게 함
+    noise_threshold = min(float(np.percentile(rms, 10)) * ENERGY_NOISE_FACTOR, peak * 0.5)
+    threshold = max(noise_threshold, peak * 10 ** (ENERGY_PEAK_RATIO_DB / 20))
+    speech = rms > threshold
+
+    # 음성 프레임 구간 추출 (경계 인덱스를 한 번에 계산)
+    padded = np.concatenate(([False], speech, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = edges[0::2], edges[1::2]
+
+    # min_silence_ms보다 짧은 침묵으로 떨어진 구간은 합침
+    min_gap = max(1, int(min_silence_ms / ENERGY_FRAME_MS))
+    regions: List[Tuple[int, int]] = []
+    for start, end in zip(starts, ends):
+        if regions and start - regions[-1][1] < min_gap:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return [(start * frame, min(len(audio), end * frame)) for start, end in regions]
+
+
+def speech_regions(audio: np.ndarray, sample_rate: int = SAMPLE_RATE, min_silence_ms: float = STT_CHUNK_MIN_SILENCE_MS) -> List[Tuple[int, int]]:
+    """음성 구간 목록 [(시작 샘플, 끝 샘플)]을 반환합니다."""
+    if VAD_BACKEND in ("auto", "silero"):
+        try:
+            return _silero_regions(audio, min_silence_ms)
+        except ImportError:
+            if VAD_BACKEND == "silero":
+                raise
+        except Exception as e:
+            logger.warning(f"Silero VAD 실패, 에너지 VAD로 대체: {e}")
+    return _energy_regions(audio, sample_rate, min_silence_ms)
+
+
+def split_on_silence(
+    audio: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    chunk_seconds: float = STT_CHUNK_SECONDS,
+    min_silence_ms: float = STT_CHUNK_MIN_SILENCE_MS,
+) -> List[AudioChunk]:
+    """오디오를 침묵 경계에서 chunk_seconds 이하의 청크로 나눕니다.
+
+    음성 구간을 순서대로 이어 붙이다가 길이를 넘으면 직전 침묵의 가운데에서 자릅니다.
+    침묵이 길어 가운데에서 자르면 길이를 넘는 경우에는 청크 끝과 다음 청크 시작을 음성 쪽으로 당기므로
+    (긴 침묵의 일부는 어느 청크에도 들어가지 않음) 모든 청크는 chunk_seconds 이하입니다.
+    한 음성 구간이 chunk_seconds보다 길면 같은 길이로 강제 분할합니다.
+    음성이 없으면 빈 목록을 반환합니다.
+
+    Args:
+        audio: 16kHz 모노 float32 오디오
+        sample_rate: 샘플 레이트
+        chunk_seconds: 청크 최대 길이 (초)
+        min_silence_ms: 경계로 쓸 최소 침묵 길이
+
+    Returns:
+        List[AudioChunk]: 시간 순서의 청크 목록
+    """
+    max_samples = int(chunk_seconds * sample_rate)
+    regions = speech_regions(audio, sample_rate, min_silence_ms)
+    if not regions:
+        return []
+
+    # 너무 긴 음성 구간은 먼저 나눔
+    bounded: List[Tuple[int, int]] = []
+    for start, end in regions:
+        pieces = -(-(end - start) // max_samples)
+        step = -(-(end - start) // pieces)
+        bounded.extend((position, min(end, position + step)) for position in range(start, end, step))
+
+    # 청크 범위: 첫 음성 앞 여유, 침묵 가운데, 마지막 음성 뒤 여유 (각 청크는 max_samples 이하)
+    # 청크 첫 음성 구간의 끝은 항상 chunk_start + max_samples 안에 있고, 이어 붙인 구간도 여유까지 그 안에 있음
+    padding = int(min_silence_ms / 1000 * sample_rate)
+    ranges: List[Tuple[int, int]] = []
+    chunk_start = max(0, bounded[0][0] - padding, bounded[0][1] - max_samples)
+    for (_, previous_end), (start, end) in zip(bounded, bounded[1:]):
+        if end + padding - chunk_start > max_samples:
+            cut = (previous_end + start) // 2
+            ranges.append((chunk_start, min(cut, chunk_start + max_samples)))
+            chunk_start = max(cut, end - max_samples)
+    ranges.append((chunk_start, min(len(audio), bounded[-1][1] + padding, chunk_start + max_samples)))
+
+    return [AudioChunk(index, start, end) for index, (start, end) in enumerate(ranges)]
@@ -0,0 +1,22 @@
+"""
+JSON Lines(NDJSON) 스트리밍 헬퍼 모듈
+
+일괄 처리 엔드포인트가 항목별 결과를 끝나는 대로 한 줄씩 보내도록 직렬화와 응답 생성을 제공합니다.
+"""
+
+import json
+from typing import Any, AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+from utils.sse import SSE_HEADERS
+
+
+def format_line(data: Any) -> bytes:
+    """JSON 객체 하나를 한 줄로 직렬화합니다."""
+    return (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def ndjson_response(lines: AsyncIterator[bytes]) -> StreamingResponse:
+    """줄 바이트를 내보내는 비동기 이터레이터로 JSON Lines 응답을 만듭니다 (프록시 버퍼링 없음)."""
+    return StreamingResponse(lines, media_type="application/x-ndjson", headers=SSE_HEADERS)
@@ -0,0 +1,46 @@
+"""
+Server-Sent Events(SSE) 헬퍼 모듈
+
+스트리밍 엔드포인트가 같은 형식으로 이벤트를 보내도록 이벤트 직렬화와 응답 생성을 제공합니다.
+"""
+
+import json
+from typing import Any, AsyncIterator, Optional
+
+from fastapi.responses import StreamingResponse
+
+# 프록시(nginx 등)가 응답을 버퍼링하지 않도록 하는 헤더
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_event(event: str, data: Any, event_id: Optional[str] = None) -> bytes:
+    """SSE 이벤트 하나를 직렬화합니다 (data는 JSON).
+
+    Args:
+        event: 이벤트 이름
+        data: JSON으로 직렬화할 데이터
+        event_id: 이벤트 ID (재연결 시 Last-Event-ID로 사용)
+
+    Returns:
+        bytes: 전송할 이벤트 바이트
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+def format_comment(text: str = "") -> bytes:
+    """연결 유지용 주석 이벤트 (클라이언트는 무시함)"""
+    return f": {text}\n\n".encode("utf-8")
+
+
+def sse_response(events: AsyncIterator[bytes]) -> StreamingResponse:
+    """이벤트 바이트를 내보내는 비동기 이터레이터로 SSE 응답을 만듭니다."""
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
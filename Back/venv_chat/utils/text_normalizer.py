@@ -0,0 +1,293 @@
+"""
+한국어 텍스트 정규화 모듈
+
+TTS 합성 전에 숫자, 날짜, 시각, 단위, 영문 약어를 한국어 읽기로 풀어 쓰고
+공백과 문장 부호를 정리합니다. 같은 의미의 표기 차이("10시"/"열 시", 공백, 끝 문장 부호)가
+같은 문자열로 모이므로 정규화 결과를 TTS 캐시 키로 사용합니다.
+
+결과는 메모이제이션되며, 크기는 TEXT_NORMALIZE_CACHE_SIZE 환경 변수로 조정합니다.
+"""
+
+import os
+import re
+import logging
+import unicodedata
+from functools import lru_cache
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+TEXT_NORMALIZE_CACHE_SIZE = int(os.getenv("TEXT_NORMALIZE_CACHE_SIZE", "4096"))
+
+SINO_DIGITS = "영일이삼사오육칠팔구"
+SINO_SMALL_UNITS = ("", "십", "백", "천")
+SINO_LARGE_UNITS = ("", "만", "억", "조", "경")
+PHONE_DIGITS = "공일이삼사오육칠팔구"
+NATIVE_TENS = ("", "열", "스물", "서른", "마흔", "쉰", "예순", "일흔", "여든", "아흔")
+NATIVE_ONES = ("", "한", "두", "세", "네", "다섯", "여섯", "일곱", "여덟", "아홉")
+
+# 고유어 수사로 읽는 단위 (긴 단위를 먼저 두어 "시간"이 "시"보다 먼저 매칭되도록 함)
+NATIVE_COUNTERS = ("시간", "군데", "가지", "마리", "개", "명", "살", "잔", "권", "달", "시")
+
+# 고유어 단위로 시작하지만 한자어 수사로 읽는 단위 ("3개월" → 삼 개월, "3달러" → 삼 달러, "2시즌" → 이 시즌)
+SINO_COUNTERS = ("시리즈", "개월", "개국", "개년", "달러", "시즌", "권역")
+
+# 이웃한 두 수의 어림수 읽기 ("3-4개" → 서너 개)
+NATIVE_APPROXIMATES = {
+    (1, 2): "한두", (2, 3): "두세", (3, 4): "서너", (4, 5): "네다섯",
+    (5, 6): "대여섯", (6, 7): "예닐곱", (7, 8): "일고여덟", (8, 9): "여덟아홉",
+}
+
+# 숫자 뒤의 측정 단위 읽기
+UNIT_READINGS = {
+    "km": "킬로미터", "cm": "센티미터", "mm": "밀리미터", "m": "미터",
+    "kg": "킬로그램", "mg": "밀리그램", "g": "그램",
+    "ml": "밀리리터", "mL": "밀리리터", "L": "리터",
+    "KB": "킬로바이트", "MB": "메가바이트", "GB": "기가바이트", "TB": "테라바이트",
+    "ms": "밀리초", "Hz": "헤르츠", "kHz": "킬로헤르츠",
+    "%": "퍼센트", "°C": "도",
+}
+
+# 숫자 앞에 붙는 통화 기호
+CURRENCY_READINGS = {"$": "달러", "€": "유로", "£": "파운드", "¥": "엔", "₩": "원"}
+
+# 영문 알파벳 읽기
+LETTER_READINGS = {
+    "A": "에이", "B": "비", "C": "씨", "D": "디", "E": "이", "F": "에프", "G": "지",
+    "H": "에이치", "I": "아이", "J": "제이", "K": "케이", "L": "엘", "M": "엠", "N": "엔",
+    "O": "오", "P": "피", "Q": "큐", "R": "알", "S": "에스", "T": "티", "U": "유",
+    "V": "브이", "W": "더블유", "X": "엑스", "Y": "와이", "Z": "지",
+}
+
+# 글자 단위가 아니라 단어로 읽는 약어
+ACRONYM_READINGS = {"OK": "오케이", "NASA": "나사", "UNESCO": "유네스코", "NATO": "나토"}
+
+_NUMBER = r"\d{1,3}(?:,\d{3})+|\d+"
+
+_UNIT_PATTERN = re.compile(
+    r"((?:(?<![\w.])-)?(?:" + _NUMBER + r")(?:\.\d+)?)\s?("
+    + "|".join(re.escape(unit) for unit in sorted(UNIT_READINGS, key=len, reverse=True))
+    + r")(?![A-Za-z])"
+)
+_CURRENCY_PATTERN = re.compile(
+    "([" + "".join(re.escape(symbol) for symbol in CURRENCY_READINGS) + r"])\s?((?:" + _NUMBER + r")(?:\.\d+)?)"
+)
+_SINO_COUNTER_PATTERN = re.compile(r"(?<![\d,.])(" + _NUMBER + r")\s?(" + "|".join(SINO_COUNTERS) + ")")
+_COUNTER_PATTERN = re.compile(
+    r"(?<![\d,.])(" + _NUMBER + r")\s?(?!" + "|".join(SINO_COUNTERS) + ")(" + "|".join(NATIVE_COUNTERS) + ")"
+)
+_MINUTE_PATTERN = re.compile(r"(?<![\d,.])(\d+)\s?(분|초)")
+_DATE_PATTERN = re.compile(r"(?<!\d)(\d{4})[-./](\d{1,2})[-./](\d{1,2})(?!\d)")
+# 연-월 ("2024-05", "2024.05"): 통화 기호 뒤나 단위 앞의 소수("$2024.05", "2024.5kg")는 제외
+_YEAR_MONTH_PATTERN = re.compile(
+    r"(?<![\d,.\-" + "".join(re.escape(symbol) for symbol in CURRENCY_READINGS) + r"])"
+    r"((?:19|20)\d{2})[-./](\d{1,2})(?![\d,]|[-./]\d|\s?[A-Za-z%°])"
+)
+_MONTH_PATTERN = re.compile(r"(?<![\d,.])(\d{1,2})\s?월")
+_CLOCK_PATTERN = re.compile(r"(?<![\d:])(\d{1,2}):(\d{2})(?![\d:])")
+_PHONE_PATTERN = re.compile(r"(?<!\d)(0\d{1,2})-(\d{3,4})-(\d{4})(?!\d)")
+_COUNTER_RANGE_PATTERN = re.compile(
+    r"(?<![\d,.])(\d{1,2})(?:\s?~\s?|-)(\d{1,2})\s?(?!" + "|".join(SINO_COUNTERS) + ")(" + "|".join(NATIVE_COUNTERS) + ")"
+)
+_RANGE_PATTERN = re.compile(r"(\d)(?:\s?~\s?|-)(\d)")
+_NUMBER_PATTERN = re.compile(r"((?<![\w.])-)?(" + _NUMBER + r")(?:\.(\d+))?")
+_ACRONYM_PATTERN = re.compile(r"(?<![A-Za-z])[A-Z]{2,6}(?![A-Za-z])")
+
+_QUOTES = str.maketrans("", "", "\"'`“”‘’«»「」『』")
+_INLINE_SPACE = re.compile(r"[^\S\n]+")
+_NEWLINES = re.compile(r"\s*\n\s*")
+_SPACE_BEFORE_PUNCT = re.compile(r"\s+([.,!?])")
+_ELLIPSIS = re.compile(r"\.{2,}|…")
+_REPEATED_PUNCT = re.compile(r"([!?])[!?]+|,{2,}")
+_TILDE = re.compile(r"~+")
+
+
+def sino_number(value: int) -> str:
+    """정수를 한자어 수사로 읽습니다 (예: 2024 → 이천이십사, 10000 → 만)."""
+    if value == 0:
+        return SINO_DIGITS[0]
+    if value < 0:
+        return f"마이너스 {sino_number(-value)}"
+
+    groups = []
+    index = 0
+    while value > 0 and index < len(SINO_LARGE_UNITS):
+        value, group = divmod(value, 10000)
+        if group:
+            words = []
+            for position in range(3, -1, -1):
+                digit = group // (10 ** position) % 10
+                if digit:
+                    # 십/백/천 앞의 "일"은 생략
+                    words.append(("" if digit == 1 and position else SINO_DIGITS[digit]) + SINO_SMALL_UNITS[position])
+            reading = "".join(words)
+            if index == 1 and group == 1:
+                reading = ""  # "일만" 대신 "만"
+            groups.append(reading + SINO_LARGE_UNITS[index])
+        index += 1
+    return " ".join(reversed(groups))
+
+
+def native_number(value: int) -> str:
+    """단위 앞에서 쓰는 고유어 수사 (1~99, 그 밖의 값은 한자어 수사)"""
+    if not 0 < value < 100:
+        return sino_number(value)
+    tens, ones = divmod(value, 10)
+    if tens == 2 and ones == 0:
+        return "스무"
+    return NATIVE_TENS[tens] + NATIVE_ONES[ones]
+
+
+def read_digits(digits: str, zero: str = SINO_DIGITS[0]) -> str:
+    """숫자를 한 자리씩 읽습니다 (전화번호, 소수부 등)."""
+    return "".join(zero if ch == "0" else SINO_DIGITS[int(ch)] for ch in digits)
+
+
+def read_number(text: str) -> str:
+    """숫자 문자열(부호, 천 단위 쉼표, 소수부 포함)을 한자어로 읽습니다."""
+    match = _NUMBER_PATTERN.fullmatch(text)
+    if not match:
+        return text
+    sign, integer, fraction = match.groups()
+    integer = integer.replace(",", "")
+    if len(integer) > 1 and integer.startswith("0") or len(integer) > 20:
+        # 0으로 시작하거나 너무 긴 숫자는 번호로 보고 한 자리씩 읽음
+        reading = read_digits(integer, PHONE_DIGITS[0])
+    else:
+        reading = sino_number(int(integer))
+    if fraction:
+        reading = f"{reading} 점 {read_digits(fraction)}"
+    return f"마이너스 {reading}" if sign else reading
+
+
+def month_reading(month: int) -> str:
+    """월 이름 읽기 (6월 → 유월, 10월 → 시월)"""
+    return {6: "유", 10: "시"}.get(month, sino_number(month)) + "월"
+
+
+def _replace_date(match: re.Match) -> str:
+    year, month, day = (int(group) for group in match.groups())
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return match.group(0)
+    return f"{sino_number(year)}년 {month_reading(month)} {sino_number(day)}일"
+
+
+def _replace_clock(match: re.Match) -> str:
+    hour, minute = int(match.group(1)), int(match.group(2))
+    if hour > 24 or minute > 59:
+        return match.group(0)
+    reading = f"{native_number(hour) if 0 < hour <= 12 else sino_number(hour)} 시"
+    return f"{reading} {sino_number(minute)} 분" if minute else reading
+
+
+def _replace_year_month(match: re.Match) -> str:
+    year, month = int(match.group(1)), int(match.group(2))
+    if not 1 <= month <= 12:
+        return match.group(0)
+    return f"{sino_number(year)}년 {month_reading(month)}"
+
+
+def _counter_number(value: int, counter: str) -> str:
+    """단위 앞의 수 읽기 (시각은 1~12시만 고유어)"""
+    if counter == "시" and not 0 < value <= 12:
+        return sino_number(value)
+    return native_number(value)
+
+
+def _replace_counter(match: re.Match) -> str:
+    value, counter = int(match.group(1).replace(",", "")), match.group(2)
+    return f"{_counter_number(value, counter)} {counter}"
+
+
+def _replace_counter_range(match: re.Match) -> str:
+    start, end, counter = int(match.group(1)), int(match.group(2)), match.group(3)
+    if counter == "시":
+        # 시각 범위는 양쪽에 "시"를 붙여 읽음 ("3~5시" → 세 시에서 다섯 시)
+        return f"{_counter_number(start, counter)} 시에서 {_counter_number(end, counter)} 시"
+    approximate = NATIVE_APPROXIMATES.get((start, end))
+    if approximate:
+        return f"{approximate} {counter}"
+    return f"{_counter_number(start, counter)}에서 {_counter_number(end, counter)} {counter}"
+
+
+def _replace_acronym(match: re.Match) -> str:
+    word = match.group(0)
+    return ACRONYM_READINGS.get(word) or "".join(LETTER_READINGS[ch] for ch in word)
+
+
+def _normalize_punctuation(text: str) -> str:
+    """문장 부호를 정리하고 끝 문장 부호를 하나로 맞춥니다."""
+    text = text.translate(_QUOTES)
+    text = _ELLIPSIS.sub("...", text)
+    text = _REPEATED_PUNCT.sub(lambda m: m.group(1) or ",", text)
+    text = _TILDE.sub("", text)
+    text = _SPACE_BEFORE_PUNCT.sub(r"\1", text)
+
+    # 끝 문장 부호 통일: 물음표/느낌표는 유지하고, 없으면 마침표를 붙임
+    stripped = text.rstrip(" .,!?")
+    tail = text[len(stripped):]
+    if not stripped:
+        return stripped
+    if "?" in tail:
+        return stripped + "?"
+    if "!" in tail:
+        return stripped + "!"
+    if tail.strip() == "...":
+        return stripped + "..."
+    return stripped + "."
+
+
+@lru_cache(maxsize=TEXT_NORMALIZE_CACHE_SIZE)
+def normalize_text(text: str) -> str:
+    """TTS 입력 텍스트를 정규화합니다 (결과 메모이제이션).
+
+    Args:
+        text: 원본 텍스트
+
+    Returns:
+        str: 숫자/기호를 한국어로 풀어 쓰고 공백/문장 부호를 정리한 텍스트
+
+    결과가 TTS 캐시 키이므로 읽기를 바꾸면 캐시가 갈라집니다. 고정된 예
+    (`python -m doctest utils/text_normalizer.py`로 확인):
+
+    >>> normalize_text("2024-05 보고서")
+    '이천이십사년 오월 보고서.'
+    >>> normalize_text("2024.05 결산")
+    '이천이십사년 오월 결산.'
+    >>> normalize_text("3~5명")
+    '세에서 다섯 명.'
+    >>> normalize_text("3-4개")
+    '서너 개.'
+    >>> normalize_text("3~5시")
+    '세 시에서 다섯 시.'
+    >>> normalize_text("3~5개월")
+    '삼에서 오 개월.'
+    """
+    # 전각 문자, 호환 문자(℃ 등) 통일
+    text = unicodedata.normalize("NFKC", text)
+
+    # 공백 정리 (줄바꿈은 문장 경계로 유지)
+    text = _INLINE_SPACE.sub(" ", text)
+    text = _NEWLINES.sub("\n", text).strip()
+    if not text:
+        return ""
+
+    # 형식이 정해진 숫자 표현을 먼저 처리한 뒤 남은 숫자를 읽음
+    text = _PHONE_PATTERN.sub(lambda m: " ".join(read_digits(group, PHONE_DIGITS[0]) for group in m.groups()), text)
+    text = _DATE_PATTERN.sub(_replace_date, text)
+    text = _YEAR_MONTH_PATTERN.sub(_replace_year_month, text)
+    text = _CLOCK_PATTERN.sub(_replace_clock, text)
+    # 범위 양 끝을 같은 방식으로 읽도록 단위가 붙은 범위를 먼저 처리
+    text = _COUNTER_RANGE_PATTERN.sub(_replace_counter_range, text)
+    text = _RANGE_PATTERN.sub(r"\1에서 \2", text)
+    text = _CURRENCY_PATTERN.sub(lambda m: f"{read_number(m.group(2))} {CURRENCY_READINGS[m.group(1)]}", text)
+    text = _UNIT_PATTERN.sub(lambda m: f"{read_number(m.group(1))} {UNIT_READINGS[m.group(2)]}", text)
+    text = _MONTH_PATTERN.sub(lambda m: month_reading(int(m.group(1))) if 1 <= int(m.group(1)) <= 12 else m.group(0), text)
+    text = _SINO_COUNTER_PATTERN.sub(lambda m: f"{read_number(m.group(1))} {m.group(2)}", text)
+    text = _COUNTER_PATTERN.sub(_replace_counter, text)
+    text = _MINUTE_PATTERN.sub(lambda m: f"{sino_number(int(m.group(1)))} {m.group(2)}", text)
+    text = _NUMBER_PATTERN.sub(lambda m: read_number(m.group(0)), text)
+    text = _ACRONYM_PATTERN.sub(_replace_acronym, text)
+
+    text = _normalize_punctuation(text)
+    return _INLINE_SPACE.sub(" ", text).strip()
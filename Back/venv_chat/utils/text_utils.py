@@ -3,6 +3,7 @@ Utils 모듈: TTS 서비스 및 기타 유틸리티 함수를 위한 헬퍼 모
 """
 
 import os
+import bisect
 import logging
 import re
 from pathlib import Path
@@ -46,25 +47,172 @@ def get_file_paths(directory: str, extension: str = None) -> List[str]:
     
     return file_paths
 
+# 문장 경계 후보: 줄바꿈, 문장 부호 연속, 따옴표 (한 번의 스캔으로 모두 찾음)
+_BOUNDARY_PATTERN = re.compile(r'\n+|[.!?…]+(?=\s|$|[\uAC00-\uD7A3])|["“”「」『』]')
+_OPEN_QUOTES = '“「『'
+_CLOSE_QUOTES = '”」』'
+# 긴 문장을 나눌 위치: 쉼표/세미콜론/콜론 뒤(우선), 공백
+_STRONG_BREAK_PATTERN = re.compile(r'[,;:，、]\s+')
+_WEAK_BREAK_PATTERN = re.compile(r'\s+')
+
+SEGMENT_MIN_CHARS = 10
+SEGMENT_MAX_CHARS = 100
+
+
+def _is_hangul(ch: str) -> bool:
+    return '\uAC00' <= ch <= '\uD7A3'
+
+
+def segment_sentences(text: str) -> List[str]:
+    """텍스트를 한국어 문장 경계 기준으로 분할합니다 (선형 시간, 한 번의 스캔).
+
+    - 마침표/물음표/느낌표 뒤에 공백이나 줄 끝이 오면 경계
+    - "요.다음"처럼 한글 어미 뒤 문장 부호에 바로 한글이 이어져도 경계
+    - 줄바꿈은 항상 경계
+    - 소수점("3.5"), 말줄임표("음... 그렇군요"), 따옴표 안의 문장 부호는 경계가 아님
+    - 목록 번호("1. ")는 앞에서 끊고 번호 뒤에서는 끊지 않음
+
+    Args:
+        text: 분할할 텍스트
+
+    Returns:
+        List[str]: 문장 목록 (앞뒤 공백 제거, 빈 문장 제외)
+    """
+    sentences = []
+    start = 0
+    quote_depth = 0
+    ascii_quote_open = False
+
+    def emit(end: int) -> None:
+        sentence = text[start:end].strip()
+        if sentence:
+            sentences.append(sentence)
+
+    for match in _BOUNDARY_PATTERN.finditer(text):
+        token = match.group()
+        first = token[0]
+        if first == '\n':
+            emit(match.start())
+            start = match.end()
+            quote_depth, ascii_quote_open = 0, False
+            continue
+        if first == '"':
+            ascii_quote_open = not ascii_quote_open
+            continue
+        if first in _OPEN_QUOTES:
+            quote_depth += 1
+            continue
+        if first in _CLOSE_QUOTES:
+            quote_depth = max(0, quote_depth - 1)
+            continue
+
+        # 문장 부호 연속
+        if quote_depth or ascii_quote_open:
+            continue
+        end = match.end()
+        is_ellipsis = '…' in token or token.startswith('..')
+        followed_by_text = end < len(text) and not text[end].isspace()
+        if followed_by_text and (is_ellipsis or not _is_hangul(text[match.start() - 1:match.start()] or ' ')):
+            # 한글 어미 뒤가 아니면 붙어 있는 텍스트는 같은 문장 (약어, 말줄임표 등)
+            continue
+        if is_ellipsis and not followed_by_text:
+            # 말줄임표 뒤 공백은 문장 안의 쉼으로 취급
+            continue
+        if token == '.' and text[match.start() - 1:match.start()].isdigit():
+            # 목록 번호("1. ", "12. "): 번호 앞에서 끊고, 번호는 다음 항목에 붙임
+            marker = match.start() - 1
+            if marker > start and text[marker - 1].isdigit():
+                marker -= 1
+            if marker == start or text[marker - 1].isspace():
+                emit(marker)
+                start = marker
+                continue
+        emit(end)
+        start = end
+
+    emit(len(text))
+    return sentences
+
+
+def _split_long_sentence(sentence: str, max_chars: int) -> List[str]:
+    """긴 문장을 비슷한 길이의 조각으로 나눕니다 (쉼표 > 공백 > 강제 분할 순)."""
+    length = len(sentence)
+    pieces_count = -(-length // max_chars)
+    target = length / pieces_count
+    strong = [m.end() for m in _STRONG_BREAK_PATTERN.finditer(sentence)]
+    weak = [m.end() for m in _WEAK_BREAK_PATTERN.finditer(sentence)]
+
+    pieces = []
+    start = 0
+    while length - start > max_chars:
+        ideal = start + target
+        low, high = start + target * 0.5, start + max_chars
+        cut = None
+        for candidates in (strong, weak):
+            # 허용 범위 안에서 목표 길이에 가장 가까운 위치
+            lo = bisect.bisect_left(candidates, low)
+            hi = bisect.bisect_right(candidates, high)
+            if lo < hi:
+                cut = min(candidates[lo:hi], key=lambda position: abs(position - ideal))
+                break
+        if cut is None:
+            cut = int(ideal)
+        piece = sentence[start:cut].strip()
+        if piece:
+            pieces.append(piece)
+        start = cut
+    tail = sentence[start:].strip()
+    if tail:
+        pieces.append(tail)
+    return pieces
+
+
+def segment_text(text: str, min_chars: int = SEGMENT_MIN_CHARS, max_chars: int = SEGMENT_MAX_CHARS) -> List[str]:
+    """합성/스트리밍 단위로 쓰기 좋은 길이의 조각으로 텍스트를 나눕니다.
+
+    문장 단위로 분할한 뒤, min_chars보다 짧은 문장은 다음 문장(마지막이면 이전 조각)과 합치고
+    max_chars보다 긴 문장은 쉼표나 공백 위치에서 비슷한 길이로 나눕니다.
+
+    Args:
+        text: 분할할 텍스트
+        min_chars: 조각 최소 길이 (이보다 짧으면 이웃과 합침)
+        max_chars: 조각 최대 길이
+
+    Returns:
+        List[str]: 조각 목록 (각 조각은 max_chars 이하)
+    """
+    chunks: List[str] = []
+    pending = ""
+    for sentence in segment_sentences(text):
+        if pending:
+            sentence = f"{pending} {sentence}"
+            pending = ""
+        if len(sentence) < min_chars:
+            pending = sentence
+            continue
+        if len(sentence) > max_chars:
+            chunks.extend(_split_long_sentence(sentence, max_chars))
+        else:
+            chunks.append(sentence)
+
+    if pending:
+        if chunks and len(chunks[-1]) + len(pending) + 1 <= max_chars:
+            chunks[-1] = f"{chunks[-1]} {pending}"
+        else:
+            chunks.append(pending)
+    return chunks
+
+
 def split_text_into_sentences(text: str) -> List[str]:
-    """텍스트를 문장 단위로 분할합니다.
-    
+    """텍스트를 문장 단위로 분할합니다 (segment_sentences와 동일).
+
     Args:
         text: 분할할 텍스트
-        
+
     Returns:
         List[str]: 문장 목록
     """
-    # 문장 구분자: 마침표, 물음표, 느낌표 뒤에 공백이 있는 경우
-    delimiters = r'(?<=[.!?])\s+'
-    
-    # 텍스트 분할
-    sentences = re.split(delimiters, text)
-    
-    # 빈 문장 제거
-    sentences = [sentence.strip() for sentence in sentences if sentence.strip()]
-    
-    return sentences
+    return segment_sentences(text)
 
 def is_korean(text: str) -> bool:
     """텍스트에 한글이 포함되어 있는지 확인합니다.
@@ -1,65 +1,78 @@
 // DeepSeek API 서비스
 // src/api/deepseekService.js
 
-// DeepSeek API 요청을 위한 기본 설정
-const DEEPSEEK_API_URL = 'https://api.deepseek.com/v1/chat/completions';  // 실제 API URL로 변경 필요
-const DEEPSEEK_MODEL = 'deepseek-chat';  // 실제 모델명으로 변경 필요
+// 백엔드 스트리밍 채팅 API (API 키는 서버에서 관리, 브라우저는 DeepSeek을 직접 호출하지 않음)
+const CHAT_STREAM_URL = 'http://localhost:8000/api/chat/stream';
 
 /**
- * DeepSeek API를 호출하여 텍스트 응답을 생성합니다.
+ * 백엔드 스트리밍 API(SSE)로 응답을 받아 토큰이 도착할 때마다 onDelta를 호출합니다.
  * @param {string} prompt - 사용자 입력 메시지
  * @param {Array} history - 이전 대화 내역 (선택적)
- * @param {string} apiKey - DeepSeek API 키
- * @returns {Promise<Object>} - 응답 객체
+ * @param {Function} onDelta - (delta, 지금까지의 전체 텍스트)로 호출되는 콜백 (선택적)
+ * @returns {Promise<Object>} - 응답 객체 ({ success, content, data, error })
+ *   done 이벤트 없이 스트림이 끝나면 (연결 끊김 등) 받은 부분까지 content에 담아 success: false로 반환
  */
-export const getDeepSeekResponse = async (prompt, history = [], apiKey) => {
+export const streamChatResponse = async (prompt, history = [], onDelta = () => {}) => {
+  let content = '';
   try {
-    // API 키 확인
-    if (!apiKey) {
-      throw new Error('DeepSeek API 키가 제공되지 않았습니다.');
-    }
-    
-    // 대화 형식으로 메시지 구성
-    const messages = [...formatChatHistory(history), {
-      role: 'user',
-      content: prompt
-    }];
-    
-    // API 요청 설정
-    const response = await fetch(DEEPSEEK_API_URL, {
+    const response = await fetch(CHAT_STREAM_URL, {
       method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        'Authorization': `Bearer ${apiKey}`
-      },
+      headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({
-        model: DEEPSEEK_MODEL,
-        messages: messages,
+        message: prompt,
+        history: formatChatHistory(history),
         temperature: 0.7,
         max_tokens: 500
       })
     });
     
-    // 응답 확인
+    // 스트림 시작 전 오류 (API 키 미설정 등)
     if (!response.ok) {
-      const errorData = await response.json();
-      throw new Error(`DeepSeek API 오류: ${errorData.error?.message || response.statusText}`);
+      const errorData = await response.json().catch(() => ({}));
+      throw new Error(`채팅 API 오류: ${errorData.detail || response.statusText}`);
+    }
+    
+    // SSE 이벤트를 도착하는 대로 파싱
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let data = null;
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const events = buffer.split('\n\n');
+      buffer = events.pop();
+      for (const raw of events) {
+        const event = raw.match(/^event: (.*)$/m)?.[1];
+        const payload = JSON.parse(raw.match(/^data: (.*)$/m)?.[1] || 'null');
+        if (event === 'delta') {
+          content += payload.content;
+          onDelta(payload.content, content);
+        } else if (event === 'done') {
+          data = payload;
+        } else if (event === 'error') {
+          throw new Error(`DeepSeek API 오류: ${payload.detail}`);
+        }
+      }
     }
     
-    // 응답 데이터 파싱
-    const data = await response.json();
+    // 서버는 정상 종료 시 항상 done 이벤트를 보내므로, 없으면 중간에 끊긴 응답
+    if (data === null) {
+      throw new Error('응답 스트림이 완료되지 않았습니다 (연결이 중간에 끊어졌습니다)');
+    }
     
     return {
       success: true,
-      content: data.choices[0].message.content,
+      content: content,
       data: data
     };
   } catch (error) {
-    console.error('DeepSeek API 호출 실패:', error);
+    console.error('채팅 스트리밍 실패:', error);
     return {
       success: false,
       error: error.message,
-      content: null,
+      content: content || null,
       data: null
     };
   }
@@ -82,13 +95,3 @@ const formatChatHistory = (messages) => {
     content: msg.content
   }));
 };
-
-/**
- * 환경 변수에서 DeepSeek API 키를 가져옵니다.
- * 프로덕션에서는 안전한 방법으로 API 키를 관리해야 합니다.
- * @returns {string} API 키
- */
-export const getDeepSeekApiKey = () => {
-  // 실제 환경에서는 서버 사이드에서 안전하게 관리되어야 함
-  return import.meta.env.VITE_DEEPSEEK_API_KEY;
-};
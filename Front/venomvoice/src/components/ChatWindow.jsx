@@ -1,7 +1,7 @@
 import { useEffect, useState, useRef } from 'react';
 import useChatStore from '../store/chatStore.js';
 import useAuthStore from '../store/authStore.js';
-import { getDeepSeekResponse, getDeepSeekApiKey } from '../api/deepseekService.js';
+import { streamChatResponse } from '../api/deepseekService.js';
 import axios from 'axios';
 import Lottie from 'lottie-web';
 
@@ -11,6 +11,7 @@ const ChatWindow = () => {
   const [inputMessage, setInputMessage] = useState('');
   const [isProcessing, setIsProcessing] = useState(false);
   const [selectedConversation, setSelectedConversation] = useState(null);
+  const [streamingText, setStreamingText] = useState(null); // 스트리밍 중인 AI 응답 (저장 전)
   const messagesEndRef = useRef(null);
   
   // 음성 관련 상태
@@ -235,16 +236,10 @@ const ChatWindow = () => {
       
       await addMessage(userMessage);
       
-      // DeepSeek API 요청
+      // 백엔드 채팅 API 요청 (API 키는 서버에서 관리)
       setConversationStatus('AI 응답 생성 중');
       
-      const apiKey = getDeepSeekApiKey();
-      
-      if (!apiKey) {
-        throw new Error('DeepSeek API 키가 설정되지 않았습니다.');
-      }
-      
-      const response = await getDeepSeekResponse(text, messages, apiKey);
+      const response = await streamChatResponse(text, messages);
       
       let botResponse;
       if (response.success) {
@@ -314,14 +309,10 @@ const ChatWindow = () => {
     await addMessage(userMessage);
     
     try {
-      // DeepSeek API 호출
-      const apiKey = getDeepSeekApiKey();
-      
-      if (!apiKey) {
-        throw new Error('DeepSeek API 키가 설정되지 않았습니다.');
-      }
-      
-      const response = await getDeepSeekResponse(messageText, messages, apiKey);
+      // 백엔드 스트리밍 API 호출 (토큰이 도착하는 대로 표시)
+      setStreamingText('');
+      const response = await streamChatResponse(messageText, messages, (delta, text) => setStreamingText(text));
+      setStreamingText(null);
       
       let botResponse;
       if (response.success) {
@@ -368,6 +359,7 @@ const ChatWindow = () => {
       
       await addMessage(errorResponse);
     } finally {
+      setStreamingText(null);
       setIsProcessing(false);
       setInputMessage('');
     }
@@ -481,6 +473,13 @@ const ChatWindow = () => {
                   </div>
                 </div>
               ))}
+              {streamingText && (
+                <div className="message assistant-message">
+                  <div className="message-content">
+                    {streamingText}
+                  </div>
+                </div>
+              )}
               <div ref={messagesEndRef} />
             </>
           )}